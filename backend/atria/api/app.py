@@ -10,7 +10,6 @@ from api.extensions import migrate
 from api.extensions import socketio
 
 # from api.extensions import CustomJSONProvider
-from api.models import TokenBlocklist
 
 
 def create_app(testing=False):
@@ -46,7 +45,7 @@ def configure_extensions(app):
 
     if redis_url:
         try:
-            # General purpose Redis client (DB 0) - currently unused
+            # General purpose Redis client (DB 0) - chat write-behind journal, upload jobs
             extensions.redis_client = redis_lib.from_url(
                 redis_url, decode_responses=True
             )
@@ -80,6 +79,24 @@ def configure_extensions(app):
     else:
         app.logger.info("ℹ️ Redis not configured - using in-memory mode")
 
+    # Socket session registry (shared across workers when Redis is up)
+    from api.sockets.session_manager import session_manager
+
+    session_manager.configure(
+        app.config.get("SOCKET_SESSION_BACKEND"), extensions.presence_redis
+    )
+
+    from api.sockets.admission import anonymous_admission, connection_admission
+
+    connection_admission.configure(
+        app.config.get("SOCKET_CONNECT_RATE", 50),
+        app.config.get("SOCKET_CONNECT_BURST", 200),
+    )
+    anonymous_admission.configure(
+        app.config.get("SOCKET_ANONYMOUS_CONNECT_RATE", 10),
+        app.config.get("SOCKET_ANONYMOUS_CONNECT_BURST", 50),
+    )
+
     # Configure CORS based on environment
     flask_env = os.getenv("FLASK_ENV", "production")
     if flask_env == "development":
@@ -153,7 +170,20 @@ def configure_extensions(app):
     register_socket_handlers()
     from api.sockets import setup_socket_maintenance
 
-    setup_socket_maintenance()
+    setup_socket_maintenance(app)
+
+    from api.services.chat_write_buffer import chat_write_buffer
+
+    chat_write_buffer.configure(app, app.config.get("CHAT_WRITE_BEHIND", False))
+
+    from api.services.image_pipeline import image_pipeline
+
+    image_pipeline.configure(
+        app.config.get("IMAGE_PROCESS_WORKERS", 0),
+        app.config.get("IMAGE_PROCESS_MAX_TASKS"),
+        app.config.get("IMAGE_STAGING_DIR"),
+        app.config.get("IMAGE_RENDER_TIMEOUT"),
+    )
     configure_jwt_handlers(app)
 
 
@@ -199,9 +229,11 @@ def configure_jwt_handlers(app):
 
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
-        jti = jwt_payload["jti"]
-        token = TokenBlocklist.query.filter_by(jti=jti).first()
-        return token is not None and token.revoked
+        # Served from the token state cache; tokens missing from the
+        # blocklist table (e.g. socket tokens) are treated as valid here
+        from api.auth.helpers import get_token_state, TOKEN_REVOKED
+
+        return get_token_state(jwt_payload) == TOKEN_REVOKED
 
     @jwt.invalid_token_loader
     def invalid_token_callback(error):
@@ -7,12 +7,16 @@ from api.auth.helpers import (
     add_token_to_database,
     revoke_token,
     is_token_revoked,
+    get_token_state,
+    invalidate_token_state,
 )
 
 __all__ = [
     "add_token_to_database",
     "revoke_token",
     "is_token_revoked",
+    "get_token_state",
+    "invalidate_token_state",
     "jwt_required",
     "get_jwt_identity",
     "get_jwt",
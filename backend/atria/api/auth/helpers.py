@@ -2,15 +2,123 @@
 
 Heavily inspired by
 https://github.com/vimalloc/flask-jwt-extended/blob/master/examples/blocklist_database.py
+
+Token state is cached write-through so the blocklist check that runs on every
+authenticated request does not need a Postgres round trip:
+
+- L1: a small per-process LRU (``_local_token_states``)
+- L2: ``cache_redis`` keys ``token_state:{jti}`` that expire with the token
+
+Revocation is one-way, so a cached "revoked" state is kept until the token
+expires. A cached "active" state is only trusted locally for
+``LOCAL_ACTIVE_TTL`` seconds, which bounds how long another worker can keep
+accepting a token after it has been revoked.
 """
+import logging
+import time
 from datetime import datetime
 
 from flask_jwt_extended import decode_token
 from sqlalchemy.orm.exc import NoResultFound
 
+from api import extensions
+from api.commons.local_cache import LocalTTLCache
 from api.extensions import db
 from api.models import TokenBlocklist
 
+logger = logging.getLogger(__name__)
+
+TOKEN_ACTIVE = "active"
+TOKEN_REVOKED = "revoked"
+TOKEN_UNKNOWN = "unknown"
+
+LOCAL_ACTIVE_TTL = 5  # seconds an "active" state is trusted without Redis
+UNKNOWN_TTL = 60  # seconds a "not in database" result is cached
+
+_local_token_states = LocalTTLCache(maxsize=10000)
+
+
+def _token_state_key(jti):
+    return f"token_state:{jti}"
+
+
+def _seconds_until(exp):
+    """Seconds until a unix timestamp (at least 1), or None if unknown"""
+    if exp is None:
+        return None
+    return max(1, int(exp - time.time()))
+
+
+def cache_token_state(jti, state, exp=None):
+    """
+    Write a token state through both cache tiers.
+
+    :param jti: token identifier
+    :param state: one of TOKEN_ACTIVE, TOKEN_REVOKED, TOKEN_UNKNOWN
+    :param exp: token expiry as a unix timestamp, used for the TTL
+    """
+    ttl = _seconds_until(exp)
+    if state == TOKEN_UNKNOWN:
+        ttl = min(ttl or UNKNOWN_TTL, UNKNOWN_TTL)
+    elif ttl is None:
+        ttl = UNKNOWN_TTL
+
+    local_ttl = ttl if state == TOKEN_REVOKED else min(ttl, LOCAL_ACTIVE_TTL)
+    _local_token_states.set(jti, state, ttl=local_ttl)
+
+    if extensions.cache_redis:
+        try:
+            extensions.cache_redis.setex(_token_state_key(jti), ttl, state)
+        except Exception as e:
+            logger.debug(f"Token state cache write error for {jti}: {e}")
+
+
+def invalidate_token_state(jti):
+    """Drop a token's cached state from both tiers"""
+    _local_token_states.delete(jti)
+    if extensions.cache_redis:
+        try:
+            extensions.cache_redis.delete(_token_state_key(jti))
+        except Exception as e:
+            logger.debug(f"Token state cache delete error for {jti}: {e}")
+
+
+def get_token_state(jwt_payload):
+    """
+    Resolve a token's blocklist state, reading the database only on a miss.
+
+    :return: TOKEN_ACTIVE, TOKEN_REVOKED or TOKEN_UNKNOWN (not in database)
+    """
+    jti = jwt_payload["jti"]
+    exp = jwt_payload.get("exp")
+
+    state = _local_token_states.get(jti)
+    if state is not None:
+        return state
+
+    if extensions.cache_redis:
+        try:
+            state = extensions.cache_redis.get(_token_state_key(jti))
+        except Exception as e:
+            logger.debug(f"Token state cache read error for {jti}: {e}")
+            state = None
+        if state is not None:
+            ttl = _seconds_until(exp) or UNKNOWN_TTL
+            if state != TOKEN_REVOKED:
+                ttl = min(ttl, LOCAL_ACTIVE_TTL)
+            _local_token_states.set(jti, state, ttl=ttl)
+            return state
+
+    token = TokenBlocklist.query.filter_by(jti=jti).first()
+    if token is None:
+        state = TOKEN_UNKNOWN
+    else:
+        state = TOKEN_REVOKED if token.revoked else TOKEN_ACTIVE
+        exp = token.expires.timestamp() if exp is None else exp
+
+    cache_token_state(jti, state, exp)
+    return state
+
 
 def add_token_to_database(encoded_token, identity_claim):
     """
@@ -35,6 +143,8 @@ def add_token_to_database(encoded_token, identity_claim):
     db.session.add(db_token)
     db.session.commit()
 
+    cache_token_state(jti, TOKEN_ACTIVE, decoded_token["exp"])
+
 
 def is_token_revoked(jwt_payload):
     """
@@ -43,12 +153,7 @@ def is_token_revoked(jwt_payload):
     in the database we are going to consider it revoked, as we don't know where
     it was created.
     """
-    jti = jwt_payload["jti"]
-    try:
-        token = TokenBlocklist.query.filter_by(jti=jti).one()
-        return token.revoked
-    except NoResultFound:
-        return True
+    return get_token_state(jwt_payload) != TOKEN_ACTIVE
 
 
 def revoke_token(token_jti, user):
@@ -63,3 +168,5 @@ def revoke_token(token_jti, user):
         db.session.commit()
     except NoResultFound:
         raise Exception("Could not find the token {}".format(token_jti))
+
+    cache_token_state(token_jti, TOKEN_REVOKED, token.expires.timestamp())
@@ -1,8 +1,8 @@
 from functools import wraps
-from flask_jwt_extended import get_jwt_identity
 from flask_smorest import abort
-from api.models import User, Organization, Event, Session, ChatRoom, EventUser
+from api.models import Organization, Event, Session, ChatRoom
 from api.models.enums import EventUserRole, OrganizationUserRole
+from api.commons.principal import get_current_user, get_event_principal
 
 
 # check if admin of organization (ie. can edit)
@@ -12,8 +12,7 @@ def org_admin_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
+            current_user = get_current_user()
             org_id = kwargs.get("org_id")
 
             org = Organization.query.get_or_404(org_id)
@@ -38,8 +37,7 @@ def org_owner_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
+            current_user = get_current_user()
             
             # Handle both org_id in kwargs and event_id (need to get org from event)
             org_id = kwargs.get("org_id")
@@ -69,8 +67,7 @@ def org_member_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
+            current_user = get_current_user()
             org_id = kwargs.get("org_id")
 
             org = Organization.query.get(org_id)
@@ -97,9 +94,6 @@ def event_member_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
-
             # Handle either direct event_id or get it from session
             event_id = kwargs.get("event_id")
             if not event_id and "session_id" in kwargs:
@@ -109,17 +103,12 @@ def event_member_required():
             if not event_id:
                 abort(400, message="No event ID found")
 
-            event = Event.query.get_or_404(event_id)
-            if not event.user_can_access(current_user):
+            principal = get_event_principal(event_id)
+            if not principal.can_access:
                 abort(403, message="Not authorized to access this event")
 
             # Check if user is banned from the event
-            event_user = EventUser.query.filter_by(
-                event_id=event_id,
-                user_id=current_user_id
-            ).first()
-
-            if event_user and event_user.is_banned:
+            if principal.is_banned:
                 abort(403, message="You have been banned from this event")
 
             return f(*args, **kwargs)
@@ -139,9 +128,6 @@ def event_member_or_admin_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
-
             # Handle either direct event_id or get it from session
             event_id = kwargs.get("event_id")
             if not event_id and "session_id" in kwargs:
@@ -151,18 +137,13 @@ def event_member_or_admin_required():
             if not event_id:
                 abort(400, message="No event ID found")
 
-            event = Event.query.get_or_404(event_id)
-            if not event.user_can_access(current_user):
+            principal = get_event_principal(event_id)
+            if not principal.can_access:
                 abort(403, message="Not authorized to access this event")
 
-            # Get user's event role
-            event_user = EventUser.query.filter_by(
-                event_id=event_id,
-                user_id=current_user_id
-            ).first()
-
             # Allow access if user is admin/organizer even if banned,
             # or if user is not banned
+            event_user = principal.event_user
             if event_user:
                 is_admin_or_organizer = event_user.role in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]
                 if not is_admin_or_organizer and event_user.is_banned:
@@ -186,17 +167,13 @@ def event_organizer_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
-
             # Handle either direct event_id or get it from session
             event_id = kwargs.get("event_id")
             if not event_id and "session_id" in kwargs:
                 session = Session.query.get_or_404(kwargs["session_id"])
                 event_id = session.event_id
 
-            event = Event.query.get_or_404(event_id)
-            user_role = event.get_user_role(current_user)
+            user_role = get_event_principal(event_id).role
 
             if user_role not in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]:
                 abort(403, message="Must be admin or organizer to perform this action")
@@ -219,12 +196,9 @@ def event_admin_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
             event_id = kwargs.get("event_id")
 
-            event = Event.query.get_or_404(event_id)
-            user_role = event.get_user_role(current_user)
+            user_role = get_event_principal(event_id).role
 
             if user_role != EventUserRole.ADMIN:
                 abort(403, message="Must be admin to perform this action")
@@ -246,12 +220,10 @@ def session_access_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
             session_id = kwargs.get("session_id")
 
             session = Session.query.get_or_404(session_id)
-            if not session.event.user_can_access(current_user):
+            if not get_event_principal(session.event_id).can_access:
                 return {
                     "message": "Not authorized to access this session"
                 }, 403
@@ -273,25 +245,18 @@ def chat_room_access_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
+            current_user = get_current_user()
             room_id = kwargs.get("room_id")
 
             chat_room = ChatRoom.query.get_or_404(room_id)
-            event = Event.query.get_or_404(chat_room.event_id)
+            principal = get_event_principal(chat_room.event_id)
 
             # First check basic event access
-            if not event.user_can_access(current_user):
+            if not principal.can_access:
                 abort(403, message="Not authorized to access this chat room")
 
-            # Get user's role in the event for room type checking
-            event_user = EventUser.query.filter_by(
-                event_id=chat_room.event_id,
-                user_id=current_user_id
-            ).first()
-
             # If no EventUser record but has access, they're likely org owner (treated as ADMIN)
-            user_role = event.get_user_role(current_user) if not event_user else event_user.role
+            user_role = principal.role
 
             # Check room type access based on role
             from api.models.enums import ChatRoomType
@@ -328,26 +293,20 @@ def event_organizer_or_org_owner_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
-
             # Handle either direct event_id or get it from session
             event_id = kwargs.get("event_id")
             if not event_id and "session_id" in kwargs:
                 session = Session.query.get_or_404(kwargs["session_id"])
                 event_id = session.event_id
 
-            event = Event.query.get_or_404(event_id)
+            principal = get_event_principal(event_id)
             
             # First check event role
-            user_role = event.get_user_role(current_user)
-            if user_role in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]:
+            if principal.is_admin_or_organizer:
                 return f(*args, **kwargs)
             
             # Then check if user is organization owner
-            org = Organization.query.get(event.organization_id)
-            org_role = org.get_user_role(current_user)
-            if org_role == OrganizationUserRole.OWNER:
+            if principal.is_org_owner:
                 return f(*args, **kwargs)
 
             return {
@@ -365,21 +324,16 @@ def event_admin_or_org_owner_required():
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            current_user = User.query.get_or_404(current_user_id)
             event_id = kwargs.get("event_id")
 
-            event = Event.query.get_or_404(event_id)
+            principal = get_event_principal(event_id)
             
             # First check event role
-            user_role = event.get_user_role(current_user)
-            if user_role == EventUserRole.ADMIN:
+            if principal.role == EventUserRole.ADMIN:
                 return f(*args, **kwargs)
             
             # Then check if user is organization owner
-            org = Organization.query.get(event.organization_id)
-            org_role = org.get_user_role(current_user)
-            if org_role == OrganizationUserRole.OWNER:
+            if principal.is_org_owner:
                 return f(*args, **kwargs)
 
             return {
@@ -13,10 +13,18 @@ Fernet provides:
 - Safe for database storage (base64-encoded output)
 """
 
+from functools import lru_cache
+
 from cryptography.fernet import Fernet
 from flask import current_app
 
 
+@lru_cache(maxsize=4)
+def _get_fernet(encryption_key: str) -> Fernet:
+    """Fernet cipher for a key (built once per key, not per call)"""
+    return Fernet(encryption_key.encode())
+
+
 def encrypt_secret(plaintext: str) -> str:
     """
     Encrypt sensitive data before storing in database.
@@ -45,8 +53,8 @@ def encrypt_secret(plaintext: str) -> str:
     # Get encryption key from Flask config
     encryption_key = current_app.config["ENCRYPTION_KEY"]
 
-    # Create Fernet cipher
-    f = Fernet(encryption_key.encode())
+    # Get Fernet cipher
+    f = _get_fernet(encryption_key)
 
     # Encrypt and return base64-encoded token
     return f.encrypt(plaintext.encode()).decode()
@@ -84,8 +92,8 @@ def decrypt_secret(encrypted: str) -> str:
     # Get encryption key from Flask config
     encryption_key = current_app.config["ENCRYPTION_KEY"]
 
-    # Create Fernet cipher
-    f = Fernet(encryption_key.encode())
+    # Get Fernet cipher
+    f = _get_fernet(encryption_key)
 
     # Decrypt and return plaintext
     return f.decrypt(encrypted.encode()).decode()
@@ -0,0 +1,92 @@
+"""
+Render worker process for api.services.image_pipeline.
+
+Started as ``python -m api.commons.image_worker FD``: reads render requests
+from the socket on file descriptor FD, renders them with api.commons.images
+and writes the result back, one request at a time, until the other end
+closes the socket. Only Pillow is imported here, never Flask or the app.
+
+Messages are pickled and length-prefixed (see send/receive); both ends are
+this codebase. A request is ``(source, value, context)`` where source is
+"data" (value is the upload's bytes) or "path" (value is a staged file). A
+reply is ``("ok", renditions)``, ``("invalid", message)`` for images
+render_image rejects, or ``("error", message)`` for anything else.
+"""
+
+import pickle
+import socket
+import struct
+import sys
+from typing import Any, Optional, Tuple
+
+from api.commons.images import render_image
+
+_HEADER = struct.Struct("!Q")
+# Largest single recv
+_CHUNK = 1 << 20
+
+
+def send(sock: socket.socket, message: Any) -> None:
+    """Write one message"""
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(data)))
+    sock.sendall(data)
+
+
+def receive(sock: socket.socket) -> Optional[Any]:
+    """
+    Read one message
+
+    Returns:
+        The message, or None if the other end closed the socket
+
+    Raises:
+        EOFError: If the socket was closed halfway through a message
+    """
+    header = _read_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    data = _read_exactly(sock, _HEADER.unpack(header)[0])
+    if data is None:
+        raise EOFError("Socket closed mid-message")
+    return pickle.loads(data)
+
+
+def _read_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(min(size - len(buffer), _CHUNK))
+        if not chunk:
+            return None
+        buffer += chunk
+    return bytes(buffer)
+
+
+def handle(request: Tuple[str, Any, str]) -> Tuple[str, Any]:
+    """Render one request into a reply"""
+    source, value, context = request
+    try:
+        if source == "path":
+            with open(value, "rb") as staged:
+                value = staged.read()
+        return "ok", render_image(value, context)
+    except ValueError as e:
+        return "invalid", str(e)
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}"
+
+
+def main(fd: int) -> None:
+    sock = socket.socket(fileno=fd)
+    # Inherited non-blocking when the parent's socketpair was green
+    sock.setblocking(True)
+    with sock:
+        while True:
+            request = receive(sock)
+            if request is None:
+                return
+            send(sock, handle(request))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]))
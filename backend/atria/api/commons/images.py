@@ -0,0 +1,174 @@
+"""
+Image decoding and rendition encoding for uploads.
+
+Pure functions over bytes, with no Flask or database imports, so they can run
+in a separate worker process (see api.services.image_pipeline). Large JPEGs
+are decoded at reduced scale with Pillow's draft mode, so memory per image is
+bounded by the largest rendition rather than by the camera's resolution.
+"""
+
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageOps
+
+# Longest side of the "full" rendition by upload context
+MAX_DIMENSIONS = {
+    'avatar': 600,
+    'sponsor_logo': 800,
+    'event_logo': 800,
+    'event_banner': 1600,
+}
+DEFAULT_MAX_DIMENSION = 1200
+
+# Smaller renditions, by name and longest side; only produced when smaller
+# than the full rendition
+RENDITION_SIZES = {
+    'thumbnail': 160,
+    'medium': 480,
+}
+
+# Contexts whose transparency is kept (lossless WebP)
+TRANSPARENT_CONTEXTS = ('sponsor_logo', 'avatar')
+
+# Refuse images that would decode to more pixels than this (decompression bombs)
+MAX_PIXELS = 50_000_000
+
+
+def max_dimension(context: str) -> int:
+    """Longest side of the full rendition for a context"""
+    return MAX_DIMENSIONS.get(context, DEFAULT_MAX_DIMENSION)
+
+
+def verify_image(data: bytes) -> None:
+    """
+    Check that data is a complete, decodable image.
+
+    Raises:
+        ValueError: If it isn't, or if it's unreasonably large
+    """
+    try:
+        with Image.open(BytesIO(data)) as image:
+            if image.width * image.height > MAX_PIXELS:
+                raise ValueError("Image dimensions too large")
+            image.verify()
+    except ValueError:
+        raise
+    except Exception:
+        raise ValueError("Invalid image file")
+
+
+def load_image(data: bytes, target: int) -> Image.Image:
+    """
+    Decode an image, oriented per EXIF, at no more than ``target`` on its longest side.
+
+    JPEGs are decoded with draft(), which lets libjpeg scale by 1/2, 1/4 or
+    1/8 while decoding instead of materializing the full-size bitmap.
+    """
+    image = Image.open(BytesIO(data))
+    if image.format == 'JPEG':
+        image.draft(None, (target, target))
+    image = ImageOps.exif_transpose(image)
+    if image.width > target or image.height > target:
+        image.thumbnail((target, target), Image.Resampling.LANCZOS)
+    return image
+
+
+def encode_image(image: Image.Image, context: str) -> Tuple[bytes, str]:
+    """
+    Encode an image for web delivery.
+
+    WebP (lossless for logos/avatars with transparency), falling back to PNG
+    or JPEG if WebP isn't available.
+
+    Returns:
+        (encoded bytes, file extension)
+    """
+    has_transparency = image.mode in ('RGBA', 'LA') or (
+        image.mode == 'P' and 'transparency' in image.info
+    )
+
+    output = BytesIO()
+
+    try:
+        if has_transparency and context in TRANSPARENT_CONTEXTS:
+            # Use lossless WebP for logos/avatars with transparency
+            image.save(output, format='WEBP', lossless=True, quality=100)
+        else:
+            # Use lossy WebP for everything else
+            if image.mode == 'RGBA' and context not in TRANSPARENT_CONTEXTS:
+                # Convert RGBA to RGB for non-logo/avatar images
+                image = _flatten(image)
+            image.save(output, format='WEBP', quality=85, method=6)
+        format_ext = 'webp'
+    except Exception:
+        # Fallback to PNG for transparency or JPEG for non-transparent
+        output = BytesIO()  # Reset buffer
+        if has_transparency:
+            image.save(output, format='PNG', optimize=True)
+            format_ext = 'png'
+        else:
+            if image.mode == 'RGBA':
+                # Convert RGBA to RGB for JPEG
+                image = _flatten(image)
+            image.save(output, format='JPEG', quality=85, optimize=True, progressive=True)
+            format_ext = 'jpg'
+
+    return output.getvalue(), format_ext
+
+
+def render_image(data: bytes, context: str) -> Dict[str, Tuple[bytes, str]]:
+    """
+    Verify an uploaded image and produce its renditions.
+
+    Decodes once at the full rendition's size; each smaller rendition is
+    downsized from the previous one.
+
+    Args:
+        data: Uploaded file contents
+        context: Upload context (e.g., 'avatar', 'event_banner')
+
+    Returns:
+        {rendition name: (encoded bytes, file extension)}, always with "full"
+
+    Raises:
+        ValueError: If the data isn't a valid image
+    """
+    verify_image(data)
+
+    full_size = max_dimension(context)
+    try:
+        image = load_image(data, full_size)
+        image.load()
+    except OSError:
+        # verify() doesn't decode pixel data, so e.g. truncated JPEGs only fail here
+        raise ValueError("Invalid image file")
+    renditions = {'full': encode_image(image, context)}
+
+    source, previous = image, 'full'
+    for name, size in _smaller_renditions(full_size):
+        if source.width > size or source.height > size:
+            source = source.copy()
+            source.thumbnail((size, size), Image.Resampling.LANCZOS)
+            renditions[name] = encode_image(source, context)
+            previous = name
+        else:
+            # Already small enough: same as the next larger rendition
+            renditions[name] = renditions[previous]
+
+    return renditions
+
+
+def _smaller_renditions(full_size: int) -> List[Tuple[str, int]]:
+    """Rendition sizes below the full size, largest first"""
+    return sorted(
+        ((name, size) for name, size in RENDITION_SIZES.items() if size < full_size),
+        key=lambda item: -item[1],
+    )
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """Composite an RGBA image onto white"""
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.split()[3])
+    return background
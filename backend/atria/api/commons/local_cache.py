@@ -0,0 +1,101 @@
+"""
+In-process LRU cache with per-entry TTL.
+
+Used as a small L1 in front of Redis for values that are read on nearly every
+request (token state, hot service results). Each worker process has its own
+copy, so entries must either be safe to serve slightly stale or be invalidated
+explicitly by the code that changes them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+
+
+_MISSING = object()
+
+
+class LocalTTLCache:
+    """
+    Bounded LRU mapping where every entry carries its own expiry.
+
+    Design Principles:
+    - Bounded: evicts least recently used entries past ``maxsize``
+    - Per-entry TTL: callers pick how stale a value may get
+    - Thread/greenlet safe: a single lock guards the OrderedDict
+    """
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = 60):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value, or ``default`` if missing or expired
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the oldest entries if over capacity
+
+        Args:
+            key: Cache key
+            value: Value to store (kept by reference, not copied)
+            ttl: Seconds until the entry expires (defaults to default_ttl)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            self.delete(key)
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key, returning True if it was present"""
+        with self._lock:
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Snapshot of the live (key, value) pairs, without touching LRU order"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value)
+                for key, (value, expires_at) in self._data.items()
+                if expires_at > now
+            ]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -1,8 +1,13 @@
 """Simple helper to paginate query"""
 
-from typing import Dict, Any, Tuple, Optional, Union
+import base64
+import json
+from datetime import datetime
+from typing import Dict, Any, List, Sequence, Tuple, Optional, Union
 from flask import url_for, request
+from flask_smorest import abort
 from marshmallow import Schema, fields
+from sqlalchemy import tuple_
 
 DEFAULT_PAGE_SIZE = 50
 DEFAULT_PAGE_NUMBER = 1
@@ -23,6 +28,29 @@ PAGINATION_PARAMETERS = [
     },
 ]
 
+# Documentation parameters for endpoints that also support cursor pagination
+CURSOR_PAGINATION_PARAMETERS = [
+    {
+        "in": "query",
+        "name": "cursor",
+        "schema": {"type": "string"},
+        "description": (
+            "Opaque cursor from a previous response's next_cursor. Passing "
+            "cursor (empty for the first page) switches to cursor pagination, "
+            "which costs the same for every page"
+        ),
+    },
+    {
+        "in": "query",
+        "name": "count",
+        "schema": {"type": "string", "enum": ["exact", "estimate"]},
+        "description": (
+            "Cursor pagination only: include total_items, either exact "
+            "(COUNT query) or estimated by the query planner. Omitted by default"
+        ),
+    },
+]
+
 
 # Reusable response structure
 def get_pagination_schema(collection_name: str, ref_schema: str):
@@ -241,3 +269,166 @@ def paginate(query, schema, collection_name: str = "results"):
         **links,
         collection_name: schema.dump(page_obj.items),
     }
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode keyset values (e.g. created_at, id) as an opaque URL-safe cursor
+    """
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor()
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list):
+            raise ValueError("cursor must encode a list")
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+
+def keyset_page(
+    query,
+    columns: Sequence[Any],
+    cursor: Optional[str] = None,
+    per_page: int = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a query using keyset (seek) pagination
+
+    Instead of OFFSET, the page starts right after the last row of the
+    previous page: WHERE (col1, col2) < (:v1, :v2) ORDER BY col1, col2.
+    With an index on the columns, every page costs the same.
+
+    Args:
+        query: Filtered query (any existing ORDER BY is replaced)
+        columns: Unique ordering columns, e.g. (Model.created_at, Model.id)
+        cursor: Cursor from a previous page, or None for the first page
+        per_page: Page size
+        descending: Newest first (True) or oldest first (False)
+
+    Returns:
+        Tuple of (items, next_cursor). next_cursor is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    order = [column.desc() if descending else column.asc() for column in columns]
+    query = query.order_by(None).order_by(*order)
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(columns):
+            raise ValueError("Invalid cursor: wrong number of values")
+        keys, bounds = tuple_(*columns), tuple_(*values)
+        query = query.filter(keys < bounds if descending else keys > bounds)
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page:
+        next_cursor = encode_cursor(
+            [getattr(items[-1], column.key) for column in columns]
+        )
+    return items, next_cursor
+
+
+def estimate_count(query) -> Optional[int]:
+    """
+    Estimate a query's row count from the Postgres planner (no table scan)
+
+    Returns:
+        Estimated number of rows, or None if the planner could not be asked
+    """
+    try:
+        statement = query.order_by(None).statement
+        session = query.session
+        compiled = statement.compile(
+            dialect=session.get_bind().dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        plan = session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
+
+
+def cursor_paginate(
+    query,
+    schema,
+    collection_name: str = "results",
+    columns: Sequence[Any] = (),
+    descending: bool = True,
+):
+    """
+    Paginate a query by cursor and return the standard response envelope
+
+    Page-number fields that would need a COUNT are null unless the client
+    asks for ?count=exact or ?count=estimate. Clients follow next_cursor
+    (or the next link) until it is null.
+    """
+    page, per_page, other_request_args = extract_pagination(**request.args)
+    other_request_args.pop("cursor", None)
+    cursor = request.args.get("cursor") or None
+    count_mode = other_request_args.get("count")
+
+    try:
+        items, next_cursor = keyset_page(
+            query, columns, cursor=cursor, per_page=per_page, descending=descending
+        )
+    except ValueError as e:
+        abort(400, message=str(e))
+
+    total = None
+    if count_mode == "exact":
+        total = query.order_by(None).count()
+    elif count_mode == "estimate":
+        total = estimate_count(query)
+
+    endpoint = request.endpoint
+    view_args = request.view_args or {}
+
+    def link(page_cursor):
+        return url_for(
+            endpoint,
+            cursor=page_cursor or "",
+            per_page=per_page,
+            **other_request_args,
+            **view_args,
+        )
+
+    return {
+        "total_items": total,
+        "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+        "current_page": None,
+        "per_page": per_page,
+        "self": link(cursor),
+        "first": link(None),
+        "last": None,
+        "next": link(next_cursor) if next_cursor else None,
+        "prev": None,
+        "next_cursor": next_cursor,
+        collection_name: schema.dump(items),
+    }
@@ -0,0 +1,172 @@
+"""
+Request-scoped principal context.
+
+Access decorators and services used to load the same User, Event, EventUser
+and OrganizationUser rows several times per request. This module resolves
+them once and keeps them on ``flask.g`` for the rest of the request:
+
+- ``g.current_user``: the authenticated User
+- ``g.event_principal``: the EventPrincipal resolved by the last event check
+
+The cache is tied to the current request object, so it never leaks between
+requests (or Socket.IO events) that happen to share an app context. Outside
+a request context nothing is cached and every call falls back to queries.
+"""
+
+from flask import g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+
+from api.models import User, Event, EventUser, OrganizationUser
+from api.models.enums import EventUserRole, OrganizationUserRole
+
+
+class EventPrincipal:
+    """
+    Resolved relationship between one user and one event.
+
+    Attributes:
+        user: The User
+        event: The Event
+        event_user: The user's EventUser row, or None if not a member
+    """
+
+    def __init__(self, user, event, event_user):
+        self.user = user
+        self.event = event
+        self.event_user = event_user
+        self._is_org_owner = None
+
+    @property
+    def is_org_owner(self) -> bool:
+        """Whether the user owns the event's organization (queried once)"""
+        if self._is_org_owner is None:
+            org_user = OrganizationUser.query.filter_by(
+                organization_id=self.event.organization_id,
+                user_id=self.user.id,
+            ).first()
+            self._is_org_owner = (
+                org_user is not None and org_user.role == OrganizationUserRole.OWNER
+            )
+        return self._is_org_owner
+
+    @property
+    def is_member(self) -> bool:
+        """Whether the user has an explicit EventUser record"""
+        return self.event_user is not None
+
+    @property
+    def can_access(self) -> bool:
+        """Same rule as Event.user_can_access(): member or org owner"""
+        return self.is_member or self.is_org_owner
+
+    @property
+    def role(self):
+        """Same rule as Event.get_user_role(): org owners are treated as ADMIN"""
+        if self.event_user:
+            return self.event_user.role
+        if self.is_org_owner:
+            return EventUserRole.ADMIN
+        return None
+
+    @property
+    def is_banned(self) -> bool:
+        return bool(self.event_user and self.event_user.is_banned)
+
+    @property
+    def is_admin_or_organizer(self) -> bool:
+        return self.role in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]
+
+
+def _principal_cache():
+    """Get this request's cache dict, or None outside a request"""
+    if not has_request_context():
+        return None
+
+    current_request = request._get_current_object()
+    cache = g.get("_principal_cache")
+    if cache is None or cache["request"] is not current_request:
+        cache = {"request": current_request, "users": {}, "events": {}}
+        g._principal_cache = cache
+    return cache
+
+
+def get_current_user(user_id=None):
+    """
+    Get the authenticated user, loading it at most once per request.
+
+    Args:
+        user_id: Optional user ID (defaults to the JWT identity)
+
+    Returns:
+        User (aborts with 404 if the user no longer exists)
+    """
+    if user_id is None:
+        user_id = int(get_jwt_identity())
+
+    cache = _principal_cache()
+    if cache is not None and user_id in cache["users"]:
+        return cache["users"][user_id]
+
+    user = User.query.get_or_404(user_id)
+    if cache is not None:
+        cache["users"][user_id] = user
+        g.current_user = user
+    return user
+
+
+def get_event_principal(event_id, user_id=None):
+    """
+    Resolve the user's relationship to an event, once per request.
+
+    Args:
+        event_id: ID of the event (aborts with 404 if missing)
+        user_id: Optional user ID (defaults to the JWT identity)
+
+    Returns:
+        EventPrincipal
+    """
+    user = get_current_user(user_id)
+    cache = _principal_cache()
+    key = (user.id, int(event_id)) if event_id is not None else None
+
+    if cache is not None and key in cache["events"]:
+        principal = cache["events"][key]
+    else:
+        event = Event.query.get_or_404(event_id)
+        event_user = EventUser.query.filter_by(
+            event_id=event.id, user_id=user.id
+        ).first()
+        principal = EventPrincipal(user, event, event_user)
+        if cache is not None and key is not None:
+            cache["events"][key] = principal
+
+    if cache is not None:
+        g.event_principal = principal
+    return principal
+
+
+def peek_event_principal(event_id, user_id):
+    """
+    Return an already-resolved principal without running any query.
+
+    Services use this to reuse what the access decorators loaded.
+
+    Returns:
+        EventPrincipal or None if not resolved in this request
+    """
+    cache = _principal_cache()
+    if cache is None or event_id is None or user_id is None:
+        return None
+    return cache["events"].get((int(user_id), int(event_id)))
+
+
+def get_event_role(event, user):
+    """
+    Get a user's role in an event, reusing the request's principal if present.
+
+    Falls back to Event.get_user_role() when nothing was resolved.
+    """
+    principal = peek_event_principal(event.id, user.id)
+    if principal is not None:
+        return principal.role
+    return event.get_user_role(user)
@@ -0,0 +1,130 @@
+"""
+Full-text search helpers for message tables.
+
+Message tables carry a generated ``search_vector`` tsvector column with a
+GIN index (see the models). Searches parse user input with
+``websearch_to_tsquery`` (quotes, ``or`` and ``-word`` work like a web
+search box, and malformed input never raises), rank matches with
+``ts_rank_cd`` and build highlight snippets with ``ts_headline``.
+
+Snippets are computed from HTML-escaped content, so the only markup in a
+headline is the ``<mark>`` highlight and it is safe to render as HTML.
+
+Names are different: they shouldn't be stemmed, and a search box should match
+as you type. ``users.name_search_vector`` uses the ``simple`` configuration
+and name searches match every word as a prefix (``jo sm`` finds John Smith).
+Names are weighted ``A`` and fields a user can hide (their company) ``B``, so
+a names-only query can skip what the viewer isn't allowed to see.
+"""
+
+import re
+from typing import Sequence
+
+from sqlalchemy import func
+
+# Must match the configuration used by the generated search_vector columns
+SEARCH_CONFIG = "english"
+
+# Must match the configuration used by users.name_search_vector
+NAME_SEARCH_CONFIG = "simple"
+
+# Weight of the name columns in users.name_search_vector (hideable ones get B)
+NAME_WEIGHT = "A"
+HIDEABLE_WEIGHT = "B"
+
+# Longest name search honoured (words beyond it are ignored)
+MAX_NAME_SEARCH_WORDS = 8
+
+MIN_QUERY_LENGTH = 3
+
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, "
+    "MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+
+def search_vector_sql(content_column: str = "content") -> str:
+    """SQL for a generated tsvector column over a text column"""
+    return f"to_tsvector('{SEARCH_CONFIG}', coalesce({content_column}, ''))"
+
+
+def name_search_vector_sql(names: Sequence[str], hideable: Sequence[str] = ()) -> str:
+    """
+    SQL for a generated tsvector column over name-like text columns
+
+    Args:
+        names: Columns always searchable (weighted NAME_WEIGHT)
+        hideable: Columns users can hide from others (weighted HIDEABLE_WEIGHT)
+    """
+    parts = []
+    for columns, weight in ((names, NAME_WEIGHT), (hideable, HIDEABLE_WEIGHT)):
+        if columns:
+            document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+            parts.append(f"setweight(to_tsvector('{NAME_SEARCH_CONFIG}', {document}), '{weight}')")
+    return " || ".join(parts)
+
+
+def to_name_search_query(text: str, names_only: bool = False):
+    """
+    Build a prefix tsquery from name search input
+
+    Every word must match the start of a word in the vector. Only letters
+    and digits are kept, so input never breaks the tsquery syntax.
+
+    Args:
+        text: Raw search box input
+        names_only: Only match the name columns, not hideable ones
+
+    Returns:
+        SQL expression for the tsquery, or None if the input has no words
+    """
+    words = re.findall(r"[^\W_]+", text or "")[:MAX_NAME_SEARCH_WORDS]
+    if not words:
+        return None
+    weight = NAME_WEIGHT if names_only else ""
+    return func.to_tsquery(
+        NAME_SEARCH_CONFIG, " & ".join(f"{word}:*{weight}" for word in words)
+    )
+
+
+def to_search_query(text: str):
+    """
+    Build a tsquery from user input
+
+    Args:
+        text: Raw search box input
+
+    Returns:
+        SQL expression for the tsquery
+    """
+    return func.websearch_to_tsquery(SEARCH_CONFIG, text)
+
+
+def validate_search_text(text: str) -> str:
+    """
+    Normalize search input, raising ValueError if it is too short
+
+    Returns:
+        Stripped search text
+    """
+    text = (text or "").strip()
+    if len(text) < MIN_QUERY_LENGTH:
+        raise ValueError(
+            f"Search query must be at least {MIN_QUERY_LENGTH} characters"
+        )
+    return text
+
+
+def search_rank(vector_column, tsquery):
+    """Relevance of a row for the query (cover density ranking)"""
+    return func.ts_rank_cd(vector_column, tsquery)
+
+
+def search_headline(content_column, tsquery):
+    """Highlighted snippet of the matching text (HTML-escaped, <mark> tags)"""
+    escaped = func.replace(
+        func.replace(func.replace(content_column, "&", "&amp;"), "<", "&lt;"),
+        ">",
+        "&gt;",
+    )
+    return func.ts_headline(SEARCH_CONFIG, escaped, tsquery, HEADLINE_OPTIONS)
@@ -0,0 +1,105 @@
+"""
+Per-worker cache of organization signing keys and the tokens signed with them.
+
+Playback endpoints are hit by every viewer at session start. Decrypting an
+organization's credentials and parsing its PEM key costs far more than the
+signature itself, and viewers asking within the same short window can share
+a token. Both are cached in-process (keys never leave the worker).
+
+Keys are cached under a fingerprint of the *encrypted* columns. Saving new
+credentials writes new ciphertext (Fernet uses a random IV), so every worker
+stops using the old key on its next request without any cross-worker
+invalidation; forget_signing_keys only frees this worker's copy early.
+"""
+
+import hashlib
+import math
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from api.commons.local_cache import LocalTTLCache
+
+# Seconds a parsed key is kept without being used by a request
+KEY_TTL = 60 * 60
+
+# Token expiries are rounded up to this many seconds, and a token is reused
+# for every request that rounds to the same expiry
+TOKEN_REUSE_WINDOW = 60
+
+_signing_keys = LocalTTLCache(maxsize=256, default_ttl=KEY_TTL)
+_tokens = LocalTTLCache(maxsize=10000, default_ttl=TOKEN_REUSE_WINDOW)
+
+
+def credentials_fingerprint(*encrypted: Optional[str]) -> str:
+    """
+    Fingerprint an organization's stored (encrypted) credential columns
+
+    Args:
+        encrypted: Ciphertexts as stored in the database (None allowed)
+
+    Returns:
+        Hex digest that changes whenever any of the columns is rewritten
+    """
+    digest = hashlib.sha256()
+    for value in encrypted:
+        digest.update((value or "").encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_signing_key(org_id: int, provider: str, fingerprint: str, loader: Callable[[], Any]) -> Any:
+    """
+    Return an organization's parsed signing key, loading it on a miss
+
+    Args:
+        org_id: Organization ID
+        provider: Credential set ("mux", "jaas")
+        fingerprint: credentials_fingerprint of the encrypted columns
+        loader: Decrypts and parses the key; only called on a miss
+
+    Returns:
+        Whatever loader returns (key object, or key plus decrypted metadata)
+    """
+    key = (org_id, provider, fingerprint)
+    value = _signing_keys.get(key)
+    if value is None:
+        value = loader()
+        _signing_keys.set(key, value)
+    return value
+
+
+def forget_signing_keys(org_id: int) -> None:
+    """Drop this worker's cached keys for an organization (after credentials change)"""
+    for key, _ in _signing_keys.items():
+        if key[0] == org_id:
+            _signing_keys.delete(key)
+
+
+def token_expiry(expires_in: int, now: Optional[float] = None) -> int:
+    """
+    Unix expiry for a token valid at least ``expires_in`` seconds from now
+
+    Rounded up to TOKEN_REUSE_WINDOW so requests in the same window get the
+    same expiry, and so the same token.
+    """
+    now = time.time() if now is None else now
+    return int(math.ceil((now + expires_in) / TOKEN_REUSE_WINDOW) * TOKEN_REUSE_WINDOW)
+
+
+def get_token(key: Hashable, build: Callable[[], Any]) -> Any:
+    """
+    Return a memoized signed token, signing it on a miss
+
+    Args:
+        key: Everything the token's claims depend on, including the
+            credentials fingerprint and the token_expiry
+        build: Signs the token; only called on a miss
+
+    Returns:
+        Whatever build returns
+    """
+    value = _tokens.get(key)
+    if value is None:
+        value = build()
+        _tokens.set(key, value)
+    return value
@@ -1,9 +1,10 @@
 # api/commons/socket_decorators.py
 from functools import wraps
 from flask_socketio import emit, disconnect
-from flask import request
+from flask import g, request
 from api.models import User, Event, ChatRoom
 from api.models.enums import EventUserRole
+from api.services.chat_access_cache import ChatAccessCache
 
 # Import the session manager
 from api.sockets.session_manager import session_manager
@@ -90,11 +91,6 @@ def socket_chat_room_access_required(f):
 
         # Get user_id from session
         user_id = session_manager.get_user_id(request.sid)
-        current_user = User.query.get(user_id)
-
-        if not current_user:
-            emit("error", {"message": "User not found"})
-            return
 
         # Get room_id from the data
         data = args[0] if args else {}
@@ -104,6 +100,18 @@ def socket_chat_room_access_required(f):
             emit("error", {"message": "No room ID provided"})
             return
 
+        # Fast path: access granted when this socket joined the room
+        access = ChatAccessCache.get(request.sid, room_id, user_id)
+        if access is not None:
+            g.chat_access = access
+            return f(user_id, *args, **kwargs)
+
+        current_user = User.query.get(user_id)
+
+        if not current_user:
+            emit("error", {"message": "User not found"})
+            return
+
         chat_room = ChatRoom.query.get(room_id)
         if not chat_room:
             emit("error", {"message": "Chat room not found"})
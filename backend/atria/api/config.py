@@ -104,6 +104,29 @@ CACHE_KEY_PREFIX = "atria_cache_"
 SOCKETIO_ASYNC_MODE = "eventlet"
 SOCKETIO_LOGGER = ENV == "development"
 SOCKETIO_ENGINEIO_LOGGER = False
+# Socket session registry: "redis" (cluster-wide, falls back to memory
+# without Redis) or "memory" (per process)
+SOCKET_SESSION_BACKEND = os.getenv("SOCKET_SESSION_BACKEND", "redis")
+# Socket connect admission per worker: sustained connects/second (0 disables)
+# and burst size, to absorb reconnect storms after deploys
+SOCKET_CONNECT_RATE = float(os.getenv("SOCKET_CONNECT_RATE", "50"))
+SOCKET_CONNECT_BURST = int(os.getenv("SOCKET_CONNECT_BURST", "200"))
+# Same for connects without a valid token, kept apart so they can't use up
+# the admissions of authenticated users
+SOCKET_ANONYMOUS_CONNECT_RATE = float(os.getenv("SOCKET_ANONYMOUS_CONNECT_RATE", "10"))
+SOCKET_ANONYMOUS_CONNECT_BURST = int(os.getenv("SOCKET_ANONYMOUS_CONNECT_BURST", "50"))
+# Buffer chat messages (journaled in Redis) and INSERT them in batches
+# instead of one transaction per message; needs REDIS_URL
+CHAT_WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "false").lower() == "true"
+
+# Image uploads: processes per worker that decode/resize/encode images off
+# the request thread (0, the default, processes inline), images a process
+# renders before it's replaced by a fresh one, seconds to wait for one image,
+# and where background uploads wait to be processed
+IMAGE_PROCESS_WORKERS = int(os.getenv("IMAGE_PROCESS_WORKERS", "0"))
+IMAGE_PROCESS_MAX_TASKS = int(os.getenv("IMAGE_PROCESS_MAX_TASKS", "50"))
+IMAGE_RENDER_TIMEOUT = float(os.getenv("IMAGE_RENDER_TIMEOUT", "30"))
+IMAGE_STAGING_DIR = os.getenv("IMAGE_STAGING_DIR")
 
 # Celery settings (for future use)
 USE_CELERY = os.getenv("USE_CELERY", "false").lower() == "true"
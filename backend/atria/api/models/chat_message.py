@@ -1,6 +1,8 @@
 # api/models/chat_message.py
 from api.extensions import db
+from api.commons.search import search_vector_sql
 from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 
 class ChatMessage(db.Model):
@@ -27,6 +29,14 @@ class ChatMessage(db.Model):
         db.ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
     )
+    # Full-text search (GIN indexed), maintained by Postgres
+    search_vector = db.Column(
+        TSVECTOR, db.Computed(search_vector_sql(), persisted=True)
+    )
+
+    # Loaded by search queries only (see ChatRoomService.search_messages)
+    search_rank = db.query_expression()
+    search_headline = db.query_expression()
 
     # Relationships
     room = db.relationship("ChatRoom", back_populates="messages")
@@ -38,6 +48,12 @@ class ChatMessage(db.Model):
         lazy="joined",
     )
 
+    __table_args__ = (
+        db.Index("idx_chat_messages_search", "search_vector", postgresql_using="gin"),
+        # Cursor pagination seeks on (created_at, id) within a room
+        db.Index("idx_chat_messages_room_created_id", "room_id", "created_at", "id"),
+    )
+
     @property
     def is_deleted(self):
         """Check if message has been soft deleted"""
@@ -1,7 +1,9 @@
 # api/models/direct_message.py
 from api.extensions import db
+from api.commons.search import search_vector_sql
 from api.models.enums import MessageStatus
 from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 
 class DirectMessage(db.Model):
@@ -24,10 +26,29 @@ class DirectMessage(db.Model):
     created_at = db.Column(
         db.DateTime(timezone=True), server_default=db.func.current_timestamp()
     )
+    # Full-text search (GIN indexed), maintained by Postgres.
+    # NULL for E2EE messages so their content is never indexed
+    search_vector = db.Column(
+        TSVECTOR,
+        db.Computed(
+            f"CASE WHEN encrypted_content IS NULL THEN {search_vector_sql()} END",
+            persisted=True,
+        ),
+    )
+
+    # Loaded by search queries only (see DirectMessageService.search_messages)
+    search_rank = db.query_expression()
+    search_headline = db.query_expression()
 
     # Relationships
     thread = db.relationship("DirectMessageThread", back_populates="messages")
     sender = db.relationship("User", back_populates="sent_direct_messages")
 
+    __table_args__ = (
+        db.Index("idx_dm_messages_search", "search_vector", postgresql_using="gin"),
+        # Cursor pagination seeks on (created_at, id) within a thread
+        db.Index("idx_dm_messages_thread_created_id", "thread_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"DirectMessage(id={self.id}, thread_id={self.thread_id}, sender_id={self.sender_id})"
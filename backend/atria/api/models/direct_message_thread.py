@@ -33,6 +33,10 @@ class DirectMessageThread(db.Model):
     # Thread hiding: cutoff timestamps for each user
     user1_cutoff = db.Column(db.DateTime(timezone=True), nullable=True)
     user2_cutoff = db.Column(db.DateTime(timezone=True), nullable=True)
+    # Unread counters: DELIVERED messages from the other participant.
+    # Maintained by DirectMessageService, rebuilt by reconcile_unread_counts
+    user1_unread_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    user2_unread_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     user1 = db.relationship("User", foreign_keys=[user1_id])
@@ -45,6 +49,8 @@ class DirectMessageThread(db.Model):
         db.UniqueConstraint(
             "user1_id", "user2_id", "event_scope_id", name="uix_dm_thread_users_scope"
         ),
+        # user1_id is covered by the unique constraint above
+        db.Index("idx_dm_threads_user2", "user2_id"),
     )
 
     def get_other_user(self, user_id):
@@ -80,5 +86,13 @@ class DirectMessageThread(db.Model):
         else:
             raise ValueError("User is not part of this thread")
 
+    def get_unread_count(self, user_id):
+        """Get the unread message counter for a specific user"""
+        if self.user1_id == user_id:
+            return self.user1_unread_count or 0
+        elif self.user2_id == user_id:
+            return self.user2_unread_count or 0
+        return 0
+
     def __repr__(self):
         return f"DirectMessageThread(id={self.id}, user1_id={self.user1_id}, user2_id={self.user2_id}, event_scope_id={self.event_scope_id})"
@@ -273,21 +273,25 @@ class Event(db.Model):
     def get_users_by_role(self, *roles: EventUserRole):
         """Get all users with specific roles"""
         from api.models import EventUser
+        from sqlalchemy.orm import joinedload
 
         return [
             event_user.user
-            for event_user in EventUser.query.filter(
-                EventUser.event_id == self.id, EventUser.role.in_(roles)
-            ).all()
+            for event_user in EventUser.query.options(joinedload(EventUser.user))
+            .filter(EventUser.event_id == self.id, EventUser.role.in_(roles))
+            .all()
         ]
 
     def get_event_users_by_role(self, *roles: EventUserRole):
         """Get all EventUser objects with specific roles"""
         from api.models import EventUser
+        from sqlalchemy.orm import joinedload
 
-        return EventUser.query.filter(
-            EventUser.event_id == self.id, EventUser.role.in_(roles)
-        ).all()
+        return (
+            EventUser.query.options(joinedload(EventUser.user))
+            .filter(EventUser.event_id == self.id, EventUser.role.in_(roles))
+            .all()
+        )
 
     def add_icebreaker(self, message):
         """Add a new icebreaker message"""
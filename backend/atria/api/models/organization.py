@@ -203,6 +203,13 @@ class Organization(db.Model):
 
         org_user.role = new_role
 
+    def _forget_signing_keys(self):
+        """Drop this worker's parsed signing keys (other workers notice the new ciphertext)"""
+        from api.commons.signing_keys import forget_signing_keys
+
+        if self.id is not None:
+            forget_signing_keys(self.id)
+
     # Mux credential management with automatic encryption/decryption
     def set_mux_credentials(
         self, token_id: str, token_secret: str, signing_key_id: str = None, signing_private_key: str = None
@@ -214,6 +221,7 @@ class Organization(db.Model):
         self.mux_token_secret = encrypt_secret(token_secret)
         self.mux_signing_key_id = signing_key_id
         self.mux_signing_private_key = encrypt_secret(signing_private_key) if signing_private_key else None
+        self._forget_signing_keys()
 
     def get_mux_token_secret(self) -> str:
         """Get decrypted Mux token secret"""
@@ -233,6 +241,7 @@ class Organization(db.Model):
         self.mux_token_secret = None
         self.mux_signing_key_id = None
         self.mux_signing_private_key = None
+        self._forget_signing_keys()
 
     @property
     def has_mux_credentials(self) -> bool:
@@ -254,6 +263,7 @@ class Organization(db.Model):
         self.jaas_app_id = app_id
         self.jaas_api_key_encrypted = encrypt_secret(api_key)
         self.jaas_private_key_encrypted = encrypt_secret(private_key)
+        self._forget_signing_keys()
 
     def get_jaas_api_key(self) -> str:
         """Get decrypted JaaS API key"""
@@ -272,6 +282,7 @@ class Organization(db.Model):
         self.jaas_app_id = None
         self.jaas_api_key_encrypted = None
         self.jaas_private_key_encrypted = None
+        self._forget_signing_keys()
 
     @property
     def has_jaas_credentials(self) -> bool:
@@ -1,4 +1,5 @@
 from api.extensions import db, pwd_context
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.hybrid import hybrid_property
 from api.models.enums import (
     SessionSpeakerRole,
@@ -7,6 +8,7 @@ from api.models.enums import (
     ConnectionStatus,
 )
 from api.commons.avatar_presets import get_random_avatar_url
+from api.commons.search import name_search_vector_sql
 import random
 import string
 
@@ -45,6 +47,21 @@ class User(db.Model):
     updated_at = db.Column(
         db.DateTime(timezone=True), onupdate=db.func.current_timestamp()
     )
+    # Attendee search by name or company (GIN indexed), maintained by Postgres;
+    # the company is weighted apart so hidden ones can be left out of a search
+    name_search_vector = db.Column(
+        TSVECTOR,
+        db.Computed(
+            name_search_vector_sql(("first_name", "last_name"), hideable=("company_name",)),
+            persisted=True,
+        ),
+    )
+
+    __table_args__ = (
+        db.Index("idx_users_name_search", "name_search_vector", postgresql_using="gin"),
+        # Attendee lists are sorted by name
+        db.Index("idx_users_name_sort", "last_name", "first_name", "id"),
+    )
 
     organizations = db.relationship(
         "Organization",
@@ -70,6 +70,7 @@ def register_pagination_schemas(api):
         OrganizationSchema,
         OrganizationUserSchema,
         DirectMessageThreadSchema,
+        DirectMessageSearchResultSchema,
         EventInvitationDetailSchema,
         OrganizationInvitationDetailSchema,
         EventUserSchema,
@@ -80,6 +81,7 @@ def register_pagination_schemas(api):
         SessionSpeakerSchema,
         ChatRoomSchema,
         ChatMessageSchema,
+        ChatMessageSearchResultSchema,
     )
 
     # List of (schema_class, collection_name) tuples for all paginated endpoints
@@ -92,6 +94,7 @@ def register_pagination_schemas(api):
         (OrganizationUserSchema, "organization_users"),
         # Direct Messages
         (DirectMessageThreadSchema, "threads"),
+        (DirectMessageSearchResultSchema, "results"),
         # Invitations
         (EventInvitationDetailSchema, "invitations"),
         (OrganizationInvitationDetailSchema, "invitations"),
@@ -107,6 +110,7 @@ def register_pagination_schemas(api):
         # Chat
         (ChatRoomSchema, "chat_rooms"),
         (ChatMessageSchema, "messages"),
+        (ChatMessageSearchResultSchema, "results"),
     ]
 
     print("\n🔧 Registering pagination schemas...")
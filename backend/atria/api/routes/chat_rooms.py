@@ -14,6 +14,7 @@ from api.schemas import (
     ChatRoomUpdateSchema,
     ChatRoomAdminSchema,
     ChatMessageSchema,
+    ChatMessageSearchResultSchema,
     ChatMessageCreateSchema,
 )
 from api.commons.decorators import (
@@ -25,6 +26,7 @@ from api.commons.decorators import (
 from api.commons.pagination import (
     paginate,
     PAGINATION_PARAMETERS,
+    CURSOR_PAGINATION_PARAMETERS,
     get_pagination_doc_reference,
 )
 from api.services.chat_room import ChatRoomService
@@ -70,13 +72,10 @@ class ChatRoomList(MethodView):
     def get(self, event_id):
         """Get event's chat rooms"""
         from api.services.chat_room import ChatRoomService
-        
-        user_id = int(get_jwt_identity())
-        current_user = User.query.get_or_404(user_id)
-        event = Event.query.get_or_404(event_id)
-        
-        # Get user's role in the event
-        user_role = event.get_user_role(current_user)
+        from api.commons.principal import get_event_principal
+
+        # Get user's role in the event (already resolved by event_member_required)
+        user_role = get_event_principal(event_id).role
         
         # Build query based on user's permissions
         room_types_allowed = []
@@ -225,6 +224,7 @@ class ChatMessageList(MethodView):
                 "example": 123,
             },
             *PAGINATION_PARAMETERS,
+            *CURSOR_PAGINATION_PARAMETERS,
         ],
         responses={
             200: get_pagination_doc_reference("ChatMessageBase"),
@@ -374,6 +374,72 @@ class EventAdminChatRooms(MethodView):
         return {"chat_rooms": schema.dump(rooms)}
 
 
+@blp.route("/events/<int:event_id>/chat-rooms/search")
+class EventChatSearch(MethodView):
+    @blp.response(200)
+    @blp.doc(
+        summary="Search chat messages",
+        description=(
+            "Full-text search across the event's chat rooms the current user "
+            "can access, ranked by relevance. Each result has a highlighted "
+            "headline (HTML-escaped text with <mark> tags)."
+        ),
+        parameters=[
+            {
+                "in": "path",
+                "name": "event_id",
+                "schema": {"type": "integer"},
+                "required": True,
+                "description": "Event ID",
+                "example": 123,
+            },
+            {
+                "in": "query",
+                "name": "q",
+                "schema": {"type": "string"},
+                "required": True,
+                "description": "Search text (min 3 chars; supports quotes, or, -word)",
+            },
+            {
+                "in": "query",
+                "name": "room_id",
+                "schema": {"type": "integer"},
+                "description": "Limit the search to one chat room",
+            },
+            *PAGINATION_PARAMETERS,
+        ],
+        responses={
+            200: get_pagination_doc_reference("ChatMessageSearchResult"),
+            400: {"description": "Search query too short"},
+            403: {"description": "Not authorized to search this event or room"},
+            404: {"description": "Event not found"},
+        },
+    )
+    @jwt_required()
+    @event_member_required()
+    def get(self, event_id):
+        """Search chat messages"""
+        from api.commons.search import validate_search_text
+
+        user_id = int(get_jwt_identity())
+
+        try:
+            query = validate_search_text(request.args.get("q", ""))
+        except ValueError as e:
+            abort(400, message=str(e))
+
+        try:
+            return ChatRoomService.search_messages(
+                event_id,
+                user_id,
+                query,
+                room_id=request.args.get("room_id", type=int),
+                schema=ChatMessageSearchResultSchema(many=True),
+            )
+        except ValueError as e:
+            abort(403, message=str(e))
+
+
 @blp.route("/events/<int:event_id>/chat-rooms/disable-all-public")
 class DisableAllPublicRooms(MethodView):
     @blp.response(200)
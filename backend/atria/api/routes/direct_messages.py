@@ -7,6 +7,7 @@ from flask import request
 from api.schemas import (
     DirectMessageThreadSchema,
     DirectMessageSchema,
+    DirectMessageSearchResultSchema,
     DirectMessageCreateSchema,
     DirectMessageThreadCreateSchema,
     DirectMessagesWithContextSchema,
@@ -14,6 +15,7 @@ from api.schemas import (
 )
 from api.commons.pagination import (
     PAGINATION_PARAMETERS,
+    CURSOR_PAGINATION_PARAMETERS,
     get_pagination_doc_reference,
 )
 from api.services.direct_message import DirectMessageService
@@ -44,14 +46,16 @@ class DirectMessageThreadList(MethodView):
         # Get optional event_id from query params for event-specific enrichment
         event_id = request.args.get('event_id', type=int)
 
-        # TODO: Implement pagination - route claims to support it but doesn't
-        # Need to add:
-        # page = request.args.get('page', 1, type=int)
-        # per_page = request.args.get('per_page', 50, type=int)
-        # And update get_user_threads() to handle pagination
+        # Paging is opt-in: without per_page every visible thread is returned
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', type=int)
 
         return DirectMessageService.get_user_threads(
-            user_id, DirectMessageThreadSchema(many=True), event_id=event_id
+            user_id,
+            DirectMessageThreadSchema(many=True),
+            event_id=event_id,
+            page=page,
+            per_page=per_page,
         )
 
     @blp.arguments(DirectMessageThreadCreateSchema)
@@ -174,6 +178,7 @@ class DirectMessageList(MethodView):
                 "example": 123,
             },
             *PAGINATION_PARAMETERS,
+            CURSOR_PAGINATION_PARAMETERS[0],  # count is not supported here
         ],
         responses={
             200: {"description": "Messages with thread context"},
@@ -187,11 +192,12 @@ class DirectMessageList(MethodView):
         user_id = int(get_jwt_identity())
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 50, type=int)
+        cursor = request.args.get('cursor')
 
         try:
             # Use the new unified service method that includes thread context
             return DirectMessageService.get_thread_messages_with_context(
-                thread_id, user_id, page=page, per_page=per_page
+                thread_id, user_id, page=page, per_page=per_page, cursor=cursor
             )
         except ValueError as e:
             return {"message": str(e)}, 403
@@ -297,3 +303,43 @@ class DirectMessageThreadClear(MethodView):
             return thread
         except ValueError as e:
             return {"message": str(e)}, 403
+
+
+@blp.route("/direct-messages/search")
+class DirectMessageSearch(MethodView):
+    @blp.response(200)
+    @blp.doc(
+        summary="Search direct messages",
+        description=(
+            "Full-text search across the current user's threads, ranked by "
+            "relevance. Each result has a highlighted headline (HTML-escaped "
+            "text with <mark> tags). Encrypted messages are not searchable."
+        ),
+        parameters=[
+            {
+                "in": "query",
+                "name": "q",
+                "schema": {"type": "string"},
+                "required": True,
+                "description": "Search text (min 3 chars; supports quotes, or, -word)",
+            },
+            *PAGINATION_PARAMETERS,
+        ],
+        responses={
+            200: get_pagination_doc_reference("DirectMessageSearchResult"),
+            400: {"description": "Search query too short"},
+        },
+    )
+    @jwt_required()
+    def get(self):
+        """Search direct messages"""
+        user_id = int(get_jwt_identity())
+
+        try:
+            return DirectMessageService.search_messages(
+                user_id,
+                request.args.get("q", ""),
+                DirectMessageSearchResultSchema(many=True),
+            )
+        except ValueError as e:
+            abort(400, message=str(e))
@@ -87,6 +87,15 @@ class EventUserList(MethodView):
                 "description": "Filter by role (optional)",
                 "enum": [role.value for role in EventUserRole],
             },
+            {
+                "in": "query",
+                "name": "search",
+                "schema": {"type": "string"},
+                "description": (
+                    "Search by name or company (optional); every word "
+                    "matches the start of a word"
+                ),
+            },
             *PAGINATION_PARAMETERS,
         ],
         responses={
@@ -100,10 +109,11 @@ class EventUserList(MethodView):
     def get(self, event_id):
         """Get list of event users for networking - privacy-filtered view"""
         role = request.args.get("role")
+        search = request.args.get("search")
         # Always use networking schema for consistent privacy-filtered view
         # Even admins see the public view here - they have AttendeesManager for full data
         return EventUserService.get_event_users_with_connection_status(
-            event_id, role, EventUserNetworkingSchema(many=True)
+            event_id, role, EventUserNetworkingSchema(many=True), search=search
         )
 
     @blp.arguments(EventUserCreateSchema)
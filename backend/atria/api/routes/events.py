@@ -98,10 +98,18 @@ class EventList(MethodView):
 
 @blp.route("/events/<int:event_id>")
 class EventResource(MethodView):
-    @blp.response(200, EventDetailSchema)
+    @blp.response(200)  # Already serialized (cached) - see EventService.get_event
     @blp.doc(
         summary="Get event details",
         responses={
+            200: {
+                "description": "Event details",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/EventDetail"}
+                    }
+                },
+            },
             403: {"description": "Not authorized to view this event"},
             404: {"description": "Event not found"},
         },
@@ -217,6 +217,19 @@ class DetailedHealthCheck(MethodView):
             "cors_origins": os.getenv("SOCKETIO_CORS_ALLOWED_ORIGINS", "not_set"),
         }
 
+        # Connect admission (reconnect storms) and cluster-wide online users
+        from api.sockets.admission import anonymous_admission, connection_admission
+        from api.sockets.session_manager import session_manager
+
+        health_status["services"]["socketio"]["admission"] = connection_admission.stats()
+        health_status["services"]["socketio"]["anonymous_admission"] = anonymous_admission.stats()
+        try:
+            health_status["services"]["socketio"]["online_users"] = (
+                session_manager.online_user_count()
+            )
+        except Exception:
+            pass  # Not critical
+
         # If we can access the server object, get more details
         if hasattr(socketio, 'server') and socketio.server:
             try:
@@ -37,6 +37,9 @@ blp = Blueprint(
 
 @blp.route("/events/<int:event_id>/sessions")
 class SessionList(MethodView):
+    # ETag from the response content: clients polling the agenda send
+    # If-None-Match and get 304 until the schedule changes
+    @blp.etag
     @blp.response(200)
     @blp.doc(
         summary="List event sessions",
@@ -262,7 +265,9 @@ class SessionChatRoomList(MethodView):
         current_user = User.query.get(user_id)
         
         # Check user's role in the event
-        user_role = session.event.get_user_role(current_user)
+        from api.commons.principal import get_event_role
+
+        user_role = get_event_role(session.event, current_user)
         is_speaker = session.has_speaker(current_user)
         is_organizer = user_role in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]
         
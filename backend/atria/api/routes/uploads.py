@@ -5,10 +5,12 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import request, jsonify, send_file
 from io import BytesIO
 
+from api.services.image_pipeline import ImageProcessingError, image_pipeline
 from api.services.storage import storage_service, StorageBucket
 from api.schemas.upload import (
     ImageUploadSchema,
     ImageUploadResponseSchema,
+    ImageUploadJobSchema,
     PresignedUrlResponseSchema
 )
 from api.commons.decorators import event_member_required
@@ -23,6 +25,67 @@ blp = Blueprint(
 )
 
 
+def _content_url(bucket, object_key, url=None):
+    """URL clients use to fetch an uploaded object"""
+    # For public bucket, URL is already set
+    # For private buckets, construct the appropriate route URL
+    if bucket == StorageBucket.PUBLIC.value:
+        return url
+    elif bucket == StorageBucket.AUTHENTICATED.value:
+        return f"/api/content/{object_key}"
+    else:  # PRIVATE bucket
+        return f"/api/private/{object_key}"
+
+
+def _upload_response(result):
+    """Storage result as an ImageUploadResponseSchema payload"""
+    bucket = result['bucket']
+    return {
+        'object_key': result['object_key'],
+        'bucket': bucket,
+        'url': _content_url(bucket, result['object_key'], result['url']),
+        'context': result['context'],
+        'renditions': {
+            name: _content_url(bucket, key, storage_service.object_url(bucket, key))
+            for name, key in result['renditions'].items()
+        },
+    }
+
+
+def _job_response(job):
+    """Job record as an ImageUploadJobSchema payload"""
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'context': job['context'],
+        'result': _upload_response(job['result']) if job['result'] else None,
+        'error': job['error'],
+    }
+
+
+def _get_upload(args, current_user_id):
+    """The uploaded file and its storage path parameters, or abort 400"""
+    if 'file' not in request.files:
+        abort(400, message="No file provided")
+    
+    file = request.files['file']
+    if not file or file.filename == '':
+        abort(400, message="No file selected")
+    
+    context = args['context']
+    
+    # Build kwargs based on context
+    kwargs = {}
+    if context == 'avatar':
+        kwargs['user_id'] = current_user_id
+    elif context in ['event_logo', 'event_banner', 'sponsor_logo', 'event_document']:
+        if 'event_id' not in args:
+            abort(400, message="event_id required for this context")
+        kwargs['event_id'] = args['event_id']
+    
+    return file, context, kwargs
+
+
 @blp.route("/uploads/image")
 class ImageUploadResource(MethodView):
     @blp.arguments(ImageUploadSchema, location="form")
@@ -34,57 +97,80 @@ class ImageUploadResource(MethodView):
             400: {"description": "Invalid file or validation error"},
             401: {"description": "Authentication required"},
             500: {"description": "Server error during upload"},
+            503: {"description": "Image processing temporarily unavailable"},
         },
     )
     @jwt_required()
     def post(self, args):
         """Upload an image file"""
         current_user_id = int(get_jwt_identity())
-        
-        if 'file' not in request.files:
-            abort(400, message="No file provided")
-        
-        file = request.files['file']
-        if not file or file.filename == '':
-            abort(400, message="No file selected")
-        
-        context = args['context']
-        
-        # Build kwargs based on context
-        kwargs = {}
-        if context == 'avatar':
-            kwargs['user_id'] = current_user_id
-        elif context in ['event_logo', 'event_banner', 'sponsor_logo', 'event_document']:
-            if 'event_id' not in args:
-                abort(400, message="event_id required for this context")
-            kwargs['event_id'] = args['event_id']
+        file, context, kwargs = _get_upload(args, current_user_id)
         
         try:
             # Upload the image
             result = storage_service.upload_image(file, context=context, **kwargs)
-            
-            # For public bucket, URL is already set
-            # For private buckets, construct the appropriate route URL
-            if result['bucket'] == StorageBucket.PUBLIC.value:
-                url = result['url']
-            elif result['bucket'] == StorageBucket.AUTHENTICATED.value:
-                url = f"/api/content/{result['object_key']}"
-            else:  # PRIVATE bucket
-                url = f"/api/private/{result['object_key']}"
-            
-            return {
-                'object_key': result['object_key'],
-                'bucket': result['bucket'],
-                'url': url,
-                'context': result['context']
-            }, 201
+            return _upload_response(result), 201
             
         except ValueError as e:
             abort(400, message=str(e))
+        except ImageProcessingError as e:
+            abort(503, message=str(e))
         except Exception as e:
             return {"message": "Failed to upload image"}, 500
 
 
+@blp.route("/uploads/image/jobs")
+class ImageUploadJobListResource(MethodView):
+    @blp.arguments(ImageUploadSchema, location="form")
+    @blp.response(202, ImageUploadJobSchema)
+    @blp.doc(
+        summary="Upload an image for background processing",
+        description=(
+            "Accept an image and process it in the background. Returns a job "
+            "to poll at /uploads/image/jobs/{job_id} until its status is "
+            "'done' (result holds the upload) or 'failed' (error says why)."
+        ),
+        responses={
+            400: {"description": "Invalid file or validation error"},
+            401: {"description": "Authentication required"},
+        },
+    )
+    @jwt_required()
+    def post(self, args):
+        """Upload an image for background processing"""
+        current_user_id = int(get_jwt_identity())
+        file, context, kwargs = _get_upload(args, current_user_id)
+        
+        try:
+            data = storage_service.read_upload(file, context=context, **kwargs)
+        except ValueError as e:
+            abort(400, message=str(e))
+        
+        job = image_pipeline.submit(current_user_id, data, context, **kwargs)
+        return _job_response(job), 202
+
+
+@blp.route("/uploads/image/jobs/<job_id>")
+class ImageUploadJobResource(MethodView):
+    @blp.response(200, ImageUploadJobSchema)
+    @blp.doc(
+        summary="Get an image upload job",
+        description="Poll the status of a background image upload",
+        responses={
+            401: {"description": "Authentication required"},
+            404: {"description": "Job not found"},
+        },
+    )
+    @jwt_required()
+    def get(self, job_id):
+        """Get an image upload job"""
+        job = image_pipeline.get_job(job_id)
+        if not job or job['owner_id'] != int(get_jwt_identity()):
+            abort(404, message="Upload job not found")
+        
+        return _job_response(job)
+
+
 @blp.route("/content/<path:object_key>")
 class AuthenticatedContentResource(MethodView):
     @blp.response(200, PresignedUrlResponseSchema)
@@ -227,4 +313,8 @@ class UploadDeleteResource(MethodView):
         if not success:
             return {"message": "Failed to delete file"}, 404
         
+        # Smaller renditions stored alongside the image
+        for rendition_key in storage_service.rendition_keys(object_key):
+            storage_service.delete_file(bucket, rendition_key)
+        
         return '', 204
\ No newline at end of file
@@ -93,6 +93,7 @@ from api.schemas.chat import (
     ChatRoomUpdateSchema,
     ChatRoomAdminSchema,
     ChatMessageSchema,
+    ChatMessageSearchResultSchema,
     ChatMessageCreateSchema,
     SessionChatRoomSchema,
 )
@@ -104,6 +105,7 @@ from api.schemas.connection import (
 from api.schemas.direct_message import (
     DirectMessageThreadSchema,
     DirectMessageSchema,
+    DirectMessageSearchResultSchema,
     DirectMessageCreateSchema,
     DirectMessageThreadCreateSchema,
     DirectMessagesWithContextSchema,
@@ -120,6 +122,7 @@ from api.schemas.sponsor import (
 from api.schemas.upload import (
     ImageUploadSchema,
     ImageUploadResponseSchema,
+    ImageUploadJobSchema,
     PresignedUrlResponseSchema,
 )
 from api.schemas.invitation import (
@@ -216,6 +219,7 @@ __all__ = [
     "ChatRoomUpdateSchema",
     "ChatRoomAdminSchema",
     "ChatMessageSchema",
+    "ChatMessageSearchResultSchema",
     "ChatMessageCreateSchema",
     "SessionChatRoomSchema",
     "ConnectionSchema",
@@ -223,6 +227,7 @@ __all__ = [
     "ConnectionUpdateSchema",
     "DirectMessageThreadSchema",
     "DirectMessageSchema",
+    "DirectMessageSearchResultSchema",
     "DirectMessageCreateSchema",
     "DirectMessageThreadCreateSchema",
     # Sponsor schemas
@@ -235,6 +240,7 @@ __all__ = [
     # Upload schemas
     "ImageUploadSchema",
     "ImageUploadResponseSchema",
+    "ImageUploadJobSchema",
     "PresignedUrlResponseSchema",
     # Invitation schemas
     "InvitationDetailsResponseSchema",
@@ -46,6 +46,7 @@ class ChatMessageSchema(ma.SQLAlchemyAutoSchema):
         sqla_session = db.session
         include_fk = True
         name = "ChatMessageBase"
+        exclude = ("search_vector", "search_rank", "search_headline")
 
     user = ma.Nested(
         "UserSchema",
@@ -60,6 +61,16 @@ class ChatMessageSchema(ma.SQLAlchemyAutoSchema):
     is_deleted = ma.Boolean(dump_only=True)
 
 
+class ChatMessageSearchResultSchema(ChatMessageSchema):
+    """Chat message search hit with relevance and highlighted snippet"""
+
+    class Meta(ChatMessageSchema.Meta):
+        name = "ChatMessageSearchResult"
+
+    rank = ma.Float(attribute="search_rank", dump_only=True)
+    headline = ma.String(attribute="search_headline", dump_only=True)
+
+
 class ChatMessageCreateSchema(ma.Schema):
     """Schema for creating chat messages"""
 
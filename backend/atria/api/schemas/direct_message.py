@@ -1,7 +1,6 @@
 # api/api/schemas/direct_message.py
 from api.extensions import ma, db
 from api.models import DirectMessageThread, DirectMessage
-from api.models.enums import MessageStatus
 from flask_jwt_extended import get_jwt_identity
 
 
@@ -36,7 +35,16 @@ class DirectMessageThreadSchema(ma.SQLAlchemyAutoSchema):
     other_user_in_event = ma.Boolean(dump_only=True, required=False)
     is_new = ma.Boolean(dump_only=True, required=False)  # Set when thread is newly created
 
+    # The thread listing query preloads these values on each thread
+    # (preloaded_*); fall back to per-thread queries otherwise
+
+    def _is_preloaded(self, obj):
+        preloaded_for = getattr(obj, "preloaded_for_user", None)
+        return preloaded_for is not None and preloaded_for == int(get_jwt_identity())
+
     def get_last_message(self, obj):
+        if self._is_preloaded(obj):
+            return obj.preloaded_last_message
         message = (
             DirectMessage.query.filter_by(thread_id=obj.id)
             .order_by(DirectMessage.created_at.desc())
@@ -54,20 +62,17 @@ class DirectMessageThreadSchema(ma.SQLAlchemyAutoSchema):
 
     def get_unread_count(self, obj):
         user_id = int(get_jwt_identity())
-        return (
-            DirectMessage.query.filter_by(
-                thread_id=obj.id, status=MessageStatus.DELIVERED
-            )
-            .filter(DirectMessage.sender_id != user_id)
-            .count()
-        )
+        return obj.get_unread_count(user_id)
 
     def get_other_user(self, obj):
-        user_id = int(get_jwt_identity())
-        other_id = obj.user2_id if obj.user1_id == user_id else obj.user1_id
-        from api.models import User
-
-        other_user = User.query.get(other_id)
+        if self._is_preloaded(obj):
+            other_user = obj.preloaded_other_user
+        else:
+            user_id = int(get_jwt_identity())
+            other_id = obj.user2_id if obj.user1_id == user_id else obj.user1_id
+            from api.models import User
+
+            other_user = User.query.get(other_id)
         if other_user:
             return {
                 "id": other_user.id,
@@ -86,6 +91,7 @@ class DirectMessageSchema(ma.SQLAlchemyAutoSchema):
         sqla_session = db.session
         include_fk = True
         name = "DirectMessageBase"
+        exclude = ("search_vector", "search_rank", "search_headline")
 
     sender = ma.Nested(
         "UserSchema",
@@ -94,6 +100,16 @@ class DirectMessageSchema(ma.SQLAlchemyAutoSchema):
     )
 
 
+class DirectMessageSearchResultSchema(DirectMessageSchema):
+    """Direct message search hit with relevance and highlighted snippet"""
+
+    class Meta(DirectMessageSchema.Meta):
+        name = "DirectMessageSearchResult"
+
+    rank = ma.Float(attribute="search_rank", dump_only=True)
+    headline = ma.String(attribute="search_headline", dump_only=True)
+
+
 class DirectMessageCreateSchema(ma.Schema):
     """Schema for creating direct messages"""
 
@@ -128,6 +144,9 @@ class MessagePaginationSchema(ma.Schema):
     per_page = ma.Integer(dump_only=True)
     total = ma.Integer(dump_only=True)
     total_pages = ma.Integer(dump_only=True)
+    # Cursor pagination (when the request passes cursor)
+    next_cursor = ma.String(dump_only=True, allow_none=True)
+    has_more = ma.Boolean(dump_only=True)
 
 
 class ThreadUserSchema(ma.Schema):
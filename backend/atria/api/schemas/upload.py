@@ -39,6 +39,38 @@ class ImageUploadResponseSchema(Schema):
         required=True,
         dump_only=True
     )
+    renditions = fields.Dict(
+        keys=fields.String(),
+        values=fields.String(allow_none=True),
+        dump_only=True,
+        metadata={"description": "URL of each rendition (full, medium, thumbnail)"}
+    )
+
+
+class ImageUploadJobSchema(Schema):
+    """Schema for a background image upload job"""
+    job_id = fields.String(
+        required=True,
+        dump_only=True
+    )
+    status = fields.String(
+        required=True,
+        dump_only=True,
+        validate=validate.OneOf(['pending', 'processing', 'done', 'failed'])
+    )
+    context = fields.String(
+        required=True,
+        dump_only=True
+    )
+    result = fields.Nested(
+        ImageUploadResponseSchema,
+        allow_none=True,
+        dump_only=True
+    )
+    error = fields.String(
+        allow_none=True,
+        dump_only=True
+    )
 
 
 class PresignedUrlResponseSchema(Schema):
@@ -12,7 +12,8 @@ class UserSchema(ma.SQLAlchemyAutoSchema):
         model = User
         load_instance = True
         sqla_session = db.session
-        exclude = ("_password", "organizations")  # Don't expose password hash
+        # Don't expose password hash
+        exclude = ("_password", "organizations", "name_search_vector")
         name = "UserBase"
 
     # Computed Properties
@@ -5,13 +5,39 @@ Provides a generic caching interface for future expansion beyond Socket.IO
 This service operates at the service layer, AFTER authentication and authorization
 checks have been performed. Cache keys are resource-based (not user-based) to ensure
 that cached data is only accessed by users who have already passed permission checks.
+
+Invalidation uses a tag index instead of scanning the keyspace. Every cached key is
+added to one or more tag sets (e.g. "event:123", "org:456:events"), and invalidating
+a tag deletes exactly the keys registered under it, in pipelined batches.
+
+cache_result can also keep a small per-worker LRU (L1) in front of Redis (L2).
+Every invalidation is published on a Redis channel so other workers drop their
+L1 copies; the L1 TTL bounds staleness if a message is ever missed.
+
+Hot keys can opt into stampede protection (CacheService.get_or_compute): only the
+worker holding a per-key lock recomputes, entries are refreshed a little before
+they expire, and everyone else keeps serving the previous value meanwhile.
+
+Redis Key Structure:
+- {resource}:{id}[:...] → Cached JSON value
+- tag:{tag} → Set of cache keys registered under the tag
+- lock:{key} → Single-flight recompute lock for a key
+- cache:invalidate → Pub/sub channel for L1 invalidation messages
 """
 
 import json
 import hashlib
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from fnmatch import fnmatchcase
 from functools import wraps
-from typing import Any, Optional, Callable
-from api.extensions import cache_redis
+from typing import Any, Dict, Iterable, List, Optional, Callable
+from api import extensions
+from api.commons.local_cache import LocalTTLCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,8 +51,42 @@ class CacheService:
     - Graceful degradation: Works without Redis (returns None/False)
     - Resource-based keys: Cache keys use resource IDs, not user IDs
     - Service layer only: Never used in routes, only in services after auth
+    - Tag-indexed: invalidation cost grows with the keys affected, not DB size
     """
 
+    # Keys deleted per round trip during invalidation
+    DELETE_BATCH_SIZE = 500
+
+    # Tag sets outlive the keys they index (cache TTLs are minutes, not days)
+    TAG_TTL = 86400
+
+    @staticmethod
+    def _get_tag_key(tag: str) -> str:
+        """Generate Redis key for a tag's member set"""
+        return f"tag:{tag}"
+
+    @staticmethod
+    def tags_for_key(key: str) -> List[str]:
+        """
+        Derive the default tags for a resource-based cache key
+
+        "event:123:users:page:2" is tagged "event:123" and "event:123:users",
+        so it can be invalidated with the whole event or with its user lists.
+
+        Args:
+            key: Cache key following the CacheKeys format
+
+        Returns:
+            List of tags (empty if the key has no resource:id root)
+        """
+        parts = key.split(":")
+        if len(parts) < 2:
+            return []
+        tags = [":".join(parts[:2])]
+        if len(parts) > 3:
+            tags.append(":".join(parts[:3]))
+        return tags
+
     @staticmethod
     def get(key: str) -> Optional[Any]:
         """
@@ -38,6 +98,7 @@ class CacheService:
         Returns:
             Cached value or None if not found/error
         """
+        cache_redis = extensions.cache_redis
         if not cache_redis:
             return None
         try:
@@ -48,22 +109,34 @@ class CacheService:
             return None
 
     @staticmethod
-    def set(key: str, value: Any, ttl: int = 300) -> bool:
+    def set(
+        key: str, value: Any, ttl: int = 300, tags: Optional[Iterable[str]] = None
+    ) -> bool:
         """
-        Store a value in cache
+        Store a value in cache and register it in the tag index
 
         Args:
             key: Cache key
             value: Value to cache (will be JSON serialized)
             ttl: Time to live in seconds (default 5 minutes)
+            tags: Tags to register the key under (defaults to tags_for_key(key))
 
         Returns:
             True if successful, False otherwise
         """
+        cache_redis = extensions.cache_redis
         if not cache_redis:
             return False
+        if tags is None:
+            tags = CacheService.tags_for_key(key)
         try:
-            cache_redis.setex(key, ttl, json.dumps(value))
+            pipeline = cache_redis.pipeline(transaction=False)
+            pipeline.setex(key, ttl, json.dumps(value))
+            for tag in tags:
+                tag_key = CacheService._get_tag_key(tag)
+                pipeline.sadd(tag_key, key)
+                pipeline.expire(tag_key, max(ttl, CacheService.TAG_TTL))
+            pipeline.execute()
             return True
         except Exception as e:
             logger.debug(f"Cache set error for key {key}: {e}")
@@ -80,23 +153,79 @@ class CacheService:
         Returns:
             True if successful, False otherwise
         """
+        _drop_local(keys=[key])
+        cache_redis = extensions.cache_redis
         if not cache_redis:
             return False
         try:
-            cache_redis.delete(key)
+            pipeline = cache_redis.pipeline(transaction=False)
+            pipeline.delete(key)
+            _publish_invalidation(pipeline, keys=[key])
+            pipeline.execute()
             return True
         except Exception as e:
             logger.debug(f"Cache delete error for key {key}: {e}")
             return False
 
+    @staticmethod
+    def invalidate_tags(*tags: str) -> int:
+        """
+        Invalidate every key registered under any of the given tags
+
+        The tag sets are read and dropped in one transaction, so keys cached
+        while this runs land in a fresh set instead of being lost. Members are
+        then deleted in pipelined batches - no keyspace scan.
+
+        Args:
+            tags: Tags to invalidate (e.g. "event:123", "org:456:events")
+
+        Returns:
+            Number of keys deleted
+        """
+        if not tags:
+            return 0
+        _drop_local(tags=tags)
+        cache_redis = extensions.cache_redis
+        if not cache_redis:
+            return 0
+        try:
+            pipeline = cache_redis.pipeline()
+            for tag in tags:
+                tag_key = CacheService._get_tag_key(tag)
+                pipeline.smembers(tag_key)
+                pipeline.delete(tag_key)
+            _publish_invalidation(pipeline, tags=tags)
+            results = pipeline.execute()
+
+            keys = set()
+            for members in results[:-1:2]:
+                keys.update(members)
+
+            deleted_count = CacheService._delete_in_batches(cache_redis, list(keys))
+            logger.debug(f"Invalidated {deleted_count} keys tagged {tags}")
+            return deleted_count
+        except Exception as e:
+            logger.debug(f"Cache tag invalidation error for {tags}: {e}")
+            return 0
+
+    @staticmethod
+    def _delete_in_batches(cache_redis, keys: List[str]) -> int:
+        """Delete keys with one pipelined round trip, DELETE_BATCH_SIZE keys per command"""
+        if not keys:
+            return 0
+        batch_size = CacheService.DELETE_BATCH_SIZE
+        pipeline = cache_redis.pipeline(transaction=False)
+        for start in range(0, len(keys), batch_size):
+            pipeline.delete(*keys[start:start + batch_size])
+        return sum(pipeline.execute())
+
     @staticmethod
     def invalidate_pattern(pattern: str) -> int:
         """
         Invalidate all keys matching pattern
 
-        This is crucial for maintaining cache consistency when permissions
-        or data changes. For example, when an event is updated, we invalidate
-        all cache entries related to that event.
+        Prefer invalidate_tags() - this walks the whole keyspace and is only
+        kept for keys that were not cached with a matching tag.
 
         Args:
             pattern: Redis pattern (e.g., "event:123:*", "org:456:*")
@@ -104,20 +233,214 @@ class CacheService:
         Returns:
             Number of keys deleted
         """
+        _drop_local(patterns=[pattern])
+        cache_redis = extensions.cache_redis
         if not cache_redis:
             return 0
         try:
+            _publish_invalidation(cache_redis, patterns=[pattern])
             deleted_count = 0
+            batch = []
             # scan_iter is more memory efficient than keys() for large datasets
-            for key in cache_redis.scan_iter(match=pattern):
-                cache_redis.delete(key)
-                deleted_count += 1
+            for key in cache_redis.scan_iter(
+                match=pattern, count=CacheService.DELETE_BATCH_SIZE
+            ):
+                batch.append(key)
+                if len(batch) >= CacheService.DELETE_BATCH_SIZE:
+                    deleted_count += cache_redis.delete(*batch)
+                    batch = []
+            if batch:
+                deleted_count += cache_redis.delete(*batch)
             logger.debug(f"Invalidated {deleted_count} keys matching {pattern}")
             return deleted_count
         except Exception as e:
             logger.debug(f"Cache pattern invalidation error for {pattern}: {e}")
             return 0
 
+    # Lua: delete the lock only if we still own it
+    _RELEASE_LOCK_SCRIPT = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+
+    @staticmethod
+    def _get_lock_key(key: str) -> str:
+        """Generate Redis key for a cache key's recompute lock"""
+        return f"lock:{key}"
+
+    @staticmethod
+    def acquire_lock(key: str, timeout: float = 10) -> Optional[str]:
+        """
+        Try to take the single-flight lock for a cache key
+
+        Args:
+            key: Cache key being recomputed
+            timeout: Seconds before the lock expires on its own
+
+        Returns:
+            Lock token to pass to release_lock, or None if another worker holds it
+        """
+        cache_redis = extensions.cache_redis
+        if not cache_redis:
+            return None
+        token = uuid.uuid4().hex
+        try:
+            acquired = cache_redis.set(
+                CacheService._get_lock_key(key), token, nx=True, px=int(timeout * 1000)
+            )
+            return token if acquired else None
+        except Exception as e:
+            logger.debug(f"Cache lock error for key {key}: {e}")
+            return None
+
+    @staticmethod
+    def release_lock(key: str, token: str) -> None:
+        """Release a lock taken with acquire_lock (no-op if it expired meanwhile)"""
+        cache_redis = extensions.cache_redis
+        if not cache_redis or not token:
+            return
+        try:
+            cache_redis.eval(
+                CacheService._RELEASE_LOCK_SCRIPT, 1, CacheService._get_lock_key(key), token
+            )
+        except Exception as e:
+            logger.debug(f"Cache lock release error for key {key}: {e}")
+
+    @staticmethod
+    def get_or_compute(
+        key: str,
+        compute: Callable[[], Any],
+        ttl: int = 300,
+        stale_ttl: int = 60,
+        tags: Optional[Iterable[str]] = None,
+        beta: float = 1.0,
+        lock_timeout: float = 10,
+        lock_wait: float = 2,
+    ) -> Any:
+        """
+        Get a cached value, recomputing it at most once across all workers
+
+        Entries are stored as {"value", "expires_at", "delta"} and kept in Redis
+        for ttl + stale_ttl seconds:
+        - Fresh: returned, except that a worker may refresh it early with a
+          probability that grows as expiry nears (scaled by how long the last
+          computation took and by beta)
+        - Stale or due for early refresh: the lock holder recomputes, every
+          other worker keeps serving the old value
+        - Missing: the lock holder computes, others wait up to lock_wait
+          seconds for its result before computing themselves
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+            ttl: Seconds the value is considered fresh
+            stale_ttl: Extra seconds a stale value may still be served
+            tags: Tags to register the key under (defaults to tags_for_key(key))
+            beta: Early refresh aggressiveness (0 disables, >1 refreshes earlier)
+            lock_timeout: Seconds before an abandoned lock expires
+            lock_wait: Seconds to wait for another worker on a cold miss
+
+        Returns:
+            The cached or freshly computed value
+        """
+        return CacheService._get_or_compute(
+            key, compute, ttl, stale_ttl, tags, beta, lock_timeout, lock_wait
+        )[0]
+
+    @staticmethod
+    def _get_or_compute(key, compute, ttl, stale_ttl, tags, beta, lock_timeout, lock_wait):
+        """get_or_compute(), also returning "hit", "stale" or "miss" for statistics"""
+        if not extensions.cache_redis:
+            return compute(), "miss"
+
+        entry = CacheService._get_entry(key)
+        if entry is not None:
+            remaining = entry["expires_at"] - time.time()
+            # XFetch: -log(U) is exponential, so refreshes spread out before expiry
+            early = beta * entry.get("delta", 0) * -math.log(1.0 - random.random())
+            if remaining - early > 0:
+                return entry["value"], "hit"
+
+            token = CacheService.acquire_lock(key, lock_timeout)
+            if token is None:
+                return entry["value"], "stale"
+            try:
+                return CacheService._compute_and_store(key, compute, ttl, stale_ttl, tags), "miss"
+            finally:
+                CacheService.release_lock(key, token)
+
+        token = CacheService.acquire_lock(key, lock_timeout)
+        if token is None:
+            # Someone else is computing - wait for their result
+            deadline = time.monotonic() + lock_wait
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                entry = CacheService._get_entry(key)
+                if entry is not None:
+                    return entry["value"], "hit"
+        try:
+            return CacheService._compute_and_store(key, compute, ttl, stale_ttl, tags), "miss"
+        finally:
+            if token is not None:
+                CacheService.release_lock(key, token)
+
+    @staticmethod
+    def _get_entry(key):
+        """Read a get_or_compute entry, ignoring values stored in another format"""
+        entry = CacheService.get(key)
+        if isinstance(entry, dict) and "expires_at" in entry and "value" in entry:
+            return entry
+        return None
+
+    @staticmethod
+    def _compute_and_store(key, compute, ttl, stale_ttl, tags):
+        started = time.perf_counter()
+        value = compute()
+        delta = time.perf_counter() - started
+        if value is not None:
+            entry = {"value": value, "expires_at": time.time() + ttl, "delta": delta}
+            CacheService.set(key, entry, ttl + stale_ttl, tags=tags)
+        return value
+
+    @staticmethod
+    def get_version(key: str) -> int:
+        """
+        Read a version counter (see bump_version)
+
+        Returns:
+            The current version, 0 if unset or Redis is unavailable
+        """
+        cache_redis = extensions.cache_redis
+        if not cache_redis:
+            return 0
+        try:
+            return int(cache_redis.get(key) or 0)
+        except Exception as e:
+            logger.debug(f"Cache version read error for key {key}: {e}")
+            return 0
+
+    @staticmethod
+    def bump_version(key: str) -> None:
+        """
+        Increment a version counter
+
+        Entries whose keys embed the version are never read again once it
+        changes and simply expire. The counter outlives them (TAG_TTL), so a
+        reset can't bring an old entry back.
+        """
+        cache_redis = extensions.cache_redis
+        if not cache_redis:
+            return
+        try:
+            pipeline = cache_redis.pipeline(transaction=False)
+            pipeline.incr(key)
+            pipeline.expire(key, CacheService.TAG_TTL)
+            pipeline.execute()
+        except Exception as e:
+            logger.debug(f"Cache version bump error for key {key}: {e}")
+
     @staticmethod
     def exists(key: str) -> bool:
         """
@@ -129,6 +452,7 @@ class CacheService:
         Returns:
             True if exists, False otherwise
         """
+        cache_redis = extensions.cache_redis
         if not cache_redis:
             return False
         try:
@@ -148,6 +472,7 @@ class CacheService:
         Returns:
             TTL in seconds, None if key doesn't exist or error
         """
+        cache_redis = extensions.cache_redis
         if not cache_redis:
             return None
         try:
@@ -158,7 +483,160 @@ class CacheService:
             return None
 
 
-def cache_result(ttl: int = 300, key_prefix: Optional[str] = None) -> Callable:
+# ============================================================================
+# L1 (PER-WORKER) CACHE AND STATISTICS
+# ============================================================================
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Identifies this worker's own messages on the invalidation channel
+_process_id = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# {key_prefix: LocalTTLCache} for every cache_result function with an L1
+_local_caches: Dict[str, LocalTTLCache] = {}
+
+# {key_prefix: CacheStats} for every cache_result function
+_cache_stats: Dict[str, "CacheStats"] = {}
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class CacheStats:
+    """
+    Hit/miss/latency counters for one cached function.
+
+    Attributes:
+        local_hits: Results served from the worker's L1
+        remote_hits: Results served from Redis
+        stale_hits: Stale results served while another worker recomputed
+        misses: Calls that ran the function
+        remote_seconds: Total time spent in Redis lookups
+        compute_seconds: Total time spent running the function on misses
+    """
+
+    def __init__(self):
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.remote_seconds = 0.0
+        self.compute_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Counters plus derived hit ratio and average latencies"""
+        remote_lookups = self.remote_hits + self.stale_hits + self.misses
+        calls = self.local_hits + remote_lookups
+        return {
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (calls - self.misses) / calls if calls else 0.0,
+            "avg_remote_ms": (
+                self.remote_seconds * 1000 / remote_lookups if remote_lookups else 0.0
+            ),
+            "avg_compute_ms": (
+                self.compute_seconds * 1000 / self.misses if self.misses else 0.0
+            ),
+        }
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get hit/miss/latency counters for every cache_result function in this worker
+
+    Returns:
+        Dictionary of key prefix to CacheStats.as_dict()
+    """
+    return {prefix: stats.as_dict() for prefix, stats in _cache_stats.items()}
+
+
+def _drop_local(keys: Iterable[str] = (), tags: Iterable[str] = (), patterns: Iterable[str] = ()):
+    """
+    Remove matching entries from this worker's L1 caches.
+
+    L1 entries are stored as (value, tags), so tag and pattern invalidation
+    walk the (size-bounded) caches instead of keeping a separate index.
+    """
+    if not _local_caches:
+        return
+    tags = set(tags)
+    patterns = list(patterns)
+
+    for key in keys:
+        local = _local_caches.get(key.rsplit(":", 1)[0])
+        if local is not None:
+            local.delete(key)
+
+    if not tags and not patterns:
+        return
+
+    for local in list(_local_caches.values()):
+        for key, (_, entry_tags) in local.items():
+            if tags.intersection(entry_tags) or any(
+                fnmatchcase(key, pattern) for pattern in patterns
+            ):
+                local.delete(key)
+
+
+def _publish_invalidation(client, keys=(), tags=(), patterns=()):
+    """Queue an invalidation message for other workers' L1 caches"""
+    message = {"origin": _process_id}
+    if keys:
+        message["keys"] = list(keys)
+    if tags:
+        message["tags"] = list(tags)
+    if patterns:
+        message["patterns"] = list(patterns)
+    client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+
+
+def _handle_invalidation_message(message):
+    """Apply an invalidation published by another worker"""
+    try:
+        data = json.loads(message["data"])
+        if data.get("origin") == _process_id:
+            return  # Already applied locally
+        _drop_local(
+            keys=data.get("keys", ()),
+            tags=data.get("tags", ()),
+            patterns=data.get("patterns", ()),
+        )
+    except Exception as e:
+        logger.debug(f"Ignoring bad cache invalidation message: {e}")
+
+
+def _ensure_invalidation_listener():
+    """
+    Subscribe this worker to the invalidation channel (once).
+
+    Called before the first L1 write, so no invalidation published after a
+    value enters L1 can be missed by a healthy connection.
+    """
+    global _listener
+    cache_redis = extensions.cache_redis
+    if _listener is not None or not cache_redis:
+        return
+    with _listener_lock:
+        if _listener is not None:
+            return
+        try:
+            pubsub = cache_redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: _handle_invalidation_message})
+            _listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            logger.debug(f"Cache invalidation listener unavailable: {e}")
+
+
+def cache_result(
+    ttl: int = 300,
+    key_prefix: Optional[str] = None,
+    tags: Optional[Callable[..., Iterable[str]]] = None,
+    local_ttl: Optional[float] = None,
+    local_maxsize: int = 256,
+    stale_ttl: Optional[int] = None,
+) -> Callable:
     """
     Decorator for caching function results at the service layer.
 
@@ -169,9 +647,22 @@ def cache_result(ttl: int = 300, key_prefix: Optional[str] = None) -> Callable:
     Args:
         ttl: Time to live in seconds (default 5 minutes)
         key_prefix: Custom key prefix (defaults to function name)
+        tags: Optional callable taking the function's arguments and returning
+            the tags to register each result under
+        local_ttl: Enable a per-worker L1 with this TTL in seconds. L1 hits
+            return the same object every time, so results must be treated
+            as read-only.
+        local_maxsize: Maximum number of L1 entries for this function
+        stale_ttl: Enable stampede protection (see CacheService.get_or_compute):
+            single-flight recompute, early refresh, and serving the previous
+            result for up to this many seconds while it is recomputed
 
     Example:
-        @cache_result(ttl=600, key_prefix="event_detail")
+        @cache_result(
+            ttl=600,
+            key_prefix="event_detail",
+            tags=lambda event_id: [f"event:{event_id}"],
+        )
         def get_event(event_id):
             # This method is only called after auth checks pass
             return Event.query.get(event_id)
@@ -181,54 +672,120 @@ def cache_result(ttl: int = 300, key_prefix: Optional[str] = None) -> Callable:
     2. Checks cache before executing the function
     3. Stores the result if not cached
     4. Provides invalidation methods
+    5. Counts hits/misses/latency (see get_cache_stats)
     """
     def decorator(func: Callable) -> Callable:
+        prefix = key_prefix or func.__name__
+        stats = _cache_stats.setdefault(prefix, CacheStats())
+        local = None
+        if local_ttl:
+            local = _local_caches.setdefault(
+                prefix, LocalTTLCache(maxsize=local_maxsize, default_ttl=local_ttl)
+            )
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Skip caching if Redis is not available
-            if not cache_redis:
+            # Skip caching if neither tier is available
+            if local is None and not extensions.cache_redis:
                 return func(*args, **kwargs)
 
             # Generate cache key based on function name and arguments
-            prefix = key_prefix or func.__name__
             # Create a deterministic hash of arguments for the cache key
             args_str = str((args, sorted(kwargs.items())))
             args_hash = hashlib.md5(args_str.encode()).hexdigest()[:16]  # Use first 16 chars for brevity
             cache_key = f"{prefix}:{args_hash}"
 
-            # Try to get from cache first
-            cached = CacheService.get(cache_key)
-            if cached is not None:
-                logger.debug(f"Cache hit for {cache_key}")
-                return cached
+            # L1: this worker's memory
+            if local is not None:
+                entry = local.get(cache_key)
+                if entry is not None:
+                    stats.local_hits += 1
+                    return entry[0]
+                _ensure_invalidation_listener()
+
+            # L2: Redis, with single-flight recompute
+            if stale_ttl is not None and extensions.cache_redis:
+                def compute():
+                    started = time.perf_counter()
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        stats.compute_seconds += time.perf_counter() - started
+
+                result_tags = _result_tags(args, kwargs)
+                started = time.perf_counter()
+                compute_before = stats.compute_seconds
+                result, status = CacheService._get_or_compute(
+                    cache_key, compute, ttl, stale_ttl, result_tags,
+                    beta=1.0, lock_timeout=10, lock_wait=2,
+                )
+                # Count only Redis time, not the recompute
+                stats.remote_seconds += (
+                    time.perf_counter() - started - (stats.compute_seconds - compute_before)
+                )
+                if status == "hit":
+                    stats.remote_hits += 1
+                elif status == "stale":
+                    stats.stale_hits += 1
+                else:
+                    stats.misses += 1
+                if local is not None and result is not None:
+                    local.set(cache_key, (result, result_tags))
+                return result
+
+            # L2: Redis
+            result_tags = None
+            if extensions.cache_redis:
+                started = time.perf_counter()
+                cached = CacheService.get(cache_key)
+                stats.remote_seconds += time.perf_counter() - started
+                if cached is not None:
+                    logger.debug(f"Cache hit for {cache_key}")
+                    stats.remote_hits += 1
+                    if local is not None:
+                        result_tags = _result_tags(args, kwargs)
+                        local.set(cache_key, (cached, result_tags))
+                    return cached
 
             # Execute function and cache result
             logger.debug(f"Cache miss for {cache_key}, executing function")
+            stats.misses += 1
+            started = time.perf_counter()
             result = func(*args, **kwargs)
+            stats.compute_seconds += time.perf_counter() - started
 
             # Only cache non-None results
             if result is not None:
-                CacheService.set(cache_key, result, ttl)
+                result_tags = _result_tags(args, kwargs)
+                CacheService.set(cache_key, result, ttl, tags=result_tags)
+                if local is not None:
+                    local.set(cache_key, (result, result_tags))
                 logger.debug(f"Cached result for {cache_key} with TTL {ttl}s")
 
             return result
 
+        def _result_tags(args, kwargs) -> List[str]:
+            result_tags = [f"fn:{prefix}"]
+            if tags is not None:
+                result_tags.extend(tags(*args, **kwargs))
+            return result_tags
+
         # Add method to invalidate this specific function call's cache
         def invalidate(*args, **kwargs):
             """Invalidate cache for specific function arguments"""
-            prefix = key_prefix or func.__name__
             args_str = str((args, sorted(kwargs.items())))
             args_hash = hashlib.md5(args_str.encode()).hexdigest()[:16]
             cache_key = f"{prefix}:{args_hash}"
             return CacheService.delete(cache_key)
 
-        # Add method to invalidate by pattern
+        # Add method to invalidate every cached call
         def invalidate_all():
             """Invalidate all cached results for this function"""
-            return CacheService.invalidate_pattern(f"{key_prefix or func.__name__}:*")
+            return CacheService.invalidate_tags(f"fn:{prefix}")
 
         wrapper.invalidate = invalidate
         wrapper.invalidate_all = invalidate_all
+        wrapper.stats = stats
 
         return wrapper
     return decorator
@@ -255,6 +812,11 @@ class CacheKeys:
         """Cache key for event's session list"""
         return f"event:{event_id}:sessions"
 
+    @staticmethod
+    def event_sessions_version(event_id: int) -> str:
+        """Version counter of an event's schedule (session list cache entries embed it)"""
+        return f"event:{event_id}:sessions:version"
+
     @staticmethod
     def event_users(event_id: int, page: int = 1) -> str:
         """Cache key for event's user list (paginated)"""
@@ -344,46 +906,105 @@ class CacheInvalidation:
 
     These methods ensure cache consistency when data changes.
     Called from service layer after successful database updates.
+    Each call is a handful of pipelined round trips - see CacheService.invalidate_tags.
     """
 
     @staticmethod
     def event_updated(event_id: int, org_id: int):
         """Invalidate all caches related to an updated event"""
-        patterns = [
-            f"event:{event_id}*",  # All event-related caches
-            f"org:{org_id}:events:*",  # Organization's event lists
-            f"org:{org_id}:dashboard",  # Organization dashboard
-        ]
-        for pattern in patterns:
-            CacheService.invalidate_pattern(pattern)
+        CacheService.invalidate_tags(
+            f"event:{event_id}",  # All event-related caches
+            f"org:{org_id}:events",  # Organization's event lists
+        )
+        CacheService.delete(CacheKeys.org_dashboard(org_id))
+        # Session times depend on the event's dates and timezone
+        CacheInvalidation.event_schedule_changed(event_id)
 
     @staticmethod
     def session_updated(session_id: int, event_id: int):
-        """Invalidate caches when a session is updated"""
-        patterns = [
-            f"session:{session_id}*",  # Session details and speakers
-            f"event:{event_id}:sessions",  # Event's session list
-        ]
-        for pattern in patterns:
-            CacheService.invalidate_pattern(pattern)
+        """Invalidate caches when a session is created, updated or deleted"""
+        CacheService.invalidate_tags(f"session:{session_id}")  # Details and speakers
+        CacheInvalidation.event_schedule_changed(event_id)
+        CacheService.delete(CacheKeys.event(event_id))  # Event detail lists sessions
+
+    @staticmethod
+    def event_schedule_changed(*event_ids: int):
+        """Move events' session lists to a new version (sessions or speakers changed)"""
+        for event_id in event_ids:
+            CacheService.bump_version(CacheKeys.event_sessions_version(event_id))
+
+    @staticmethod
+    def speaker_profile_changed(user_id: int):
+        """Invalidate the schedules a user speaks in after their profile or privacy changed"""
+        from api.extensions import db
+        from api.models import Session, SessionSpeaker
+
+        event_ids = (
+            db.session.query(Session.event_id)
+            .join(SessionSpeaker, SessionSpeaker.session_id == Session.id)
+            .filter(SessionSpeaker.user_id == user_id)
+            .distinct()
+        )
+        CacheInvalidation.event_schedule_changed(*(event_id for (event_id,) in event_ids))
+
+    @staticmethod
+    def event_detail_changed(*event_ids: int):
+        """Invalidate event details when their sponsors or listed people change"""
+        for event_id in event_ids:
+            CacheService.delete(CacheKeys.event(event_id))
+
+    @staticmethod
+    def event_members_changed(event_id: int, *roles):
+        """
+        Invalidate an event's detail (and schedule, for speakers) when a
+        member with one of these roles (old and new) joins, leaves or changes
+        role
+
+        The detail lists admins, organizers and speakers only, so attendees
+        joining on event day leave it cached.
+        """
+        from api.models.enums import EventUserRole
+
+        listed = (EventUserRole.ADMIN, EventUserRole.ORGANIZER, EventUserRole.SPEAKER)
+        if any(role in listed for role in roles):
+            CacheInvalidation.event_detail_changed(event_id)
+        # Speakers leaving or losing the role are removed from sessions
+        if EventUserRole.SPEAKER in roles:
+            CacheInvalidation.event_schedule_changed(event_id)
 
     @staticmethod
     def user_joined_event(user_id: int, event_id: int):
         """Invalidate caches when a user joins an event"""
-        patterns = [
-            f"event:{event_id}:users:*",  # Event's user lists
-            f"event:{event_id}:stats",  # Event statistics
-        ]
-        for pattern in patterns:
-            CacheService.invalidate_pattern(pattern)
+        CacheService.invalidate_tags(f"event:{event_id}:users")  # Event's user lists
+        CacheService.delete(CacheKeys.event_stats(event_id))
 
     @staticmethod
     def organization_updated(org_id: int):
         """Invalidate all organization-related caches"""
-        CacheService.invalidate_pattern(f"org:{org_id}*")
+        CacheService.invalidate_tags(f"org:{org_id}")
+
+    @staticmethod
+    def chat_rooms_changed(event_id: int):
+        """Invalidate caches when an event's chat rooms are created or deleted"""
+        CacheService.invalidate_tags(f"event:{event_id}:chat_rooms")
+
+    @staticmethod
+    def online_audience_changed(*user_ids: int):
+        """Invalidate online-status audiences when connections or event membership change"""
+        CacheService.invalidate_tags(
+            *(f"user:{user_id}:online_audience" for user_id in user_ids)
+        )
+
+    @staticmethod
+    def user_events_changed(*user_ids: int):
+        """Invalidate per-user event lists (and what derives from them) on event membership or ban changes"""
+        CacheService.invalidate_tags(
+            *(f"user:{user_id}:events" for user_id in user_ids),
+            *(f"user:{user_id}:online_audience" for user_id in user_ids),
+        )
 
     @staticmethod
     def message_sent(room_id: int):
         """Invalidate message cache when new message is sent"""
         # Only invalidate first page since that's where new messages appear
-        CacheService.delete(f"chat_room:{room_id}:messages:page:1")
\ No newline at end of file
+        CacheService.delete(f"chat_room:{room_id}:messages:page:1")
@@ -0,0 +1,231 @@
+"""
+Chat Access Cache - per-connection authorization for the chat message hot path
+
+Sending a chat message used to re-load the User, ChatRoom, Event and EventUser
+rows on every ``chat_message`` event. Access to a room is already fully
+checked when the socket joins it, so the result of that check is kept here,
+keyed by Socket.IO sid and room, and reused until something invalidates it.
+
+Architecture:
+- Grants live in process memory (a sid only ever lives on one worker)
+- Each grant remembers the user's and room's generation counters
+- Moderation code bumps the counters in Redis, so every worker notices the
+  change on the next message without any pub/sub
+- Time-based chat bans are evaluated at send time, so they expire on their own
+
+Redis Key Structure:
+- chat_access:gen:user:{user_id} → Counter bumped on bans, role changes, etc.
+- chat_access:gen:room:{room_id} → Counter bumped when the room goes away
+
+If Redis is unavailable grants are never trusted and the decorators fall back
+to the full database checks.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from api import extensions
+from api.models.enums import EventUserRole
+
+logger = logging.getLogger(__name__)
+
+
+class ChatAccessGrant:
+    """
+    Snapshot of what one socket may do in one chat room.
+
+    Attributes:
+        user_id: ID of the connected user
+        event_id: ID of the room's event
+        room_id: ID of the chat room
+        author: Preformatted user payload for outgoing messages
+        can_moderate: Admin or organizer of the event
+        is_blocked: Event ban or permanent chat ban
+        chat_ban_until: End of a temporary chat ban, if any
+        generation: Counter values the grant was issued under
+    """
+
+    __slots__ = (
+        "user_id",
+        "event_id",
+        "room_id",
+        "author",
+        "can_moderate",
+        "is_blocked",
+        "chat_ban_until",
+        "generation",
+    )
+
+    def __init__(self, event_user, room_id: int, generation: Tuple[int, int]):
+        user = event_user.user
+        self.user_id = event_user.user_id
+        self.event_id = event_user.event_id
+        self.room_id = room_id
+        self.author = {
+            "id": user.id,
+            "full_name": user.full_name,
+            "image_url": user.image_url,
+        }
+        self.can_moderate = event_user.role in (
+            EventUserRole.ADMIN,
+            EventUserRole.ORGANIZER,
+        )
+        self.is_blocked = bool(
+            event_user.is_banned
+            or (event_user.is_chat_banned and not event_user.chat_ban_until)
+        )
+        self.chat_ban_until = (
+            event_user.chat_ban_until if event_user.is_chat_banned else None
+        )
+        self.generation = generation
+
+    def can_use_chat(self) -> bool:
+        """Same rule as EventUser.can_use_chat(), without touching the row"""
+        if self.is_blocked:
+            return False
+        if self.chat_ban_until and self.chat_ban_until > datetime.now(timezone.utc):
+            return False
+        return True
+
+
+class ChatAccessCache:
+    """
+    Per-sid chat room authorization cache.
+
+    Grants are issued by join_chat_room, read by the chat_message access
+    check, and dropped on leave, disconnect or a generation bump.
+    """
+
+    # {sid: {room_id: ChatAccessGrant}}
+    _grants: Dict[str, Dict[int, ChatAccessGrant]] = {}
+
+    @staticmethod
+    def _get_user_key(user_id: int) -> str:
+        """Generate Redis key for a user's access generation"""
+        return f"chat_access:gen:user:{user_id}"
+
+    @staticmethod
+    def _get_room_key(room_id: int) -> str:
+        """Generate Redis key for a room's access generation"""
+        return f"chat_access:gen:room:{room_id}"
+
+    @staticmethod
+    def _get_generation(user_id: int, room_id: int) -> Optional[Tuple[int, int]]:
+        """
+        Read the current (user, room) generation pair.
+
+        Returns:
+            Tuple of counters, or None if Redis is unavailable
+        """
+        redis = extensions.cache_redis
+        if not redis:
+            return None
+
+        try:
+            user_gen, room_gen = redis.mget(
+                ChatAccessCache._get_user_key(user_id),
+                ChatAccessCache._get_room_key(room_id),
+            )
+            return int(user_gen or 0), int(room_gen or 0)
+        except Exception as e:
+            logger.debug(f"Error reading chat access generation: {e}")
+            return None
+
+    @staticmethod
+    def _bump(key: str) -> None:
+        redis = extensions.cache_redis
+        if not redis:
+            return
+
+        try:
+            redis.incr(key)
+        except Exception as e:
+            logger.error(f"Error bumping chat access generation {key}: {e}")
+
+    @staticmethod
+    def grant_for_join(sid: str, room_id, user_id: int) -> Optional[ChatAccessGrant]:
+        """
+        Run the full room access check and remember the result for this sid.
+
+        Args:
+            sid: Socket.IO session ID
+            room_id: Chat room ID
+            user_id: Authenticated user ID
+
+        Returns:
+            ChatAccessGrant if the user may join the room, None otherwise
+        """
+        from api.services.chat_room import ChatRoomService
+
+        # Read the generation first so a concurrent bump invalidates this grant
+        generation = ChatAccessCache._get_generation(user_id, room_id)
+
+        event_user = ChatRoomService.get_room_access(room_id, user_id)
+        if event_user is None:
+            ChatAccessCache.revoke(sid, room_id)
+            return None
+
+        grant = ChatAccessGrant(event_user, int(room_id), generation)
+        if generation is not None:
+            ChatAccessCache._grants.setdefault(sid, {})[int(room_id)] = grant
+        return grant
+
+    @staticmethod
+    def get(sid: str, room_id, user_id: int) -> Optional[ChatAccessGrant]:
+        """
+        Get a still-valid grant for this sid and room.
+
+        Costs one Redis MGET and no database queries.
+
+        Args:
+            sid: Socket.IO session ID
+            room_id: Chat room ID
+            user_id: Authenticated user ID
+
+        Returns:
+            ChatAccessGrant, or None if the caller must do the full check
+        """
+        try:
+            room_id = int(room_id)
+        except (TypeError, ValueError):
+            return None
+
+        grant = ChatAccessCache._grants.get(sid, {}).get(room_id)
+        if grant is None or grant.user_id != user_id:
+            return None
+
+        if ChatAccessCache._get_generation(user_id, room_id) != grant.generation:
+            ChatAccessCache.revoke(sid, room_id)
+            return None
+
+        return grant
+
+    @staticmethod
+    def revoke(sid: str, room_id=None) -> None:
+        """
+        Drop this sid's grant for one room, or all of them.
+
+        Args:
+            sid: Socket.IO session ID
+            room_id: Chat room ID (None drops every grant for the sid)
+        """
+        if room_id is None:
+            ChatAccessCache._grants.pop(sid, None)
+            return
+
+        rooms = ChatAccessCache._grants.get(sid)
+        if rooms is not None:
+            rooms.pop(int(room_id), None)
+            if not rooms:
+                ChatAccessCache._grants.pop(sid, None)
+
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        """Invalidate every grant held by a user, on every worker"""
+        ChatAccessCache._bump(ChatAccessCache._get_user_key(user_id))
+
+    @staticmethod
+    def invalidate_room(room_id: int) -> None:
+        """Invalidate every grant for a room, on every worker"""
+        ChatAccessCache._bump(ChatAccessCache._get_room_key(room_id))
@@ -0,0 +1,252 @@
+"""
+Chat History Cache - recent messages per room, for join_chat_room
+
+Every join used to load the room, event, user and role, query the last 50
+messages and look up each author. The last RING_SIZE preformatted messages
+of each room are now kept in Redis, newest first, in two views:
+
+- moderators (admins/organizers): every message, with deletion info
+- everyone else: messages that aren't deleted
+
+A join reads its view with one LRANGE. New messages are pushed onto both
+views as they're broadcast; moderation drops the room's history, which is
+rebuilt from the database by the next join. Lists are only pushed to while
+the room's ready marker exists, so a missing or expired history is never
+mistaken for a short one.
+
+A rebuild sets the room's rebuilding marker before it queries the database.
+Messages pushed while it's set are kept aside, and store() adds the ones its
+query didn't see, so a message sent on any worker mid-rebuild isn't lost.
+Moderation drops the marker too: a rebuild it interrupts stores nothing.
+
+Redis Key Structure (cache DB):
+- chat:recent:{room_id}:ready → Marker, set when the lists below were rebuilt
+- chat:recent:{room_id}:all → List of JSON messages (moderator view)
+- chat:recent:{room_id}:visible → List of JSON messages (attendee view)
+- chat:recent:{room_id}:rebuilding → Token of the rebuild in progress
+- chat:recent:{room_id}:pending → List of JSON messages pushed during it
+
+Histories expire HISTORY_TTL after their rebuild, which also bounds how long
+a renamed author shows their old name. Without Redis every join reads the
+database, as before.
+"""
+
+import json
+import logging
+import uuid
+from typing import Dict, List, Optional
+
+from api import extensions
+
+logger = logging.getLogger(__name__)
+
+
+class ChatHistoryCache:
+    """Per-room ring buffer of recent chat messages"""
+
+    # Messages kept per view (the join history size)
+    RING_SIZE = 50
+    HISTORY_TTL = 3600
+    # Longest a rebuild may take before its marker lapses
+    REBUILD_TTL = 60
+
+    # KEYS: ready, all, visible, rebuilding, pending; ARGV: message JSON, ring size
+    _PUSH_SCRIPT = """
+    local ring = tonumber(ARGV[2])
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        for i = 2, 3 do
+            redis.call('LPUSH', KEYS[i], ARGV[1])
+            redis.call('LTRIM', KEYS[i], 0, ring - 1)
+        end
+        return 1
+    end
+    local ttl = redis.call('TTL', KEYS[4])
+    if ttl > 0 then
+        redis.call('LPUSH', KEYS[5], ARGV[1])
+        redis.call('LTRIM', KEYS[5], 0, ring - 1)
+        redis.call('EXPIRE', KEYS[5], ttl)
+        return 2
+    end
+    return 0
+    """
+
+    # KEYS: ready, all, visible, rebuilding, pending
+    # ARGV: rebuild token, ttl, ring size, count of moderator-view messages,
+    #       then moderator-view and attendee-view JSON messages, newest first
+    _STORE_SCRIPT = """
+    if redis.call('GET', KEYS[4]) ~= ARGV[1] then
+        return 0
+    end
+    local ttl, ring, count = tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+    local loaded = {{}, {}}
+    redis.call('DEL', KEYS[2], KEYS[3])
+    for i = 5, #ARGV do
+        local view = 2
+        if i < 5 + count then
+            view = 1
+        end
+        loaded[view][cjson.decode(ARGV[i]).id] = true
+        redis.call('RPUSH', KEYS[view + 1], ARGV[i])
+    end
+    -- Pushed since the rebuild began (oldest first), unless already loaded
+    local pending = redis.call('LRANGE', KEYS[5], 0, -1)
+    for i = #pending, 1, -1 do
+        local id = cjson.decode(pending[i]).id
+        for view = 1, 2 do
+            if not loaded[view][id] then
+                redis.call('LPUSH', KEYS[view + 1], pending[i])
+            end
+        end
+    end
+    for i = 2, 3 do
+        redis.call('LTRIM', KEYS[i], 0, ring - 1)
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+    redis.call('SET', KEYS[1], 1, 'EX', ttl)
+    redis.call('DEL', KEYS[4], KEYS[5])
+    return 1
+    """
+
+    @staticmethod
+    def _keys(room_id):
+        prefix = f"chat:recent:{int(room_id)}"
+        return (
+            f"{prefix}:ready",
+            f"{prefix}:all",
+            f"{prefix}:visible",
+            f"{prefix}:rebuilding",
+            f"{prefix}:pending",
+        )
+
+    @staticmethod
+    def get(room_id, privileged: bool, limit: int = RING_SIZE) -> Optional[List[Dict]]:
+        """
+        Get a room's recent messages from the ring buffer
+
+        Args:
+            room_id: Chat room ID
+            privileged: Read the moderator view (includes deleted messages)
+            limit: Number of messages (at most RING_SIZE)
+
+        Returns:
+            Messages in chronological order, or None if the history isn't
+            cached (the caller should rebuild it)
+        """
+        cache_redis = extensions.cache_redis
+        if not cache_redis or limit > ChatHistoryCache.RING_SIZE:
+            return None
+
+        ready_key, all_key, visible_key, _, _ = ChatHistoryCache._keys(room_id)
+        try:
+            pipeline = cache_redis.pipeline(transaction=False)
+            pipeline.exists(ready_key)
+            pipeline.lrange(all_key if privileged else visible_key, 0, limit - 1)
+            ready, messages = pipeline.execute()
+        except Exception as e:
+            logger.error(f"Error reading chat history for room {room_id}: {e}")
+            return None
+
+        if not ready:
+            return None
+        return [json.loads(message) for message in reversed(messages)]
+
+    @staticmethod
+    def begin_rebuild(room_id) -> Optional[str]:
+        """
+        Mark a room's history as being rebuilt; call before loading it
+
+        Returns:
+            Token to pass to store(), or None if Redis unavailable
+        """
+        cache_redis = extensions.cache_redis
+        if not cache_redis:
+            return None
+
+        token = uuid.uuid4().hex
+        try:
+            cache_redis.set(
+                ChatHistoryCache._keys(room_id)[3], token, ex=ChatHistoryCache.REBUILD_TTL
+            )
+        except Exception as e:
+            logger.error(f"Error marking chat history rebuild for room {room_id}: {e}")
+            return None
+        return token
+
+    @staticmethod
+    def store(room_id, token: Optional[str], all_messages: List[Dict],
+              visible_messages: List[Dict]) -> bool:
+        """
+        Replace a room's history with messages loaded from the database
+
+        Messages pushed since begin_rebuild that the load missed are added on
+        top. Nothing is stored if another rebuild or moderation has happened
+        since (the next join rebuilds again).
+
+        Args:
+            room_id: Chat room ID
+            token: From begin_rebuild
+            all_messages: Moderator view, chronological
+            visible_messages: Attendee view, chronological
+
+        Returns:
+            True if the history was stored
+        """
+        cache_redis = extensions.cache_redis
+        if not cache_redis or token is None:
+            return False
+
+        try:
+            return bool(cache_redis.eval(
+                ChatHistoryCache._STORE_SCRIPT,
+                5,
+                *ChatHistoryCache._keys(room_id),
+                token,
+                ChatHistoryCache.HISTORY_TTL,
+                ChatHistoryCache.RING_SIZE,
+                len(all_messages),
+                # Newest first, like LPUSH
+                *(json.dumps(m) for m in reversed(all_messages)),
+                *(json.dumps(m) for m in reversed(visible_messages)),
+            ))
+        except Exception as e:
+            logger.error(f"Error storing chat history for room {room_id}: {e}")
+            return False
+
+    @staticmethod
+    def push(room_id, message_data: Dict):
+        """
+        Add a new (not deleted) message to both views of a room's history
+
+        Kept aside for store() while the history is being rebuilt; a no-op
+        if it isn't cached at all.
+        """
+        cache_redis = extensions.cache_redis
+        if not cache_redis:
+            return
+
+        try:
+            cache_redis.eval(
+                ChatHistoryCache._PUSH_SCRIPT,
+                5,
+                *ChatHistoryCache._keys(room_id),
+                json.dumps(message_data),
+                ChatHistoryCache.RING_SIZE,
+            )
+        except Exception as e:
+            logger.error(f"Error pushing chat history for room {room_id}: {e}")
+            ChatHistoryCache.invalidate(room_id)
+
+    @staticmethod
+    def invalidate(room_id):
+        """
+        Drop a room's history (after moderation), and abandon any rebuild in
+        progress; the next join rebuilds it
+        """
+        cache_redis = extensions.cache_redis
+        if not cache_redis:
+            return
+
+        try:
+            cache_redis.delete(*ChatHistoryCache._keys(room_id))
+        except Exception as e:
+            logger.error(f"Error invalidating chat history for room {room_id}: {e}")
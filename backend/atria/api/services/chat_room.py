@@ -1,8 +1,14 @@
 from api.extensions import db
 from api.models import ChatRoom, ChatMessage, Event, User, EventUser
 from api.models.enums import EventUserRole
-from api.commons.pagination import paginate
+from flask import request
+from api.commons.pagination import paginate, cursor_paginate
+from api.commons.principal import get_event_role, peek_event_principal
+from api.services.cache_service import CacheInvalidation, cache_result
+from api.services.chat_history_cache import ChatHistoryCache
+from api.services.chat_write_buffer import chat_write_buffer
 from datetime import datetime, timezone
+from sqlalchemy.orm import joinedload
 
 
 class ChatRoomService:
@@ -17,6 +23,26 @@ class ChatRoomService:
             return paginate(query, schema, collection_name="chat_rooms")
         return query.all()
 
+    @staticmethod
+    @cache_result(
+        ttl=600,
+        key_prefix="event_chat_room_ids",
+        tags=lambda event_id: [f"event:{event_id}:chat_rooms"],
+    )
+    def get_event_room_ids(event_id):
+        """
+        Get the ids of every chat room in an event (event and session rooms)
+
+        Cached per event; invalidated by CacheInvalidation.chat_rooms_changed.
+        Always pass event_id as an int so callers share the cache entry.
+        """
+        return [
+            room_id
+            for (room_id,) in db.session.query(ChatRoom.id)
+            .filter_by(event_id=event_id)
+            .order_by(ChatRoom.id)
+        ]
+
     @staticmethod
     def create_event_chat_room(event_id, room_data, user_id):
         """Create a new event-level chat room"""
@@ -57,7 +83,9 @@ class ChatRoomService:
         
         db.session.add(chat_room)
         db.session.commit()
-        
+
+        CacheInvalidation.chat_rooms_changed(event_id)
+
         return chat_room
 
     @staticmethod
@@ -72,7 +100,7 @@ class ChatRoomService:
         chat_room = ChatRoom.query.get_or_404(room_id)
         event = Event.query.get_or_404(chat_room.event_id)
 
-        user_role = event.get_user_role(current_user)
+        user_role = get_event_role(event, current_user)
         if user_role not in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]:
             raise ValueError("Must be admin or organizer to update chat rooms")
 
@@ -109,23 +137,39 @@ class ChatRoomService:
         chat_room = ChatRoom.query.get_or_404(room_id)
         event = Event.query.get_or_404(chat_room.event_id)
 
-        user_role = event.get_user_role(current_user)
+        user_role = get_event_role(event, current_user)
         if user_role != EventUserRole.ADMIN:
             raise ValueError("Must be admin to delete chat rooms")
 
         db.session.delete(chat_room)
         db.session.commit()
 
+        from api.services.chat_access_cache import ChatAccessCache
+        ChatAccessCache.invalidate_room(room_id)
+        CacheInvalidation.chat_rooms_changed(event.id)
+
         return chat_room.event_id  # Return event_id for notifications
 
     @staticmethod
     def get_chat_messages(room_id, user_id, schema=None):
-        """Get messages for a chat room with role-based filtering"""
+        """
+        Get messages for a chat room with role-based filtering
+
+        For the newest page, the room's messages still buffered for
+        write-behind (on any worker) are written first, so the history
+        matches what was broadcast. Older pages can't contain them.
+        """
         # Get user's role in the event
         chat_room = ChatRoom.query.get_or_404(room_id)
         event = Event.query.get_or_404(chat_room.event_id)
         user = User.query.get_or_404(user_id)
-        user_role = event.get_user_role(user)
+        user_role = get_event_role(event, user)
+
+        newest_page = not schema or (
+            not request.args.get("cursor") and request.args.get("page", 1, type=int) == 1
+        )
+        if newest_page:
+            chat_write_buffer.flush_room(room_id)
         
         # Base query
         query = ChatMessage.query.filter_by(room_id=room_id)
@@ -139,7 +183,16 @@ class ChatRoomService:
         query = query.order_by(ChatMessage.created_at.desc())
 
         if schema:
-            result = paginate(query, schema, collection_name="messages")
+            if "cursor" in request.args:
+                # Keyset pagination: constant cost however far back the page is
+                result = cursor_paginate(
+                    query,
+                    schema,
+                    collection_name="messages",
+                    columns=(ChatMessage.created_at, ChatMessage.id),
+                )
+            else:
+                result = paginate(query, schema, collection_name="messages")
             # Reverse the messages for proper display order (oldest to newest)
             # This way pagination loads older messages but displays them chronologically
             if result.get("messages"):
@@ -148,21 +201,121 @@ class ChatRoomService:
         return query.all()
 
     @staticmethod
-    def send_message(room_id, user_id, content):
-        """Send a new message in a chat room"""
-        # Check if user can send chat messages
-        chat_room = ChatRoom.query.get_or_404(room_id)
-        event_user = EventUser.query.filter_by(
-            event_id=chat_room.event_id,
-            user_id=user_id
-        ).first()
-        
-        if not event_user:
-            raise ValueError("User is not part of this event")
-        
-        if not event_user.can_use_chat():
-            raise ValueError("You are not allowed to send messages in this chat")
-        
+    def search_messages(event_id, user_id, query, room_id=None, schema=None):
+        """
+        Full-text search over the chat rooms a user can access in an event.
+
+        Uses the GIN-indexed search_vector and ranks by relevance (newest
+        first on ties), with a highlighted snippet on each hit. Deleted
+        messages are only searchable by admins/organizers, matching
+        get_chat_messages.
+
+        Args:
+            event_id: Event whose chat rooms are searched
+            user_id: ID of the searching user
+            query: Search text (web search syntax: quotes, or, -word)
+            room_id: Optional single room to search
+            schema: Optional schema (e.g. ChatMessageSearchResultSchema)
+
+        Returns:
+            Paginated results if schema provided, otherwise matching messages
+
+        Raises:
+            ValueError: If the query is too short or room_id is not accessible
+        """
+        from sqlalchemy.orm import with_expression
+        from api.commons.search import (
+            validate_search_text,
+            to_search_query,
+            search_rank,
+            search_headline,
+        )
+
+        query = validate_search_text(query)
+        event = Event.query.get_or_404(event_id)
+        user = User.query.get_or_404(user_id)
+        user_role = get_event_role(event, user)
+
+        # Rooms per event are few; reuse the room-type rules instead of
+        # duplicating them in SQL
+        rooms = ChatRoom.query.filter_by(event_id=event_id).all()
+        room_ids = [
+            room.id
+            for room in rooms
+            if ChatRoomService.can_access_room_type(room, user, user_role)
+        ]
+        if room_id is not None:
+            if room_id not in room_ids:
+                raise ValueError("Not authorized to search this chat room")
+            room_ids = [room_id]
+
+        tsquery = to_search_query(query)
+        rank = search_rank(ChatMessage.search_vector, tsquery)
+
+        search_query = ChatMessage.query.filter(
+            ChatMessage.room_id.in_(room_ids),
+            ChatMessage.search_vector.op("@@")(tsquery),
+        )
+        if user_role not in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]:
+            search_query = search_query.filter(ChatMessage.deleted_at.is_(None))
+
+        search_query = search_query.options(
+            with_expression(ChatMessage.search_rank, rank),
+            # Only evaluated for the rows of the returned page
+            with_expression(
+                ChatMessage.search_headline,
+                search_headline(ChatMessage.content, tsquery),
+            ),
+        ).order_by(rank.desc(), ChatMessage.created_at.desc(), ChatMessage.id.desc())
+
+        if schema:
+            return paginate(search_query, schema, collection_name="results")
+        return search_query.all()
+
+    @staticmethod
+    def send_message(room_id, user_id, content, access=None):
+        """
+        Send a new message in a chat room
+
+        Args:
+            room_id: ID of the chat room
+            user_id: ID of the sender
+            content: Message text
+            access: Optional ChatAccessGrant from the socket access check.
+                When given, no rows are read before the INSERT.
+
+        With CHAT_WRITE_BEHIND on, the returned message has its final id but
+        is written by chat_write_buffer a few milliseconds later.
+        """
+        if access is not None:
+            if not access.can_use_chat():
+                raise ValueError("You are not allowed to send messages in this chat")
+        else:
+            # Check if user can send chat messages
+            chat_room = ChatRoom.query.get_or_404(room_id)
+
+            # Reuse the membership resolved by the access check, if any
+            principal = peek_event_principal(chat_room.event_id, user_id)
+            if principal is not None:
+                event_user = principal.event_user
+            else:
+                event_user = EventUser.query.filter_by(
+                    event_id=chat_room.event_id,
+                    user_id=user_id
+                ).first()
+
+            if not event_user:
+                raise ValueError("User is not part of this event")
+
+            if not event_user.can_use_chat():
+                raise ValueError("You are not allowed to send messages in this chat")
+
+        if chat_write_buffer.enabled:
+            # Final id now, INSERT batched in the background
+            message = chat_write_buffer.append(room_id, user_id, content)
+            if message is not None:
+                return message
+
         message = ChatMessage(
             room_id=room_id, user_id=user_id, content=content
         )
@@ -174,14 +327,25 @@ class ChatRoomService:
 
     @staticmethod
     def delete_message(message_id, user_id):
-        """Soft delete a chat message (moderation)"""
-        message = ChatMessage.query.get_or_404(message_id)
+        """
+        Soft delete a chat message (moderation)
+
+        With CHAT_WRITE_BEHIND on, a message seen in the chat may not be
+        written yet, by this worker or another one. If it isn't found, the
+        journal (every worker's buffered rows) is written out and it's
+        looked up again.
+        """
+        message = ChatMessage.query.get(message_id)
+        if message is None and chat_write_buffer.enabled:
+            chat_write_buffer.flush_journal()
+        if message is None:
+            message = ChatMessage.query.get_or_404(message_id)
         chat_room = ChatRoom.query.get(message.room_id)
         event = Event.query.get(chat_room.event_id)
 
         # Only admins/organizers can moderate messages
         current_user = User.query.get(user_id)
-        user_role = event.get_user_role(current_user)
+        user_role = get_event_role(event, current_user)
 
         if user_role not in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]:
             raise ValueError("Not authorized to moderate this message")
@@ -191,22 +355,32 @@ class ChatRoomService:
         message.deleted_by_id = user_id
 
         db.session.commit()
+        ChatHistoryCache.invalidate(message.room_id)
 
         return {"message_id": message_id, "room_id": message.room_id, "deleted_by": current_user}
 
     @staticmethod
-    def format_message_for_response(message, include_deletion_info=False):
-        """Format a message for socket response"""
-        user = User.query.get(message.user_id)
+    def format_message_for_response(message, include_deletion_info=False, author=None):
+        """
+        Format a message for socket response
+
+        Args:
+            message: ChatMessage instance
+            include_deletion_info: Include moderation details
+            author: Optional preformatted user payload (skips the User lookup)
+        """
+        if author is None:
+            user = User.query.get(message.user_id)
+            author = {
+                "id": user.id,
+                "full_name": user.full_name,
+                "image_url": user.image_url,
+            }
         data = {
             "id": message.id,
             "room_id": message.room_id,
             "user_id": message.user_id,
-            "user": {
-                "id": user.id,
-                "full_name": user.full_name,
-                "image_url": user.image_url,
-            },
+            "user": author,
             "content": message.content,
             "created_at": message.created_at.isoformat(),
             "is_deleted": message.is_deleted,
@@ -257,22 +431,32 @@ class ChatRoomService:
     @staticmethod
     def check_room_access(room_id, user_id):
         """Check if a user has access to a chat room"""
-        from api.models.enums import ChatRoomType
-        
+        return ChatRoomService.get_room_access(room_id, user_id) is not None
+
+    @staticmethod
+    def get_room_access(room_id, user_id):
+        """
+        Resolve a user's access to a chat room
+
+        Returns:
+            The user's EventUser if they may access the room, None otherwise
+        """
         chat_room = ChatRoom.query.get(room_id)
         if not chat_room:
-            return False
+            return None
 
         # Check if user is part of the event
         event_user = EventUser.query.filter_by(
             event_id=chat_room.event_id, user_id=user_id
         ).first()
-        
+
         if not event_user:
-            return False
-            
+            return None
+
         # Check room type specific permissions
-        return ChatRoomService.can_access_room_type(chat_room, event_user.user, event_user.role)
+        if not ChatRoomService.can_access_room_type(chat_room, event_user.user, event_user.role):
+            return None
+        return event_user
     
     @staticmethod
     def can_access_room_type(chat_room, user, user_event_role=None):
@@ -317,33 +501,77 @@ class ChatRoomService:
         return False
 
     @staticmethod
-    def get_recent_messages(room_id, user_id, limit=50):
-        """Get recent messages for a chat room with role-based filtering"""
-        # Get user's role
-        chat_room = ChatRoom.query.get_or_404(room_id)
-        event = Event.query.get_or_404(chat_room.event_id)
-        user = User.query.get_or_404(user_id)
-        user_role = event.get_user_role(user)
-        
-        # Build query
-        query = ChatMessage.query.filter_by(room_id=room_id)
-        
-        # Filter deleted messages for non-privileged users
-        include_deletion_info = user_role in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]
-        if not include_deletion_info:
+    def get_recent_messages(room_id, user_id, limit=50, privileged=None):
+        """
+        Get recent messages for a chat room with role-based filtering
+
+        Served from ChatHistoryCache; a miss rebuilds both views of the
+        room's history from the database.
+
+        Args:
+            room_id: ID of the chat room
+            user_id: ID of the viewer
+            limit: Number of messages
+            privileged: Whether the viewer is an admin/organizer (sees
+                deleted messages); looked up when not given
+        """
+        if privileged is None:
+            chat_room = ChatRoom.query.get_or_404(room_id)
+            event = Event.query.get_or_404(chat_room.event_id)
+            user = User.query.get_or_404(user_id)
+            user_role = get_event_role(event, user)
+            privileged = user_role in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]
+
+        messages = ChatHistoryCache.get(room_id, privileged, limit)
+        if messages is not None:
+            return messages
+
+        if limit > ChatHistoryCache.RING_SIZE:
+            chat_write_buffer.flush_journal()
+            return ChatRoomService._load_recent_messages(room_id, privileged, limit)
+
+        # Messages pushed from here on, by any worker, are merged into the
+        # history by store(); earlier ones still buffered (on any worker) are
+        # written to the database before it's read
+        token = ChatHistoryCache.begin_rebuild(room_id)
+        chat_write_buffer.flush_journal()
+        all_messages = ChatRoomService._load_recent_messages(
+            room_id, True, ChatHistoryCache.RING_SIZE
+        )
+        visible_messages = ChatRoomService._load_recent_messages(
+            room_id, False, ChatHistoryCache.RING_SIZE
+        )
+        ChatHistoryCache.store(room_id, token, all_messages, visible_messages)
+
+        messages = all_messages if privileged else visible_messages
+        return messages[-limit:] if limit > 0 else []
+
+    @staticmethod
+    def _load_recent_messages(room_id, include_deleted, limit):
+        """Query and format a room's last messages, oldest first"""
+        query = ChatMessage.query.filter_by(room_id=room_id).options(
+            joinedload(ChatMessage.user)
+        )
+        if not include_deleted:
             query = query.filter(ChatMessage.deleted_at.is_(None))
-        
-        messages = query.order_by(ChatMessage.created_at.desc()).limit(limit).all()
 
-        # Format messages for response
-        formatted_messages = []
-        for message in reversed(messages):  # Reverse to get chronological order
-            formatted_messages.append(
-                ChatRoomService.format_message_for_response(message, include_deletion_info)
+        messages = query.order_by(
+            ChatMessage.created_at.desc(), ChatMessage.id.desc()
+        ).limit(limit).all()
+
+        return [
+            ChatRoomService.format_message_for_response(
+                message,
+                include_deletion_info=include_deleted,
+                author={
+                    "id": message.user.id,
+                    "full_name": message.user.full_name,
+                    "image_url": message.user.image_url,
+                },
             )
+            for message in reversed(messages)
+        ]
 
-        return formatted_messages
-    
     @staticmethod
     def toggle_chat_room(room_id, user_id):
         """Toggle chat room enabled status"""
@@ -0,0 +1,340 @@
+"""
+Chat Write Buffer - optional write-behind persistence for chat messages
+
+Every chat line used to be its own INSERT + COMMIT before it was broadcast.
+In a busy keynote chat that's hundreds of transactions per second, all
+waiting on the database before anyone sees the message.
+
+With CHAT_WRITE_BEHIND enabled, send_message instead:
+1. Takes an id from a block reserved from the chat_messages sequence (one
+   query per ID_BLOCK messages), so the message is final before it's stored
+2. Appends the row to a Redis stream (the journal) - the message is durable
+   from here on
+3. Returns it for broadcasting right away
+
+A background loop per worker flushes buffered rows every FLUSH_INTERVAL in
+one multi-row INSERT ... ON CONFLICT DO NOTHING, then removes them from the
+journal. On startup the loop first replays whatever is left in the journal
+(rows from a worker that died before flushing); because ids are assigned up
+front, replays and double flushes are no-ops. Pending rows are also flushed
+at interpreter exit.
+
+Redis Key Structure (general client, DB 0):
+- chat:journal → Stream of buffered rows (id, room_id, user_id, content, created_at)
+
+A worker's flush() only writes its own buffer, so a row sent through another
+worker stays invisible to queries for up to one flush interval (longer if
+that worker is stalled or died). Reads that must see it call flush_journal()
+first, which writes every worker's journaled rows (rebuilding a room's join
+history, moderating a message that isn't found), or flush_room() for just
+one room's (the newest page of the chat history endpoint). A row is written before it leaves the journal, so it is always in one
+of the two. If Redis or the id allocation fails, the caller falls back to a
+direct INSERT.
+"""
+
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+
+from api import extensions
+from api.extensions import db, socketio
+from api.models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+class ChatWriteBuffer:
+    """
+    Write-behind buffer for chat_messages.
+
+    Design Principles:
+    - A message is journaled in Redis before it's broadcast
+    - Inserts are idempotent (ids are assigned before the row exists)
+    - A row the database rejects (e.g. its room was deleted) is dropped,
+      never retried forever; anything else is retried on the next tick
+    """
+
+    JOURNAL_KEY = "chat:journal"
+    # Seconds between flushes
+    FLUSH_INTERVAL = 0.05
+    # Rows per INSERT statement
+    MAX_BATCH = 500
+    # Ids reserved from the sequence per query
+    ID_BLOCK = 100
+
+    def __init__(self):
+        self.enabled = False
+        self._app = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # (journal entry id, row) in send order
+        self._pending: List[Tuple[str, Dict]] = []
+        self._ids: List[int] = []
+        self._started = False
+
+    def configure(self, app, enabled: bool):
+        """
+        Enable or disable write-behind for this worker
+
+        Needs the general Redis client for the journal; stays disabled
+        without it. When enabled, starts the flush loop, which replays the
+        journal before its first flush.
+        """
+        self.enabled = bool(enabled) and extensions.redis_client is not None
+        if enabled and not self.enabled:
+            logger.warning("CHAT_WRITE_BEHIND needs Redis; writing chat messages directly")
+        if not self.enabled:
+            return
+        self._app = app
+        if not self._started:
+            self._started = True
+            atexit.register(self.shutdown)
+            socketio.start_background_task(self._run)
+
+    def append(self, room_id: int, user_id: int, content: str) -> Optional[ChatMessage]:
+        """
+        Buffer a new chat message
+
+        Args:
+            room_id: ID of the chat room
+            user_id: ID of the sender
+            content: Message text
+
+        Returns:
+            A transient ChatMessage with its final id and created_at, or None
+            if the message couldn't be buffered (persist it directly instead)
+        """
+        try:
+            message_id = self._next_id()
+            created_at = datetime.now(timezone.utc)
+            row = {
+                "id": message_id,
+                "room_id": int(room_id),
+                "user_id": int(user_id),
+                "content": content,
+                "created_at": created_at,
+            }
+            entry_id = extensions.redis_client.xadd(
+                self.JOURNAL_KEY, self._encode(row)
+            )
+        except Exception as e:
+            logger.error(f"Error buffering chat message for room {room_id}: {e}")
+            return None
+
+        with self._lock:
+            self._pending.append((entry_id, row))
+
+        return ChatMessage(**row)
+
+    def pending_count(self) -> int:
+        """Number of buffered rows not yet written"""
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write every buffered row
+
+        Returns:
+            Number of rows written (or dropped as rejected)
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+
+            done = 0
+            for start in range(0, len(pending), self.MAX_BATCH):
+                batch = pending[start : start + self.MAX_BATCH]
+                try:
+                    self._write([row for _, row in batch])
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Error flushing {len(batch)} chat messages: {e}")
+                    with self._lock:
+                        self._pending[:0] = pending[start:]
+                    break
+                self._forget([entry_id for entry_id, _ in batch])
+                done += len(batch)
+
+            return done
+
+    def flush_journal(self) -> int:
+        """
+        Write every journaled row, buffered by this worker or any other
+
+        flush() only covers this worker. Reads that must see every message
+        sent so far also replay the journal, which writes other workers'
+        rows early (they skip them later as already written).
+
+        Returns:
+            Number of rows written (0 if write-behind is off)
+        """
+        if not self.enabled:
+            return 0
+        written = self.flush()
+        try:
+            written += self.recover()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error replaying chat journal: {e}")
+        return written
+
+    def flush_room(self, room_id: int) -> int:
+        """
+        Write one room's journaled rows, buffered by this worker or any other
+
+        For reads of a room's newest messages. Unlike flush_journal() it
+        leaves other rooms' rows to their workers, and writes on its own
+        connection, so the caller's session isn't committed.
+
+        Returns:
+            Number of rows written (0 if write-behind is off or on error)
+        """
+        if not self.enabled:
+            return 0
+        try:
+            entries = [
+                (entry_id, row)
+                for entry_id, row in (
+                    (entry_id, self._decode(fields))
+                    for entry_id, fields in extensions.redis_client.xrange(self.JOURNAL_KEY)
+                )
+                if row["room_id"] == int(room_id)
+            ]
+            if not entries:
+                return 0
+            with db.engine.begin() as connection:
+                connection.execute(self._insert_statement(), [row for _, row in entries])
+        except Exception as e:
+            # The room's history lags by a flush interval, as it would anyway
+            logger.error(f"Error writing journaled chat messages for room {room_id}: {e}")
+            return 0
+        self._forget([entry_id for entry_id, _ in entries])
+        return len(entries)
+
+    def recover(self) -> int:
+        """
+        Replay the journal into the database
+
+        Safe to run while other workers are flushing: rows that already
+        exist are skipped.
+
+        Returns:
+            Number of journal entries replayed
+        """
+        redis_client = extensions.redis_client
+        replayed = 0
+        last_id = "-"
+        while True:
+            entries = redis_client.xrange(
+                self.JOURNAL_KEY, min=last_id, count=self.MAX_BATCH
+            )
+            if last_id != "-":
+                entries = [entry for entry in entries if entry[0] != last_id]
+            if not entries:
+                break
+            self._write([self._decode(fields) for _, fields in entries])
+            self._forget([entry_id for entry_id, _ in entries])
+            replayed += len(entries)
+            last_id = entries[-1][0]
+
+        return replayed
+
+    def shutdown(self):
+        """Flush what's buffered before the process exits"""
+        if not self._pending or self._app is None:
+            return
+        try:
+            with self._app.app_context():
+                self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing chat messages on shutdown: {e}")
+
+    def _run(self):
+        with self._app.app_context():
+            try:
+                replayed = self.recover()
+                if replayed:
+                    logger.warning(f"Replayed {replayed} journaled chat messages")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error replaying chat journal: {e}")
+        while True:
+            socketio.sleep(self.FLUSH_INTERVAL)
+            try:
+                with self._app.app_context():
+                    self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing chat messages: {e}")
+
+    def _next_id(self) -> int:
+        with self._lock:
+            if self._ids:
+                return self._ids.pop()
+        # nextval isn't transactional, so stay out of the caller's session
+        with db.engine.connect() as connection:
+            ids = connection.execute(
+                text(
+                    "SELECT nextval(pg_get_serial_sequence('chat_messages', 'id')) "
+                    "FROM generate_series(1, :n)"
+                ),
+                {"n": self.ID_BLOCK},
+            ).scalars().all()
+        with self._lock:
+            # Pop from the end, so keep the lowest ids there
+            self._ids.extend(sorted(ids, reverse=True))
+            return self._ids.pop()
+
+    def _write(self, rows: List[Dict]):
+        """Insert rows in one statement, or one by one to skip rejected rows"""
+        statement = self._insert_statement()
+        try:
+            db.session.execute(statement, rows)
+            db.session.commit()
+            return
+        except IntegrityError:
+            db.session.rollback()
+
+        for row in rows:
+            try:
+                db.session.execute(statement, [row])
+                db.session.commit()
+            except IntegrityError as e:
+                db.session.rollback()
+                logger.error(f"Dropping chat message {row['id']}: {e.orig}")
+
+    @staticmethod
+    def _insert_statement():
+        return insert(ChatMessage.__table__).on_conflict_do_nothing(index_elements=["id"])
+
+    def _forget(self, entry_ids: List[str]):
+        try:
+            extensions.redis_client.xdel(self.JOURNAL_KEY, *entry_ids)
+        except Exception as e:
+            # Left in the journal; the next replay skips them
+            logger.error(f"Error trimming chat journal: {e}")
+
+    @staticmethod
+    def _encode(row: Dict) -> Dict[str, str]:
+        return {**row, "created_at": row["created_at"].isoformat()}
+
+    @staticmethod
+    def _decode(fields: Dict[str, str]) -> Dict:
+        return {
+            "id": int(fields["id"]),
+            "room_id": int(fields["room_id"]),
+            "user_id": int(fields["user_id"]),
+            "content": fields["content"],
+            "created_at": datetime.fromisoformat(fields["created_at"]),
+        }
+
+
+# Create a singleton instance
+chat_write_buffer = ChatWriteBuffer()
@@ -10,6 +10,7 @@ from api.models import (
 )
 from api.models.enums import ConnectionStatus, MessageStatus
 from api.commons.pagination import paginate
+from api.services.cache_service import CacheInvalidation
 
 
 class ConnectionService:
@@ -255,6 +256,11 @@ class ConnectionService:
         connection.updated_at = datetime.utcnow()
         db.session.commit()
 
+        if new_status == ConnectionStatus.ACCEPTED:
+            CacheInvalidation.online_audience_changed(
+                connection.requester_id, connection.recipient_id
+            )
+
         # If accepted, create a direct message thread
         thread_id = None
         if new_status == ConnectionStatus.ACCEPTED:
@@ -276,6 +282,7 @@ class ConnectionService:
                     user1_id=connection.requester_id,
                     user2_id=connection.recipient_id,
                     is_encrypted=False,
+                    user2_unread_count=1,  # The icebreaker below
                 )
                 db.session.add(thread)
                 db.session.flush()
@@ -352,6 +359,9 @@ class ConnectionService:
                     db.session.delete(global_thread)
             
             db.session.commit()
+            CacheInvalidation.online_audience_changed(
+                connection.requester_id, connection.recipient_id
+            )
             return connection
             
         except Exception as e:
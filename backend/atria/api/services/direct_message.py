@@ -5,7 +5,7 @@ from typing import Dict, List, Optional, Tuple, Any, Union
 from api.extensions import db
 from api.models import DirectMessageThread, DirectMessage, User, Connection
 from api.models.enums import MessageStatus, ConnectionStatus
-from api.commons.pagination import paginate
+from api.commons.pagination import paginate, cursor_paginate, keyset_page
 from api.services.cache_service import CacheService, CacheKeys
 import logging
 
@@ -14,120 +14,168 @@ logger = logging.getLogger(__name__)
 
 class DirectMessageService:
     @staticmethod
-    def get_user_threads(user_id: int, schema=None, include_enrichment=False, event_id=None):
+    def get_user_threads(
+        user_id: int,
+        schema=None,
+        include_enrichment=False,
+        event_id=None,
+        page: Optional[int] = None,
+        per_page: Optional[int] = None,
+    ):
         """
-        Get direct message threads for a user with multi-layer filtering.
-        
-        SQL filtering (efficient, reduces data loaded):
+        Get direct message threads for a user, filtered and paged in SQL.
+
+        A single query applies every visibility rule:
         - Only threads where user is participant (user1_id or user2_id)
         - Only threads with no cutoff OR messages after cutoff time
-        
-        Python filtering (complex business logic):
-        - Remove global threads where connection.status = REMOVED
-        - Hide event threads when an active global thread exists
-        
-        This two-stage approach balances performance with complex logic that
-        would be difficult to express in SQL.
-        
+        - Global threads are hidden when the connection was REMOVED
+        - Event threads are hidden when a visible global thread exists
+          for the same pair of users
+
+        The same query joins the other participant and the last message
+        (LATERAL); unread counts are counters on the thread row, so
+        serializing the result needs no per-thread queries. Shared events are added with one batch query.
+
         Args:
             user_id: ID of the user requesting threads
             schema: Optional Marshmallow schema for serialization
             include_enrichment: If True, enrich threads with service data like shared_event_ids
-            
+            event_id: Optional event to flag other_user_in_event against
+            page: Page number (only used together with per_page)
+            per_page: Threads per page (None returns every thread)
+
         Returns:
             Filtered list of threads with pagination metadata if schema provided
         """
-        from sqlalchemy import case, and_, or_, func
+        from sqlalchemy import case, and_, or_, func, select, exists, true
         from sqlalchemy.orm import aliased
-        from api.models.user import User
-        from api.models.enums import ConnectionStatus
-        
-        # Create an alias for the messages table to check for messages after cutoff
-        dm_alias = aliased(DirectMessage)
-        
-        # Create a CASE expression to get the user's cutoff time
-        user_cutoff = case(
-            (DirectMessageThread.user1_id == user_id, DirectMessageThread.user1_cutoff),
-            (DirectMessageThread.user2_id == user_id, DirectMessageThread.user2_cutoff),
-            else_=None
+
+        Thread = DirectMessageThread
+        GlobalThread = aliased(DirectMessageThread)
+        OtherUser = aliased(User)
+
+        def user_cutoff(thread):
+            return case(
+                (thread.user1_id == user_id, thread.user1_cutoff),
+                (thread.user2_id == user_id, thread.user2_cutoff),
+                else_=None,
+            )
+
+        def visible_after_cutoff(thread):
+            # No cutoff set, or at least one message after the cutoff
+            cutoff = user_cutoff(thread)
+            return or_(
+                cutoff.is_(None),
+                exists().where(
+                    DirectMessage.thread_id == thread.id,
+                    DirectMessage.created_at > cutoff,
+                ),
+            )
+
+        other_user_id = case(
+            (Thread.user1_id == user_id, Thread.user2_id), else_=Thread.user1_id
         )
-        
-        # Subquery to check if thread has messages after cutoff
-        has_messages_after_cutoff = db.session.query(dm_alias.id).filter(
-            dm_alias.thread_id == DirectMessageThread.id,
-            dm_alias.created_at > user_cutoff
-        ).limit(1).scalar_subquery()
-        
-        # Main query that filters threads based on cutoff logic
-        query = DirectMessageThread.query.filter(
-            and_(
-                # User is part of the thread
+
+        connection_removed = exists().where(
+            Connection.status == ConnectionStatus.REMOVED,
+            or_(
+                and_(Connection.requester_id == user_id, Connection.recipient_id == other_user_id),
+                and_(Connection.requester_id == other_user_id, Connection.recipient_id == user_id),
+            ),
+        )
+
+        visible_global_exists = exists().where(
+            GlobalThread.event_scope_id.is_(None),
+            or_(
+                and_(GlobalThread.user1_id == Thread.user1_id, GlobalThread.user2_id == Thread.user2_id),
+                and_(GlobalThread.user1_id == Thread.user2_id, GlobalThread.user2_id == Thread.user1_id),
+            ),
+            visible_after_cutoff(GlobalThread),
+        )
+
+        last_message = (
+            select(
+                DirectMessage.id,
+                DirectMessage.content,
+                DirectMessage.sender_id,
+                DirectMessage.created_at,
+                DirectMessage.status,
+            )
+            .where(DirectMessage.thread_id == Thread.id)
+            .order_by(DirectMessage.created_at.desc(), DirectMessage.id.desc())
+            .limit(1)
+            .correlate(Thread)
+            .lateral("last_message")
+        )
+
+        query = (
+            db.session.query(
+                Thread,
+                OtherUser,
+                last_message.c.id,
+                last_message.c.content,
+                last_message.c.sender_id,
+                last_message.c.created_at,
+                last_message.c.status,
+                func.count().over().label("total_items"),
+            )
+            .join(OtherUser, OtherUser.id == other_user_id)
+            .outerjoin(last_message, true())
+            .filter(
+                or_(Thread.user1_id == user_id, Thread.user2_id == user_id),
+                visible_after_cutoff(Thread),
                 or_(
-                    DirectMessageThread.user1_id == user_id,
-                    DirectMessageThread.user2_id == user_id
+                    and_(Thread.event_scope_id.is_(None), ~connection_removed),
+                    and_(
+                        Thread.event_scope_id.is_not(None),
+                        or_(connection_removed, ~visible_global_exists),
+                    ),
                 ),
-                # Include thread if either:
-                # 1. No cutoff is set (user_cutoff IS NULL), OR
-                # 2. There are messages after the cutoff time
-                or_(
-                    user_cutoff.is_(None),
-                    has_messages_after_cutoff.is_not(None)
-                )
+            )
+            # Most recent conversation first
+            .order_by(
+                func.coalesce(Thread.last_message_at, Thread.created_at).desc(),
+                Thread.id.desc(),
             )
         )
-        
-        # Fetch all threads then filter in Python
-        # This is more efficient than complex SQL for typical thread counts
-        all_threads = query.all()
-        
-        # Quick lookup for current user
-        current_user = User.query.get(user_id)
-        
-        # Build a set of user pairs with active global threads
-        # This lets us hide event threads when global exists
-        active_global_pairs = set()
+
+        if per_page:
+            page = max(page or 1, 1)
+            query = query.limit(per_page).offset((page - 1) * per_page)
+
         visible_threads = []
-        
-        # First pass: identify global threads with active connections
-        for thread in all_threads:
-            if thread.event_scope_id is None:  # Global thread
-                other_user_id = thread.user2_id if thread.user1_id == user_id else thread.user1_id
-                connection = current_user.get_connection_with(other_user_id)
-                
-                # Include global thread only if connection is not removed
-                if not connection or connection.status != ConnectionStatus.REMOVED:
-                    user_pair = tuple(sorted([user_id, other_user_id]))
-                    active_global_pairs.add(user_pair)
-                    visible_threads.append(thread)
-        
-        # Second pass: add event threads only if no global thread exists
-        for thread in all_threads:
-            if thread.event_scope_id is not None:  # Event thread
-                other_user_id = thread.user2_id if thread.user1_id == user_id else thread.user1_id
-                user_pair = tuple(sorted([user_id, other_user_id]))
-                
-                # Show event thread only if no active global thread exists
-                if user_pair not in active_global_pairs:
-                    visible_threads.append(thread)
-        
-        # Sort by last message time
-        visible_threads.sort(key=lambda t: t.last_message_at or t.created_at, reverse=True)
+        total_items = 0
+        for row in query.all():
+            (thread, other_user, message_id, content, sender_id,
+             created_at, status, total_items) = row
+            # Preloaded values are per-viewer (unread count, other user)
+            thread.preloaded_for_user = user_id
+            thread.preloaded_other_user = other_user
+            thread.preloaded_last_message = (
+                {
+                    "id": message_id,
+                    "content": content,
+                    "sender_id": sender_id,
+                    "created_at": created_at.isoformat(),
+                    "status": status.value if status else None,
+                }
+                if message_id is not None
+                else None
+            )
+            visible_threads.append(thread)
 
         # ALWAYS add metadata for ALL threads - single cache approach
         # This enables proper frontend filtering without multiple cache entries
 
         # Get all other user IDs from visible threads
-        other_user_ids = []
-        for thread in visible_threads:
-            other_id = thread.user2_id if thread.user1_id == user_id else thread.user1_id
-            other_user_ids.append(other_id)
+        other_user_ids = [thread.preloaded_other_user.id for thread in visible_threads]
 
         # Efficiently get all shared events for all thread participants in one query
         shared_events_map = DirectMessageService.get_batch_shared_events(user_id, other_user_ids)
 
         # Add metadata to all threads
         for thread in visible_threads:
-            other_id = thread.user2_id if thread.user1_id == user_id else thread.user1_id
+            other_id = thread.preloaded_other_user.id
             # Always include list of ALL shared events
             thread.shared_event_ids = shared_events_map.get(other_id, [])
 
@@ -138,15 +186,18 @@ class DirectMessageService:
             else:
                 # When no event specified, this field isn't relevant
                 thread.other_user_in_event = None
-        
+
         if schema:
+            if not per_page:
+                total_items = len(visible_threads)
+            page_size = per_page or len(visible_threads) or 1
             # Return in expected format for pagination
             return {
                 "threads": schema.dump(visible_threads),
-                "total_items": len(visible_threads),
-                "total_pages": 1,
-                "current_page": 1,
-                "per_page": len(visible_threads) or 1
+                "total_items": total_items,
+                "total_pages": max((total_items + page_size - 1) // page_size, 1),
+                "current_page": page or 1,
+                "per_page": page_size,
             }
 
         return visible_threads
@@ -221,9 +272,15 @@ class DirectMessageService:
 
     @staticmethod
     def get_thread_messages(
-        thread_id: int, user_id: int, schema=None, page=1, per_page=50
+        thread_id: int, user_id: int, schema=None, page=1, per_page=50, cursor=None
     ):
-        """Get messages for a thread with pagination, respecting user's cutoff"""
+        """
+        Get messages for a thread with pagination, respecting user's cutoff.
+
+        Passing a cursor (empty string for the first page) switches the manual
+        pagination to keyset mode: the pagination dict then carries next_cursor
+        instead of page totals, and no COUNT query is run.
+        """
         thread = DirectMessageThread.query.get_or_404(thread_id)
 
         # Check if user is part of this thread
@@ -249,8 +306,34 @@ class DirectMessageService:
 
         if schema:
             # Don't reverse - return newest first
+            from flask import request
+            if "cursor" in request.args:
+                return cursor_paginate(
+                    query,
+                    schema,
+                    collection_name="messages",
+                    columns=(DirectMessage.created_at, DirectMessage.id),
+                )
             return paginate(query, schema, collection_name="messages")
 
+        # Keyset pagination for deep scrollback
+        if cursor is not None:
+            per_page = min(per_page or 50, 100)
+            messages, next_cursor = keyset_page(
+                query,
+                (DirectMessage.created_at, DirectMessage.id),
+                cursor=cursor or None,
+                per_page=per_page,
+            )
+            return {
+                "messages": messages,
+                "pagination": {
+                    "per_page": per_page,
+                    "next_cursor": next_cursor,
+                    "has_more": next_cursor is not None,
+                },
+            }
+
         # Manual pagination for socket responses
         if per_page:
             per_page = min(per_page, 100)  # Limit max per_page
@@ -336,6 +419,8 @@ class DirectMessageService:
         # Update thread's last_message_at
         thread.last_message_at = datetime.utcnow()
 
+        DirectMessageService.adjust_unread_count(thread, other_user_id, 1)
+
         db.session.commit()
 
         return message, other_user_id
@@ -358,10 +443,11 @@ class DirectMessageService:
         if cutoff_time:
             unread_query = unread_query.filter(DirectMessage.created_at > cutoff_time)
         
-        unread_messages = unread_query.all()
-
-        for message in unread_messages:
-            message.status = MessageStatus.READ
+        marked = unread_query.update(
+            {DirectMessage.status: MessageStatus.READ}, synchronize_session=False
+        )
+        if marked:
+            DirectMessageService.adjust_unread_count(thread, user_id, -marked)
 
         db.session.commit()
 
@@ -370,7 +456,88 @@ class DirectMessageService:
             thread.user2_id if thread.user1_id == user_id else thread.user1_id
         )
 
-        return thread_id, other_user_id, len(unread_messages) > 0
+        return thread_id, other_user_id, marked > 0
+
+    @staticmethod
+    def adjust_unread_count(thread: DirectMessageThread, user_id: int, delta: int):
+        """
+        Atomically add delta to a user's unread counter on a thread.
+
+        Runs as a single UPDATE so concurrent senders/readers don't lose
+        increments; the counter never goes below zero. The caller commits.
+
+        Args:
+            thread: Thread holding the counter
+            user_id: Participant whose counter changes
+            delta: Amount to add (negative to decrement)
+        """
+        from sqlalchemy import func, update
+
+        if thread.user1_id == user_id:
+            column = DirectMessageThread.user1_unread_count
+        elif thread.user2_id == user_id:
+            column = DirectMessageThread.user2_unread_count
+        else:
+            return
+
+        db.session.execute(
+            update(DirectMessageThread)
+            .where(DirectMessageThread.id == thread.id)
+            .values({column: func.greatest(func.coalesce(column, 0) + delta, 0)})
+            .execution_options(synchronize_session=False)
+        )
+        db.session.expire(thread, [column.key])
+
+    @staticmethod
+    def reconcile_unread_counts(thread_ids: Optional[List[int]] = None) -> int:
+        """
+        Rebuild unread counters from direct_messages.
+
+        Counters are maintained incrementally, so this only corrects drift
+        (messages written outside DirectMessageService, partial failures).
+
+        Args:
+            thread_ids: Limit to these threads (None reconciles every thread)
+
+        Returns:
+            Number of threads whose counters were corrected
+        """
+        from sqlalchemy import func, or_, select, update
+
+        def actual_unread(user_column):
+            return (
+                select(func.count(DirectMessage.id))
+                .where(
+                    DirectMessage.thread_id == DirectMessageThread.id,
+                    DirectMessage.status == MessageStatus.DELIVERED,
+                    DirectMessage.sender_id != user_column,
+                )
+                .scalar_subquery()
+            )
+
+        user1_actual = actual_unread(DirectMessageThread.user1_id)
+        user2_actual = actual_unread(DirectMessageThread.user2_id)
+
+        stmt = (
+            update(DirectMessageThread)
+            .where(
+                or_(
+                    DirectMessageThread.user1_unread_count != user1_actual,
+                    DirectMessageThread.user2_unread_count != user2_actual,
+                )
+            )
+            .values(user1_unread_count=user1_actual, user2_unread_count=user2_actual)
+            .execution_options(synchronize_session=False)
+        )
+        if thread_ids is not None:
+            stmt = stmt.where(DirectMessageThread.id.in_(thread_ids))
+
+        corrected = db.session.execute(stmt).rowcount
+        db.session.commit()
+
+        if corrected:
+            logger.info(f"Reconciled DM unread counters on {corrected} threads")
+        return corrected
 
     @staticmethod
     def get_or_create_thread(user1_id: int, user2_id: int, event_scope_id: int = None):
@@ -501,24 +668,36 @@ class DirectMessageService:
         thread: DirectMessageThread, user_id: int
     ) -> Dict[str, Any]:
         """Format thread data for API/socket response"""
-        # Use the model's helper method to get the other user
-        other_user = thread.get_other_user(user_id)
-
-        # Get the last message
-        last_message = (
-            DirectMessage.query.filter_by(thread_id=thread.id)
-            .order_by(DirectMessage.created_at.desc())
-            .first()
-        )
-
-        # Get unread count
-        unread_count = (
-            DirectMessage.query.filter_by(
-                thread_id=thread.id, status=MessageStatus.DELIVERED
+        # Threads from get_user_threads carry preloaded values; others are
+        # looked up here
+        preloaded = getattr(thread, "preloaded_for_user", None) == user_id
+
+        if preloaded:
+            other_user = thread.preloaded_other_user
+            last_message = thread.preloaded_last_message
+        else:
+            # Use the model's helper method to get the other user
+            other_user = thread.get_other_user(user_id)
+
+            # Get the last message
+            message = (
+                DirectMessage.query.filter_by(thread_id=thread.id)
+                .order_by(DirectMessage.created_at.desc())
+                .first()
+            )
+            last_message = (
+                {
+                    "id": message.id,
+                    "sender_id": message.sender_id,
+                    "content": message.content,
+                    "created_at": message.created_at.isoformat(),
+                    "status": message.status.value,
+                }
+                if message
+                else None
             )
-            .filter(DirectMessage.sender_id != user_id)
-            .count()
-        )
+
+        unread_count = thread.get_unread_count(user_id)
 
         thread_data = {
             "id": thread.id,
@@ -539,27 +718,24 @@ class DirectMessageService:
         }
         
         # Include list of shared events using the reusable method
-        shared_event_ids = DirectMessageService.get_shared_event_ids(user_id, other_user.id)
+        shared_event_ids = getattr(thread, "shared_event_ids", None) if preloaded else None
+        if shared_event_ids is None:
+            shared_event_ids = DirectMessageService.get_shared_event_ids(user_id, other_user.id)
         thread_data["shared_event_ids"] = shared_event_ids
 
         if last_message:
-            thread_data["last_message"] = {
-                "id": last_message.id,
-                "sender_id": last_message.sender_id,
-                "content": last_message.content,
-                "created_at": last_message.created_at.isoformat(),
-                "status": last_message.status.value,
-            }
+            thread_data["last_message"] = last_message
 
         return thread_data
 
     @staticmethod
     def get_thread_messages_with_context(
-        thread_id: int, user_id: int, page=1, per_page=50
+        thread_id: int, user_id: int, page=1, per_page=50, cursor=None
     ) -> Dict[str, Any]:
         """
         Get thread messages with full context including other_user info.
         This is the unified method for both HTTP and WebSocket responses.
+        Pass cursor to use keyset pagination (see get_thread_messages).
         """
         # Get the thread and validate access
         thread = DirectMessageService.get_thread(thread_id, user_id)
@@ -569,7 +745,7 @@ class DirectMessageService:
         
         # Get paginated messages
         messages_result = DirectMessageService.get_thread_messages(
-            thread_id, user_id, page=page, per_page=per_page
+            thread_id, user_id, page=page, per_page=per_page, cursor=cursor
         )
         
         # Format messages for response
@@ -646,23 +822,25 @@ class DirectMessageService:
     @staticmethod
     def get_unread_count(user_id: int) -> int:
         """Get total unread messages count across all threads"""
-        # Find all threads the user is part of
-        threads = DirectMessageThread.query.filter(
-            (DirectMessageThread.user1_id == user_id)
-            | (DirectMessageThread.user2_id == user_id)
-        ).all()
-
-        thread_ids = [thread.id for thread in threads]
-
-        # Count unread messages
-        if not thread_ids:
-            return 0
-
-        return DirectMessage.query.filter(
-            DirectMessage.thread_id.in_(thread_ids),
-            DirectMessage.sender_id != user_id,
-            DirectMessage.status == MessageStatus.DELIVERED,
-        ).count()
+        from sqlalchemy import case, func
+
+        # Sum the per-thread counters; no scan of direct_messages
+        total = (
+            db.session.query(
+                func.sum(
+                    case(
+                        (DirectMessageThread.user1_id == user_id, DirectMessageThread.user1_unread_count),
+                        else_=DirectMessageThread.user2_unread_count,
+                    )
+                )
+            )
+            .filter(
+                (DirectMessageThread.user1_id == user_id)
+                | (DirectMessageThread.user2_id == user_id)
+            )
+            .scalar()
+        )
+        return int(total or 0)
 
     @staticmethod
     def delete_message(message_id: int, user_id: int) -> Tuple[int, int]:
@@ -688,6 +866,8 @@ class DirectMessageService:
         )
 
         # Delete the message
+        if message.status == MessageStatus.DELIVERED:
+            DirectMessageService.adjust_unread_count(thread, other_user_id, -1)
         db.session.delete(message)
         db.session.commit()
 
@@ -695,26 +875,62 @@ class DirectMessageService:
 
     @staticmethod
     def search_messages(user_id: int, query: str, schema=None):
-        """Search for messages containing the query text"""
-        if not query or len(query) < 3:
-            raise ValueError("Search query must be at least 3 characters")
-
-        # Find all threads the user is part of
-        threads = DirectMessageThread.query.filter(
-            (DirectMessageThread.user1_id == user_id)
-            | (DirectMessageThread.user2_id == user_id)
-        ).all()
+        """
+        Full-text search over the user's direct messages.
+
+        Uses the GIN-indexed search_vector, ranks by relevance (newest first
+        on ties) and attaches a highlighted snippet to each hit. E2EE
+        messages have no search_vector and never match; messages hidden by
+        the user's thread cutoff are skipped.
 
-        thread_ids = [thread.id for thread in threads]
+        Args:
+            user_id: ID of the searching user
+            query: Search text (web search syntax: quotes, or, -word)
+            schema: Optional schema (e.g. DirectMessageSearchResultSchema)
+
+        Returns:
+            Paginated results if schema provided, otherwise matching messages
+        """
+        from sqlalchemy import case, or_
+        from sqlalchemy.orm import with_expression
+        from api.commons.search import (
+            validate_search_text,
+            to_search_query,
+            search_rank,
+            search_headline,
+        )
 
-        if not thread_ids:
-            return [] if not schema else {"results": []}
+        query = validate_search_text(query)
+        tsquery = to_search_query(query)
+        rank = search_rank(DirectMessage.search_vector, tsquery)
+
+        user_cutoff = case(
+            (DirectMessageThread.user1_id == user_id, DirectMessageThread.user1_cutoff),
+            else_=DirectMessageThread.user2_cutoff,
+        )
 
-        # Search for messages
-        search_query = DirectMessage.query.filter(
-            DirectMessage.thread_id.in_(thread_ids),
-            DirectMessage.content.ilike(f"%{query}%"),
-        ).order_by(DirectMessage.created_at.desc())
+        search_query = (
+            DirectMessage.query.join(
+                DirectMessageThread, DirectMessage.thread_id == DirectMessageThread.id
+            )
+            .filter(
+                or_(
+                    DirectMessageThread.user1_id == user_id,
+                    DirectMessageThread.user2_id == user_id,
+                ),
+                DirectMessage.search_vector.op("@@")(tsquery),
+                or_(user_cutoff.is_(None), DirectMessage.created_at > user_cutoff),
+            )
+            .options(
+                with_expression(DirectMessage.search_rank, rank),
+                # Only evaluated for the rows of the returned page
+                with_expression(
+                    DirectMessage.search_headline,
+                    search_headline(DirectMessage.content, tsquery),
+                ),
+            )
+            .order_by(rank.desc(), DirectMessage.created_at.desc(), DirectMessage.id.desc())
+        )
 
         if schema:
             return paginate(search_query, schema, collection_name="results")
@@ -811,6 +1027,15 @@ class DirectMessageService:
                         created_at=message.created_at  # Preserve original timestamp
                     )
                     db.session.add(new_message)
+                    if message.status == MessageStatus.DELIVERED:
+                        recipient_id = (
+                            global_thread.user2_id
+                            if message.sender_id == global_thread.user1_id
+                            else global_thread.user1_id
+                        )
+                        DirectMessageService.adjust_unread_count(
+                            global_thread, recipient_id, 1
+                        )
             
             # Update global thread's last_message_at if needed
             if event_thread.last_message_at and (not global_thread.last_message_at or 
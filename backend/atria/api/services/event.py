@@ -2,9 +2,17 @@ from api.extensions import db
 from api.models import Event, User
 from api.models.enums import EventUserRole, EventStatus
 from api.commons.pagination import paginate
+from api.services.cache_service import CacheInvalidation, CacheKeys, CacheService
 
 
 class EventService:
+    # Event detail payload cache (invalidated on every change it reflects)
+    DETAIL_TTL = 600
+    DETAIL_STALE_TTL = 60
+
+    # Detail fields that depend on the viewer or on today's date, added per request
+    DETAIL_REQUEST_FIELDS = ("user_role", "is_upcoming", "is_ongoing", "is_past")
+
     @staticmethod
     def get_organization_events(org_id, schema, include_deleted=False):
         """Get all events for an organization with pagination"""
@@ -29,30 +37,78 @@ class EventService:
 
         event.add_user(current_user, EventUserRole.ADMIN)
         db.session.commit()
+        CacheInvalidation.user_events_changed(current_user.id)
 
         return event
 
     @staticmethod
     def get_event(event_id):
-        """Get event details by ID"""
-        from flask_jwt_extended import get_jwt_identity
-        from api.models import User
+        """
+        Get event details by ID
+
+        The viewer-independent part comes from get_event_detail (cached);
+        the current user's role and the date-relative flags are merged in
+        per request from the event the access check already loaded.
+
+        Returns:
+            Dict in the EventDetailSchema format
+        """
         from flask_smorest import abort
-        
-        event = Event.query.get_or_404(event_id)
-        
+        from api.commons.principal import get_event_principal
+
+        principal = get_event_principal(event_id)
+        event = principal.event
+
         # Check if event is soft-deleted
         if event.status == EventStatus.DELETED:
             abort(404, message="Event not found")
-        
-        # Add current user's role in the event
-        current_user_id = int(get_jwt_identity())
-        current_user = User.query.get(current_user_id)
-        if current_user:
-            role = event.get_user_role(current_user)
-            event.user_role = role.value if role else None
-        
-        return event
+
+        detail = EventService.get_event_detail(event.id, event.organization_id)
+        role = principal.role
+        return {
+            **detail,
+            "user_role": role.value if role else None,
+            "is_upcoming": event.is_upcoming,
+            "is_ongoing": event.is_ongoing,
+            "is_past": event.is_past,
+        }
+
+    @staticmethod
+    def get_event_detail(event_id, org_id):
+        """
+        Get the serialized event detail shared by every viewer
+
+        Sessions, organizers, speakers and sponsors_count cost a query each
+        (and grow with the event), so the dump is cached under
+        CacheKeys.event with stampede protection. Invalidated by
+        CacheInvalidation.event_updated, session_updated,
+        event_detail_changed and event_members_changed, and with the
+        organization by organization_updated.
+
+        Args:
+            event_id: Event ID
+            org_id: The event's organization ID (cache tag)
+
+        Returns:
+            Dict in the EventDetailSchema format, without DETAIL_REQUEST_FIELDS
+        """
+        from api.schemas import EventDetailSchema
+
+        def build():
+            event = Event.query.get(event_id)
+            if event is None:
+                return None
+            return EventDetailSchema(
+                exclude=EventService.DETAIL_REQUEST_FIELDS
+            ).dump(event)
+
+        return CacheService.get_or_compute(
+            CacheKeys.event(event_id),
+            build,
+            ttl=EventService.DETAIL_TTL,
+            stale_ttl=EventService.DETAIL_STALE_TTL,
+            tags=[f"event:{event_id}", f"org:{org_id}"],
+        )
 
     @staticmethod
     def update_event(event_id, update_data):
@@ -82,6 +138,7 @@ class EventService:
             setattr(event, key, value)
 
         db.session.commit()
+        CacheInvalidation.event_updated(event.id, event.organization_id)
         return event
 
     @staticmethod
@@ -94,6 +151,7 @@ class EventService:
         
         event.soft_delete(current_user_id)
         db.session.commit()
+        CacheInvalidation.event_updated(event.id, event.organization_id)
 
     @staticmethod
     def update_event_branding(event_id, branding_data):
@@ -101,4 +159,5 @@ class EventService:
         event = Event.query.get_or_404(event_id)
         event.update_branding(**branding_data)
         db.session.commit()
+        CacheInvalidation.event_updated(event.id, event.organization_id)
         return event
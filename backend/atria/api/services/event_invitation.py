@@ -3,6 +3,7 @@ from api.extensions import db
 from api.models import Event, User, EventInvitation
 from api.models.enums import EventUserRole, InvitationStatus
 from api.services.email import email_service
+from api.services.cache_service import CacheInvalidation
 from flask_jwt_extended import get_jwt_identity
 from datetime import datetime, timedelta, timezone
 import secrets
@@ -146,6 +147,8 @@ class EventInvitationService:
         invitation.user_id = user.id
 
         db.session.commit()
+        CacheInvalidation.user_events_changed(user.id)
+        CacheInvalidation.event_members_changed(event.id, invitation.role)
 
         return event_user
 
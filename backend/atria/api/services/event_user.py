@@ -1,13 +1,37 @@
 from api.extensions import db
 from api.models import Event, User, EventUser, Session, SessionSpeaker, Connection, Organization
-from api.models.enums import EventUserRole, ConnectionStatus, OrganizationUserRole
+from api.models.enums import EventUserRole, OrganizationUserRole
 from api.commons.pagination import paginate
 from flask_jwt_extended import get_jwt_identity
 from sqlalchemy.orm import joinedload
 from api.services.user import UserService
+from api.services.chat_access_cache import ChatAccessCache
+from api.services.cache_service import CacheInvalidation, cache_result
 
 
 class EventUserService:
+    @staticmethod
+    @cache_result(
+        ttl=3600,
+        key_prefix="user_event_ids",
+        tags=lambda user_id: [f"user:{user_id}:events"],
+        local_ttl=30,
+    )
+    def get_user_event_ids(user_id):
+        """
+        Get ids of the events a user belongs to and isn't banned from
+
+        Used on every socket connect to join event rooms, so it is cached per
+        user; invalidated by CacheInvalidation.user_events_changed. Always
+        pass user_id as an int so callers share the cache entry.
+        """
+        return [
+            event_id
+            for (event_id,) in db.session.query(EventUser.event_id)
+            .filter(EventUser.user_id == user_id, EventUser.is_banned.is_(False))
+            .order_by(EventUser.event_id)
+        ]
+
     @staticmethod
     def add_or_create_user(event_id, data):
         """Add or create user and add to event"""
@@ -36,6 +60,8 @@ class EventUserService:
         )
 
         db.session.commit()
+        CacheInvalidation.user_events_changed(user.id)
+        CacheInvalidation.event_members_changed(event_id, data["role"])
 
         return EventUser.query.filter_by(
             event_id=event_id, user_id=user.id
@@ -77,8 +103,27 @@ class EventUserService:
         return result
     
     @staticmethod
-    def get_event_users_with_connection_status(event_id, role=None, schema=None):
-        """Get list of event users with privacy filtering - excludes banned users for networking"""
+    def get_event_users_with_connection_status(event_id, role=None, schema=None, search=None):
+        """
+        Get a page of event users with privacy filtering - excludes banned users for networking
+
+        Paging, the role filter, name search and sorting run in SQL, so only
+        the requested page is loaded; connection status and privacy are
+        computed for those rows only.
+
+        Args:
+            event_id: Event ID
+            role: Optional role filter
+            schema: Schema to serialize the page with (returns the EventUsers if None)
+            search: Optional name/company search; every word matches as a prefix
+
+        Returns:
+            Paginated dict (page, per_page from the request args)
+        """
+        from flask import request
+        from sqlalchemy.orm import contains_eager
+        from api.commons.principal import get_current_user
+
         current_user_id = get_jwt_identity()
         
         if not current_user_id:
@@ -87,55 +132,47 @@ class EventUserService:
             
         current_user_id = int(current_user_id)
         
-        # Get base query with eager loading for efficiency
-        query = EventUser.query.filter_by(event_id=event_id)
+        query = (
+            EventUser.query.join(EventUser.user)
+            .filter(EventUser.event_id == event_id)
+            # Filter out banned users for networking purposes
+            .filter(EventUser.is_banned.is_(False))
+        )
         if role:
-            query = query.filter_by(role=role)
-        
-        # Filter out banned users for networking purposes
-        query = query.filter(EventUser.is_banned.is_(False))
-        
-        # Eager load users and session data to prevent N+1 queries
+            query = query.filter(EventUser.role == role)
+        if search:
+            search_filter = EventUserService._directory_search_filter(
+                event_id, current_user_id, search
+            )
+            if search_filter is not None:
+                query = query.filter(search_filter)
+
+        # The user comes with the row; speaker sessions only for this page
         query = query.options(
-            joinedload(EventUser.user).joinedload(User.session_speakers).joinedload(SessionSpeaker.session)
-        ).join(EventUser.user).order_by(User.last_name, User.first_name)
-        
-        # Get all event users
-        event_users = query.all()
-        
-        # Collect all user IDs (excluding current user) for batch connection lookup
-        other_user_ids = [eu.user_id for eu in event_users if eu.user_id != current_user_id]
-        
-        # Get all connection statuses in a single query
-        connection_map = EventUserService._get_bulk_connection_status(
-            current_user_id, 
-            other_user_ids
-        ) if other_user_ids else {}
-        
-        # Get the viewer once (not 50 times!)
-        viewer = User.query.get(current_user_id) if current_user_id else None
-        
-        # Get viewer's event role once
-        viewer_event_user = next((eu for eu in event_users if eu.user_id == current_user_id), None)
-        
-        # Build privacy contexts in batch
-        privacy_contexts = EventUserService._build_batch_privacy_contexts(
-            event_users, viewer, viewer_event_user, connection_map, event_id
-        )
-        
-        # Apply privacy filtering using pre-built contexts
+            contains_eager(EventUser.user)
+            .selectinload(User.session_speakers)
+            .joinedload(SessionSpeaker.session)
+        ).order_by(User.last_name, User.first_name, User.id)
+
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 50, type=int)
+        page_obj = query.paginate(page=page, per_page=per_page, error_out=False)
+        event_users = page_obj.items
+
+        # Viewer's own EventUser comes from the access check (see build_batch_contexts)
+        viewer = get_current_user(current_user_id)
+
+        # Connections (one query) and privacy for this page in one pass
         from api.services.privacy import PrivacyService
-        for event_user in event_users:
-            # Use pre-built context
+
+        pairs = [(eu.user, eu) for eu in event_users]
+        privacy_contexts = PrivacyService.build_batch_contexts(viewer, pairs, event_id)
+        filtered_users = PrivacyService.filter_users_batch(
+            viewer, pairs, event_id, contexts=privacy_contexts
+        )
+
+        for event_user, user_data in zip(event_users, filtered_users):
             context = privacy_contexts[event_user.user_id]
-            
-            # Pass the event_user object to avoid another query for privacy overrides
-            user_data = PrivacyService.filter_user_data(
-                event_user.user,  # Already eager-loaded
-                context,
-                event_id,
-                event_user  # Pass the pre-loaded EventUser
-            )
 
             # Store privacy-filtered fields as custom attributes
             event_user._filtered_email = user_data.get('email')
@@ -151,12 +188,54 @@ class EventUserService:
                 event_user.connection_id = None
                 event_user.connection_direction = None
         
-        # Use the schema to serialize the EventUser objects
-        if schema:
-            serialized_data = schema.dump(event_users)
-            return EventUserService._paginate_list(serialized_data, "event_users")
-        
-        return event_users
+        return {
+            'event_users': schema.dump(event_users) if schema else event_users,
+            'total_items': page_obj.total,
+            'total_pages': page_obj.pages,
+            'current_page': page_obj.page,
+            'per_page': page_obj.per_page,
+            'has_next': page_obj.has_next,
+            'has_prev': page_obj.has_prev
+        }
+
+    @staticmethod
+    def _directory_search_filter(event_id, viewer_id, search):
+        """
+        Name/company search clause for the attendee list
+
+        A company only matches where the viewer could see it (as in
+        PrivacyService.filter_user_data): its user shows their company in
+        this event, or the viewer is that user or an organizer of the event.
+
+        Returns:
+            SQL clause, or None if the search has no words
+        """
+        from sqlalchemy import and_, func, or_
+        from api.commons.principal import get_event_principal
+        from api.commons.search import to_name_search_query
+
+        tsquery = to_name_search_query(search)
+        if tsquery is None:
+            return None
+        matches = User.name_search_vector.op("@@")
+
+        viewer_event = get_event_principal(event_id, viewer_id).event_user
+        if viewer_event and not viewer_event.is_banned and viewer_event.role in [
+            EventUserRole.ADMIN,
+            EventUserRole.ORGANIZER,
+        ]:
+            return matches(tsquery)
+
+        # Event overrides win over the user's settings; shown by default
+        shows_company = func.coalesce(
+            EventUser.privacy_overrides["show_company"].as_boolean(),
+            User.privacy_settings["show_company"].as_boolean(),
+            True,
+        )
+        return or_(
+            matches(to_name_search_query(search, names_only=True)),
+            and_(or_(shows_company, User.id == viewer_id), matches(tsquery)),
+        )
 
     @staticmethod
     def add_user_to_event(event_id, data):
@@ -174,6 +253,8 @@ class EventUserService:
             speaker_title=data.get("speaker_title"),
         )
         db.session.commit()
+        CacheInvalidation.user_events_changed(new_user.id)
+        CacheInvalidation.event_members_changed(event_id, data["role"])
 
         return EventUser.query.filter_by(
             event_id=event_id, user_id=new_user.id
@@ -193,6 +274,7 @@ class EventUserService:
         event_user = EventUser.query.filter_by(
             event_id=event_id, user_id=user_id
         ).first_or_404()
+        previous_role = event_user.role
         
         # Check if role is being changed
         if "role" in update_data:
@@ -270,6 +352,9 @@ class EventUserService:
                 event_user.speaker_title = update_data["speaker_title"]
 
         db.session.commit()
+        ChatAccessCache.invalidate_user(user_id)
+        if event_user.role != previous_role:
+            CacheInvalidation.event_members_changed(event_id, previous_role, event_user.role)
         return event_user
 
     @staticmethod
@@ -319,6 +404,9 @@ class EventUserService:
 
         db.session.delete(event_user)
         db.session.commit()
+        ChatAccessCache.invalidate_user(user_id)
+        CacheInvalidation.user_events_changed(user_id)
+        CacheInvalidation.event_members_changed(event_id, target_role)
 
         return {"message": "User removed from event"}
 
@@ -359,117 +447,3 @@ class EventUserService:
             'connection_id': None,
             'connection_direction': None
         }
-    
-    @staticmethod
-    def _build_batch_privacy_contexts(event_users, viewer, viewer_event_user, connection_map, event_id):
-        """
-        Build privacy contexts for all users in a single pass without additional queries.
-        
-        Returns a dict mapping user_id -> context
-        """
-        contexts = {}
-        
-        # Determine viewer's role once
-        is_viewer_organizer = False
-        if viewer_event_user:
-            is_viewer_organizer = viewer_event_user.role in [EventUserRole.ADMIN, EventUserRole.ORGANIZER]
-        
-        for event_user in event_users:
-            user = event_user.user
-            
-            context = {
-                'is_self': viewer.id == user.id if viewer else False,
-                'is_connected': False,
-                'is_organizer': is_viewer_organizer,
-                'is_co_speaker': False,
-                'is_event_attendee': viewer_event_user is not None and not viewer_event_user.is_banned,
-                'shared_events': []  # Skip for performance - not used in current implementation
-            }
-            
-            # Add connection info from pre-fetched map
-            if user.id in connection_map:
-                conn_info = connection_map[user.id]
-                context['is_connected'] = (
-                    conn_info.get('connection_status') == ConnectionStatus.ACCEPTED.value
-                )
-                # Also store raw connection info for later use
-                context['connection_status'] = conn_info.get('connection_status')
-                context['connection_id'] = conn_info.get('connection_id')
-                context['connection_direction'] = conn_info.get('connection_direction')
-            
-            # Check if both are speakers (using pre-loaded data)
-            if viewer_event_user and event_user.role == EventUserRole.SPEAKER:
-                context['is_co_speaker'] = viewer_event_user.role == EventUserRole.SPEAKER
-            
-            contexts[user.id] = context
-        
-        return contexts
-    
-    @staticmethod
-    def _get_bulk_connection_status(current_user_id, target_user_ids):
-        """Get connection status between current user and multiple target users in a single query"""
-        if not target_user_ids:
-            return {}
-        
-        # Single query to get all connections involving current user and any target users
-        connections = Connection.query.filter(
-            (
-                (Connection.requester_id == current_user_id) & 
-                (Connection.recipient_id.in_(target_user_ids))
-            ) | (
-                (Connection.requester_id.in_(target_user_ids)) & 
-                (Connection.recipient_id == current_user_id)
-            )
-        ).all()
-        
-        # Build a map of user_id -> connection info
-        connection_map = {}
-        for conn in connections:
-            # Determine which user is the "other" user from current user's perspective
-            if conn.requester_id == current_user_id:
-                other_user_id = conn.recipient_id
-                direction = 'sent'
-            else:
-                other_user_id = conn.requester_id
-                direction = 'received'
-            
-            connection_map[other_user_id] = {
-                'connection_status': conn.status.value,
-                'connection_id': conn.id,
-                'connection_direction': direction
-            }
-        
-        # Fill in None for users without connections
-        for user_id in target_user_ids:
-            if user_id not in connection_map:
-                connection_map[user_id] = {
-                    'connection_status': None,
-                    'connection_id': None,
-                    'connection_direction': None
-                }
-        
-        return connection_map
-    
-    @staticmethod
-    def _paginate_list(items, collection_name):
-        """Apply pagination to a list of items - matching standard format"""
-        from flask import request
-        
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
-        
-        # Calculate pagination
-        total = len(items)
-        total_pages = (total + per_page - 1) // per_page if total > 0 else 0
-        start = (page - 1) * per_page
-        end = start + per_page
-        
-        return {
-            collection_name: items[start:end],
-            'total_items': total,  # Changed from 'total'
-            'total_pages': total_pages,  # Changed from 'pages'
-            'current_page': page,  # Changed from 'page'
-            'per_page': per_page,
-            'has_next': page < total_pages,
-            'has_prev': page > 1
-        }
@@ -0,0 +1,346 @@
+"""
+Image Pipeline - image processing off the request thread
+
+Decoding, resizing and WebP-encoding an upload takes hundreds of
+milliseconds of CPU. Under eventlet that blocks the whole worker - every
+request and every connected socket on it - for as long as it runs.
+
+Rendering (api.commons.images.render_image) runs in separate worker
+processes instead (api.commons.image_worker, at most IMAGE_PROCESS_WORKERS
+of them). Each is a fresh interpreter that never imports the app, and the
+request's green thread talks to it over a socket: under eventlet's monkey
+patching that socket is green, so waiting for an image only parks the green
+thread and the hub keeps serving everything else. No threads or
+multiprocessing machinery sit in between - those block the hub while they
+wait, or keep it from exiting.
+
+A render waits at most IMAGE_RENDER_TIMEOUT seconds. A process that times
+out or dies is killed and the image fails with ImageProcessingError; the
+next image starts a new process. To keep memory bounded a process is retired
+after IMAGE_PROCESS_MAX_TASKS images.
+
+Two ways in:
+- render(): process and wait (used by the regular synchronous upload)
+- submit(): stage the upload on disk, return a job right away and process
+  it in the background; clients poll get_job() until it's done or failed
+
+Redis Key Structure (general client, DB 0):
+- upload:job:{job_id} → JSON job record (status, owner, result or error), TTL JOB_TTL
+
+Without Redis, job records live in this worker's memory, so only this worker
+can answer polls for them. With IMAGE_PROCESS_WORKERS = 0 (the default),
+images are processed inline, as before.
+"""
+
+import atexit
+import json
+import logging
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import api
+from api import extensions
+from api.commons import image_worker
+from api.commons.images import render_image
+from api.commons.local_cache import LocalTTLCache
+from api.extensions import socketio
+
+logger = logging.getLogger(__name__)
+
+Renditions = Dict[str, Tuple[bytes, str]]
+
+# Directory holding the api package, for the worker processes' import path
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(api.__file__)))
+
+
+class ImageProcessingError(Exception):
+    """No worker could render an image (crashed, timed out or all busy); not the image's fault"""
+
+
+class JobStatus:
+    """Upload job states"""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class _RenderProcess:
+    """One render worker process (api.commons.image_worker) and its socket"""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.tasks = 0
+        parent, child = socket.socketpair()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, (_PROJECT_ROOT, env.get("PYTHONPATH"))))
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "api.commons.image_worker", str(child.fileno())],
+                pass_fds=(child.fileno(),),
+                stdin=subprocess.DEVNULL,
+                env=env,
+            )
+        except Exception:
+            parent.close()
+            raise
+        finally:
+            child.close()
+        self.socket = parent
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def render(self, request: Tuple[str, Any, str], timeout: float) -> Tuple[str, Any]:
+        """
+        Send one request and wait for the reply
+
+        Raises:
+            OSError: If the socket failed or timed out
+            EOFError: If the process exited before replying
+        """
+        self.tasks += 1
+        self.socket.settimeout(timeout)
+        image_worker.send(self.socket, request)
+        reply = image_worker.receive(self.socket)
+        if reply is None:
+            raise EOFError("Render process exited")
+        return reply
+
+    def close(self, kill: bool = False):
+        """
+        Stop the process: closing the socket lets it exit after its current
+        image; kill stops it right away
+        """
+        self.socket.close()
+        if kill:
+            self.process.kill()
+        # Reap it without waiting here (a green thread when monkey-patched)
+        threading.Thread(target=self.process.wait, daemon=True).start()
+
+
+class ImagePipeline:
+    """
+    Render worker processes for uploads, plus background upload jobs.
+
+    Design Principles:
+    - The request thread never runs Pillow when workers are configured
+    - Waiting on a worker only ever blocks on a socket
+    - Staged uploads are deleted once processed, whatever the outcome
+    - Job records expire on their own; nothing needs cleaning up
+    """
+
+    JOB_KEY = "upload:job:{job_id}"
+    # Seconds a job record is kept after its last update
+    JOB_TTL = 60 * 60
+    # Seconds to wait for a worker process to render one image
+    DEFAULT_RENDER_TIMEOUT = 30
+    DEFAULT_STAGING_DIR = os.path.join(tempfile.gettempdir(), "atria-uploads")
+
+    def __init__(self):
+        self.workers = 0
+        self.max_tasks = None
+        self.render_timeout = self.DEFAULT_RENDER_TIMEOUT
+        self.staging_dir = self.DEFAULT_STAGING_DIR
+        self._generation = 0
+        self._slots = threading.BoundedSemaphore(1)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local_jobs = LocalTTLCache(maxsize=1000, default_ttl=self.JOB_TTL)
+
+    def configure(self, workers: int, max_tasks: Optional[int] = None,
+                  staging_dir: Optional[str] = None,
+                  render_timeout: Optional[float] = None):
+        """
+        Set the number of worker processes and staging directory for this worker
+
+        Args:
+            workers: Render processes (0 processes images inline)
+            max_tasks: Images a process renders before it's replaced by a
+                fresh one (None for never)
+            staging_dir: Where submitted uploads wait to be processed
+                (defaults to a directory under the system temp dir)
+            render_timeout: Seconds to wait for one image (defaults to
+                DEFAULT_RENDER_TIMEOUT)
+        """
+        self.shutdown()
+        self.workers = max(0, int(workers or 0))
+        self.max_tasks = max_tasks or None
+        self.staging_dir = staging_dir or self.DEFAULT_STAGING_DIR
+        self.render_timeout = render_timeout or self.DEFAULT_RENDER_TIMEOUT
+        self._slots = threading.BoundedSemaphore(max(1, self.workers))
+
+    def _checkout(self) -> _RenderProcess:
+        """An idle worker process, or a new one"""
+        with self._lock:
+            generation = self._generation
+            while self._idle:
+                process = self._idle.pop()
+                if process.alive():
+                    return process
+                process.close()
+        return _RenderProcess(generation)
+
+    def _checkin(self, process: _RenderProcess):
+        """Keep a process for the next image, or retire it after max_tasks"""
+        with self._lock:
+            if process.generation == self._generation and not (
+                self.max_tasks and process.tasks >= self.max_tasks
+            ):
+                self._idle.append(process)
+                return
+        process.close()
+
+    def _run(self, source: str, value: Any, context: str) -> Renditions:
+        """
+        Render in a worker process and wait for the result
+
+        Raises:
+            ValueError: If the image isn't valid
+            ImageProcessingError: If no process was free in time, or the
+                process crashed or timed out (it's killed; the next image
+                starts a new one)
+        """
+        slots = self._slots
+        if not slots.acquire(timeout=self.render_timeout):
+            raise ImageProcessingError("Image processing is temporarily unavailable")
+        try:
+            process = None
+            try:
+                process = self._checkout()
+                status, result = process.render((source, value, context), self.render_timeout)
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                logger.error(f"Image render process failed ({type(e).__name__}: {e}); replacing it")
+                if process is not None:
+                    process.close(kill=True)
+                raise ImageProcessingError("Image processing is temporarily unavailable")
+            self._checkin(process)
+        finally:
+            slots.release()
+
+        if status == "invalid":
+            raise ValueError(result)
+        if status != "ok":
+            raise RuntimeError(result)
+        return result
+
+    def shutdown(self):
+        """Stop idle worker processes; busy ones stop once their image is done"""
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+        for process in idle:
+            process.close(kill=True)
+
+    def render(self, data: bytes, context: str) -> Renditions:
+        """
+        Verify an image and produce its renditions, off the request thread
+
+        Args:
+            data: Uploaded file contents
+            context: Upload context (e.g., 'avatar')
+
+        Returns:
+            {rendition name: (encoded bytes, file extension)}
+
+        Raises:
+            ValueError: If the data isn't a valid image
+            ImageProcessingError: If the pool failed or timed out
+        """
+        if not self.workers:
+            return render_image(data, context)
+        return self._run("data", data, context)
+
+    def submit(self, owner_id: int, data: bytes, context: str, **kwargs) -> Dict[str, Any]:
+        """
+        Stage an upload and process it in the background
+
+        Args:
+            owner_id: Uploader; only they can read the job
+            data: Uploaded file contents
+            context: Upload context (e.g., 'avatar')
+            **kwargs: Storage path parameters (e.g., user_id, event_id)
+
+        Returns:
+            The new job record
+        """
+        os.makedirs(self.staging_dir, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        path = os.path.join(self.staging_dir, job_id)
+        with open(path, "wb") as staged:
+            staged.write(data)
+
+        job = {
+            "job_id": job_id,
+            "owner_id": owner_id,
+            "context": context,
+            "status": JobStatus.PENDING,
+            "result": None,
+            "error": None,
+        }
+        self._save_job(job)
+        socketio.start_background_task(self._process, dict(job), path, kwargs)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record, or None if unknown or expired"""
+        if extensions.redis_client:
+            try:
+                raw = extensions.redis_client.get(self.JOB_KEY.format(job_id=job_id))
+                return json.loads(raw) if raw else None
+            except Exception as e:
+                logger.error(f"Error reading upload job {job_id}: {e}")
+        return self._local_jobs.get(job_id)
+
+    def _save_job(self, job: Dict[str, Any]):
+        """Write a job record (to this worker's memory if Redis is unavailable)"""
+        if extensions.redis_client:
+            try:
+                extensions.redis_client.setex(
+                    self.JOB_KEY.format(job_id=job["job_id"]), self.JOB_TTL, json.dumps(job)
+                )
+                return
+            except Exception as e:
+                logger.error(f"Error saving upload job {job['job_id']}: {e}")
+        self._local_jobs.set(job["job_id"], dict(job))
+
+    def _process(self, job: Dict[str, Any], path: str, kwargs: Dict[str, Any]):
+        """Render and store a staged upload, recording the outcome on the job"""
+        from api.services.storage import storage_service
+
+        job["status"] = JobStatus.PROCESSING
+        self._save_job(job)
+        try:
+            if self.workers:
+                renditions = self._run("path", path, job["context"])
+            else:
+                with open(path, "rb") as staged:
+                    renditions = render_image(staged.read(), job["context"])
+            job["result"] = storage_service.store_renditions(
+                renditions, job["context"], **kwargs
+            )
+            job["status"] = JobStatus.DONE
+        except (ValueError, ImageProcessingError) as e:
+            job["status"], job["error"] = JobStatus.FAILED, str(e)
+        except Exception as e:
+            logger.error(f"Error processing upload job {job['job_id']}: {e}")
+            job["status"], job["error"] = JobStatus.FAILED, "Failed to process image"
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._save_job(job)
+
+
+# Create singleton instance
+image_pipeline = ImagePipeline()
+atexit.register(image_pipeline.shutdown)
@@ -19,6 +19,7 @@ from api.models.enums import (
     OrganizationUserRole
 )
 from api.services.dashboard import DashboardService
+from api.services.cache_service import CacheInvalidation
 
 
 class InvitationService:
@@ -183,6 +184,7 @@ class InvitationService:
             invitation.accepted_at = datetime.now(timezone.utc)
         
         # Process event invitations with role adjustments
+        joined_events = []
         for inv_id in event_invitation_ids:
             invitation = EventInvitation.query.get(inv_id)
             if not invitation or invitation.email != email:
@@ -210,6 +212,7 @@ class InvitationService:
             # Add user to event
             if not event.has_user(user):
                 event.add_user(user, role)
+                joined_events.append((event.id, role))
             
             # Update invitation status
             invitation.status = InvitationStatus.ACCEPTED
@@ -218,6 +221,9 @@ class InvitationService:
         
         # Commit all changes
         db.session.commit()
+        CacheInvalidation.user_events_changed(user.id)
+        for event_id, role in joined_events:
+            CacheInvalidation.event_members_changed(event_id, role)
         
         # Generate JWT tokens for auto-login
         access_token = create_access_token(identity=str(user.id))
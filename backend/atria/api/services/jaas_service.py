@@ -9,6 +9,8 @@ Token Generation Strategy:
 - Expiration calculated as: session_duration + 1 hour buffer
 - Similar to Mux: time-limited but long enough for viewing
 - Fallback: 8 hours if session duration unknown
+- Expiry rounded up to a short reuse window; tokens are memoized per
+  (user, room, expiry) and parsed keys per organization, in each worker
 
 Feature Permissions:
 - Moderators: Can record, livestream, upload files
@@ -20,6 +22,13 @@ from typing import Optional, Dict, Any
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 
+from api.commons.signing_keys import (
+    credentials_fingerprint,
+    get_signing_key,
+    get_token,
+    token_expiry,
+)
+
 
 class JaaSService:
     """Service for generating JaaS JWT tokens for Jitsi video conferencing"""
@@ -102,22 +111,17 @@ class JaaSService:
                 "JaaS requires App ID, API Key, and Private Key."
             )
 
-        # Get credentials (decrypt API key and private key)
         app_id = organization.jaas_app_id
-        api_key = organization.get_jaas_api_key()
-        private_key_pem = organization.get_jaas_private_key()
-
-        # Load RSA private key
-        private_key = serialization.load_pem_private_key(
-            private_key_pem.encode(),
-            password=None,
-            backend=default_backend()
+        fingerprint = credentials_fingerprint(
+            organization.jaas_api_key_encrypted,
+            organization.jaas_private_key_encrypted
         )
 
-        # Calculate timestamps
+        # Calculate timestamps; the expiry is rounded up to the reuse window,
+        # so a user reloading the player in the same window gets the same token
         now = int(time.time())
         expiration = token_expiration or JaaSService.DEFAULT_TOKEN_EXPIRATION
-        exp_timestamp = now + expiration
+        exp_timestamp = token_expiry(expiration, now)
         nbf_timestamp = now - JaaSService.NBF_DELAY
 
         # Build user context from our User model
@@ -145,30 +149,42 @@ class JaaSService:
             "features": features_context
         }
 
-        # Build JWT claims
-        payload = {
-            "aud": "jitsi",  # Required, hardcoded
-            "iss": "chat",  # Required, hardcoded
-            "sub": app_id,  # JaaS App ID (vpaas-magic-cookie-xxx)
-            "exp": exp_timestamp,  # Expiration timestamp
-            "nbf": nbf_timestamp,  # Not before timestamp (accounts for clock skew)
-            "room": room_name,  # Lock token to specific room (prevents reuse)
-            "context": context
-        }
+        def sign():
+            api_key, private_key = JaaSService._get_signing_key(organization, fingerprint)
+
+            # Build JWT claims
+            payload = {
+                "aud": "jitsi",  # Required, hardcoded
+                "iss": "chat",  # Required, hardcoded
+                "sub": app_id,  # JaaS App ID (vpaas-magic-cookie-xxx)
+                "exp": exp_timestamp,  # Expiration timestamp
+                "nbf": nbf_timestamp,  # Not before timestamp (accounts for clock skew)
+                "room": room_name,  # Lock token to specific room (prevents reuse)
+                "context": context
+            }
 
-        # Build JWT header
-        headers = {
-            "alg": "RS256",
-            "kid": api_key,  # API Key ID
-            "typ": "JWT"
-        }
+            # Build JWT header
+            headers = {
+                "alg": "RS256",
+                "kid": api_key,  # API Key ID
+                "typ": "JWT"
+            }
+
+            # Sign token with RS256
+            return jwt.encode(
+                payload,
+                private_key,
+                algorithm="RS256",
+                headers=headers
+            )
 
-        # Sign token with RS256
-        token = jwt.encode(
-            payload,
-            private_key,
-            algorithm="RS256",
-            headers=headers
+        # Everything the claims depend on except nbf, which is only a lower bound
+        token = get_token(
+            (
+                "jaas", organization.id, fingerprint, app_id, room_name,
+                tuple(sorted(user_context.items())), is_moderator, exp_timestamp
+            ),
+            sign
         )
 
         return {
@@ -176,6 +192,27 @@ class JaaSService:
             "expires_at": exp_timestamp
         }
 
+    @staticmethod
+    def _get_signing_key(organization, fingerprint: str):
+        """
+        Get the organization's decrypted API key and parsed private key.
+
+        Cached per worker, keyed by the stored ciphertext, so new credentials
+        are picked up immediately.
+
+        Returns:
+            (api_key, private_key)
+        """
+        def load():
+            private_key = serialization.load_pem_private_key(
+                organization.get_jaas_private_key().encode(),
+                password=None,
+                backend=default_backend()
+            )
+            return organization.get_jaas_api_key(), private_key
+
+        return get_signing_key(organization.id, "jaas", fingerprint, load)
+
     @staticmethod
     def calculate_session_token_expiration(session) -> int:
         """
@@ -4,6 +4,8 @@ from flask_jwt_extended import get_jwt_identity
 from api.extensions import db
 from api.models import EventUser, User, Event
 from api.models.enums import EventUserRole
+from api.services.chat_access_cache import ChatAccessCache
+from api.services.cache_service import CacheInvalidation
 
 
 class ModerationService:
@@ -87,6 +89,8 @@ class ModerationService:
             target_event_user.moderation_notes = f"{current_notes}\n{ban_note}".strip()
         
         db.session.commit()
+        ChatAccessCache.invalidate_user(user_id)
+        CacheInvalidation.user_events_changed(user_id)
         return target_event_user
     
     @staticmethod
@@ -153,6 +157,8 @@ class ModerationService:
             target_event_user.moderation_notes = f"{current_notes}\nUnbanned: {unban_data['moderation_notes']}".strip()
         
         db.session.commit()
+        ChatAccessCache.invalidate_user(user_id)
+        CacheInvalidation.user_events_changed(user_id)
         return target_event_user
     
     @staticmethod
@@ -232,6 +238,7 @@ class ModerationService:
             target_event_user.moderation_notes = f"{current_notes}\n{ban_note}".strip()
         
         db.session.commit()
+        ChatAccessCache.invalidate_user(user_id)
         return target_event_user
     
     @staticmethod
@@ -298,6 +305,7 @@ class ModerationService:
             target_event_user.moderation_notes = f"{current_notes}\n{unban_note}".strip()
         
         db.session.commit()
+        ChatAccessCache.invalidate_user(user_id)
         return target_event_user
     
     @staticmethod
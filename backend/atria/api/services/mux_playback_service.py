@@ -6,16 +6,24 @@ Uses organization's encrypted Mux credentials.
 
 Token Generation Strategy:
 - Tokens generated on-demand when user loads player (not pre-generated)
-- Expiration calculated as: session_duration + 1 hour buffer
+- Expiration calculated as: session_duration + 1 hour buffer, rounded up to
+  a short reuse window so viewers starting together share one set of tokens
+- Parsed signing keys are cached per worker (api.commons.signing_keys)
 - Similar to MinIO signed URLs: time-limited but long enough for viewing
 """
+import base64
 import jwt
-import time
-from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 
+from api.commons.signing_keys import (
+    credentials_fingerprint,
+    get_signing_key,
+    get_token,
+    token_expiry,
+)
+
 
 class MuxPlaybackService:
     """Service for generating Mux playback URLs with JWT tokens"""
@@ -160,50 +168,68 @@ class MuxPlaybackService:
                 "storyboard": str (JWT)
             }
         """
-        # Get decrypted private key and key ID
-        private_key_base64 = organization.get_mux_signing_private_key()
         signing_key_id = organization.mux_signing_key_id
 
-        # Decode base64-encoded private key
-        import base64
-        private_key_pem = base64.b64decode(private_key_base64).decode('utf-8')
+        # Expiry rounded up to the reuse window: every viewer of this playback
+        # ID in the same window gets the same tokens
+        exp_timestamp = token_expiry(expiration)
+
+        def sign():
+            private_key = MuxPlaybackService._get_private_key(organization)
+            return {
+                name: MuxPlaybackService._create_jwt(
+                    private_key=private_key,
+                    key_id=signing_key_id,
+                    audience=audience,
+                    expiration=exp_timestamp,
+                    playback_id=playback_id
+                )
+                for name, audience in (
+                    ("playback", MuxPlaybackService.AUDIENCE_VIDEO),
+                    ("thumbnail", MuxPlaybackService.AUDIENCE_THUMBNAIL),
+                    ("storyboard", MuxPlaybackService.AUDIENCE_STORYBOARD),
+                )
+            }
+
+        tokens = get_token(
+            ("mux", organization.id, MuxPlaybackService._fingerprint(organization),
+             playback_id, exp_timestamp),
+            sign
+        )
+
+        # Shared by every request in the window; callers get their own dict
+        return dict(tokens)
 
-        # Load RSA private key
-        private_key = serialization.load_pem_private_key(
-            private_key_pem.encode(),
-            password=None,
-            backend=default_backend()
+    @staticmethod
+    def _fingerprint(organization) -> str:
+        """Fingerprint of the organization's stored Mux signing credentials"""
+        return credentials_fingerprint(
+            organization.mux_signing_key_id,
+            organization.mux_signing_private_key
         )
 
-        # Calculate expiration timestamp
-        exp_timestamp = int(time.time() + expiration)
-
-        # Generate tokens for each type
-        tokens = {
-            "playback": MuxPlaybackService._create_jwt(
-                private_key=private_key,
-                key_id=signing_key_id,
-                audience=MuxPlaybackService.AUDIENCE_VIDEO,
-                expiration=exp_timestamp,
-                playback_id=playback_id
-            ),
-            "thumbnail": MuxPlaybackService._create_jwt(
-                private_key=private_key,
-                key_id=signing_key_id,
-                audience=MuxPlaybackService.AUDIENCE_THUMBNAIL,
-                expiration=exp_timestamp,
-                playback_id=playback_id
-            ),
-            "storyboard": MuxPlaybackService._create_jwt(
-                private_key=private_key,
-                key_id=signing_key_id,
-                audience=MuxPlaybackService.AUDIENCE_STORYBOARD,
-                expiration=exp_timestamp,
-                playback_id=playback_id
+    @staticmethod
+    def _get_private_key(organization):
+        """
+        Get the organization's parsed Mux signing key.
+
+        Decrypting and parsing the key is cached per worker, keyed by the
+        stored ciphertext, so new credentials are picked up immediately.
+        """
+        def load():
+            # Stored as base64-encoded PEM
+            private_key_pem = base64.b64decode(
+                organization.get_mux_signing_private_key()
+            )
+            return serialization.load_pem_private_key(
+                private_key_pem,
+                password=None,
+                backend=default_backend()
             )
-        }
 
-        return tokens
+        return get_signing_key(
+            organization.id, "mux", MuxPlaybackService._fingerprint(organization), load
+        )
 
     @staticmethod
     def _create_jwt(
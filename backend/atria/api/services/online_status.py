@@ -0,0 +1,59 @@
+"""
+Online Status Service - who hears about a user's online/offline changes
+
+A user's audience is their own user room (their other tabs), the user rooms
+of their accepted connections (DM list green dots) and the rooms of events
+they're a non-banned member of (participant lists). Computing it takes two
+queries, so it is cached per user and invalidated by
+CacheInvalidation.online_audience_changed when connections change and by
+CacheInvalidation.user_events_changed when event membership changes;
+connect/disconnect handling never touches the database on a warm cache.
+"""
+
+from typing import List
+
+from api.extensions import db
+from api.models import Connection
+from api.models.enums import ConnectionStatus
+from api.services.cache_service import cache_result
+from api.services.event_user import EventUserService
+
+
+class OnlineStatusService:
+    @staticmethod
+    @cache_result(
+        ttl=3600,
+        key_prefix="online_audience",
+        tags=lambda user_id: [f"user:{user_id}:online_audience"],
+        local_ttl=30,
+    )
+    def get_audience(user_id: int) -> List[str]:
+        """
+        Get the Socket.IO rooms that should receive a user's status changes
+
+        Always pass user_id as an int so callers share the cache entry.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Sorted list of room names (user_{id} and event_{id})
+        """
+        connections = (
+            db.session.query(Connection.requester_id, Connection.recipient_id)
+            .filter(
+                (Connection.requester_id == user_id)
+                | (Connection.recipient_id == user_id),
+                Connection.status == ConnectionStatus.ACCEPTED,
+            )
+            .all()
+        )
+        user_ids = {user_id}
+        for requester_id, recipient_id in connections:
+            user_ids.add(recipient_id if requester_id == user_id else requester_id)
+
+        event_ids = EventUserService.get_user_event_ids(user_id)
+
+        return sorted(f"user_{uid}" for uid in user_ids) + sorted(
+            f"event_{eid}" for eid in event_ids
+        )
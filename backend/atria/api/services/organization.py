@@ -6,6 +6,7 @@ from api.extensions import db
 from api.models import Organization, User, OrganizationUser
 from api.models.enums import OrganizationUserRole
 from api.commons.pagination import paginate
+from api.services.cache_service import CacheInvalidation
 
 
 class OrganizationService:
@@ -65,6 +66,7 @@ class OrganizationService:
             setattr(org, key, value)
 
         db.session.commit()
+        CacheInvalidation.organization_updated(org_id)
         return org
 
     @staticmethod
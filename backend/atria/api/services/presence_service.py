@@ -10,19 +10,35 @@ Architecture:
 - Tracks bidirectional relationships (user->rooms, room->users) for fast cleanup
 - Automatic TTL expiration prevents stale presence data
 - Gracefully degrades if Redis is unavailable
+- Socket handlers track membership per connection (sid) and refcount it per
+  user, so a user with several tabs open only joins/leaves a room (and only
+  triggers count updates) with their first/last connection
 
 Redis Key Structure:
 - presence:room:{room_id}:users → Set of user IDs in this room
 - presence:user:{user_id}:rooms → Set of room IDs this user is in
+- presence:conn:{sid} → Hash of user_id plus room:{id}/session:{id} fields
+  this connection has joined
+- presence:user:{user_id}:refs → Hash of connections, room:{id} and
+  session:{id} → number of the user's connections holding them
 """
 
 import logging
-from typing import Set, Optional
-from api.extensions import presence_redis  # Will be added to extensions
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+from api import extensions
 
 logger = logging.getLogger(__name__)
 
 
+class ReleasedConnection(NamedTuple):
+    """What a disconnect changed at the user level"""
+
+    user_id: Optional[int]
+    rooms: Set[int]  # Rooms the user left (no other connection in them)
+    sessions: Set[int]  # Sessions the user left
+    last_connection: bool  # True if the user has no connections left
+
+
 class PresenceService:
     """
     Service for tracking user presence in chat rooms using Redis.
@@ -37,6 +53,44 @@ class PresenceService:
     # TTL for presence keys (5 minutes - refreshed on heartbeat)
     PRESENCE_TTL = 300
 
+    # TTL for per-connection bookkeeping; it must outlive the socket (same
+    # horizon as SessionManager.cleanup_inactive) or refcounts would drift
+    CONNECTION_TTL = 24 * 60 * 60
+
+    # KEYS: connection hash, user refs hash, member set, user's set
+    # ARGV: field, user_id, target id, presence ttl, connection ttl
+    # Returns {1 if this is the user's first connection holding field, count}
+    _JOIN_SCRIPT = """
+    local joined = 0
+    if redis.call('HSETNX', KEYS[1], ARGV[1], 1) == 1 then
+        if redis.call('HINCRBY', KEYS[2], ARGV[1], 1) == 1 then
+            joined = 1
+        end
+    end
+    redis.call('SADD', KEYS[3], ARGV[2])
+    redis.call('SADD', KEYS[4], ARGV[3])
+    redis.call('EXPIRE', KEYS[3], ARGV[4])
+    redis.call('EXPIRE', KEYS[4], ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    redis.call('EXPIRE', KEYS[2], ARGV[5])
+    return {joined, redis.call('SCARD', KEYS[3])}
+    """
+
+    # Same KEYS/ARGV as _JOIN_SCRIPT (ttls unused)
+    # Returns {1 if this was the user's last connection holding field, count}
+    _LEAVE_SCRIPT = """
+    local left = 0
+    if redis.call('HDEL', KEYS[1], ARGV[1]) == 1 then
+        if redis.call('HINCRBY', KEYS[2], ARGV[1], -1) <= 0 then
+            redis.call('HDEL', KEYS[2], ARGV[1])
+            redis.call('SREM', KEYS[3], ARGV[2])
+            redis.call('SREM', KEYS[4], ARGV[3])
+            left = 1
+        end
+    end
+    return {left, redis.call('SCARD', KEYS[3])}
+    """
+
     @staticmethod
     def _get_room_key(room_id: int) -> str:
         """Generate Redis key for room's user set"""
@@ -47,6 +101,209 @@ class PresenceService:
         """Generate Redis key for user's room set"""
         return f"presence:user:{user_id}:rooms"
 
+    @staticmethod
+    def _get_connection_key(sid: str) -> str:
+        """Generate Redis key for a connection's joined rooms/sessions hash"""
+        return f"presence:conn:{sid}"
+
+    @staticmethod
+    def _get_user_refs_key(user_id: int) -> str:
+        """Generate Redis key for a user's per-connection refcounts"""
+        return f"presence:user:{user_id}:refs"
+
+    @staticmethod
+    def _target_keys(field: str, user_id: int) -> Tuple[str, str, int]:
+        """Map a room:{id}/session:{id} field to (member set, user's set, id)"""
+        kind, target_id = field.split(":", 1)
+        if kind == "room":
+            return (
+                PresenceService._get_room_key(target_id),
+                PresenceService._get_user_key(user_id),
+                int(target_id),
+            )
+        return (
+            PresenceService._get_session_key(target_id),
+            PresenceService._get_user_sessions_key(user_id),
+            int(target_id),
+        )
+
+    @staticmethod
+    def _run_connection_script(
+        client, script: str, sid: str, field: str, user_id: int
+    ):
+        member_key, user_set_key, target_id = PresenceService._target_keys(field, user_id)
+        return client.eval(
+            script,
+            4,
+            PresenceService._get_connection_key(sid),
+            PresenceService._get_user_refs_key(user_id),
+            member_key,
+            user_set_key,
+            field,
+            user_id,
+            target_id,
+            PresenceService.PRESENCE_TTL,
+            PresenceService.CONNECTION_TTL,
+        )
+
+    @staticmethod
+    def _connection_change(
+        script: str, sid: str, field: str, user_id: int
+    ) -> Tuple[bool, Optional[int]]:
+        presence_redis = extensions.presence_redis
+        if not presence_redis:
+            return False, None
+
+        try:
+            changed, count = PresenceService._run_connection_script(
+                presence_redis, script, sid, field, user_id
+            )
+            return bool(changed), count
+
+        except Exception as e:
+            logger.error(f"Error updating presence {field} for connection {sid}: {e}")
+            return False, None
+
+    @staticmethod
+    def join_room_for_connection(
+        sid: str, room_id: int, user_id: int
+    ) -> Tuple[bool, Optional[int]]:
+        """
+        Add one of a user's connections to a room.
+
+        The user only becomes present in the room with their first
+        connection to join it; further tabs just bump a refcount.
+
+        Args:
+            sid: Socket.IO session ID
+            room_id: Chat room ID
+            user_id: User ID joining the room
+
+        Returns:
+            (True if the user was not already in the room, user count),
+            (False, None) if Redis unavailable
+        """
+        return PresenceService._connection_change(
+            PresenceService._JOIN_SCRIPT, sid, f"room:{int(room_id)}", user_id
+        )
+
+    @staticmethod
+    def leave_room_for_connection(
+        sid: str, room_id: int, user_id: int
+    ) -> Tuple[bool, Optional[int]]:
+        """
+        Remove one of a user's connections from a room.
+
+        The user only leaves the room when none of their connections is
+        still in it.
+
+        Args:
+            sid: Socket.IO session ID
+            room_id: Chat room ID
+            user_id: User ID leaving the room
+
+        Returns:
+            (True if the user actually left the room, user count),
+            (False, None) if Redis unavailable
+        """
+        return PresenceService._connection_change(
+            PresenceService._LEAVE_SCRIPT, sid, f"room:{int(room_id)}", user_id
+        )
+
+    @staticmethod
+    def register_connection(sid: str, user_id: int) -> bool:
+        """
+        Count a new socket connection for a user.
+
+        Args:
+            sid: Socket.IO session ID
+            user_id: Authenticated user ID
+
+        Returns:
+            True if this is the user's only connection, False otherwise or
+            if Redis unavailable
+        """
+        presence_redis = extensions.presence_redis
+        if not presence_redis:
+            return False
+
+        try:
+            connection_key = PresenceService._get_connection_key(sid)
+            refs_key = PresenceService._get_user_refs_key(user_id)
+
+            pipeline = presence_redis.pipeline()
+            pipeline.hset(connection_key, "user_id", user_id)
+            pipeline.expire(connection_key, PresenceService.CONNECTION_TTL)
+            pipeline.hincrby(refs_key, "connections", 1)
+            pipeline.expire(refs_key, PresenceService.CONNECTION_TTL)
+            results = pipeline.execute()
+
+            return results[2] == 1
+
+        except Exception as e:
+            logger.error(f"Error registering connection {sid} for user {user_id}: {e}")
+            return False
+
+    @staticmethod
+    def release_connection(sid: str, user_id: Optional[int] = None) -> ReleasedConnection:
+        """
+        Drop a disconnected socket and everything it had joined.
+
+        Every room/session the connection held is released in one pipeline;
+        only those no other connection of the user still holds are left at
+        the user level.
+
+        Args:
+            sid: Socket.IO session ID
+            user_id: User ID, if known (otherwise read from the connection)
+
+        Returns:
+            ReleasedConnection with the rooms/sessions the user left and
+            whether this was their last connection. With Redis unavailable
+            the connection is reported as the user's last.
+        """
+        released = ReleasedConnection(user_id, set(), set(), True)
+        presence_redis = extensions.presence_redis
+        if not presence_redis:
+            return released
+
+        try:
+            connection_key = PresenceService._get_connection_key(sid)
+            fields = presence_redis.hgetall(connection_key)
+            if user_id is None:
+                user_id = int(fields["user_id"]) if "user_id" in fields else None
+            if user_id is None:
+                presence_redis.delete(connection_key)
+                return released
+
+            targets = [field for field in fields if field != "user_id"]
+            refs_key = PresenceService._get_user_refs_key(user_id)
+
+            pipeline = presence_redis.pipeline()
+            for field in targets:
+                PresenceService._run_connection_script(
+                    pipeline, PresenceService._LEAVE_SCRIPT, sid, field, user_id
+                )
+            pipeline.hincrby(refs_key, "connections", -1)
+            pipeline.delete(connection_key)
+            results = pipeline.execute()
+
+            rooms, sessions = set(), set()
+            for field, (left, _) in zip(targets, results):
+                if left:
+                    kind, target_id = field.split(":", 1)
+                    (rooms if kind == "room" else sessions).add(int(target_id))
+
+            last_connection = results[len(targets)] <= 0
+            if last_connection:
+                presence_redis.delete(refs_key)
+
+            return ReleasedConnection(user_id, rooms, sessions, last_connection)
+
+        except Exception as e:
+            logger.error(f"Error releasing connection {sid}: {e}")
+            return ReleasedConnection(user_id, set(), set(), True)
+
     @staticmethod
     def join_room(room_id: int, user_id: int) -> Optional[int]:
         """
@@ -66,6 +323,7 @@ class PresenceService:
         Returns:
             New user count in room, or None if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             logger.debug("Redis not available, skipping presence tracking")
             return None
@@ -110,6 +368,7 @@ class PresenceService:
         Returns:
             New user count in room, or None if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return None
 
@@ -147,6 +406,7 @@ class PresenceService:
         Returns:
             Number of active users in room, or 0 if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return 0
 
@@ -159,6 +419,65 @@ class PresenceService:
             logger.error(f"Error getting room {room_id} count: {e}")
             return 0
 
+    @staticmethod
+    def get_presence_counts(
+        room_ids: Iterable[int] = (), session_ids: Iterable[int] = ()
+    ) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Get user counts for many rooms and viewer counts for many sessions.
+
+        All SCARDs go out in one pipeline, so the cost is a single round
+        trip however many rooms/sessions are asked for.
+
+        Args:
+            room_ids: Chat room IDs
+            session_ids: Session IDs
+
+        Returns:
+            (room_id -> user count, session_id -> viewer count); counts are 0
+            if Redis is unavailable
+        """
+        room_ids = list(room_ids)
+        session_ids = list(session_ids)
+        room_counts = {room_id: 0 for room_id in room_ids}
+        session_counts = {session_id: 0 for session_id in session_ids}
+
+        presence_redis = extensions.presence_redis
+        if not presence_redis or not (room_ids or session_ids):
+            return room_counts, session_counts
+
+        try:
+            pipeline = presence_redis.pipeline(transaction=False)
+            for room_id in room_ids:
+                pipeline.scard(PresenceService._get_room_key(room_id))
+            for session_id in session_ids:
+                pipeline.scard(PresenceService._get_session_key(session_id))
+            results = pipeline.execute()
+
+            for room_id, count in zip(room_ids, results):
+                room_counts[room_id] = count or 0
+            for session_id, count in zip(session_ids, results[len(room_ids):]):
+                session_counts[session_id] = count or 0
+
+        except Exception as e:
+            logger.error(f"Error getting presence counts: {e}")
+
+        return room_counts, session_counts
+
+    @staticmethod
+    def get_room_user_counts(room_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Get user counts for many rooms in one round trip.
+
+        Args:
+            room_ids: Chat room IDs
+
+        Returns:
+            Dict of room_id -> user count (0 if Redis unavailable)
+        """
+        room_counts, _ = PresenceService.get_presence_counts(room_ids=room_ids)
+        return room_counts
+
     @staticmethod
     def get_room_users(room_id: int) -> Set[int]:
         """
@@ -174,6 +493,7 @@ class PresenceService:
         Returns:
             Set of user IDs in room, empty set if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return set()
 
@@ -201,6 +521,7 @@ class PresenceService:
         Returns:
             True if user is in room, False otherwise
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return False
 
@@ -227,6 +548,7 @@ class PresenceService:
         Returns:
             Number of rooms cleaned up, or 0 if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return 0
 
@@ -275,6 +597,7 @@ class PresenceService:
         Returns:
             True if successful, False if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return False
 
@@ -317,6 +640,7 @@ class PresenceService:
         Returns:
             Set of room IDs user is in, empty set if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return set()
 
@@ -373,6 +697,7 @@ class PresenceService:
             # SET current_join_time = NOW
         ```
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return None
 
@@ -426,6 +751,7 @@ class PresenceService:
             tracking.save()
         ```
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return None
 
@@ -485,6 +811,7 @@ class PresenceService:
                 # - Accurate total across multiple visits
         ```
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return False
 
@@ -521,6 +848,7 @@ class PresenceService:
         Returns:
             Number of active viewers, or 0 if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return 0
 
@@ -544,6 +872,7 @@ class PresenceService:
         Returns:
             Set of user IDs viewing session, empty set if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return set()
 
@@ -569,6 +898,7 @@ class PresenceService:
         Returns:
             Set of session IDs user is viewing, empty set if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return set()
 
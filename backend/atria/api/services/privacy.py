@@ -1,5 +1,9 @@
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import func
+from api.extensions import db
 from api.models import User, EventUser, Connection
+from api.services.cache_service import CacheInvalidation
 from api.models.enums import (
     EventUserRole, 
     ConnectionStatus,
@@ -9,6 +13,33 @@ from api.models.enums import (
 )
 
 
+class PrivacyRules(NamedTuple):
+    """A user's effective privacy settings, normalized, with defaults applied"""
+
+    email_visibility: str
+    show_public_email: bool
+    public_email: Optional[str]
+    show_company: bool
+    show_bio: bool
+    show_social_links: str
+    allow_connection_requests: str
+
+
+@lru_cache(maxsize=1024)
+def _compile_rules(settings: Tuple) -> PrivacyRules:
+    """Compile merged settings (as sorted items) into rules; most users share a few"""
+    privacy = dict(settings)
+    return PrivacyRules(
+        email_visibility=(privacy.get('email_visibility') or 'CONNECTIONS_ORGANIZERS').upper(),
+        show_public_email=privacy.get('show_public_email', False),
+        public_email=privacy.get('public_email'),
+        show_company=privacy.get('show_company', True),
+        show_bio=privacy.get('show_bio', True),
+        show_social_links=(privacy.get('show_social_links') or 'EVENT_ATTENDEES').upper(),
+        allow_connection_requests=(privacy.get('allow_connection_requests') or 'EVENT_ATTENDEES').upper(),
+    )
+
+
 class PrivacyService:
     """Service for handling user privacy settings and data filtering"""
     
@@ -54,10 +85,17 @@ class PrivacyService:
                 user_id=user.id
             ).first()
             
-            viewer_event = EventUser.query.filter_by(
-                event_id=event_id, 
-                user_id=viewer.id
-            ).first()
+            # Viewer's membership is usually resolved already by the access check
+            from api.commons.principal import peek_event_principal
+
+            principal = peek_event_principal(event_id, viewer.id)
+            if principal is not None:
+                viewer_event = principal.event_user
+            else:
+                viewer_event = EventUser.query.filter_by(
+                    event_id=event_id, 
+                    user_id=viewer.id
+                ).first()
             
             if viewer_event and not viewer_event.is_banned:
                 # Check if viewer is an organizer/admin of the event
@@ -76,16 +114,175 @@ class PrivacyService:
                         event_user.role == EventUserRole.SPEAKER
                     )
         
-        # Get shared events (for future use)
+        # Get shared events (for future use) - events both are active members of
         if not context['is_self']:
-            viewer_events = {eu.event_id for eu in viewer.event_users if not eu.is_banned}
-            user_events = {eu.event_id for eu in user.event_users if not eu.is_banned}
-            context['shared_events'] = list(viewer_events & user_events)
+            shared = (
+                db.session.query(EventUser.event_id)
+                .filter(
+                    EventUser.user_id.in_([viewer.id, user.id]),
+                    EventUser.is_banned.is_(False),
+                )
+                .group_by(EventUser.event_id)
+                .having(func.count(EventUser.user_id) == 2)
+                .all()
+            )
+            context['shared_events'] = [event_id for event_id, in shared]
         
         return context
     
     @staticmethod
-    def _determine_email_visibility(user: User, context: Dict[str, Any], privacy: Dict, email_visibility: str, event_id: Optional[int] = None) -> Dict[str, Any]:
+    def get_connection_map(viewer_id: int, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the viewer's connection with each of many users in a single query
+
+        Returns:
+            Dict of user_id -> connection_status, connection_id and
+            connection_direction ('sent'/'received'), all None if unconnected
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+
+        connections = Connection.query.filter(
+            (
+                (Connection.requester_id == viewer_id) &
+                (Connection.recipient_id.in_(user_ids))
+            ) | (
+                (Connection.requester_id.in_(user_ids)) &
+                (Connection.recipient_id == viewer_id)
+            )
+        ).all()
+
+        connection_map = {
+            user_id: {
+                'connection_status': None,
+                'connection_id': None,
+                'connection_direction': None
+            }
+            for user_id in user_ids
+        }
+        for conn in connections:
+            # Determine which user is the "other" user from the viewer's perspective
+            if conn.requester_id == viewer_id:
+                other_user_id, direction = conn.recipient_id, 'sent'
+            else:
+                other_user_id, direction = conn.requester_id, 'received'
+
+            connection_map[other_user_id] = {
+                'connection_status': conn.status.value,
+                'connection_id': conn.id,
+                'connection_direction': direction
+            }
+
+        return connection_map
+
+    @staticmethod
+    def build_batch_contexts(
+        viewer: Optional[User],
+        pairs: Iterable[Tuple[User, Optional[EventUser]]],
+        event_id: Optional[int] = None,
+        viewer_event_user=None,
+        connection_map: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Build viewer contexts for many users at once (get_viewer_context in bulk).
+
+        Costs at most two queries (viewer membership and connections) however
+        many users there are; none if both are passed in. shared_events is
+        left empty.
+
+        Args:
+            viewer: The user viewing the data (None for unauthenticated)
+            pairs: (user, event_user) tuples; event_user may be None
+            event_id: Optional event context
+            viewer_event_user: Optional pre-loaded EventUser of the viewer
+            connection_map: Optional result of get_connection_map()
+
+        Returns:
+            Dict of user_id -> context, including the connection_status,
+            connection_id and connection_direction of each user
+        """
+        pairs = list(pairs)
+        contexts = {}
+
+        if viewer is None:
+            for user, _ in pairs:
+                contexts[user.id] = {
+                    'is_self': False,
+                    'is_connected': False,
+                    'is_organizer': False,
+                    'is_co_speaker': False,
+                    'is_event_attendee': False,
+                    'shared_events': []
+                }
+            return contexts
+
+        if connection_map is None:
+            connection_map = PrivacyService.get_connection_map(
+                viewer.id, [user.id for user, _ in pairs if user.id != viewer.id]
+            )
+
+        if event_id and viewer_event_user is None:
+            viewer_event_user = next(
+                (eu for user, eu in pairs if user.id == viewer.id and eu is not None),
+                None
+            )
+            if viewer_event_user is None:
+                from api.commons.principal import peek_event_principal
+
+                principal = peek_event_principal(event_id, viewer.id)
+                if principal is not None:
+                    viewer_event_user = principal.event_user
+                else:
+                    viewer_event_user = EventUser.query.filter_by(
+                        event_id=event_id,
+                        user_id=viewer.id
+                    ).first()
+
+        # Same rules as get_viewer_context, resolved once for the viewer
+        active_viewer_event = (
+            viewer_event_user if event_id and viewer_event_user and not viewer_event_user.is_banned
+            else None
+        )
+        is_organizer = active_viewer_event is not None and active_viewer_event.role in [
+            EventUserRole.ADMIN,
+            EventUserRole.ORGANIZER
+        ]
+        viewer_is_speaker = (
+            active_viewer_event is not None and active_viewer_event.role == EventUserRole.SPEAKER
+        )
+
+        for user, event_user in pairs:
+            connection = connection_map.get(user.id, {})
+            contexts[user.id] = {
+                'is_self': viewer.id == user.id,
+                'is_connected': connection.get('connection_status') == ConnectionStatus.ACCEPTED.value,
+                'is_organizer': is_organizer,
+                'is_co_speaker': (
+                    viewer_is_speaker and event_user is not None and
+                    event_user.role == EventUserRole.SPEAKER
+                ),
+                'is_event_attendee': active_viewer_event is not None,
+                'shared_events': [],
+                'connection_status': connection.get('connection_status'),
+                'connection_id': connection.get('connection_id'),
+                'connection_direction': connection.get('connection_direction')
+            }
+
+        return contexts
+
+    @staticmethod
+    def get_rules(privacy: Dict[str, Any]) -> PrivacyRules:
+        """Compile merged privacy settings into rules (cached per distinct settings)"""
+        settings = tuple(sorted(privacy.items()))
+        try:
+            return _compile_rules(settings)
+        except TypeError:
+            # Unhashable values; compile without the cache
+            return _compile_rules.__wrapped__(settings)
+
+    @staticmethod
+    def _determine_email_visibility(context: Dict[str, Any], rules: PrivacyRules, event_id: Optional[int] = None) -> Dict[str, Any]:
         """
         Determine email visibility based on context and privacy settings.
         
@@ -99,8 +296,9 @@ class PrivacyService:
         }
         
         # Check public email settings
-        show_public_email = privacy.get('show_public_email', False)
-        public_email = privacy.get('public_email')
+        show_public_email = rules.show_public_email
+        public_email = rules.public_email
+        email_visibility = rules.email_visibility
         
         # Determine visibility
         if context['is_self']:
@@ -153,6 +351,54 @@ class PrivacyService:
         Returns:
             Filtered user data dictionary with appropriate fields
         """
+        if not event_id:
+            event_user = None
+        elif event_user is None:
+            # Resolved once: both the overrides and event_role need it
+            event_user = EventUser.query.filter_by(
+                event_id=event_id,
+                user_id=user.id
+            ).first()
+
+        return PrivacyService._apply_rules(user, event_user, context, event_id)
+
+    @staticmethod
+    def filter_users_batch(
+        viewer: Optional[User],
+        pairs: Iterable[Tuple[User, Optional[EventUser]]],
+        event_id: Optional[int] = None,
+        contexts: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply privacy rules to many users for one viewer (filter_user_data in bulk).
+
+        No per-user queries: event overrides and roles come from the given
+        EventUsers, and contexts are built with build_batch_contexts() if not
+        passed in.
+
+        Args:
+            viewer: The user viewing the data (None for unauthenticated)
+            pairs: (user, event_user) tuples; event_user may be None
+            event_id: Optional event ID for event-specific privacy overrides
+            contexts: Optional user_id -> context from build_batch_contexts()
+
+        Returns:
+            Filtered user data dictionaries, in the order of pairs
+        """
+        pairs = list(pairs)
+        if contexts is None:
+            contexts = PrivacyService.build_batch_contexts(viewer, pairs, event_id)
+
+        return [
+            PrivacyService._apply_rules(
+                user, event_user if event_id else None, contexts[user.id], event_id
+            )
+            for user, event_user in pairs
+        ]
+
+    @staticmethod
+    def _apply_rules(user: User, event_user, context: Dict[str, Any], event_id: Optional[int]) -> Dict[str, Any]:
+        """Filter one user's data; event_user is the user's resolved membership (or None)"""
         # Start with basic always-visible fields
         filtered = {
             'id': user.id,
@@ -162,31 +408,16 @@ class PrivacyService:
             'image_url': user.image_url
         }
         
-        # Get privacy settings with defaults
+        # Get privacy settings, merged with event-specific overrides
         privacy = user.privacy_settings or {}
+        if event_user and event_user.privacy_overrides:
+            privacy = {**privacy, **event_user.privacy_overrides}
         
-        # Check for event-specific overrides
-        if event_id:
-            # Use pre-loaded event_user if provided, otherwise query
-            if not event_user:
-                event_user = EventUser.query.filter_by(
-                    event_id=event_id,
-                    user_id=user.id
-                ).first()
-            
-            if event_user and event_user.privacy_overrides:
-                # Merge event overrides with global settings
-                privacy = {**privacy, **event_user.privacy_overrides}
-        
-        # Extract privacy settings with defaults (normalize to UPPERCASE for consistency)
-        email_visibility = (privacy.get('email_visibility') or 'CONNECTIONS_ORGANIZERS').upper()
-        show_company = privacy.get('show_company', True)
-        show_bio = privacy.get('show_bio', True)
-        show_social_links = (privacy.get('show_social_links') or 'EVENT_ATTENDEES').upper()
-        allow_connection_requests = (privacy.get('allow_connection_requests') or 'EVENT_ATTENDEES').upper()
+        # Normalized settings with defaults (UPPERCASE enums)
+        rules = PrivacyService.get_rules(privacy)
         
         # Apply email visibility rules
-        email_data = PrivacyService._determine_email_visibility(user, context, privacy, email_visibility, event_id)
+        email_data = PrivacyService._determine_email_visibility(context, rules, event_id)
         
         # Set email field (explicit None if hidden)
         if email_data['show_real_email']:
@@ -197,7 +428,7 @@ class PrivacyService:
             filtered['email'] = None
         
         # Apply company/title visibility
-        if show_company or context['is_self'] or context['is_organizer']:
+        if rules.show_company or context['is_self'] or context['is_organizer']:
             filtered['company_name'] = user.company_name
             filtered['title'] = user.title
         else:
@@ -205,13 +436,14 @@ class PrivacyService:
             filtered['title'] = None
         
         # Apply bio visibility
-        if show_bio or context['is_self'] or context['is_organizer']:
+        if rules.show_bio or context['is_self'] or context['is_organizer']:
             filtered['bio'] = user.bio
         else:
             filtered['bio'] = None
         
         # Apply social links visibility
         # Social links respect user's privacy even for organizers (unlike email)
+        show_social_links = rules.show_social_links
         if context['is_self']:
             # Always show to self
             filtered['social_links'] = user.social_links or {}
@@ -249,6 +481,7 @@ class PrivacyService:
         
         # Add connection request permission for others
         if not context['is_self']:
+            allow_connection_requests = rules.allow_connection_requests
             filtered['allow_connection_requests'] = allow_connection_requests
             
             # Check if viewer can actually send a connection request
@@ -270,19 +503,13 @@ class PrivacyService:
         filtered['is_connected'] = context['is_connected']
         
         # If in event context, add event-specific user info
-        if event_id:
-            event_user = EventUser.query.filter_by(
-                event_id=event_id,
-                user_id=user.id
-            ).first()
+        if event_id and event_user:
+            filtered['event_role'] = event_user.role.value if event_user.role else None
             
-            if event_user:
-                filtered['event_role'] = event_user.role.value if event_user.role else None
-                
-                # Add speaker-specific fields if applicable
-                if event_user.role == EventUserRole.SPEAKER:
-                    filtered['speaker_bio'] = event_user.speaker_bio
-                    filtered['speaker_title'] = event_user.speaker_title
+            # Add speaker-specific fields if applicable
+            if event_user.role == EventUserRole.SPEAKER:
+                filtered['speaker_bio'] = event_user.speaker_bio
+                filtered['speaker_title'] = event_user.speaker_title
         
         return filtered
     
@@ -494,6 +721,7 @@ class PrivacyService:
         # CRITICAL: Must assign a NEW dict for SQLAlchemy to detect the change
         user.privacy_settings = new_settings
         db.session.commit()
+        CacheInvalidation.speaker_profile_changed(user_id)
         print(f"DEBUG Service: Committed to DB")
         
         return PrivacyService.get_user_privacy_settings(user_id)
@@ -549,6 +777,7 @@ class PrivacyService:
         # Set or update overrides (None to delete)
         event_user.privacy_overrides = overrides
         db.session.commit()
+        CacheInvalidation.event_schedule_changed(event_id)
         
         return {
             'event_id': event_id,
@@ -585,6 +814,7 @@ class PrivacyService:
         # Set or update overrides
         event_user.privacy_overrides = overrides if overrides else None
         db.session.commit()
+        CacheInvalidation.event_schedule_changed(event_id)
         
         return {
             'event_id': event_id,
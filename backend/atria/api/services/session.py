@@ -1,26 +1,165 @@
 # api/services/session.py
-from datetime import time
+from datetime import datetime, time, timezone
 from typing import Dict, Optional, Any
 
 from api.extensions import db
-from api.models import Session, Event, User, SessionSpeaker
-from api.models.enums import SessionStatus, SessionSpeakerRole
+from api.models import Session, Event, EventUser, User, SessionSpeaker
+from api.models.enums import (
+    ConnectionStatus,
+    EventUserRole,
+    SessionStatus,
+    SessionSpeakerRole,
+)
 from api.commons.pagination import paginate
+from api.services.cache_service import CacheInvalidation, CacheKeys, CacheService
+
+# Speaker fields SessionSpeakerSchema takes from privacy filtering
+SPEAKER_PRIVACY_FIELDS = ("title", "company_name", "social_links")
 
 
 class SessionService:
+    # Serialized schedule cache (versioned, see get_event_schedule)
+    SCHEDULE_TTL = 600
+    SCHEDULE_STALE_TTL = 60
+
     @staticmethod
     def get_event_sessions(
         event_id: int, day_number: Optional[int] = None, schema=None
     ):
-        """Get sessions for an event with optional day filter and privacy-filtered speaker data"""
-        # Verify event exists
-        event = Event.query.get_or_404(event_id)
+        """
+        Get sessions for an event with optional day filter and privacy-filtered speaker data
+
+        With a schema, the serialized schedule comes from get_event_schedule
+        (cached per schedule version and audience); only the viewer's own
+        speaker entry, connection-only social links and the time-relative
+        flags are applied per request. Without one, returns the filtered
+        Session objects.
+        """
+        if schema is None:
+            # Verify event exists
+            Event.query.get_or_404(event_id)
+            sessions = SessionService._schedule_query(event_id, day_number).all()
+            for session in sessions:
+                SessionService._apply_speaker_privacy_filtering(session)
+            return sessions
+
+        from flask import url_for, request
+        from flask_smorest import abort
+        from api.commons.pagination import extract_pagination
+        from api.commons.principal import get_event_principal
+        from api.services.privacy import PrivacyService
+
+        principal = get_event_principal(event_id)
+        audience = SessionService._schedule_audience(principal.event_user)
+        schedule = SessionService.get_event_schedule(
+            event_id, day_number, audience, schema
+        )
+
+        page, per_page, other_request_args = extract_pagination(**request.args)
+        if page < 1 or per_page < 1:
+            abort(404)
+        total = len(schedule["sessions"])
+        total_pages = (total + per_page - 1) // per_page
+        start = (page - 1) * per_page
+        if start >= total and page != 1:
+            abort(404)
+        # Entries are decoded fresh from Redis, so they can be modified
+        sessions = schedule["sessions"][start : start + per_page]
+
+        # Viewer-specific speaker fields: their own entry, and social links
+        # shown to connections only
+        viewer_id = principal.user.id
+        overlays = {}
+        connected = [
+            int(user_id) for user_id in schedule["connected"] if int(user_id) != viewer_id
+        ]
+        if connected:
+            for user_id, connection in PrivacyService.get_connection_map(
+                viewer_id, connected
+            ).items():
+                if connection["connection_status"] == ConnectionStatus.ACCEPTED.value:
+                    overlays[user_id] = schedule["connected"][str(user_id)]
+        if str(viewer_id) in schedule["self"]:
+            overlays[viewer_id] = schedule["self"][str(viewer_id)]
+
+        now = datetime.now(timezone.utc)
+        for session in sessions:
+            # Same rules as Session.is_upcoming / is_in_progress
+            starts_at, ends_at = (
+                datetime.fromisoformat(value) for value in schedule["times"][str(session["id"])]
+            )
+            session["is_upcoming"] = (
+                session["status"] == SessionStatus.SCHEDULED.value and starts_at > now
+            )
+            session["is_in_progress"] = (
+                session["status"] == SessionStatus.LIVE.value and starts_at <= now <= ends_at
+            )
+            for speaker in session.get("session_speakers") or ():
+                if speaker["user_id"] in overlays:
+                    speaker.update(overlays[speaker["user_id"]])
+
+        endpoint = request.endpoint
+        view_args = request.view_args or {}
+
+        def link(page_number):
+            return url_for(endpoint, page=page_number, per_page=per_page, **other_request_args, **view_args)
+
+        links = {"self": link(page), "first": link(1), "last": link(total_pages)}
+        if page < total_pages:
+            links["next"] = link(page + 1)
+        if page > 1:
+            links["prev"] = link(page - 1)
+
+        return {
+            "total_items": total,
+            "total_pages": total_pages,
+            "current_page": page,
+            "per_page": per_page,
+            **links,
+            "sessions": sessions,
+        }
+
+    @staticmethod
+    def get_event_schedule(event_id: int, day_number: Optional[int], audience: str, schema):
+        """
+        Get an event's serialized schedule as seen by an audience
+
+        Cached under the event's schedule version, which
+        CacheInvalidation.event_schedule_changed bumps on every session or
+        speaker change, so an entry is never invalidated - it just stops
+        being read.
+
+        Args:
+            event_id: Event ID
+            day_number: Optional day filter
+            audience: "organizer", "attendee" or "guest" (see _schedule_audience)
+            schema: Schema (many=True) to serialize sessions with
+
+        Returns:
+            Dict with:
+            - sessions: serialized sessions, speaker privacy applied for a
+              viewer of the audience who is neither the speaker nor connected
+            - self / connected: speaker user_id -> fields that differ for the
+              speaker themselves / for their accepted connections
+            - times: session_id -> [start, end] ISO datetimes
+        """
+        version = CacheService.get_version(CacheKeys.event_sessions_version(event_id))
+        key = (
+            f"{CacheKeys.event_sessions(event_id)}:v{version}:"
+            f"{type(schema).__name__}:{audience}:day:{day_number or 'all'}"
+        )
+        return CacheService.get_or_compute(
+            key,
+            lambda: SessionService._build_schedule(event_id, day_number, audience, schema),
+            ttl=SessionService.SCHEDULE_TTL,
+            stale_ttl=SessionService.SCHEDULE_STALE_TTL,
+        )
 
-        # Build query with optimized eager loading
+    @staticmethod
+    def _schedule_query(event_id: int, day_number: Optional[int] = None):
         # Load session_speakers with their user relationships in one query
         query = Session.query.options(
-            db.joinedload(Session.session_speakers).joinedload(SessionSpeaker.user),
+            db.selectinload(Session.session_speakers).joinedload(SessionSpeaker.user),
         ).filter_by(event_id=event_id)
 
         # Apply day filter if provided
@@ -28,51 +167,84 @@ class SessionService:
             query = query.filter_by(day_number=day_number)
 
         # Order by day and start time
-        query = query.order_by(Session.day_number, Session.start_time)
+        return query.order_by(Session.day_number, Session.start_time, Session.id)
 
-        if schema:
-            # Use the standard paginate which will fetch and serialize
-            # But we need to hook into it to apply privacy filtering
-            from api.commons.pagination import extract_pagination
-            from flask import url_for, request
-            
-            page, per_page, other_request_args = extract_pagination(**request.args)
-            page_obj = query.paginate(page=page, per_page=per_page)
-            
-            # Apply privacy filtering to the fetched items BEFORE serialization
-            for session in page_obj.items:
-                SessionService._apply_speaker_privacy_filtering(session)
-            
-            # Generate pagination response
-            endpoint = request.endpoint
-            view_args = request.view_args or {}
-            
-            links = {
-                "self": url_for(endpoint, page=page_obj.page, per_page=per_page, **other_request_args, **view_args),
-                "first": url_for(endpoint, page=1, per_page=per_page, **other_request_args, **view_args),
-                "last": url_for(endpoint, page=page_obj.pages, per_page=per_page, **other_request_args, **view_args),
+    @staticmethod
+    def _schedule_audience(event_user) -> str:
+        """Which cached schedule a viewer gets, from their event membership"""
+        if event_user is None or event_user.is_banned:
+            # e.g. organization owners who aren't members
+            return "guest"
+        if event_user.role in (EventUserRole.ADMIN, EventUserRole.ORGANIZER):
+            return "organizer"
+        return "attendee"
+
+    @staticmethod
+    def _build_schedule(event_id: int, day_number: Optional[int], audience: str, schema):
+        from api.services.privacy import PrivacyService
+
+        sessions = SessionService._schedule_query(event_id, day_number).all()
+        speakers = {
+            speaker.user.id: speaker.user
+            for session in sessions
+            for speaker in session.session_speakers
+            if speaker.user
+        }
+        event_users = {
+            event_user.user_id: event_user
+            for event_user in EventUser.query.filter(
+                EventUser.event_id == event_id, EventUser.user_id.in_(list(speakers))
+            )
+        } if speakers else {}
+        pairs = [(user, event_users.get(user.id)) for user in speakers.values()]
+
+        def views(**context):
+            contexts = {
+                user.id: {
+                    "is_self": False,
+                    "is_connected": False,
+                    "is_organizer": audience == "organizer",
+                    "is_co_speaker": False,
+                    "is_event_attendee": audience != "guest",
+                    "shared_events": [],
+                    **context,
+                }
+                for user in speakers.values()
             }
-            
-            if page_obj.has_next:
-                links["next"] = url_for(endpoint, page=page_obj.next_num, per_page=per_page, **other_request_args, **view_args)
-            
-            if page_obj.has_prev:
-                links["prev"] = url_for(endpoint, page=page_obj.prev_num, per_page=per_page, **other_request_args, **view_args)
-            
+            filtered = PrivacyService.filter_users_batch(None, pairs, event_id, contexts)
             return {
-                "total_items": page_obj.total,
-                "total_pages": page_obj.pages,
-                "current_page": page_obj.page,
-                "per_page": per_page,
-                **links,
-                "sessions": schema.dump(page_obj.items),  # Now serialized with filtered data
+                data["id"]: {field: data.get(field) for field in SPEAKER_PRIVACY_FIELDS}
+                for data in filtered
             }
-        
-        # For non-paginated results, get all and filter
-        sessions = query.all()
+
+        base = views()
         for session in sessions:
-            SessionService._apply_speaker_privacy_filtering(session)
-        return sessions
+            for speaker in session.session_speakers:
+                if speaker.user:
+                    speaker._filtered_title = base[speaker.user.id]["title"]
+                    speaker._filtered_company_name = base[speaker.user.id]["company_name"]
+                    speaker._filtered_social_links = base[speaker.user.id]["social_links"]
+                    speaker._privacy_filtered = True
+
+        def differences(view):
+            return {
+                str(user_id): fields
+                for user_id, fields in view.items()
+                if fields != base[user_id]
+            }
+
+        return {
+            "sessions": schema.dump(sessions),
+            "self": differences(views(is_self=True)),
+            "connected": differences(views(is_connected=True)),
+            "times": {
+                str(session.id): [
+                    session.start_datetime.isoformat(),
+                    session.end_datetime.isoformat(),
+                ]
+                for session in sessions
+            },
+        }
 
     @staticmethod
     def get_session(session_id: int):
@@ -131,6 +303,9 @@ class SessionService:
         db.session.add_all(chat_rooms)
         db.session.commit()
 
+        CacheInvalidation.chat_rooms_changed(event_id)
+        CacheInvalidation.session_updated(session.id, event_id)
+
         return session
 
     @staticmethod
@@ -155,15 +330,21 @@ class SessionService:
                 setattr(session, key, value)
 
         db.session.commit()
+        CacheInvalidation.session_updated(session.id, session.event_id)
         return session
 
     @staticmethod
     def delete_session(session_id: int):
         """Delete a session"""
         session = Session.query.get_or_404(session_id)
+        event_id = session.event_id
 
         db.session.delete(session)
         db.session.commit()
+
+        # Session chat rooms are deleted with the session
+        CacheInvalidation.chat_rooms_changed(event_id)
+        CacheInvalidation.session_updated(session_id, event_id)
         return True
 
     @staticmethod
@@ -173,6 +354,7 @@ class SessionService:
 
         session.update_status(new_status)
         db.session.commit()
+        CacheInvalidation.session_updated(session.id, session.event_id)
         return session
 
     @staticmethod
@@ -185,6 +367,7 @@ class SessionService:
         try:
             session.update_times(start_time, end_time)
             db.session.commit()
+            CacheInvalidation.session_updated(session.id, session.event_id)
             return session
         except ValueError as e:
             raise ValueError(str(e))
@@ -203,6 +386,7 @@ class SessionService:
         try:
             speaker = session.add_speaker(user, role, order)
             db.session.commit()
+            CacheInvalidation.session_updated(session.id, session.event_id)
             return speaker
         except ValueError as e:
             db.session.rollback()
@@ -216,6 +400,7 @@ class SessionService:
 
         session.remove_speaker(user)
         db.session.commit()
+        CacheInvalidation.session_updated(session.id, session.event_id)
         return True
 
     @staticmethod
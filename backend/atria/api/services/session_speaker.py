@@ -5,6 +5,7 @@ from api.extensions import db
 from api.models import Session, User, SessionSpeaker
 from api.models.enums import SessionSpeakerRole
 from api.commons.pagination import paginate
+from api.services.cache_service import CacheInvalidation
 
 
 class SessionSpeakerService:
@@ -99,6 +100,7 @@ class SessionSpeakerService:
         # Add speaker
         session.add_speaker(user, role=role, order=order)
         db.session.commit()
+        CacheInvalidation.session_updated(session.id, session.event_id)
 
         # Return the created speaker record
         return SessionSpeaker.query.filter_by(
@@ -120,6 +122,7 @@ class SessionSpeakerService:
             speaker.order = update_data["order"]
 
         db.session.commit()
+        CacheInvalidation.session_updated(session_id, speaker.session.event_id)
         return speaker
 
     @staticmethod
@@ -129,8 +132,11 @@ class SessionSpeakerService:
             session_id=session_id, user_id=user_id
         ).first_or_404()
 
+        event_id = speaker.session.event_id
+
         db.session.delete(speaker)
         db.session.commit()
+        CacheInvalidation.session_updated(session_id, event_id)
         return True
 
     @staticmethod
@@ -143,6 +149,7 @@ class SessionSpeakerService:
         try:
             speakers = speaker.update_order(new_order)
             db.session.commit()
+            CacheInvalidation.session_updated(session_id, speaker.session.event_id)
             return speakers
         except ValueError as e:
             raise ValueError(str(e))
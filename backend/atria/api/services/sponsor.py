@@ -4,6 +4,7 @@ from flask_smorest import abort
 from api.extensions import db
 from api.models import Sponsor, Event
 from api.commons.pagination import paginate
+from api.services.cache_service import CacheInvalidation
 
 
 class SponsorService:
@@ -62,6 +63,7 @@ class SponsorService:
         
         db.session.add(sponsor)
         db.session.commit()
+        CacheInvalidation.event_detail_changed(event_id)  # sponsors_count
         
         return sponsor
 
@@ -88,6 +90,7 @@ class SponsorService:
                 setattr(sponsor, key, value)
         
         db.session.commit()
+        CacheInvalidation.event_detail_changed(sponsor.event_id)
         
         return sponsor
 
@@ -95,9 +98,11 @@ class SponsorService:
     def delete_sponsor(sponsor_id: int):
         """Delete a sponsor"""
         sponsor = Sponsor.query.get_or_404(sponsor_id)
+        event_id = sponsor.event_id
         
         db.session.delete(sponsor)
         db.session.commit()
+        CacheInvalidation.event_detail_changed(event_id)
 
 
     @staticmethod
@@ -107,6 +112,7 @@ class SponsorService:
         sponsor.is_active = not sponsor.is_active
         
         db.session.commit()
+        CacheInvalidation.event_detail_changed(sponsor.event_id)
         db.session.refresh(sponsor)  # Refresh to ensure relationships are loaded
         
         return sponsor
@@ -148,5 +154,6 @@ class SponsorService:
         event.sponsor_tiers = tiers
         
         db.session.commit()
+        CacheInvalidation.event_updated(event.id, event.organization_id)
         
         return event.sponsor_tiers
\ No newline at end of file
@@ -1,15 +1,17 @@
 import os
 import uuid
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
 from datetime import timedelta
 from io import BytesIO
 from enum import Enum
 
 from minio import Minio
 from minio.error import S3Error
-from PIL import Image, ImageOps
+from PIL import Image
 from werkzeug.datastructures import FileStorage
 
+from api.commons import images
+from api.services.image_pipeline import image_pipeline
 
 
 class StorageBucket(Enum):
@@ -27,12 +29,7 @@ class StorageService:
     MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
     
     # Max dimensions by context
-    MAX_DIMENSIONS = {
-        'avatar': 600,
-        'sponsor_logo': 800,
-        'event_logo': 800,
-        'event_banner': 1600,
-    }
+    MAX_DIMENSIONS = images.MAX_DIMENSIONS
     
     # Storage paths by context
     # Note: Bucket names are read from StorageBucket enum which uses environment variables
@@ -114,67 +111,15 @@ class StorageService:
         if size > self.MAX_IMAGE_SIZE:
             return False, f"File too large. Maximum size: {self.MAX_IMAGE_SIZE // (1024 * 1024)}MB"
         
-        # Verify it's a valid image
+        # Check it looks like an image (header only; fully verified when processed)
         try:
-            img = Image.open(file)
-            img.verify()
-            file.seek(0)  # Reset after verify
+            Image.open(file)
+            file.seek(0)  # Reset after reading the header
         except Exception:
             return False, "Invalid image file"
         
         return True, None
     
-    def _optimize_image(self, image: Image.Image, context: str) -> Tuple[BytesIO, str]:
-        """Optimize image for web delivery."""
-        # Fix orientation based on EXIF data
-        image = ImageOps.exif_transpose(image)
-        
-        # Get max dimensions for context
-        max_dimension = self.MAX_DIMENSIONS.get(context, 1200)
-        
-        # Resize if needed (maintaining aspect ratio)
-        if image.width > max_dimension or image.height > max_dimension:
-            image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
-        
-        # Determine if image has transparency
-        has_transparency = image.mode in ('RGBA', 'LA') or (
-            image.mode == 'P' and 'transparency' in image.info
-        )
-        
-        output = BytesIO()
-        
-        # Try WebP first (best compression)
-        try:
-            if has_transparency and context in ['sponsor_logo', 'avatar']:
-                # Use lossless WebP for logos/avatars with transparency
-                image.save(output, format='WEBP', lossless=True, quality=100)
-            else:
-                # Use lossy WebP for everything else
-                if image.mode == 'RGBA' and context not in ['sponsor_logo', 'avatar']:
-                    # Convert RGBA to RGB for non-logo/avatar images
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[3])
-                    image = background
-                image.save(output, format='WEBP', quality=85, method=6)
-            format_ext = 'webp'
-        except Exception:
-            # Fallback to PNG for transparency or JPEG for non-transparent
-            output = BytesIO()  # Reset buffer
-            if has_transparency:
-                image.save(output, format='PNG', optimize=True)
-                format_ext = 'png'
-            else:
-                if image.mode == 'RGBA':
-                    # Convert RGBA to RGB for JPEG
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[3])
-                    image = background
-                image.save(output, format='JPEG', quality=85, optimize=True, progressive=True)
-                format_ext = 'jpg'
-        
-        output.seek(0)
-        return output, format_ext
-    
     def _get_storage_config(self, context: str, **kwargs) -> Tuple[str, str]:
         """Get bucket and path for a given storage context."""
         if context not in self.STORAGE_PATHS:
@@ -194,79 +139,120 @@ class StorageService:
         """
         Upload an image file to MinIO.
         
+        The image is processed off the request thread (see image_pipeline)
+        into full, medium and thumbnail renditions.
+        
         Args:
             file: The file to upload
             context: Storage context (e.g., 'avatar', 'event_logo')
             **kwargs: Context-specific parameters (e.g., user_id, event_id)
             
         Returns:
-            Dictionary with object_key and url
+            Dictionary with object_key, url and the renditions' object keys
         """
         # Validate the image first
         is_valid, error = self._validate_image(file)
         if not is_valid:
             raise ValueError(error)
         
-        # Get bucket and path
-        bucket, path = self._get_storage_config(context, **kwargs)
+        # Check the storage path before doing any work
+        self._get_storage_config(context, **kwargs)
         
-        # Open image and optimize it (this works even without MinIO)
-        image = Image.open(file)
-        optimized_buffer, format_ext = self._optimize_image(image, context)
+        renditions = image_pipeline.render(file.read(), context)
+        return self.store_renditions(renditions, context, **kwargs)
+    
+    def read_upload(self, file: FileStorage, context: str, **kwargs) -> bytes:
+        """
+        Validate an upload and return its contents, for background processing.
         
-        # Generate unique filename with optimized extension
-        filename = f"{uuid.uuid4()}.{format_ext}"
-        object_name = f"{path}/{filename}"
+        Only cheap checks run here (type, size, image header); the image is
+        fully decoded and verified when it's processed.
+        
+        Raises:
+            ValueError: If the upload is invalid
+        """
+        is_valid, error = self._validate_image(file)
+        if not is_valid:
+            raise ValueError(error)
         
+        self._get_storage_config(context, **kwargs)
+        return file.read()
+    
+    @staticmethod
+    def rendition_keys(object_key: str) -> List[str]:
+        """Object keys of the smaller renditions stored alongside an image"""
+        base, dot, ext = object_key.rpartition('.')
+        if not dot:
+            return []
+        return [f"{base}_{name}.{ext}" for name in images.RENDITION_SIZES]
+    
+    def store_renditions(self, renditions: Dict[str, Tuple[bytes, str]], context: str, **kwargs) -> Dict:
+        """
+        Upload processed renditions of one image.
+        
+        The full rendition is stored as {uuid}.{ext} (the image's object_key),
+        others as {uuid}_{name}.{ext}. A rendition identical to a larger one
+        (the image was already small) isn't stored twice.
+        
+        Args:
+            renditions: {name: (encoded bytes, extension)}, from image_pipeline
+            context: Storage context (e.g., 'avatar', 'event_logo')
+            **kwargs: Context-specific parameters (e.g., user_id, event_id)
+            
+        Returns:
+            Dictionary with object_key, bucket, url, context and renditions
+            ({name: object_key})
+        """
+        bucket, path = self._get_storage_config(context, **kwargs)
+        base = f"{path}/{uuid.uuid4()}"
+        
+        object_keys = {}
+        stored = {}  # id(rendition) -> object key, to skip duplicates
+        for name, rendition in renditions.items():
+            if id(rendition) in stored:
+                object_keys[name] = stored[id(rendition)]
+                continue
+            content, format_ext = rendition
+            suffix = '' if name == 'full' else f"_{name}"
+            object_name = f"{base}{suffix}.{format_ext}"
+            self._put_object(bucket, object_name, content, format_ext, context)
+            object_keys[name] = stored[id(rendition)] = object_name
+        
+        object_name = object_keys['full']
+        return {
+            'object_key': object_name,
+            'bucket': bucket,
+            'url': self.object_url(bucket, object_name),
+            'context': context,
+            'renditions': object_keys,
+        }
+    
+    def _put_object(self, bucket: str, object_name: str, content: bytes, format_ext: str, context: str):
+        """Upload one object (logs it instead in development without MinIO)"""
         if not self._connected:
             # Development mode - just log what would happen
-            optimized_size = optimized_buffer.getbuffer().nbytes
-            original_size = file.tell()
             print(f"[DEV MODE] Would upload optimized {context}:")
-            print(f"  Original: {file.filename} ({original_size:,} bytes)")
-            print(f"  Optimized: {filename} ({optimized_size:,} bytes)")
-            print(f"  Compression: {(1 - optimized_size/original_size)*100:.1f}% reduction")
+            print(f"  Size: {len(content):,} bytes")
             print(f"  Path: {bucket}/{object_name}")
-            
-            # Return mock response for development
-            return {
-                'object_key': object_name,
-                'bucket': bucket,
-                'url': None,
-                'context': context
-            }
+            return
         
         try:
-            # Get size of optimized image
-            optimized_size = optimized_buffer.getbuffer().nbytes
-            
-            # Upload optimized image to MinIO
             self.client.put_object(
                 bucket,
                 object_name,
-                optimized_buffer,
-                optimized_size,
+                BytesIO(content),
+                len(content),
                 content_type=f"image/{format_ext}"
             )
-            
-            # Return appropriate URL based on bucket type
-            if bucket == StorageBucket.PUBLIC.value:
-                # For public bucket, return direct URL
-                url = f"{self.external_url}/{bucket}/{object_name}"
-            else:
-                # For private buckets, we'll generate presigned URLs through Flask routes
-                url = None  # Will be handled by Flask routes
-            
-            return {
-                'object_key': object_name,
-                'bucket': bucket,
-                'url': url,
-                'context': context
-            }
-            
         except S3Error as e:
             raise Exception(f"Failed to upload file: {str(e)}")
     
+    def object_url(self, bucket: str, object_name: str) -> Optional[str]:
+        """Direct URL for public objects; private buckets go through Flask routes"""
+        if self._connected and bucket == StorageBucket.PUBLIC.value:
+            return f"{self.external_url}/{bucket}/{object_name}"
+        return None
+    
     def delete_file(self, bucket: str, object_name: str) -> bool:
         """
         Delete a file from MinIO.
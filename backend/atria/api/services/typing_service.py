@@ -14,18 +14,21 @@ Architecture:
 Redis Key Structure:
 - typing:room:{room_id} → Hash of {user_id: timestamp} for chat rooms
 - typing:dm:{thread_id} → Hash of {user_id: timestamp} for DM threads
+- typing:user:{user_id} → Set of typing keys the user is in (reverse index,
+  so disconnect cleanup never has to scan the keyspace)
 
 Performance Characteristics:
-- O(1) set/check operations (HSET, HEXISTS)
+- O(1) set/check operations (HSET, HEXISTS), one round trip per typing event
 - O(N) get all typing users where N = number typing (typically small, <10)
 - Automatic cleanup via TTL reduces server load
 - No background jobs needed for cleanup
+- Disconnect cleanup is O(keys the user is typing in), one pipeline
 """
 
 import logging
 import time
 from typing import List, Dict, Optional
-from api.extensions import presence_redis  # Shares the same Redis instance as presence
+from api import extensions  # Shares the same Redis instance as presence
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +67,35 @@ class TypingService:
         """Generate Redis key for DM thread typing indicator"""
         return f"typing:dm:{thread_id}"
 
+    @staticmethod
+    def _get_user_typing_key(user_id: int) -> str:
+        """Generate Redis key for a user's reverse index of typing keys"""
+        return f"typing:user:{user_id}"
+
+    @staticmethod
+    def _set_typing(typing_key: str, user_id: int, is_typing: bool):
+        """
+        Update one typing hash and the user's reverse index in one round trip.
+
+        The index shares the typing TTL, so it lives as long as the user's
+        most recently refreshed indicator.
+        """
+        user_key = TypingService._get_user_typing_key(user_id)
+        pipeline = extensions.presence_redis.pipeline(transaction=False)
+
+        if is_typing:
+            # Store current timestamp and refresh TTL on the entire hash
+            pipeline.hset(typing_key, user_id, int(time.time()))
+            pipeline.expire(typing_key, TypingService.TYPING_TTL)
+            pipeline.sadd(user_key, typing_key)
+            pipeline.expire(user_key, TypingService.TYPING_TTL)
+        else:
+            # Remove user from typing hash
+            pipeline.hdel(typing_key, user_id)
+            pipeline.srem(user_key, typing_key)
+
+        pipeline.execute()
+
     @staticmethod
     def set_typing_in_room(room_id: int, user_id: int, is_typing: bool) -> bool:
         """
@@ -81,23 +113,17 @@ class TypingService:
         Returns:
             True if successful, False if Redis unavailable
         """
-        if not presence_redis:
+        if not extensions.presence_redis:
             logger.debug("Redis not available, skipping typing indicator")
             return False
 
         try:
             typing_key = TypingService._get_room_typing_key(room_id)
+            TypingService._set_typing(typing_key, user_id, is_typing)
 
             if is_typing:
-                # Store current timestamp
-                timestamp = int(time.time())
-                presence_redis.hset(typing_key, user_id, timestamp)
-                # Refresh TTL on the entire hash
-                presence_redis.expire(typing_key, TypingService.TYPING_TTL)
                 logger.debug(f"User {user_id} is typing in room {room_id}")
             else:
-                # Remove user from typing hash
-                presence_redis.hdel(typing_key, user_id)
                 logger.debug(f"User {user_id} stopped typing in room {room_id}")
 
             return True
@@ -121,19 +147,16 @@ class TypingService:
         Returns:
             True if successful, False if Redis unavailable
         """
-        if not presence_redis:
+        if not extensions.presence_redis:
             return False
 
         try:
             typing_key = TypingService._get_dm_typing_key(thread_id)
+            TypingService._set_typing(typing_key, user_id, is_typing)
 
             if is_typing:
-                timestamp = int(time.time())
-                presence_redis.hset(typing_key, user_id, timestamp)
-                presence_redis.expire(typing_key, TypingService.TYPING_TTL)
                 logger.debug(f"User {user_id} is typing in DM thread {thread_id}")
             else:
-                presence_redis.hdel(typing_key, user_id)
                 logger.debug(f"User {user_id} stopped typing in DM thread {thread_id}")
 
             return True
@@ -157,6 +180,7 @@ class TypingService:
             List of dicts with user_id and timestamp, sorted by timestamp (oldest first)
             Empty list if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return []
 
@@ -207,6 +231,7 @@ class TypingService:
             List of dicts with user_id and timestamp
             Empty list if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return []
 
@@ -253,6 +278,7 @@ class TypingService:
         Returns:
             True if user is typing, False otherwise
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return False
 
@@ -278,41 +304,38 @@ class TypingService:
         """
         Remove user from ALL typing indicators.
 
-        This is called when a user disconnects. Unlike presence tracking,
-        we don't maintain a bidirectional mapping for typing (too ephemeral),
-        so we rely on TTL expiration for most cleanup.
+        This is called when a user disconnects. Like presence tracking, the
+        user -> typing keys reverse index means only that user's keys are
+        touched (one SMEMBERS plus one pipeline), so a mass disconnect never
+        turns into thousands of keyspace scans.
 
         This method is primarily for immediate cleanup on disconnect to provide
         better UX (typing indicator disappears immediately rather than after TTL).
 
-        Note: This requires scanning all typing keys, which is acceptable because:
-        1. It only happens on disconnect (infrequent)
-        2. Typing keys are short-lived and few in number
-        3. We limit the scan to a reasonable batch size
-
         Args:
             user_id: User ID to clean up
 
         Returns:
             Number of keys cleaned up, or 0 if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return 0
 
         try:
-            cleaned = 0
+            user_key = TypingService._get_user_typing_key(user_id)
+            typing_keys = presence_redis.smembers(user_key)
+
+            if not typing_keys:
+                return 0
 
-            # Scan for room typing keys
-            for key in presence_redis.scan_iter(match="typing:room:*", count=100):
-                if presence_redis.hexists(key, user_id):
-                    presence_redis.hdel(key, user_id)
-                    cleaned += 1
+            pipeline = presence_redis.pipeline(transaction=False)
+            for key in typing_keys:
+                pipeline.hdel(key, user_id)
+            pipeline.delete(user_key)
+            results = pipeline.execute()
 
-            # Scan for DM typing keys
-            for key in presence_redis.scan_iter(match="typing:dm:*", count=100):
-                if presence_redis.hexists(key, user_id):
-                    presence_redis.hdel(key, user_id)
-                    cleaned += 1
+            cleaned = sum(results[:-1])
 
             if cleaned > 0:
                 logger.info(f"Cleaned up user {user_id} from {cleaned} typing indicators")
@@ -337,6 +360,7 @@ class TypingService:
         Returns:
             Number of users typing, or 0 if Redis unavailable
         """
+        presence_redis = extensions.presence_redis
         if not presence_redis:
             return 0
 
@@ -10,8 +10,16 @@ from api.models.enums import (
 )
 from api.services.privacy import PrivacyService
 from api.commons.pagination import paginate
+from api.services.cache_service import CacheInvalidation
+
 from sqlalchemy import distinct
 
+# User fields shown (privacy filtered) in event schedules
+SPEAKER_PROFILE_FIELDS = {
+    "first_name", "last_name", "title", "company_name",
+    "image_url", "social_links", "privacy_settings",
+}
+
 
 class UserService:
     @staticmethod
@@ -115,6 +123,18 @@ class UserService:
             setattr(user, key, value)
 
         db.session.commit()
+
+        # Chat grants carry the author's name and avatar
+        from api.services.chat_access_cache import ChatAccessCache
+        ChatAccessCache.invalidate_user(user_id)
+
+        # Event details list organizers' and speakers' names
+        if update_data.keys() & {"first_name", "last_name", "email", "title", "company_name"}:
+            for event_user in user.event_users:
+                CacheInvalidation.event_members_changed(event_user.event_id, event_user.role)
+        # Schedules show speakers' names, images and (privacy-filtered) profiles
+        if update_data.keys() & SPEAKER_PROFILE_FIELDS:
+            CacheInvalidation.speaker_profile_changed(user_id)
         return user
 
     @staticmethod
@@ -308,6 +328,7 @@ class UserService:
         
         user.privacy_settings = updated_settings
         db.session.commit()
+        CacheInvalidation.speaker_profile_changed(user_id)
         
         return updated_settings
     
@@ -341,5 +362,6 @@ class UserService:
         
         event_user.privacy_overrides = updated_overrides
         db.session.commit()
+        CacheInvalidation.event_schedule_changed(event_id)
         
         return updated_overrides
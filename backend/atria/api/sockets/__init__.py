@@ -1,15 +1,29 @@
 # api/sockets/__init__.py
+import logging
+from datetime import datetime
+
 from api.extensions import socketio
-from flask_socketio import emit, join_room, disconnect
+from flask_socketio import ConnectionRefusedError, emit, join_room, disconnect
 from flask_jwt_extended import decode_token
 from flask import request, current_app
+from .admission import anonymous_admission, connection_admission
 from .session_manager import session_manager, authenticated_only
 
+logger = logging.getLogger(__name__)
+
+
+def _admit(limiter):
+    """Refuse the connect if the limiter is out of tokens (reconnect storms)"""
+    retry_after = limiter.admit()
+    if retry_after is not None:
+        raise ConnectionRefusedError(
+            {"message": "Server busy, retry shortly", "retry_after": retry_after}
+        )
+
 
 @socketio.on("connect")
 def handle_connect(auth=None):
-    print(f"Client connecting: {request.sid}")
-    print(f"Auth data received: {auth}")
+    logger.debug(f"Client connecting: {request.sid}")
 
     # Try multiple auth methods
     token = None
@@ -17,31 +31,30 @@ def handle_connect(auth=None):
     # 1. Check auth object (best for WebSocket)
     if auth and isinstance(auth, dict) and 'token' in auth:
         token = auth['token']
-        print("Token found in auth object")
     
     # 2. Check cookies (if using httpOnly cookies)
     if not token:
-        from flask_jwt_extended import jwt_required, verify_jwt_in_request
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
         try:
             # This will check cookies automatically based on JWT_TOKEN_LOCATION config
             verify_jwt_in_request(optional=True)
-            # If we get here, a valid token was found in cookies
-            print("Token found in cookies")
-            token = "cookie"  # We don't need the actual token, just need to know it's valid
+            # optional=True also passes without any token; only a found one counts
+            if get_jwt_identity() is not None:
+                token = "cookie"  # We don't need the actual token, just need to know it's valid
         except:
             pass
     
     # 3. Check Authorization header (fallback for polling)
     if not token:
         auth_header = request.headers.get("Authorization")
-        print(f"Auth header: {auth_header}")
         
         if auth_header and auth_header.startswith("Bearer "):
             token = auth_header.split(" ")[1]
-            print("Token found in Authorization header")
     
     if not token:
-        print("No valid auth token found in any location")
+        # Refuse early during storms, without touching the authenticated bucket
+        _admit(anonymous_admission)
+        logger.debug(f"No valid auth token found for {request.sid}")
         emit("auth_required", {"message": "Authentication required"})
         return
 
@@ -55,27 +68,44 @@ def handle_connect(auth=None):
             # Manually verify the token from auth object or header
             decoded_token = decode_token(token)
             user_id = decoded_token["sub"]
+    except Exception as e:
+        _admit(anonymous_admission)
+        logger.info(f"Socket authentication failed: {e}")
+        emit("auth_error", {"message": f"Authentication failed: {str(e)}"})
+        return
 
+    # Only now take a token: registering the socket and joining rooms is the
+    # expensive part, and only authenticated users can use up this bucket
+    _admit(connection_admission)
+
+    try:
         # Authenticate the session
-        session_manager.authenticate(request.sid, user_id)
+        first_connection = session_manager.authenticate(request.sid, user_id)
+
+        # Count this connection so presence survives other tabs closing
+        from api.services.presence_service import PresenceService
+        PresenceService.register_connection(request.sid, user_id)
 
         # Join user's personal room for direct messages
         join_room(f"user_{user_id}")
 
-        # Join event rooms
-        from api.models import User, EventUser
+        # Join event rooms (cached per user, so a reconnect wave doesn't hit the DB)
+        from api.services.event_user import EventUserService
 
-        user = User.query.get(user_id)
-        if user:
-            for event_user in user.event_users:
-                join_room(f"event_{event_user.event_id}")
+        for event_id in EventUserService.get_user_event_ids(int(user_id)):
+            join_room(f"event_{event_id}")
 
         emit(
             "connection_success",
             {"status": "authenticated", "user_id": user_id},
         )
+
+        # Only the user's first connection anywhere in the cluster flips them online
+        if first_connection:
+            from api.sockets.presence_notifications import emit_user_online_status
+            emit_user_online_status(user_id, is_online=True)
     except Exception as e:
-        print(f"Authentication failed: {str(e)}")
+        logger.info(f"Socket authentication failed: {e}")
         emit("auth_error", {"message": f"Authentication failed: {str(e)}"})
 
 
@@ -89,10 +119,13 @@ def handle_disconnect():
     # Clean up session
     session_manager.remove_session(request.sid)
 
+    from api.services.chat_access_cache import ChatAccessCache
+    ChatAccessCache.revoke(request.sid)
+
     # Clean up presence and typing indicators
     if user_id:
         from api.sockets.presence_notifications import cleanup_user_presence
-        cleanup_user_presence(user_id)
+        cleanup_user_presence(user_id, sid=request.sid)
 
 
 @socketio.on("heartbeat")
@@ -127,9 +160,9 @@ def handle_join_event_admin(user_id, data):
     # Join the event admin monitoring room
     join_room(f"event_{event_id}_admin")
 
-    # Emit all current room counts to hydrate the admin panel
+    # Send a snapshot of all current room counts to hydrate this admin's panel
     from api.sockets.presence_notifications import emit_all_room_counts_for_event
-    emit_all_room_counts_for_event(event_id)
+    emit_all_room_counts_for_event(event_id, to=request.sid)
 
     emit("event_admin_joined", {"event_id": event_id})
     print(f"User {user_id} joined event_{event_id}_admin monitoring room")
@@ -143,8 +176,35 @@ def handle_ping(user_id, data):
     emit("pong", {"message": "Pong!", "user_id": user_id, "received": data})
 
 
+def reconcile_dm_unread_counts(app):
+    """Rebuild DM unread counters; one worker at a time via a Redis lock"""
+    from api import extensions
+    from api.services.cache_service import CacheService
+    from api.services.direct_message import DirectMessageService
+
+    with app.app_context():
+        token = CacheService.acquire_lock("dm_unread_reconcile", timeout=600)
+        if token is None and extensions.cache_redis:
+            return  # Another worker is already reconciling
+        try:
+            DirectMessageService.reconcile_unread_counts()
+        except Exception as e:
+            app.logger.error(f"DM unread counter reconciliation failed: {e}")
+        finally:
+            CacheService.release_lock("dm_unread_reconcile", token)
+
+
+def sweep_dead_socket_workers(app):
+    """Drop sockets of workers that died, and broadcast their users going offline"""
+    with app.app_context():
+        from api.sockets.presence_notifications import emit_user_online_status
+
+        for user_id in session_manager.sweep_dead_workers():
+            emit_user_online_status(user_id, is_online=False)
+
+
 # Schedule periodic cleanup
-def setup_socket_maintenance():
+def setup_socket_maintenance(app=None):
     try:
         from apscheduler.schedulers.background import BackgroundScheduler
 
@@ -155,6 +215,16 @@ def setup_socket_maintenance():
             hours=1,
             kwargs={"timeout_hours": 24},
         )
+        scheduler.add_job(session_manager.flush_activity, "interval", seconds=30)
+        if app is not None:
+            scheduler.add_job(
+                reconcile_dm_unread_counts, "interval", hours=6, args=[app]
+            )
+            # Right away (sockets left by the worker this one replaced), then every minute
+            scheduler.add_job(
+                sweep_dead_socket_workers, "interval", minutes=1, args=[app],
+                next_run_time=datetime.now(),
+            )
         scheduler.start()
         print("Socket session cleanup scheduler started")
     except ImportError:
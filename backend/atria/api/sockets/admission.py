@@ -0,0 +1,120 @@
+"""
+Socket connection admission control
+
+After a deploy or a network blip every client reconnects at once. Each
+connect decodes a JWT, registers the socket and joins rooms, so an
+unbounded reconnect wave competes with the traffic of users who are already
+connected. The admission limiter is a per-worker token bucket: connects
+within the sustained rate (plus a burst allowance) go through, the rest are
+refused with a jittered retry_after so the client's reconnect backoff
+spreads the wave out instead of hammering in lockstep.
+
+Connects are authenticated before they're admitted. Those with a valid token
+draw from connection_admission; connects without one (or with a bad one)
+draw from the smaller anonymous_admission bucket, so anonymous traffic can't
+use up the tokens real users need to get back in.
+
+Storms are reported once when they start and once when they end, and the
+counters are exposed through stats() (see /api/health/detailed).
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionAdmission:
+    """
+    Token bucket limiting socket connects per worker.
+
+    Design Principles:
+    - Admitting is O(1) and never touches Redis or the database
+    - A refused connect costs nothing but the handshake
+    - retry_after is jittered so refused clients don't come back together
+    """
+
+    def __init__(self, rate: float = 50, burst: int = 200, name: str = "connects"):
+        self.name = name
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+        self.admitted = 0
+        self.rejected = 0
+        self.storms = 0
+        self._storm_started: Optional[float] = None
+        self._storm_rejected = 0
+
+    def configure(self, rate: float, burst: int):
+        """Set the sustained rate (connects/second) and burst size; refills the bucket"""
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = int(burst)
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+
+    def admit(self) -> Optional[float]:
+        """
+        Take a token for one connect
+
+        Returns:
+            None if the connect is admitted, otherwise seconds the client
+            should wait before retrying
+        """
+        if self.rate <= 0:
+            self.admitted += 1
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.admitted += 1
+                if self._storm_started is not None:
+                    self._end_storm(now)
+                return None
+
+            self.rejected += 1
+            self._storm_rejected += 1
+            if self._storm_started is None:
+                self._storm_started = now
+                self.storms += 1
+                logger.warning(
+                    f"Socket reconnect storm: over {self.rate:g} {self.name}/s, "
+                    f"refusing them until the rate drops"
+                )
+
+            # Time until a token is available, spread over a few seconds
+            wait = (1 - self._tokens) / self.rate
+            return round(wait + random.uniform(1, 5), 1)
+
+    def _end_storm(self, now: float):
+        logger.warning(
+            f"Socket reconnect storm over after {now - self._storm_started:.1f}s, "
+            f"{self._storm_rejected} {self.name} refused"
+        )
+        self._storm_started = None
+        self._storm_rejected = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for monitoring"""
+        return {
+            "rate_limit": self.rate,
+            "burst": self.burst,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "storms": self.storms,
+            "in_storm": self._storm_started is not None,
+        }
+
+
+# Create singleton instances
+connection_admission = ConnectionAdmission(name="connects")
+anonymous_admission = ConnectionAdmission(rate=10, burst=50, name="anonymous connects")
@@ -4,11 +4,13 @@ from api.commons.socket_decorators import (
     socket_chat_room_access_required,
     socket_event_organizer_required,
 )
+from flask import g, request
 from flask_socketio import emit, join_room, leave_room
 from flask_jwt_extended import get_jwt_identity
 from api.models import User, Event
 from api.models.enums import EventUserRole
 from api.services.chat_room import ChatRoomService
+from api.services.chat_access_cache import ChatAccessCache
 from datetime import datetime, timezone
 
 
@@ -24,8 +26,9 @@ def handle_join_chat_room(user_id, data):
         emit("error", {"message": "Missing room ID"})
         return
 
-    # Verify user has access to this room
-    if not ChatRoomService.check_room_access(room_id, user_id):
+    # Verify user has access to this room and cache the result for this socket
+    grant = ChatAccessCache.grant_for_join(request.sid, room_id, user_id)
+    if not grant:
         emit("error", {"message": "Not authorized to join this chat room"})
         return
 
@@ -38,10 +41,14 @@ def handle_join_chat_room(user_id, data):
     from api.services.presence_service import PresenceService
     from api.sockets.presence_notifications import emit_room_user_count
 
-    user_count = PresenceService.join_room(room_id, user_id)
+    joined, user_count = PresenceService.join_room_for_connection(
+        request.sid, room_id, user_id
+    )
 
-    # Get recent messages
-    messages = ChatRoomService.get_recent_messages(room_id, user_id)
+    # Get recent messages (one LRANGE when the room's history is cached)
+    messages = ChatRoomService.get_recent_messages(
+        room_id, user_id, privileged=grant.can_moderate
+    )
 
     # Send confirmation to user with current count
     emit(
@@ -54,8 +61,10 @@ def handle_join_chat_room(user_id, data):
         },
     )
 
-    # Broadcast updated count to all users in room and admins (for health meter)
-    emit_room_user_count(room_id, chat_room.event_id)
+    # Broadcast updated count to all users in room and admins (for health meter);
+    # another tab of this user joining doesn't change it
+    if joined:
+        emit_room_user_count(room_id, chat_room.event_id)
 
 
 @socketio.on("leave_chat_room")
@@ -73,7 +82,8 @@ def handle_leave_chat_room(user_id, data):
     from api.services.presence_service import PresenceService
     from api.sockets.presence_notifications import emit_room_user_count
 
-    PresenceService.leave_room(room_id, user_id)
+    left, _ = PresenceService.leave_room_for_connection(request.sid, room_id, user_id)
+    ChatAccessCache.revoke(request.sid, room_id)
 
     # Leave Socket.IO room
     leave_room(f"room_{room_id}")
@@ -81,11 +91,12 @@ def handle_leave_chat_room(user_id, data):
     # Confirm to user
     emit("chat_room_left", {"room_id": room_id})
 
-    # Broadcast updated count to remaining users and admins
-    # Need to get event_id from room
-    from api.services.chat_room import ChatRoomService
-    chat_room = ChatRoomService.get_chat_room(room_id)
-    emit_room_user_count(room_id, chat_room.event_id)
+    # Broadcast updated count to remaining users and admins, unless the user
+    # is still in the room from another tab
+    if left:
+        from api.services.chat_room import ChatRoomService
+        chat_room = ChatRoomService.get_chat_room(room_id)
+        emit_room_user_count(room_id, chat_room.event_id)
 
 
 @socketio.on("chat_message")
@@ -99,15 +110,20 @@ def handle_chat_message(user_id, data):
         emit("error", {"message": "Message content cannot be empty"})
         return
 
+    # Reuse the grant from join_chat_room, if the access check found one
+    access = g.get("chat_access")
+
     # Save message and get formatted response
-    message = ChatRoomService.send_message(room_id, user_id, content)
-    
+    message = ChatRoomService.send_message(room_id, user_id, content, access=access)
+    message_data = ChatRoomService.format_message_for_response(
+        message, author=access.author if access else None
+    )
+
     # Use centralized notification function
     from api.sockets.chat_notifications import emit_new_chat_message
-    emit_new_chat_message(message, room_id)
-    
+    emit_new_chat_message(message, room_id, message_data=message_data)
+
     # Send confirmation to sender
-    message_data = ChatRoomService.format_message_for_response(message)
     emit("chat_message_sent", message_data)
 
 
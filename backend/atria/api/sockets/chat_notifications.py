@@ -8,22 +8,29 @@ from api.extensions import socketio
 from api.services.chat_room import ChatRoomService
 
 
-def emit_new_chat_message(message, room_id):
+def emit_new_chat_message(message, room_id, message_data=None):
     """
-    Emit a new chat message to all users in a chat room.
-    Can be called from both REST routes and socket handlers.
+    Emit a new chat message to all users in a chat room and add it to the
+    room's recent history. Can be called from both REST routes and socket
+    handlers.
     
     Args:
         message: ChatMessage instance
         room_id: ID of the chat room
+        message_data: Optional already-formatted payload for the message
     """
     # Format message for response (standard format for all users)
-    message_data = ChatRoomService.format_message_for_response(message, include_deletion_info=False)
+    if message_data is None:
+        message_data = ChatRoomService.format_message_for_response(message, include_deletion_info=False)
     
     # Single broadcast to the chat room - much more efficient!
     # All users who joined this room will receive the message
     socketio.emit("new_chat_message", message_data, room=f"room_{room_id}")
 
+    from api.services.chat_history_cache import ChatHistoryCache
+
+    ChatHistoryCache.push(room_id, message_data)
+
 
 def emit_chat_message_moderated(message_id, room_id, deleted_by_user):
     """
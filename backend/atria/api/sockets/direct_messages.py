@@ -36,6 +36,7 @@ def handle_get_direct_messages(user_id, data):
     thread_id = data.get("thread_id")
     page = data.get("page", 1)
     per_page = min(data.get("per_page", 50), 100)
+    cursor = data.get("cursor")
 
     if not thread_id:
         emit("error", {"message": "Missing thread ID"})
@@ -44,7 +45,7 @@ def handle_get_direct_messages(user_id, data):
     try:
         # Use the unified service method for consistency with HTTP
         result = DirectMessageService.get_thread_messages_with_context(
-            thread_id, user_id, page=page, per_page=per_page
+            thread_id, user_id, page=page, per_page=per_page, cursor=cursor
         )
         
         emit("direct_messages", result)
@@ -0,0 +1,232 @@
+"""
+Coalesced presence-count broadcasts
+
+Joining or leaving a room used to SCARD the room and emit its count right
+away. When thousands of attendees enter a keynote room within a minute, that
+is thousands of near-identical broadcasts through the message queue.
+
+Instead, join/leave/disconnect handlers mark the room or session dirty and a
+background task flushes on a short tick: one pipelined SCARD batch for
+everything that changed, then one emit per dirty room/session. Broadcast
+volume is bounded by rooms x ticks per worker, not by joins.
+
+Each worker keeps its own dirty sets and emits through the shared Socket.IO
+message queue, so counts stay correct (they are always read from Redis) even
+when joins for one room land on different workers.
+
+Online/offline status works the same way on a slower tick: connect and
+disconnect mark the user, and a flush reads the real state from the session
+registry, drops users who flapped back to where they started, and sends
+each audience room one batch of every change it should hear about.
+"""
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from flask import current_app
+
+from api.extensions import socketio
+from api.services.presence_service import PresenceService
+
+logger = logging.getLogger(__name__)
+
+
+class _TickingBroadcaster(ABC):
+    """Starts one background flush loop per worker on first use"""
+
+    FLUSH_INTERVAL = 0.3
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or self.FLUSH_INTERVAL
+        self._lock = threading.Lock()
+        self._started = False
+
+    @abstractmethod
+    def flush(self) -> int:
+        """Send everything marked since the last flush; returns the number of emits"""
+
+    def _ensure_started(self):
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            socketio.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing {type(self).__name__}: {e}")
+
+
+class PresenceCountBroadcaster(_TickingBroadcaster):
+    """
+    Dirty-set aggregator for room_user_count / session_viewer_count events.
+
+    Design Principles:
+    - Marking is O(1) and never touches Redis or the message queue
+    - A flush reads every dirty count in one pipeline
+    - The flush loop starts lazily on first use (one per worker)
+    """
+
+    # Seconds between flushes; counts lag joins by at most this much
+    FLUSH_INTERVAL = 0.3
+
+    def __init__(self, interval: Optional[float] = None):
+        super().__init__(interval)
+        self._dirty_rooms: Set[int] = set()
+        self._dirty_sessions: Set[int] = set()
+        # room_id -> event_id, learned from marks, for the admin channel
+        self._room_events: Dict[int, int] = {}
+
+    def mark_room(self, room_id: int, event_id: Optional[int] = None):
+        """
+        Queue a room_user_count broadcast for a room
+
+        Args:
+            room_id: Chat room ID
+            event_id: Event ID (also notifies event_{id}_admin); remembered
+                for later marks that don't know it, e.g. on disconnect
+        """
+        with self._lock:
+            self._dirty_rooms.add(int(room_id))
+            if event_id:
+                self._room_events[int(room_id)] = event_id
+        self._ensure_started()
+
+    def mark_session(self, session_id: int):
+        """Queue a session_viewer_count broadcast for a session"""
+        with self._lock:
+            self._dirty_sessions.add(int(session_id))
+        self._ensure_started()
+
+    def flush(self) -> int:
+        """
+        Broadcast counts for everything marked since the last flush
+
+        Returns:
+            Number of rooms + sessions broadcast
+        """
+        with self._lock:
+            rooms, self._dirty_rooms = self._dirty_rooms, set()
+            sessions, self._dirty_sessions = self._dirty_sessions, set()
+            room_events = {room_id: self._room_events.get(room_id) for room_id in rooms}
+
+        if not rooms and not sessions:
+            return 0
+
+        room_counts, session_counts = PresenceService.get_presence_counts(
+            room_ids=rooms, session_ids=sessions
+        )
+
+        for room_id, user_count in room_counts.items():
+            data = {"room_id": room_id, "user_count": user_count}
+            socketio.emit("room_user_count", data, room=f"room_{room_id}")
+            event_id = room_events.get(room_id)
+            if event_id:
+                socketio.emit("room_user_count", data, room=f"event_{event_id}_admin")
+
+        for session_id, viewer_count in session_counts.items():
+            socketio.emit(
+                "session_viewer_count",
+                {"session_id": session_id, "viewer_count": viewer_count},
+                room=f"session_{session_id}",
+            )
+
+        logger.debug(
+            f"Flushed presence counts: {len(room_counts)} rooms, "
+            f"{len(session_counts)} sessions"
+        )
+        return len(room_counts) + len(session_counts)
+
+
+class OnlineStatusBroadcaster(_TickingBroadcaster):
+    """
+    Debounced, batched user_online_status fan-out.
+
+    Each flush emits at most one user_online_status event per audience room
+    (see OnlineStatusService.get_audience):
+    {"statuses": [{"user_id": int, "is_online": bool}, ...]}
+    """
+
+    # Reconnects within this window (page reloads, network blips) are silent
+    FLUSH_INTERVAL = 2.0
+
+    def __init__(self, interval: Optional[float] = None):
+        super().__init__(interval)
+        # user_id -> status before the first change seen this window
+        self._dirty_users: Dict[int, bool] = {}
+        self._app = None
+
+    def mark(self, user_id: int, is_online: bool):
+        """
+        Queue a status broadcast for a user
+
+        Args:
+            user_id: User ID
+            is_online: The status the user just changed to
+        """
+        if self._app is None:
+            self._app = current_app._get_current_object()
+        with self._lock:
+            self._dirty_users.setdefault(int(user_id), not is_online)
+        self._ensure_started()
+
+    def flush(self) -> int:
+        """
+        Broadcast every status that changed since the last flush
+
+        Returns:
+            Number of users whose status was broadcast
+        """
+        from api.services.online_status import OnlineStatusService
+        from api.sockets.session_manager import session_manager
+
+        with self._lock:
+            users, self._dirty_users = self._dirty_users, {}
+
+        if not users:
+            return 0
+
+        online = session_manager.online_user_ids(users)
+        changes = {
+            user_id: user_id in online
+            for user_id, was_online in users.items()
+            if (user_id in online) != was_online
+        }
+        if not changes:
+            return 0
+
+        batches: Dict[str, List[dict]] = defaultdict(list)
+        for user_id, is_online in changes.items():
+            for room in OnlineStatusService.get_audience(user_id):
+                batches[room].append({"user_id": user_id, "is_online": is_online})
+
+        for room, statuses in batches.items():
+            socketio.emit("user_online_status", {"statuses": statuses}, room=room)
+
+        logger.debug(
+            f"Flushed online status for {len(changes)} users to {len(batches)} rooms"
+        )
+        return len(changes)
+
+    def _run(self):
+        while True:
+            socketio.sleep(self.interval)
+            try:
+                with self._app.app_context():
+                    self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing online status: {e}")
+
+
+# Create singleton instances
+presence_broadcaster = PresenceCountBroadcaster()
+online_status_broadcaster = OnlineStatusBroadcaster()
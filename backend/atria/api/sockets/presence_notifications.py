@@ -18,6 +18,10 @@ Future Enhancement: Database Persistence for Analytics
 
 from api.extensions import socketio
 from api.services.presence_service import PresenceService
+from api.sockets.presence_broadcaster import (
+    online_status_broadcaster,
+    presence_broadcaster,
+)
 from api.services.typing_service import TypingService
 import logging
 
@@ -30,65 +34,59 @@ logger = logging.getLogger(__name__)
 
 def emit_room_user_count(room_id: int, event_id: int = None):
     """
-    Broadcast current user count to all users in a room AND to event admins.
+    Queue a user count broadcast to a room AND to event admins.
 
     Used for "health meter" UI showing room activity level.
     Frontend can color-code based on count/percentage of total attendees.
 
+    Counts are coalesced: the room is marked dirty and the presence
+    broadcaster emits one room_user_count per dirty room on its next tick
+    (see presence_broadcaster.py), however many joins/leaves happened.
+
     Args:
         room_id: Chat room ID
         event_id: Event ID (optional, for admin monitoring)
     """
     try:
-        user_count = PresenceService.get_room_user_count(room_id)
-
-        data = {
-            "room_id": room_id,
-            "user_count": user_count
-        }
-
-        # Emit to users actively in the room
-        socketio.emit("room_user_count", data, room=f"room_{room_id}")
-
-        # Also emit to event admins for monitoring
-        if event_id:
-            socketio.emit("room_user_count", data, room=f"event_{event_id}_admin")
-
-        logger.debug(f"Emitted room_user_count for room {room_id}: {user_count}")
-
+        presence_broadcaster.mark_room(room_id, event_id)
     except Exception as e:
-        logger.error(f"Error emitting room_user_count: {e}")
+        logger.error(f"Error queueing room_user_count: {e}")
 
 
-def emit_all_room_counts_for_event(event_id: int):
+def emit_all_room_counts_for_event(event_id: int, to: str = None):
     """
-    Broadcast current user counts for ALL rooms in an event to admin monitoring channel.
+    Send current user counts for ALL rooms in an event as one snapshot.
 
     Called when admin loads the admin panel to hydrate initial presence state.
-    Sends current count for every room in the event via socket.
+    The room id list comes from a cached per-event index and every count is
+    read in one pipelined round trip, so this costs the same for 5 rooms or
+    500. Emits a single room_user_counts event:
+    {"event_id": int, "counts": [{"room_id": int, "user_count": int}, ...]}
 
     Args:
         event_id: Event ID
+        to: Socket sid to send the snapshot to (defaults to the whole
+            event_{id}_admin channel)
     """
     try:
-        from api.models import ChatRoom
-
-        # Get all rooms for this event
-        rooms = ChatRoom.query.filter_by(event_id=event_id).all()
+        from api.services.chat_room import ChatRoomService
 
-        for room in rooms:
-            user_count = PresenceService.get_room_user_count(room.id)
+        room_ids = ChatRoomService.get_event_room_ids(int(event_id))
+        room_counts = PresenceService.get_room_user_counts(room_ids)
 
-            socketio.emit(
-                "room_user_count",
-                {
-                    "room_id": room.id,
-                    "user_count": user_count
-                },
-                room=f"event_{event_id}_admin"
-            )
+        socketio.emit(
+            "room_user_counts",
+            {
+                "event_id": event_id,
+                "counts": [
+                    {"room_id": room_id, "user_count": user_count}
+                    for room_id, user_count in room_counts.items()
+                ],
+            },
+            room=to or f"event_{event_id}_admin"
+        )
 
-        logger.debug(f"Emitted all room counts for event {event_id}: {len(rooms)} rooms")
+        logger.debug(f"Emitted room count snapshot for event {event_id}: {len(room_ids)} rooms")
 
     except Exception as e:
         logger.error(f"Error emitting all room counts for event {event_id}: {e}")
@@ -159,30 +157,19 @@ def emit_user_left_room(room_id: int, user_id: int):
 
 def emit_session_viewer_count(session_id: int):
     """
-    Broadcast current viewer count for a session.
+    Queue a viewer count broadcast for a session.
 
     Used for live viewer count on session pages and admin dashboards.
     Critical for event organizers to gauge session engagement in real-time.
+    Coalesced like emit_room_user_count.
 
     Args:
         session_id: Session ID
     """
     try:
-        viewer_count = PresenceService.get_session_viewer_count(session_id)
-
-        socketio.emit(
-            "session_viewer_count",
-            {
-                "session_id": session_id,
-                "viewer_count": viewer_count
-            },
-            room=f"session_{session_id}"
-        )
-
-        logger.debug(f"Emitted session_viewer_count for session {session_id}: {viewer_count}")
-
+        presence_broadcaster.mark_session(session_id)
     except Exception as e:
-        logger.error(f"Error emitting session_viewer_count: {e}")
+        logger.error(f"Error queueing session_viewer_count: {e}")
 
 
 def emit_user_joined_session(session_id: int, user_id: int):
@@ -252,35 +239,27 @@ def emit_user_left_session(session_id: int, user_id: int):
 
 def emit_user_online_status(user_id: int, is_online: bool):
     """
-    Broadcast user's online/offline status.
+    Queue a broadcast of user's online/offline status.
 
     This is for the "green dot" on DM lists showing who's currently in the app.
-    Only sent to users who can see this user (connections, event participants).
+    Only sent to users who can see this user: their own clients, their
+    accepted connections and the events they're in (a cached audience, so
+    this never queries the database on connect/disconnect).
+
+    Changes are debounced and batched by the online status broadcaster (see
+    presence_broadcaster.py); a user who reconnects within a tick generates
+    no broadcast at all.
 
     Args:
         user_id: User ID
         is_online: True if user came online, False if went offline
     """
     try:
-        # Emit to user's personal room (for their own clients)
-        socketio.emit(
-            "user_online_status",
-            {
-                "user_id": user_id,
-                "is_online": is_online
-            },
-            room=f"user_{user_id}"
-        )
-
-        # TODO: Emit to relevant audiences
-        # - User's connections (for DM list green dots)
-        # - Event rooms user is part of (for participant lists)
-        # This requires looking up user's connections/events
-
+        online_status_broadcaster.mark(user_id, is_online)
         logger.debug(f"User {user_id} online status: {is_online}")
 
     except Exception as e:
-        logger.error(f"Error emitting user_online_status: {e}")
+        logger.error(f"Error queueing user_online_status: {e}")
 
 
 # ============================================================================
@@ -356,26 +335,47 @@ def emit_typing_in_dm(thread_id: int, user_id: int, is_typing: bool, recipient_i
 # CLEANUP & MAINTENANCE
 # ============================================================================
 
-def cleanup_user_presence(user_id: int):
+def cleanup_user_presence(user_id: int, sid: str = None):
     """
     Clean up all presence and typing data for a user on disconnect.
 
-    This removes them from:
+    With a sid, only that connection is released first: rooms/sessions
+    another of the user's connections is still in are kept, and if the user
+    still has other connections open nothing else happens (no leave, no
+    offline status). Once the last connection goes, this removes them from:
     - All chat rooms they were in
     - All sessions they were viewing
     - Global online status
     - All typing indicators
 
-    Also emits notifications to affected rooms/sessions so other users
-    see the updates in real-time.
+    Also queues count updates for affected rooms/sessions so other users
+    see the updates in real-time (coalesced with other joins/leaves).
 
     Args:
         user_id: User ID to clean up
+        sid: Socket.IO session ID that disconnected
     """
     try:
+        user_rooms, user_sessions = set(), set()
+        if sid:
+            released = PresenceService.release_connection(sid, user_id)
+            user_rooms |= released.rooms
+            user_sessions |= released.sessions
+
+            if not released.last_connection:
+                for room_id in user_rooms:
+                    emit_room_user_count(room_id)
+                for session_id in user_sessions:
+                    emit_session_viewer_count(session_id)
+                logger.debug(
+                    f"Released connection {sid} of user {user_id}: "
+                    f"left {len(user_rooms)} rooms, {len(user_sessions)} sessions"
+                )
+                return
+
         # Get rooms and sessions user is in before cleanup
-        user_rooms = PresenceService.get_user_rooms(user_id)
-        user_sessions = PresenceService.get_user_sessions(user_id)
+        user_rooms |= PresenceService.get_user_rooms(user_id)
+        user_sessions |= PresenceService.get_user_sessions(user_id)
 
         # Clean up presence
         rooms_cleaned = PresenceService.cleanup_user(user_id)
@@ -388,13 +388,12 @@ def cleanup_user_presence(user_id: int):
             f"{typing_cleaned} typing indicators"
         )
 
-        # Emit leave events to all rooms
+        # Queue count updates for all rooms and sessions
         for room_id in user_rooms:
-            emit_user_left_room(room_id, user_id)
+            emit_room_user_count(room_id)
 
-        # Emit leave events to all sessions
         for session_id in user_sessions:
-            emit_user_left_session(session_id, user_id)
+            emit_session_viewer_count(session_id)
 
         # Update global online status
         emit_user_online_status(user_id, is_online=False)
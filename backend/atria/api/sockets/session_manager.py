@@ -1,57 +1,402 @@
 # api/sockets/session_manager.py
-from datetime import datetime, timedelta
+"""
+Socket session registry
+
+SessionManager answers "which user is this sid?" for every socket event, so
+that lookup always stays in process: a socket only ever talks to the worker
+that accepted it. What the per-worker dict couldn't do is answer cluster-wide
+questions (how many users are online, which sids does a user have) once
+several workers share the Socket.IO message queue. The registry behind
+SessionManager is pluggable:
+
+- MemorySessionRegistry: this process only (single worker, tests, no Redis)
+- RedisSessionRegistry: same local state, mirrored to the presence Redis DB
+
+Redis Key Structure (RedisSessionRegistry):
+- sockets:sids → Hash of sid → user_id
+- sockets:active → Sorted set of sid scored by last-active unix time
+- sockets:users → Hash of user_id → number of connected sids
+- sockets:user:{user_id} → Set of the user's sids
+- sockets:workers → Set of worker ids that have registered sids
+- sockets:worker:{worker_id}:sids → Set of the sids a worker owns
+- sockets:worker:{worker_id}:alive → Liveness key, TTL WORKER_TTL
+
+Activity updates only touch local state; they're written to Redis in
+batches by flush_activity (scheduled in setup_socket_maintenance), which also
+refreshes the worker's liveness key. A worker that dies without
+disconnecting its sockets (SIGKILL, OOM, deploy) stops refreshing it, and
+sweep_dead_workers - run by every worker at startup and every minute -
+removes its sids, so its users don't stay online until the daily sweep.
+"""
 import functools
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
 from flask import request
 from flask_socketio import emit, disconnect
 
+logger = logging.getLogger(__name__)
+
+
+class MemorySessionRegistry:
+    """In-process registry; also the local state of RedisSessionRegistry"""
 
-class SessionManager:
     def __init__(self):
-        self.sessions = {}  # {sid: {'user_id': id, 'last_active': timestamp}}
+        # sid -> [user_id, last_active unix time]
+        self.sessions: Dict[str, List] = {}
+        self.user_sids: Dict[int, Set[str]] = {}
+
+    def add(self, sid: str, user_id: int) -> bool:
+        """Register a sid; returns True if it's the user's first connection"""
+        user_id = int(user_id)
+        self.sessions[sid] = [user_id, time.time()]
+        sids = self.user_sids.setdefault(user_id, set())
+        sids.add(sid)
+        return len(sids) == 1
+
+    def remove(self, sid: str) -> Tuple[Optional[int], bool]:
+        """
+        Unregister a sid
+
+        Returns:
+            (user_id or None if unknown, True if it was the user's last connection)
+        """
+        session = self.sessions.pop(sid, None)
+        if session is None:
+            return None, False
+        user_id = session[0]
+        sids = self.user_sids.get(user_id, set())
+        sids.discard(sid)
+        if not sids:
+            self.user_sids.pop(user_id, None)
+        return user_id, not sids
+
+    def contains(self, sid: str) -> bool:
+        return sid in self.sessions
+
+    def get_user_id(self, sid: str) -> Optional[int]:
+        session = self.sessions.get(sid)
+        return session[0] if session else None
+
+    def touch(self, sid: str):
+        session = self.sessions.get(sid)
+        if session:
+            session[1] = time.time()
+
+    def flush_activity(self) -> int:
+        return 0
+
+    def get_user_sids(self, user_id: int) -> Set[str]:
+        return set(self.user_sids.get(int(user_id), ()))
+
+    def online_user_count(self) -> int:
+        return len(self.user_sids)
+
+    def online_user_ids(self, user_ids) -> Set[int]:
+        return {int(user_id) for user_id in user_ids if int(user_id) in self.user_sids}
+
+    def expire_inactive(self, cutoff: float) -> List[str]:
+        """Remove sids last active before cutoff; returns the removed sids"""
+        inactive = [sid for sid, (_, last_active) in self.sessions.items() if last_active < cutoff]
+        for sid in inactive:
+            self.remove(sid)
+        return inactive
+
+    def sweep_dead_workers(self) -> Set[int]:
+        """Nothing outlives this process here"""
+        return set()
+
+
+class RedisSessionRegistry(MemorySessionRegistry):
+    """Registry mirrored to Redis so every worker sees every connection"""
+
+    SIDS_KEY = "sockets:sids"
+    ACTIVE_KEY = "sockets:active"
+    USERS_KEY = "sockets:users"
+    WORKERS_KEY = "sockets:workers"
+    # Seconds a worker counts as alive after its last flush_activity (every 30s)
+    WORKER_TTL = 90
+
+    def __init__(self, redis_client):
+        super().__init__()
+        self.redis = redis_client
+        self.worker_id = uuid.uuid4().hex
+        self._pending_activity: Dict[str, float] = {}
+        self._heartbeat()
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"sockets:user:{user_id}"
+
+    @staticmethod
+    def _worker_sids_key(worker_id: str) -> str:
+        return f"sockets:worker:{worker_id}:sids"
+
+    @staticmethod
+    def _worker_alive_key(worker_id: str) -> str:
+        return f"sockets:worker:{worker_id}:alive"
+
+    def _heartbeat(self):
+        """Mark this worker alive for another WORKER_TTL seconds"""
+        try:
+            pipeline = self.redis.pipeline()
+            pipeline.set(self._worker_alive_key(self.worker_id), 1, ex=self.WORKER_TTL)
+            pipeline.sadd(self.WORKERS_KEY, self.worker_id)
+            pipeline.execute()
+        except Exception as e:
+            logger.error(f"Error refreshing socket worker {self.worker_id}: {e}")
+
+    def add(self, sid: str, user_id: int) -> bool:
+        first_local = super().add(sid, user_id)
+        user_id = int(user_id)
+        try:
+            pipeline = self.redis.pipeline()
+            pipeline.hset(self.SIDS_KEY, sid, user_id)
+            pipeline.zadd(self.ACTIVE_KEY, {sid: time.time()})
+            pipeline.sadd(self._worker_sids_key(self.worker_id), sid)
+            pipeline.sadd(self._user_key(user_id), sid)
+            pipeline.hincrby(self.USERS_KEY, user_id, 1)
+            return pipeline.execute()[-1] == 1
+        except Exception as e:
+            logger.error(f"Error registering socket {sid}: {e}")
+            return first_local
+
+    def remove(self, sid: str) -> Tuple[Optional[int], bool]:
+        user_id, last_local = super().remove(sid)
+        self._pending_activity.pop(sid, None)
+        try:
+            if user_id is None:
+                user_id = self.redis.hget(self.SIDS_KEY, sid)
+                if user_id is None:
+                    return None, False
+                user_id = int(user_id)
+            return user_id, self._remove_from_redis(sid, user_id)
+        except Exception as e:
+            logger.error(f"Error unregistering socket {sid}: {e}")
+            return user_id, last_local
+
+    def _remove_from_redis(self, sid: str, user_id: int, worker_id: Optional[str] = None) -> bool:
+        """
+        Drop a sid from the shared registry
+
+        Returns:
+            True if it was the user's last sid anywhere
+        """
+        pipeline = self.redis.pipeline()
+        pipeline.zrem(self.ACTIVE_KEY, sid)
+        pipeline.srem(self._user_key(user_id), sid)
+        pipeline.srem(self._worker_sids_key(worker_id or self.worker_id), sid)
+        pipeline.execute()
+        # Whoever deletes the sid owns the decrement, so a sweep racing a
+        # disconnect (or another sweep) can't count it twice
+        if not self.redis.hdel(self.SIDS_KEY, sid):
+            return False
+        remaining = self.redis.hincrby(self.USERS_KEY, user_id, -1)
+        if remaining <= 0:
+            # No sids left anywhere: drop the counter instead of keeping a 0
+            self.redis.hdel(self.USERS_KEY, user_id)
+            return True
+        return False
+
+    def get_user_id(self, sid: str) -> Optional[int]:
+        user_id = super().get_user_id(sid)
+        if user_id is not None:
+            return user_id
+        try:
+            user_id = self.redis.hget(self.SIDS_KEY, sid)
+            return int(user_id) if user_id is not None else None
+        except Exception as e:
+            logger.error(f"Error looking up socket {sid}: {e}")
+            return None
+
+    def touch(self, sid: str):
+        super().touch(sid)
+        if sid in self.sessions:
+            self._pending_activity[sid] = self.sessions[sid][1]
+
+    def flush_activity(self) -> int:
+        """
+        Write batched last-active times in one ZADD; returns sids written
+
+        Also refreshes this worker's liveness key.
+        """
+        self._heartbeat()
+        pending, self._pending_activity = self._pending_activity, {}
+        if not pending:
+            return 0
+        try:
+            # XX: never resurrect a sid that was removed meanwhile
+            self.redis.zadd(self.ACTIVE_KEY, pending, xx=True)
+        except Exception as e:
+            logger.error(f"Error flushing socket activity: {e}")
+            return 0
+        return len(pending)
+
+    def get_user_sids(self, user_id: int) -> Set[str]:
+        try:
+            return set(self.redis.smembers(self._user_key(int(user_id))))
+        except Exception as e:
+            logger.error(f"Error getting sockets for user {user_id}: {e}")
+            return super().get_user_sids(user_id)
+
+    def online_user_count(self) -> int:
+        try:
+            return self.redis.hlen(self.USERS_KEY)
+        except Exception as e:
+            logger.error(f"Error counting online users: {e}")
+            return super().online_user_count()
+
+    def online_user_ids(self, user_ids) -> Set[int]:
+        user_ids = [int(user_id) for user_id in user_ids]
+        if not user_ids:
+            return set()
+        try:
+            counts = self.redis.hmget(self.USERS_KEY, user_ids)
+            return {
+                user_id
+                for user_id, count in zip(user_ids, counts)
+                if count is not None and int(count) > 0
+            }
+        except Exception as e:
+            logger.error(f"Error checking online users: {e}")
+            return super().online_user_ids(user_ids)
+
+    def expire_inactive(self, cutoff: float) -> List[str]:
+        """Sweep inactive sids across the cluster (and locally)"""
+        local = set(super().expire_inactive(cutoff))
+        self.flush_activity()
+        try:
+            stale = self.redis.zrangebyscore(self.ACTIVE_KEY, "-inf", cutoff)
+            if stale:
+                user_ids = self.redis.hmget(self.SIDS_KEY, stale)
+                for sid, user_id in zip(stale, user_ids):
+                    if user_id is None:
+                        self.redis.zrem(self.ACTIVE_KEY, sid)
+                    else:
+                        self._remove_from_redis(sid, int(user_id))
+            return sorted(local | set(stale))
+        except Exception as e:
+            logger.error(f"Error expiring inactive sockets: {e}")
+            return sorted(local)
+
+    def sweep_dead_workers(self) -> Set[int]:
+        """
+        Remove the sids of workers whose liveness key has expired
+
+        Safe to run on every worker at once.
+
+        Returns:
+            Users whose last connection was swept (now offline)
+        """
+        offline = set()
+        try:
+            for worker_id in self.redis.smembers(self.WORKERS_KEY):
+                if worker_id == self.worker_id or self.redis.exists(self._worker_alive_key(worker_id)):
+                    continue
+                sids_key = self._worker_sids_key(worker_id)
+                sids = list(self.redis.smembers(sids_key))
+                user_ids = self.redis.hmget(self.SIDS_KEY, sids) if sids else []
+                for sid, user_id in zip(sids, user_ids):
+                    if user_id is not None and self._remove_from_redis(sid, int(user_id), worker_id):
+                        offline.add(int(user_id))
+                self.redis.delete(sids_key)
+                self.redis.srem(self.WORKERS_KEY, worker_id)
+                if sids:
+                    logger.warning(f"Removed {len(sids)} sockets of dead worker {worker_id}")
+        except Exception as e:
+            logger.error(f"Error sweeping dead socket workers: {e}")
+        return offline
+
+
+class SessionManager:
+    def __init__(self, registry=None):
+        self.registry = registry or MemorySessionRegistry()
+
+    def configure(self, backend: str = None, redis_client=None):
+        """
+        Pick the registry backend ("memory" or "redis")
+
+        Falls back to memory if Redis is requested but unavailable.
+        """
+        if (backend or "redis") == "redis" and redis_client is not None:
+            self.registry = RedisSessionRegistry(redis_client)
+        else:
+            self.registry = MemorySessionRegistry()
 
     def authenticate(self, sid, user_id):
-        """Authenticate a session"""
-        self.sessions[sid] = {
-            "user_id": user_id,
-            "last_active": datetime.now(),
-        }
+        """
+        Authenticate a session
+
+        Returns:
+            True if this is the user's first connection (cluster-wide with
+            the Redis backend)
+        """
+        first_connection = self.registry.add(sid, user_id)
         print(f"Authenticated session {sid} for user {user_id}")
+        return first_connection
 
     def is_authenticated(self, sid):
         """Check if a session is authenticated"""
-        return sid in self.sessions
+        return self.registry.contains(sid)
 
     def get_user_id(self, sid):
         """Get user ID for a session"""
-        if sid in self.sessions:
-            return int(self.sessions[sid]["user_id"])
-        return None
+        return self.registry.get_user_id(sid)
 
     def update_activity(self, sid):
-        """Update last activity timestamp"""
-        if sid in self.sessions:
-            self.sessions[sid]["last_active"] = datetime.now()
+        """Update last activity timestamp (written to the registry in batches)"""
+        self.registry.touch(sid)
+
+    def flush_activity(self):
+        """Write batched activity updates to the shared registry"""
+        return self.registry.flush_activity()
 
     def remove_session(self, sid):
-        """Remove a session"""
-        if sid in self.sessions:
+        """
+        Remove a session
+
+        Returns:
+            True if it was the user's last connection
+        """
+        user_id, last_connection = self.registry.remove(sid)
+        if user_id is not None:
             print(f"Removing session {sid}")
-            del self.sessions[sid]
+        return last_connection
+
+    def get_user_sids(self, user_id):
+        """Get all sids a user is connected with"""
+        return self.registry.get_user_sids(user_id)
+
+    def is_user_online(self, user_id):
+        """Check if a user has at least one connection"""
+        return bool(self.registry.get_user_sids(user_id))
+
+    def online_user_count(self):
+        """Count distinct connected users"""
+        return self.registry.online_user_count()
+
+    def online_user_ids(self, user_ids):
+        """Get which of the given users have at least one connection (one round trip)"""
+        return self.registry.online_user_ids(user_ids)
+
+    def sweep_dead_workers(self):
+        """
+        Remove sids owned by workers that died without disconnecting them
+
+        Returns:
+            Users who are now offline
+        """
+        return self.registry.sweep_dead_workers()
 
     def cleanup_inactive(self, timeout_hours=24):
         """Remove inactive sessions"""
-        now = datetime.now()
-        timeout = timedelta(hours=timeout_hours)
-
-        inactive = [
-            sid
-            for sid, data in self.sessions.items()
-            if now - data["last_active"] > timeout
-        ]
+        cutoff = time.time() - timeout_hours * 3600
+        inactive = self.registry.expire_inactive(cutoff)
 
         for sid in inactive:
             print(f"Cleaning up inactive session {sid}")
-            self.remove_session(sid)
 
         return len(inactive)
 
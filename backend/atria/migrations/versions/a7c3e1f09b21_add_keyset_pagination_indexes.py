@@ -0,0 +1,37 @@
+"""Add keyset pagination indexes for chat and direct messages
+
+Revision ID: a7c3e1f09b21
+Revises: d52998f34f7e
+Create Date: 2025-12-02 10:14:27.381245
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e1f09b21'
+down_revision = 'd52998f34f7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Cursor pagination seeks on (created_at, id) within a room/thread,
+    # so the id tiebreaker has to be part of the index
+    op.create_index(
+        'idx_chat_messages_room_created_id',
+        'chat_messages',
+        ['room_id', 'created_at', 'id']
+    )
+
+    op.create_index(
+        'idx_dm_messages_thread_created_id',
+        'direct_messages',
+        ['thread_id', 'created_at', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('idx_dm_messages_thread_created_id', table_name='direct_messages')
+    op.drop_index('idx_chat_messages_room_created_id', table_name='chat_messages')
@@ -0,0 +1,50 @@
+"""Add per-user unread counters to direct message threads
+
+Revision ID: b4d92f6c1e08
+Revises: a7c3e1f09b21
+Create Date: 2025-12-03 09:41:12.518904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d92f6c1e08'
+down_revision = 'a7c3e1f09b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('direct_message_threads', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user1_unread_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('user2_unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing messages
+    op.execute("""
+        UPDATE direct_message_threads t SET
+            user1_unread_count = (
+                SELECT count(*) FROM direct_messages m
+                WHERE m.thread_id = t.id
+                  AND m.status = 'DELIVERED'
+                  AND m.sender_id != t.user1_id
+            ),
+            user2_unread_count = (
+                SELECT count(*) FROM direct_messages m
+                WHERE m.thread_id = t.id
+                  AND m.status = 'DELIVERED'
+                  AND m.sender_id != t.user2_id
+            )
+    """)
+
+    # Summing a user's counters reads only their threads
+    op.create_index('idx_dm_threads_user2', 'direct_message_threads', ['user2_id'])
+
+
+def downgrade():
+    op.drop_index('idx_dm_threads_user2', table_name='direct_message_threads')
+
+    with op.batch_alter_table('direct_message_threads', schema=None) as batch_op:
+        batch_op.drop_column('user2_unread_count')
+        batch_op.drop_column('user1_unread_count')
@@ -0,0 +1,62 @@
+"""Add full-text search vectors to chat and direct messages
+
+Revision ID: c81f3a5d7e42
+Revises: b4d92f6c1e08
+Create Date: 2025-12-04 14:22:08.730115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f3a5d7e42'
+down_revision = 'b4d92f6c1e08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated columns: Postgres keeps them in sync with content, and adding
+    # them backfills existing rows
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', coalesce(content, ''))", persisted=True),
+            nullable=True,
+        ))
+
+    # E2EE messages are never indexed
+    with op.batch_alter_table('direct_messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "CASE WHEN encrypted_content IS NULL "
+                "THEN to_tsvector('english', coalesce(content, '')) END",
+                persisted=True,
+            ),
+            nullable=True,
+        ))
+
+    op.create_index(
+        'idx_chat_messages_search', 'chat_messages', ['search_vector'],
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'idx_dm_messages_search', 'direct_messages', ['search_vector'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade():
+    op.drop_index('idx_dm_messages_search', table_name='direct_messages')
+    op.drop_index('idx_chat_messages_search', table_name='chat_messages')
+
+    with op.batch_alter_table('direct_messages', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
+
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
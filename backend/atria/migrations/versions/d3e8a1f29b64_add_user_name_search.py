@@ -0,0 +1,48 @@
+"""Add name search vector and name sort index to users
+
+Revision ID: d3e8a1f29b64
+Revises: c81f3a5d7e42
+Create Date: 2025-12-09 10:41:52.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3e8a1f29b64'
+down_revision = 'c81f3a5d7e42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 'simple' config: names aren't stemmed, and searches match word prefixes
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'name_search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(first_name, '') || ' ' || "
+                "coalesce(last_name, '') || ' ' || coalesce(company_name, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ))
+
+    op.create_index(
+        'idx_users_name_search', 'users', ['name_search_vector'],
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'idx_users_name_sort', 'users', ['last_name', 'first_name', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('idx_users_name_sort', table_name='users')
+    op.drop_index('idx_users_name_search', table_name='users')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('name_search_vector')
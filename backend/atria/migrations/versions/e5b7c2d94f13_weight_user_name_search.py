@@ -0,0 +1,50 @@
+"""Weight company apart from names in the user search vector
+
+Revision ID: e5b7c2d94f13
+Revises: d3e8a1f29b64
+Create Date: 2025-12-12 14:06:27.520931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7c2d94f13'
+down_revision = 'd3e8a1f29b64'
+branch_labels = None
+depends_on = None
+
+
+def _replace_vector(expression):
+    # A generated column's expression can't be altered; drop and re-add it
+    op.drop_index('idx_users_name_search', table_name='users')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('name_search_vector')
+        batch_op.add_column(sa.Column(
+            'name_search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(expression, persisted=True),
+            nullable=True,
+        ))
+    op.create_index(
+        'idx_users_name_search', 'users', ['name_search_vector'],
+        postgresql_using='gin'
+    )
+
+
+def upgrade():
+    # Names weighted A, company B: searches skip B where the company is hidden
+    _replace_vector(
+        "setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || "
+        "coalesce(last_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(company_name, '')), 'B')"
+    )
+
+
+def downgrade():
+    _replace_vector(
+        "to_tsvector('simple', coalesce(first_name, '') || ' ' || "
+        "coalesce(last_name, '') || ' ' || coalesce(company_name, ''))"
+    )
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Load test for the Socket.IO real-time layer (chat, presence, DMs)
+
+Seeds a throwaway event with N attendees, chat rooms and connected DM pairs,
+then drives the real socket handlers in-process through Flask-SocketIO test
+clients:
+
+    connect -> join_chat_room -> chat_message -> typing_in_dm
+            -> send_direct_message -> disconnect
+
+For every action it reports:
+- handler latency (emit until the handler returned), p50/p95/p99
+- delivery latency (emit until each recipient got the broadcast), p50/p95/p99
+- throughput (actions/s and deliveries/s)
+- database statements, Redis commands and Redis round trips per action
+
+Everything runs in one process with no network in between, so the numbers
+are the server-side cost of each event: use them to compare branches and to
+size workers, not as end-to-end client latency. Redis is whatever
+--redis-url points at (a local redis-server is enough; "none" runs the
+in-memory fallback). The Socket.IO message queue is always disabled because
+test clients can't use it.
+
+Usage:
+    SQLALCHEMY_DATABASE_URI=postgresql+psycopg://... \\
+        python scripts/socket_load_test.py --users 200 --rooms 4 --messages 10
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from socketio import packet as sio_packet
+from sqlalchemy import delete, event as sa_event
+
+from api import config
+from api.app import create_app
+from api.extensions import db, socketio
+from api.models import (
+    ChatMessage,
+    ChatRoom,
+    Connection,
+    DirectMessage,
+    DirectMessageThread,
+    Event,
+    EventUser,
+    Organization,
+    User,
+)
+from api.models.enums import ChatRoomType, ConnectionStatus, EventUserRole
+from api.services.chat_write_buffer import chat_write_buffer
+
+
+class OpCounter:
+    """Counts database statements and Redis commands/round trips"""
+
+    def __init__(self):
+        self.db = 0
+        self.redis = 0
+        self.round_trips = 0
+
+    def snapshot(self):
+        return self.db, self.redis, self.round_trips
+
+    def on_cursor_execute(self, *args, **kwargs):
+        self.db += 1
+
+    def instrument_redis(self, client):
+        """Wrap a Redis client's commands and pipelines to count them"""
+        if client is None:
+            return
+        execute_command = client.execute_command
+        make_pipeline = client.pipeline
+
+        def counted_execute_command(*args, **kwargs):
+            self.redis += 1
+            self.round_trips += 1
+            return execute_command(*args, **kwargs)
+
+        def counted_pipeline(*args, **kwargs):
+            pipe = make_pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            def counted_execute(*exec_args, **exec_kwargs):
+                self.redis += len(pipe.command_stack)
+                self.round_trips += 1
+                return execute(*exec_args, **exec_kwargs)
+
+            pipe.execute = counted_execute
+            return pipe
+
+        client.execute_command = counted_execute_command
+        client.pipeline = counted_pipeline
+
+
+class DeliveryRecorder:
+    """Timestamps server -> client packets for the event being measured"""
+
+    def __init__(self):
+        self.watch = None
+        self.started = 0.0
+        self.samples = []
+
+    def record(self, pkt):
+        if (
+            self.watch
+            and pkt.packet_type in (sio_packet.EVENT, sio_packet.BINARY_EVENT)
+            and pkt.data[0] == self.watch
+        ):
+            self.samples.append(time.perf_counter() - self.started)
+
+    def install(self, server):
+        send_packet = server._send_packet
+        send_eio_packet = server._send_eio_packet
+
+        def recording_send_packet(eio_sid, pkt):
+            self.record(pkt)
+            return send_packet(eio_sid, pkt)
+
+        def recording_send_eio_packet(eio_sid, eio_pkt):
+            # Broadcasts arrive here already encoded, once per recipient
+            if self.watch and isinstance(eio_pkt.data, str):
+                self.record(sio_packet.Packet(encoded_packet=eio_pkt.data))
+            return send_eio_packet(eio_sid, eio_pkt)
+
+        server._send_packet = recording_send_packet
+        server._send_eio_packet = recording_send_eio_packet
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of seconds, in milliseconds"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index] * 1000
+
+
+def summarize(name, handler_samples, delivery_samples, wall, ops, errors):
+    count = len(handler_samples)
+    db_ops, redis_ops, round_trips = ops
+    return {
+        "action": name,
+        "count": count,
+        "errors": errors,
+        "handler_ms": {p: percentile(handler_samples, p) for p in (50, 95, 99)},
+        "delivery_ms": {p: percentile(delivery_samples, p) for p in (50, 95, 99)},
+        "deliveries": len(delivery_samples),
+        "actions_per_s": count / wall if wall else 0,
+        "deliveries_per_s": len(delivery_samples) / wall if wall else 0,
+        "db_per_action": db_ops / count if count else 0,
+        "redis_per_action": redis_ops / count if count else 0,
+        "round_trips_per_action": round_trips / count if count else 0,
+    }
+
+
+def run_phase(name, actions, watch, clients, counter, recorder):
+    """
+    Emit each (client, event, payload) in order and measure it
+
+    Args:
+        name: Label for the report
+        actions: List of (client, event, payload) tuples
+        watch: Server event whose delivery is timed (None for no fan-out)
+        clients: All clients, whose queues are drained after the phase
+
+    Returns:
+        Summary dict (see summarize)
+    """
+    handler_samples = []
+    errors = 0
+    recorder.watch = watch
+    recorder.samples = []
+    before = counter.snapshot()
+    phase_started = time.perf_counter()
+
+    for client, event_name, payload in actions:
+        recorder.started = time.perf_counter()
+        client.emit(event_name, payload)
+        handler_samples.append(time.perf_counter() - recorder.started)
+        errors += sum(1 for pkt in client.queue if pkt["name"] == "error")
+        client.queue = []
+
+    wall = time.perf_counter() - phase_started
+    recorder.watch = None
+    ops = tuple(after - b for after, b in zip(counter.snapshot(), before))
+    for client in clients:
+        client.queue = []
+    return summarize(name, handler_samples, recorder.samples, wall, ops, errors)
+
+
+def seed(args, tag):
+    """Create the event, attendees, chat rooms and connected DM pairs"""
+    password_hash = User(password="LoadTest123!").password
+
+    organization = Organization(name=f"Load test {tag}")
+    db.session.add(organization)
+    db.session.flush()
+
+    start = date.today() + timedelta(days=1)
+    event = Event(
+        organization_id=organization.id,
+        title=f"Load test {tag}",
+        event_type="CONFERENCE",
+        start_date=start,
+        end_date=start + timedelta(days=1),
+        company_name="Load test",
+        slug=f"load-test-{tag}",
+        status="PUBLISHED",
+    )
+    db.session.add(event)
+    db.session.flush()
+
+    users = []
+    for i in range(args.users):
+        user = User(
+            email=f"loadtest-{tag}-{i}@example.com",
+            first_name="Load",
+            last_name=f"Tester {i}",
+            social_links={},
+            email_verified=True,
+        )
+        user._password = password_hash
+        users.append(user)
+    db.session.add_all(users)
+    db.session.flush()
+
+    db.session.add_all(
+        EventUser(event_id=event.id, user_id=user.id, role=EventUserRole.ATTENDEE)
+        for user in users
+    )
+    rooms = [
+        ChatRoom(
+            event_id=event.id,
+            name=f"Room {i}",
+            room_type=ChatRoomType.GLOBAL,
+            display_order=i,
+        )
+        for i in range(args.rooms)
+    ]
+    db.session.add_all(rooms)
+
+    threads = []
+    for first, second in zip(users[::2], users[1::2]):
+        db.session.add(
+            Connection(
+                requester_id=first.id,
+                recipient_id=second.id,
+                status=ConnectionStatus.ACCEPTED,
+                icebreaker_message="Load test",
+                originating_event_id=event.id,
+            )
+        )
+        thread = DirectMessageThread(
+            user1_id=min(first.id, second.id), user2_id=max(first.id, second.id)
+        )
+        threads.append((first.id, second.id, thread))
+        db.session.add(thread)
+    db.session.commit()
+
+    return (
+        organization.id,
+        event.id,
+        [user.id for user in users],
+        [room.id for room in rooms],
+        [(first, second, thread.id) for first, second, thread in threads],
+    )
+
+
+def cleanup(organization_id, event_id, user_ids, room_ids, threads):
+    """Delete everything seed created"""
+    thread_ids = [thread_id for _, _, thread_id in threads]
+    db.session.rollback()
+    db.session.execute(delete(DirectMessage).where(DirectMessage.thread_id.in_(thread_ids)))
+    db.session.execute(delete(DirectMessageThread).where(DirectMessageThread.id.in_(thread_ids)))
+    db.session.execute(delete(ChatMessage).where(ChatMessage.room_id.in_(room_ids)))
+    db.session.execute(delete(ChatRoom).where(ChatRoom.id.in_(room_ids)))
+    db.session.execute(delete(Connection).where(Connection.requester_id.in_(user_ids)))
+    db.session.execute(delete(EventUser).where(EventUser.event_id == event_id))
+    db.session.execute(delete(Event).where(Event.id == event_id))
+    db.session.execute(delete(Organization).where(Organization.id == organization_id))
+    db.session.execute(delete(User).where(User.id.in_(user_ids)))
+    db.session.commit()
+
+
+def run(app, args):
+    from flask_jwt_extended import create_access_token
+
+    from api import extensions
+
+    counter = OpCounter()
+    recorder = DeliveryRecorder()
+    results = []
+    tag = uuid.uuid4().hex[:8]
+
+    with app.app_context():
+        sa_event.listen(db.engine, "before_cursor_execute", counter.on_cursor_execute)
+        for client in {
+            id(c): c
+            for c in (
+                extensions.redis_client,
+                extensions.cache_redis,
+                extensions.presence_redis,
+            )
+            if c is not None
+        }.values():
+            counter.instrument_redis(client)
+
+        organization_id, event_id, user_ids, room_ids, threads = seed(args, tag)
+        tokens = {
+            user_id: create_access_token(identity=str(user_id)) for user_id in user_ids
+        }
+
+    try:
+        # Connect
+        clients = {}
+        samples = []
+        refused = 0
+        before = counter.snapshot()
+        started = time.perf_counter()
+        for user_id in user_ids:
+            connect_started = time.perf_counter()
+            client = socketio.test_client(app, auth={"token": tokens[user_id]})
+            samples.append(time.perf_counter() - connect_started)
+            if client.is_connected():
+                clients[user_id] = client
+            else:
+                refused += 1
+        ops = tuple(after - b for after, b in zip(counter.snapshot(), before))
+        results.append(
+            summarize("connect", samples, [], time.perf_counter() - started, ops, refused)
+        )
+        connected = list(clients.values())
+        for client in connected:
+            client.queue = []
+
+        # Every TestClient reinstalls the server hooks, so record after connecting
+        recorder.install(socketio.server)
+
+        room_of = {
+            user_id: room_ids[i % len(room_ids)] for i, user_id in enumerate(clients)
+        }
+        results.append(
+            run_phase(
+                "join_chat_room",
+                [
+                    (client, "join_chat_room", {"room_id": room_of[user_id]})
+                    for user_id, client in clients.items()
+                ],
+                "chat_room_joined",
+                connected,
+                counter,
+                recorder,
+            )
+        )
+
+        results.append(
+            run_phase(
+                "chat_message",
+                [
+                    (
+                        client,
+                        "chat_message",
+                        {"room_id": room_of[user_id], "content": f"Message {n}"},
+                    )
+                    for n in range(args.messages)
+                    for user_id, client in clients.items()
+                ],
+                "new_chat_message",
+                connected,
+                counter,
+                recorder,
+            )
+        )
+
+        dm_senders = [
+            (clients[sender], thread_id)
+            for first, second, thread_id in threads
+            for sender in (first, second)
+            if first in clients and second in clients
+        ]
+        results.append(
+            run_phase(
+                "typing_in_dm",
+                [
+                    (client, "typing_in_dm", {"thread_id": thread_id, "is_typing": is_typing})
+                    for _ in range(args.dms)
+                    for client, thread_id in dm_senders
+                    for is_typing in (True, False)
+                ],
+                "typing_in_dm",
+                connected,
+                counter,
+                recorder,
+            )
+        )
+
+        results.append(
+            run_phase(
+                "send_direct_message",
+                [
+                    (client, "send_direct_message", {"thread_id": thread_id, "content": f"DM {n}"})
+                    for n in range(args.dms)
+                    for client, thread_id in dm_senders
+                ],
+                "new_direct_message",
+                connected,
+                counter,
+                recorder,
+            )
+        )
+
+        # Disconnect
+        samples = []
+        before = counter.snapshot()
+        started = time.perf_counter()
+        for client in connected:
+            disconnect_started = time.perf_counter()
+            client.disconnect()
+            samples.append(time.perf_counter() - disconnect_started)
+        ops = tuple(after - b for after, b in zip(counter.snapshot(), before))
+        results.append(
+            summarize("disconnect", samples, [], time.perf_counter() - started, ops, 0)
+        )
+    finally:
+        if not args.keep:
+            with app.app_context():
+                chat_write_buffer.flush()
+                cleanup(organization_id, event_id, user_ids, room_ids, threads)
+
+    return results
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def print_report(results, args):
+    print(
+        f"\nSocket.IO load test: {args.users} users, {args.rooms} rooms, "
+        f"{args.messages} messages and {args.dms} DMs per user\n"
+    )
+    header = (
+        f"{'action':<20}{'count':>7}{'err':>5}"
+        f"{'p50':>8}{'p95':>8}{'p99':>8}"
+        f"{'dlv p50':>9}{'dlv p95':>9}{'dlv p99':>9}"
+        f"{'act/s':>9}{'dlv/s':>9}{'db/act':>8}{'redis/act':>10}{'rt/act':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['action']:<20}{r['count']:>7}{r['errors']:>5}"
+            f"{format_ms(r['handler_ms'][50]):>8}{format_ms(r['handler_ms'][95]):>8}"
+            f"{format_ms(r['handler_ms'][99]):>8}"
+            f"{format_ms(r['delivery_ms'][50]):>9}{format_ms(r['delivery_ms'][95]):>9}"
+            f"{format_ms(r['delivery_ms'][99]):>9}"
+            f"{r['actions_per_s']:>9.0f}{r['deliveries_per_s']:>9.0f}"
+            f"{r['db_per_action']:>8.1f}{r['redis_per_action']:>10.1f}"
+            f"{r['round_trips_per_action']:>8.1f}"
+        )
+    print("\nLatencies in ms; dlv = delivery to each recipient; rt = Redis round trips")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=50, help="Attendees to simulate")
+    parser.add_argument("--rooms", type=int, default=3, help="Chat rooms to spread them over")
+    parser.add_argument("--messages", type=int, default=5, help="Chat messages per user")
+    parser.add_argument("--dms", type=int, default=2, help="DMs (and typing pairs) per user")
+    parser.add_argument(
+        "--redis-url",
+        default=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        help='Redis to use (DB 2 and 3 are used too); "none" for in-memory mode',
+    )
+    parser.add_argument(
+        "--write-behind", action="store_true", help="Enable CHAT_WRITE_BEHIND"
+    )
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    parser.add_argument("--keep", action="store_true", help="Don't delete the seeded data")
+    parser.add_argument("--verbose", action="store_true", help="Show handler output")
+    args = parser.parse_args()
+    args.users = max(args.users, 2)
+    args.rooms = max(args.rooms, 1)
+
+    config.REDIS_URL = None if args.redis_url == "none" else args.redis_url
+    config.SOCKETIO_REDIS_URL = None
+    config.SOCKETIO_ASYNC_MODE = "threading"
+    config.SOCKET_CONNECT_RATE = 0  # Measure the handlers, not the limiter
+    config.CHAT_WRITE_BEHIND = args.write_behind
+    if not args.verbose:
+        config.SOCKETIO_LOGGER = False
+        config.SOCKETIO_ENGINEIO_LOGGER = False
+
+    # Handlers print on every event; keep the report readable
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(open(os.devnull, "w")))
+        app = create_app()
+        if not args.verbose:
+            app.logger.setLevel(logging.WARNING)
+        results = run(app, args)
+
+    print_report(results, args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
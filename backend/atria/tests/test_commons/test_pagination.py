@@ -0,0 +1,160 @@
+"""
+Tests for cursor (keyset) pagination in api/commons/pagination.py.
+
+Cursor pages must cover every row exactly once, in order, even when many
+rows share the same created_at, and must not depend on COUNT/OFFSET.
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from api.commons.pagination import (
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+    keyset_page,
+)
+from api.models import ChatRoom, ChatMessage
+from api.models.enums import ChatRoomType, EventUserRole
+from api.schemas import ChatMessageSchema
+from api.services.chat_room import ChatRoomService
+
+
+@pytest.fixture
+def room_with_messages(db, user_factory, event_factory):
+    user = user_factory()
+    event = event_factory()
+    event.add_user(user, EventUserRole.ATTENDEE)
+    room = ChatRoom(event_id=event.id, name="General", room_type=ChatRoomType.GLOBAL)
+    db.session.add(room)
+    db.session.flush()
+
+    # Pairs of messages share a timestamp so the id tiebreaker matters
+    for i in range(7):
+        created_at = datetime(2025, 1, 1, 12, 0, i // 2, tzinfo=timezone.utc)
+        db.session.add(
+            ChatMessage(room_id=room.id, user_id=user.id, content=f"m{i}", created_at=created_at)
+        )
+    db.session.commit()
+    return room, user
+
+
+class TestCursorEncoding:
+    """Test the opaque cursor format"""
+
+    def test_roundtrip(self):
+        created_at = datetime(2025, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        cursor = encode_cursor([created_at, 42])
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == [created_at, 42]
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestKeysetPage:
+    """Test seeking through a query page by page"""
+
+    def test_pages_cover_every_row_once(self, room_with_messages):
+        room, _ = room_with_messages
+        query = ChatMessage.query.filter_by(room_id=room.id)
+        columns = (ChatMessage.created_at, ChatMessage.id)
+
+        seen, cursor = [], None
+        while True:
+            items, cursor = keyset_page(query, columns, cursor=cursor, per_page=3)
+            seen.extend(message.content for message in items)
+            if cursor is None:
+                break
+
+        expected = [
+            m.content
+            for m in query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+        ]
+        assert seen == expected
+        assert len(seen) == 7
+
+    def test_ascending(self, room_with_messages):
+        room, _ = room_with_messages
+        query = ChatMessage.query.filter_by(room_id=room.id)
+
+        items, cursor = keyset_page(
+            query, (ChatMessage.created_at, ChatMessage.id), per_page=10, descending=False
+        )
+
+        assert [m.content for m in items] == [f"m{i}" for i in range(7)]
+        assert cursor is None
+
+    def test_estimate_count(self, room_with_messages):
+        room, _ = room_with_messages
+        estimate = estimate_count(ChatMessage.query.filter_by(room_id=room.id))
+
+        assert isinstance(estimate, int)
+
+
+class TestCursorPaginateEnvelope:
+    """Test the response envelope in cursor mode"""
+
+    def test_chat_messages_cursor_mode(self, app, room_with_messages):
+        room, user = room_with_messages
+        url = f"/api/chat-rooms/{room.id}/messages"
+
+        with app.test_request_context(f"{url}?cursor=&per_page=4&count=exact"):
+            first = ChatRoomService.get_chat_messages(room.id, user.id, ChatMessageSchema(many=True))
+
+        assert first["total_items"] == 7
+        assert first["total_pages"] == 2
+        assert len(first["messages"]) == 4
+        assert first["next_cursor"]
+        assert "cursor=" in first["next"]
+
+        with app.test_request_context(f"{url}?cursor={first['next_cursor']}&per_page=4"):
+            second = ChatRoomService.get_chat_messages(room.id, user.id, ChatMessageSchema(many=True))
+
+        assert second["total_items"] is None
+        assert second["next_cursor"] is None
+        assert second["next"] is None
+        ids = {m["id"] for m in first["messages"]} | {m["id"] for m in second["messages"]}
+        assert len(ids) == 7
+
+    def test_page_mode_unchanged(self, app, room_with_messages):
+        room, user = room_with_messages
+
+        with app.test_request_context(f"/api/chat-rooms/{room.id}/messages?page=2&per_page=4"):
+            result = ChatRoomService.get_chat_messages(room.id, user.id, ChatMessageSchema(many=True))
+
+        assert result["current_page"] == 2
+        assert result["total_items"] == 7
+        assert "next_cursor" not in result
+
+
+class TestDirectMessageCursor:
+    """Test keyset mode for socket/HTTP thread message pages"""
+
+    def test_thread_messages_by_cursor(self, db, user_factory):
+        from api.models import DirectMessage, DirectMessageThread
+        from api.services.direct_message import DirectMessageService
+
+        sender, recipient = user_factory(), user_factory()
+        thread = DirectMessageThread(user1_id=sender.id, user2_id=recipient.id)
+        db.session.add(thread)
+        db.session.flush()
+        for i in range(5):
+            db.session.add(
+                DirectMessage(thread_id=thread.id, sender_id=sender.id, content=f"dm{i}")
+            )
+        db.session.commit()
+
+        first = DirectMessageService.get_thread_messages(
+            thread.id, recipient.id, per_page=3, cursor=""
+        )
+        second = DirectMessageService.get_thread_messages(
+            thread.id, recipient.id, per_page=3, cursor=first["pagination"]["next_cursor"]
+        )
+
+        assert first["pagination"]["has_more"] is True
+        assert second["pagination"]["has_more"] is False
+        contents = [m.content for m in first["messages"] + second["messages"]]
+        assert sorted(contents) == [f"dm{i}" for i in range(5)]
@@ -0,0 +1,107 @@
+"""
+Tests for the request-scoped principal context (api/commons/principal.py).
+
+The principal replaces repeated User/Event/EventUser lookups in access
+decorators and services, so it must agree with Event.user_can_access() and
+Event.get_user_role(), and must never leak between requests.
+"""
+from flask import g
+
+from api.commons.principal import (
+    get_current_user,
+    get_event_principal,
+    get_event_role,
+    peek_event_principal,
+)
+from api.models import OrganizationUser
+from api.models.enums import EventUserRole, OrganizationUserRole
+
+
+class TestEventPrincipal:
+    """Test principal resolution rules"""
+
+    def test_member_role_and_access(self, app, db, user_factory, event_factory):
+        user = user_factory()
+        event = event_factory()
+        event.add_user(user, EventUserRole.SPEAKER)
+        db.session.commit()
+
+        with app.test_request_context():
+            principal = get_event_principal(event.id, user.id)
+
+            assert principal.can_access is True
+            assert principal.role == EventUserRole.SPEAKER
+            assert principal.is_banned is False
+            assert principal.role == event.get_user_role(user)
+
+    def test_org_owner_treated_as_admin(self, app, db, user_factory, event_factory):
+        owner = user_factory()
+        event = event_factory()
+        db.session.add(
+            OrganizationUser(
+                organization_id=event.organization_id,
+                user_id=owner.id,
+                role=OrganizationUserRole.OWNER,
+            )
+        )
+        db.session.commit()
+
+        with app.test_request_context():
+            principal = get_event_principal(event.id, owner.id)
+
+            assert principal.is_member is False
+            assert principal.can_access is True
+            assert principal.role == EventUserRole.ADMIN
+
+    def test_non_member_has_no_access(self, app, db, user_factory, event_factory):
+        outsider = user_factory()
+        event = event_factory()
+
+        with app.test_request_context():
+            principal = get_event_principal(event.id, outsider.id)
+
+            assert principal.can_access is False
+            assert principal.role is None
+
+    def test_banned_member(self, app, db, user_factory, event_factory):
+        user = user_factory()
+        event = event_factory()
+        event_user = event.add_user(user, EventUserRole.ATTENDEE)
+        event_user.is_banned = True
+        db.session.commit()
+
+        with app.test_request_context():
+            assert get_event_principal(event.id, user.id).is_banned is True
+
+
+class TestPrincipalCaching:
+    """Test request scoping of the cache"""
+
+    def test_resolved_once_per_request(self, app, db, user_factory, event_factory):
+        user = user_factory()
+        event = event_factory()
+        event.add_user(user, EventUserRole.ATTENDEE)
+        db.session.commit()
+
+        with app.test_request_context():
+            first = get_event_principal(event.id, user.id)
+            second = get_event_principal(event.id, user.id)
+
+            assert first is second
+            assert g.event_principal is first
+            assert g.current_user is get_current_user(user.id)
+            assert peek_event_principal(event.id, user.id) is first
+            assert get_event_role(event, user) == EventUserRole.ATTENDEE
+
+    def test_not_shared_between_requests(self, app, db, user_factory, event_factory):
+        user = user_factory()
+        event = event_factory()
+        event.add_user(user, EventUserRole.ATTENDEE)
+        db.session.commit()
+
+        with app.test_request_context():
+            first = get_event_principal(event.id, user.id)
+
+        with app.test_request_context():
+            assert peek_event_principal(event.id, user.id) is None
+            assert get_event_principal(event.id, user.id) is not first
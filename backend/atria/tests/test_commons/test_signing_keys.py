@@ -0,0 +1,198 @@
+"""
+Tests for the per-worker signing key and token cache (api/commons/signing_keys.py).
+
+Keys are parsed once per organization and credential set, tokens are reused
+within the reuse window, and new credentials are used as soon as they're saved.
+"""
+import base64
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from api.commons import signing_keys
+from api.commons.encryption import encrypt_secret
+from api.commons.signing_keys import TOKEN_REUSE_WINDOW, token_expiry
+from api.services import jaas_service
+from api.services.jaas_service import JaaSService
+from api.services.mux_playback_service import MuxPlaybackService
+from tests.factories.organization_factory import OrganizationFactory
+from tests.factories.user_factory import UserFactory
+
+
+def make_key():
+    """RSA key and its unencrypted PKCS8 PEM"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    return key, pem
+
+
+def mux_secret(pem):
+    """Mux private keys are provided base64-encoded"""
+    return base64.b64encode(pem.encode()).decode()
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    """Keep a test's tokens in one reuse window, however close to its end it starts"""
+    now = time.time()
+    clock = SimpleNamespace(time=lambda: now)
+    monkeypatch.setattr(signing_keys, "time", clock)
+    monkeypatch.setattr(jaas_service, "time", clock)
+
+
+@pytest.fixture
+def key_loads(monkeypatch):
+    """Count PEM parses"""
+    calls = []
+    load = serialization.load_pem_private_key
+
+    def counting_load(*args, **kwargs):
+        calls.append(args)
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(serialization, "load_pem_private_key", counting_load)
+    return calls
+
+
+@pytest.fixture
+def mux_org(db):
+    key, pem = make_key()
+    org = OrganizationFactory()
+    org.set_mux_credentials(
+        token_id="token-id",
+        token_secret="token-secret",
+        signing_key_id="signing-key-id",
+        signing_private_key=mux_secret(pem),
+    )
+    db.session.commit()
+    return org, key
+
+
+@pytest.fixture
+def jaas_org(db):
+    key, pem = make_key()
+    org = OrganizationFactory()
+    org.set_jaas_credentials(app_id="vpaas-magic-cookie-test", api_key="api-key", private_key=pem)
+    db.session.commit()
+    return org, key
+
+
+def mux_tokens(org, playback_id="playback-a"):
+    return MuxPlaybackService.get_playback_url(org, playback_id, "SIGNED", 3600)["tokens"]
+
+
+class TestTokenExpiry:
+    """Test token_expiry rounding"""
+
+    def test_rounds_up_to_the_reuse_window(self):
+        now = 10 * TOKEN_REUSE_WINDOW + 1
+
+        assert token_expiry(3600, now) == 3600 + 11 * TOKEN_REUSE_WINDOW
+        assert token_expiry(3600, now + TOKEN_REUSE_WINDOW - 2) == token_expiry(3600, now)
+        assert token_expiry(3600, 10 * TOKEN_REUSE_WINDOW) == 3600 + 10 * TOKEN_REUSE_WINDOW
+
+
+class TestMuxSigning:
+    """Test MuxPlaybackService key and token reuse"""
+
+    def test_viewers_share_tokens_and_key(self, db, mux_org, key_loads):
+        org, key = mux_org
+
+        first = mux_tokens(org)
+        second = mux_tokens(org)
+        other = mux_tokens(org, "playback-b")
+
+        assert first == second
+        assert first is not second
+        assert other["playback"] != first["playback"]
+        assert len(key_loads) == 1
+
+        claims = jwt.decode(first["playback"], key.public_key(), algorithms=["RS256"], audience="v")
+        assert claims["sub"] == "playback-a"
+        assert claims["exp"] % TOKEN_REUSE_WINDOW == 0
+
+    def test_new_credentials_are_used_immediately(self, db, mux_org, key_loads):
+        org, _ = mux_org
+        old = mux_tokens(org)
+
+        new_key, new_pem = make_key()
+        org.set_mux_credentials(
+            token_id="token-id",
+            token_secret="token-secret",
+            signing_key_id="signing-key-id",
+            signing_private_key=mux_secret(new_pem),
+        )
+        db.session.commit()
+        new = mux_tokens(org)
+
+        assert new != old
+        jwt.decode(new["playback"], new_key.public_key(), algorithms=["RS256"], audience="v")
+
+    def test_credentials_saved_by_another_worker(self, db, mux_org, key_loads):
+        org, _ = mux_org
+        old = mux_tokens(org)
+
+        # Written without going through this worker's set_mux_credentials
+        new_key, new_pem = make_key()
+        org.mux_signing_private_key = encrypt_secret(mux_secret(new_pem))
+        db.session.commit()
+        new = mux_tokens(org)
+
+        assert new != old
+        jwt.decode(new["playback"], new_key.public_key(), algorithms=["RS256"], audience="v")
+        assert len(key_loads) == 2
+
+
+class TestJaasSigning:
+    """Test JaaSService key and token reuse"""
+
+    def test_tokens_are_per_user_and_reused(self, db, jaas_org, key_loads):
+        org, key = jaas_org
+        user, other_user = UserFactory(), UserFactory()
+
+        first = JaaSService.generate_token(org, "room-a", user)
+        again = JaaSService.generate_token(org, "room-a", user)
+        as_moderator = JaaSService.generate_token(org, "room-a", user, is_moderator=True)
+        other = JaaSService.generate_token(org, "room-a", other_user)
+
+        assert again == first
+        assert as_moderator["token"] != first["token"]
+        assert other["token"] != first["token"]
+        assert len(key_loads) == 1
+
+        claims = jwt.decode(first["token"], key.public_key(), algorithms=["RS256"], audience="jitsi")
+        assert claims["context"]["user"]["id"] == str(user.id)
+        assert claims["exp"] == first["expires_at"]
+
+    def test_profile_changes_are_not_served_stale(self, db, jaas_org):
+        org, _ = jaas_org
+        user = UserFactory(first_name="Old")
+        first = JaaSService.generate_token(org, "room-a", user)
+
+        user.first_name = "New"
+        db.session.commit()
+        second = JaaSService.generate_token(org, "room-a", user)
+
+        assert second["token"] != first["token"]
+
+    def test_new_credentials_are_used_immediately(self, db, jaas_org):
+        org, _ = jaas_org
+        user = UserFactory()
+        old = JaaSService.generate_token(org, "room-a", user)
+
+        new_key, new_pem = make_key()
+        org.set_jaas_credentials(app_id=org.jaas_app_id, api_key="new-api-key", private_key=new_pem)
+        db.session.commit()
+        new = JaaSService.generate_token(org, "room-a", user)
+
+        assert new["token"] != old["token"]
+        jwt.decode(new["token"], new_key.public_key(), algorithms=["RS256"], audience="jitsi")
+        assert jwt.get_unverified_header(new["token"])["kid"] == "new-api-key"
@@ -0,0 +1,148 @@
+"""
+Tests for the token blocklist state cache (api/auth/helpers.py).
+
+The blocklist check runs on every authenticated request, so token state is
+cached write-through in a per-process LRU and Redis. These tests verify the
+cache stays consistent with the TokenBlocklist table.
+"""
+import time
+
+import pytest
+from flask_jwt_extended import create_access_token, decode_token
+
+from api.commons.local_cache import LocalTTLCache
+from api.models import User
+from api.models.blocklist import TokenBlocklist
+
+
+class TestLocalTTLCache:
+    """Test the in-process LRU used as the L1 tier"""
+
+    def test_get_set_roundtrip(self):
+        cache = LocalTTLCache(maxsize=10)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert "a" in cache
+
+    def test_missing_returns_default(self):
+        cache = LocalTTLCache()
+        assert cache.get("missing") is None
+        assert cache.get("missing", "fallback") == "fallback"
+
+    def test_evicts_least_recently_used(self):
+        cache = LocalTTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now the oldest
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+
+    def test_entries_expire(self):
+        cache = LocalTTLCache()
+        cache.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+
+    def test_delete(self):
+        cache = LocalTTLCache()
+        cache.set("a", 1)
+        assert cache.delete("a") is True
+        assert cache.delete("a") is False
+
+
+class TestTokenStateCache:
+    """Test token state resolution and invalidation"""
+
+    @pytest.fixture
+    def user(self, db):
+        user = User(
+            email="tokens@sbtl.ai",
+            first_name="Token",
+            last_name="User",
+            password="Pass123!",
+        )
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    @pytest.fixture(autouse=True)
+    def clear_local_cache(self):
+        from api.auth import helpers
+
+        helpers._local_token_states.clear()
+        yield
+        helpers._local_token_states.clear()
+
+    def _issue_token(self, app, user):
+        from api.auth.helpers import add_token_to_database
+
+        token = create_access_token(identity=str(user.id))
+        add_token_to_database(token, app.config["JWT_IDENTITY_CLAIM"])
+        return decode_token(token)
+
+    def test_new_token_is_active(self, app, user):
+        from api.auth.helpers import get_token_state, is_token_revoked, TOKEN_ACTIVE
+
+        payload = self._issue_token(app, user)
+
+        assert get_token_state(payload) == TOKEN_ACTIVE
+        assert is_token_revoked(payload) is False
+
+    def test_cached_state_skips_database(self, app, user, db):
+        from api.auth.helpers import get_token_state, TOKEN_ACTIVE
+
+        payload = self._issue_token(app, user)
+
+        # Remove the row behind the cache's back - the cached state still wins
+        TokenBlocklist.query.filter_by(jti=payload["jti"]).delete()
+        db.session.commit()
+
+        assert get_token_state(payload) == TOKEN_ACTIVE
+
+    def test_revoke_updates_cached_state(self, app, user):
+        from api.auth.helpers import (
+            get_token_state,
+            is_token_revoked,
+            revoke_token,
+            TOKEN_ACTIVE,
+            TOKEN_REVOKED,
+        )
+
+        payload = self._issue_token(app, user)
+        assert get_token_state(payload) == TOKEN_ACTIVE
+
+        revoke_token(payload["jti"], user.id)
+
+        assert get_token_state(payload) == TOKEN_REVOKED
+        assert is_token_revoked(payload) is True
+
+    def test_unknown_token_is_revoked_for_helpers(self, app, user):
+        from api.auth.helpers import get_token_state, is_token_revoked, TOKEN_UNKNOWN
+
+        payload = decode_token(create_access_token(identity=str(user.id)))
+
+        assert get_token_state(payload) == TOKEN_UNKNOWN
+        assert is_token_revoked(payload) is True
+
+    def test_invalidate_forces_database_read(self, app, user, db):
+        from api.auth.helpers import (
+            get_token_state,
+            invalidate_token_state,
+            TOKEN_ACTIVE,
+            TOKEN_REVOKED,
+        )
+
+        payload = self._issue_token(app, user)
+        assert get_token_state(payload) == TOKEN_ACTIVE
+
+        # Revoke directly in the database, then drop the cached state
+        token = TokenBlocklist.query.filter_by(jti=payload["jti"]).one()
+        token.revoked = True
+        db.session.commit()
+        invalidate_token_state(payload["jti"])
+
+        assert get_token_state(payload) == TOKEN_REVOKED
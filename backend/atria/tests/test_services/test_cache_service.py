@@ -0,0 +1,251 @@
+"""
+Tests for CacheService tag-based invalidation.
+
+Invalidation must remove exactly the keys registered under a tag, without
+scanning the keyspace, and must leave unrelated keys alone.
+"""
+import pytest
+
+from api import extensions
+from api.services.cache_service import (
+    CacheService,
+    CacheKeys,
+    CacheInvalidation,
+    cache_result,
+)
+
+
+@pytest.fixture
+def redis(app):
+    if not extensions.cache_redis:
+        pytest.skip("Redis not available")
+    extensions.cache_redis.flushdb()
+    yield extensions.cache_redis
+    extensions.cache_redis.flushdb()
+
+
+class TestTagIndex:
+    """Test tag derivation and registration"""
+
+    def test_tags_for_key(self):
+        assert CacheService.tags_for_key("event:1") == ["event:1"]
+        assert CacheService.tags_for_key("event:1:sessions") == ["event:1"]
+        assert CacheService.tags_for_key("event:1:users:page:2") == [
+            "event:1",
+            "event:1:users",
+        ]
+        assert CacheService.tags_for_key("plain") == []
+
+    def test_set_registers_key_under_tags(self, redis):
+        CacheService.set(CacheKeys.event_users(7, page=3), {"ok": True})
+
+        assert redis.sismember("tag:event:7", "event:7:users:page:3")
+        assert redis.sismember("tag:event:7:users", "event:7:users:page:3")
+
+
+class TestInvalidateTags:
+    """Test tag-based invalidation"""
+
+    def test_invalidates_only_tagged_keys(self, redis):
+        CacheService.set(CacheKeys.event(1), {"id": 1})
+        CacheService.set(CacheKeys.event_sessions(1), [1, 2])
+        CacheService.set(CacheKeys.event(10), {"id": 10})
+
+        deleted = CacheService.invalidate_tags("event:1")
+
+        assert deleted == 2
+        assert CacheService.get(CacheKeys.event(1)) is None
+        assert CacheService.get(CacheKeys.event_sessions(1)) is None
+        assert CacheService.get(CacheKeys.event(10)) == {"id": 10}
+        assert not redis.exists("tag:event:1")
+
+    def test_batches_large_tags(self, redis, monkeypatch):
+        monkeypatch.setattr(CacheService, "DELETE_BATCH_SIZE", 3)
+        for page in range(1, 11):
+            CacheService.set(CacheKeys.event_users(2, page=page), [page])
+
+        assert CacheService.invalidate_tags("event:2:users") == 10
+        assert CacheService.get(CacheKeys.event_users(2, page=5)) is None
+
+    def test_event_updated(self, redis):
+        CacheService.set(CacheKeys.event_stats(3), {"count": 1})
+        CacheService.set(CacheKeys.organization_events(9, page=1), [3])
+        CacheService.set(CacheKeys.org_dashboard(9), {"events": 1})
+        CacheService.set(CacheKeys.organization_users(9), [1])
+
+        CacheInvalidation.event_updated(3, 9)
+
+        assert CacheService.get(CacheKeys.event_stats(3)) is None
+        assert CacheService.get(CacheKeys.organization_events(9, page=1)) is None
+        assert CacheService.get(CacheKeys.org_dashboard(9)) is None
+        assert CacheService.get(CacheKeys.organization_users(9)) == [1]
+
+    def test_invalidate_pattern_still_works(self, redis):
+        for i in range(5):
+            CacheService.set(f"legacy:{i}", i, tags=[])
+
+        assert CacheService.invalidate_pattern("legacy:*") == 5
+
+
+class TestCacheResultTags:
+    """Test tag registration from the cache_result decorator"""
+
+    def test_invalidate_all_and_custom_tags(self, redis):
+        calls = []
+
+        @cache_result(ttl=60, key_prefix="test_fn", tags=lambda x: [f"event:{x}"])
+        def compute(x):
+            calls.append(x)
+            return {"x": x}
+
+        compute(1)
+        compute(1)
+        compute(2)
+        assert calls == [1, 2]
+
+        CacheService.invalidate_tags("event:1")
+        compute(1)
+        compute(2)
+        assert calls == [1, 2, 1]
+
+        compute.invalidate_all()
+        compute(2)
+        assert calls == [1, 2, 1, 2]
+
+
+class TestLocalTier:
+    """Test the per-worker L1 in front of Redis"""
+
+    def test_local_hit_skips_redis(self, redis):
+        calls = []
+
+        @cache_result(ttl=60, key_prefix="test_l1_hit", local_ttl=30)
+        def compute(x):
+            calls.append(x)
+            return {"x": x}
+
+        assert compute(1) == {"x": 1}
+        redis.flushdb()  # L1 must not need Redis any more
+        assert compute(1) == {"x": 1}
+
+        assert calls == [1]
+        stats = compute.stats.as_dict()
+        assert stats["misses"] == 1
+        assert stats["local_hits"] == 1
+
+    def test_tag_invalidation_drops_local_copy(self, redis):
+        calls = []
+
+        @cache_result(
+            ttl=60, key_prefix="test_l1_tags", local_ttl=30, tags=lambda x: [f"event:{x}"]
+        )
+        def compute(x):
+            calls.append(x)
+            return [x]
+
+        compute(5)
+        CacheInvalidation.event_updated(5, 1)
+        compute(5)
+
+        assert calls == [5, 5]
+
+    def test_remote_invalidation_message(self, redis):
+        from api.services import cache_service
+
+        calls = []
+
+        @cache_result(ttl=60, key_prefix="test_l1_remote", local_ttl=30)
+        def compute(x):
+            calls.append(x)
+            return [x]
+
+        compute(1)
+        compute(2)
+        cache_service._handle_invalidation_message(
+            {"data": '{"origin": "other-worker", "tags": ["fn:test_l1_remote"]}'}
+        )
+        redis.flushdb()
+        compute(1)
+        compute(2)
+
+        assert calls == [1, 2, 1, 2]
+
+    def test_local_tier_without_redis(self, app, monkeypatch):
+        monkeypatch.setattr(extensions, "cache_redis", None)
+        calls = []
+
+        @cache_result(ttl=60, key_prefix="test_l1_no_redis", local_ttl=30)
+        def compute(x):
+            calls.append(x)
+            return x
+
+        compute(1)
+        compute(1)
+        compute.invalidate(1)
+        compute(1)
+
+        assert calls == [1, 1]
+
+
+class TestStampedeProtection:
+    """Test single-flight recompute and stale-while-revalidate"""
+
+    def test_fresh_value_is_served(self, redis):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        assert CacheService.get_or_compute("event:1:sessions", compute, ttl=60, beta=0) == {"n": 1}
+        assert CacheService.get_or_compute("event:1:sessions", compute, ttl=60, beta=0) == {"n": 1}
+        assert len(calls) == 1
+
+    def test_stale_value_served_while_locked(self, redis):
+        key = "event:2:sessions"
+        CacheService.get_or_compute(key, lambda: "old", ttl=0, stale_ttl=60, beta=0)
+
+        token = CacheService.acquire_lock(key)  # Another worker is recomputing
+        assert token is not None
+        try:
+            value = CacheService.get_or_compute(key, lambda: "new", ttl=60, beta=0)
+        finally:
+            CacheService.release_lock(key, token)
+
+        assert value == "old"
+
+    def test_stale_value_refreshed_by_lock_holder(self, redis):
+        key = "event:3:sessions"
+        CacheService.get_or_compute(key, lambda: "old", ttl=0, stale_ttl=60, beta=0)
+
+        assert CacheService.get_or_compute(key, lambda: "new", ttl=60, beta=0) == "new"
+        assert not redis.exists(CacheService._get_lock_key(key))
+
+    def test_cold_miss_waits_for_lock_holder(self, redis):
+        key = "event:4:sessions"
+        token = CacheService.acquire_lock(key)
+        CacheService.set(key, {"value": "theirs", "expires_at": 2**40, "delta": 0})
+
+        value = CacheService.get_or_compute(key, lambda: "mine", ttl=60, lock_wait=1)
+        CacheService.release_lock(key, token)
+
+        assert value == "theirs"
+
+    def test_lock_is_exclusive(self, redis):
+        token = CacheService.acquire_lock("event:5")
+        assert CacheService.acquire_lock("event:5") is None
+        CacheService.release_lock("event:5", "not-the-owner")
+        assert CacheService.acquire_lock("event:5") is None
+        CacheService.release_lock("event:5", token)
+        assert CacheService.acquire_lock("event:5") is not None
+
+    def test_cache_result_stale_stats(self, redis):
+        @cache_result(ttl=60, key_prefix="test_swr", stale_ttl=30)
+        def compute(x):
+            return [x]
+
+        assert compute(1) == [1]
+        assert compute(1) == [1]
+        stats = compute.stats.as_dict()
+        assert stats["misses"] == 1
+        assert stats["remote_hits"] + stats["misses"] == 2
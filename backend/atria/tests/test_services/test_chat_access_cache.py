@@ -0,0 +1,147 @@
+"""
+Tests for ChatAccessCache - per-socket chat room authorization.
+
+Grants are issued when a socket joins a room and reused by chat_message, so
+they must be refused where the full access check refuses, and must stop being
+trusted as soon as moderation changes the user's standing.
+"""
+import pytest
+from sqlalchemy import event as sa_event
+
+from api.models import ChatRoom, ChatMessage
+from api.models.enums import ChatRoomType, EventUserRole
+from api.services.chat_access_cache import ChatAccessCache
+from api.services.chat_room import ChatRoomService
+from api.services.moderation import ModerationService
+
+
+SID = "test-sid"
+
+
+@pytest.fixture(autouse=True)
+def clear_grants():
+    ChatAccessCache._grants.clear()
+    yield
+    ChatAccessCache._grants.clear()
+
+
+@pytest.fixture
+def room_setup(db, user_factory, event_factory):
+    admin = user_factory()
+    attendee = user_factory()
+    event = event_factory()
+    event.add_user(admin, EventUserRole.ADMIN)
+    event.add_user(attendee, EventUserRole.ATTENDEE)
+
+    room = ChatRoom(event_id=event.id, name="General", room_type=ChatRoomType.GLOBAL)
+    admin_room = ChatRoom(event_id=event.id, name="Admins", room_type=ChatRoomType.ADMIN)
+    db.session.add_all([room, admin_room])
+    db.session.commit()
+    return {
+        "event": event,
+        "admin": admin,
+        "attendee": attendee,
+        "room": room,
+        "admin_room": admin_room,
+    }
+
+
+class TestChatAccessGrants:
+    """Test issuing and reading grants"""
+
+    def test_join_issues_reusable_grant(self, room_setup):
+        attendee, room = room_setup["attendee"], room_setup["room"]
+
+        grant = ChatAccessCache.grant_for_join(SID, room.id, attendee.id)
+
+        assert grant is not None
+        assert grant.author["full_name"] == attendee.full_name
+        assert grant.can_use_chat() is True
+        assert ChatAccessCache.get(SID, str(room.id), attendee.id) is grant
+
+    def test_no_grant_without_room_access(self, room_setup, user_factory):
+        attendee = room_setup["attendee"]
+
+        assert ChatAccessCache.grant_for_join(SID, room_setup["admin_room"].id, attendee.id) is None
+        assert ChatAccessCache.grant_for_join(SID, room_setup["room"].id, user_factory().id) is None
+        assert ChatAccessCache.get(SID, room_setup["room"].id, attendee.id) is None
+
+    def test_grant_bound_to_user_and_sid(self, room_setup):
+        attendee, admin, room = room_setup["attendee"], room_setup["admin"], room_setup["room"]
+        ChatAccessCache.grant_for_join(SID, room.id, attendee.id)
+
+        assert ChatAccessCache.get(SID, room.id, admin.id) is None
+        assert ChatAccessCache.get("other-sid", room.id, attendee.id) is None
+
+    def test_revoke(self, room_setup):
+        attendee, room = room_setup["attendee"], room_setup["room"]
+        ChatAccessCache.grant_for_join(SID, room.id, attendee.id)
+
+        ChatAccessCache.revoke(SID)
+
+        assert ChatAccessCache.get(SID, room.id, attendee.id) is None
+
+
+class TestChatAccessInvalidation:
+    """Test that moderation invalidates grants"""
+
+    def test_chat_ban_invalidates_grant(self, room_setup):
+        event, admin, attendee, room = (
+            room_setup["event"],
+            room_setup["admin"],
+            room_setup["attendee"],
+            room_setup["room"],
+        )
+        ChatAccessCache.grant_for_join(SID, room.id, attendee.id)
+
+        ModerationService.chat_ban_user(
+            event.id, attendee.id, {"reason": "spam"}, banned_by_id=admin.id
+        )
+
+        assert ChatAccessCache.get(SID, room.id, attendee.id) is None
+        grant = ChatAccessCache.grant_for_join(SID, room.id, attendee.id)
+        assert grant.can_use_chat() is False
+
+    def test_room_invalidation(self, room_setup):
+        attendee, room = room_setup["attendee"], room_setup["room"]
+        ChatAccessCache.grant_for_join(SID, room.id, attendee.id)
+
+        ChatAccessCache.invalidate_room(room.id)
+
+        assert ChatAccessCache.get(SID, room.id, attendee.id) is None
+
+
+class TestSendWithGrant:
+    """Test the send path when a grant is available"""
+
+    def test_send_message_reads_nothing_before_insert(self, db, room_setup):
+        room_id, user_id = room_setup["room"].id, room_setup["attendee"].id
+        grant = ChatAccessCache.grant_for_join(SID, room_id, user_id)
+        db.session.expire_all()
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db.engine
+        sa_event.listen(engine, "before_cursor_execute", record)
+        try:
+            message = ChatRoomService.send_message(room_id, user_id, "hello", access=grant)
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", record)
+
+        assert statements
+        assert statements[0].lstrip().upper().startswith("INSERT")
+        assert ChatMessage.query.get(message.id).content == "hello"
+
+        data = ChatRoomService.format_message_for_response(message, author=grant.author)
+        assert data["user"] == grant.author
+
+    def test_send_message_rejects_blocked_grant(self, room_setup):
+        attendee, room = room_setup["attendee"], room_setup["room"]
+        grant = ChatAccessCache.grant_for_join(SID, room.id, attendee.id)
+        grant.is_blocked = True
+
+        with pytest.raises(ValueError):
+            ChatRoomService.send_message(room.id, attendee.id, "hello", access=grant)
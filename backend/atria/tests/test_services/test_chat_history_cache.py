@@ -0,0 +1,150 @@
+"""
+Tests for the recent-message ring buffer behind join_chat_room.
+
+A join must be served from Redis once the room's history is cached, new
+messages must show up in both views, and moderation must keep deleted
+messages out of the attendee view while moderators still see them.
+"""
+import pytest
+from sqlalchemy import event as sa_event
+
+from api import extensions
+from api.models import ChatMessage, ChatRoom
+from api.models.enums import ChatRoomType, EventUserRole
+from api.services.chat_history_cache import ChatHistoryCache
+from api.services.chat_room import ChatRoomService
+from api.sockets.chat_notifications import emit_new_chat_message
+
+
+@pytest.fixture
+def room_setup(db, user_factory, event_factory):
+    if extensions.cache_redis is None:
+        pytest.skip("Redis not available")
+    admin, attendee = user_factory(), user_factory()
+    event = event_factory()
+    event.add_user(admin, EventUserRole.ADMIN)
+    event.add_user(attendee, EventUserRole.ATTENDEE)
+    room = ChatRoom(event_id=event.id, name="Keynote", room_type=ChatRoomType.GLOBAL)
+    db.session.add(room)
+    db.session.flush()
+    db.session.add_all(
+        ChatMessage(room_id=room.id, user_id=attendee.id, content=f"m{i}") for i in range(3)
+    )
+    db.session.commit()
+    ChatHistoryCache.invalidate(room.id)
+    yield room, admin, attendee
+    ChatHistoryCache.invalidate(room.id)
+
+
+def count_statements(db, func):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sa_event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        result = func()
+    finally:
+        sa_event.remove(db.engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+class TestRecentMessages:
+    """Test serving join history from the ring buffer"""
+
+    def test_second_join_reads_no_rows(self, db, room_setup):
+        room, _, attendee = room_setup
+
+        first, _ = count_statements(
+            db, lambda: ChatRoomService.get_recent_messages(room.id, attendee.id, privileged=False)
+        )
+        second, queries = count_statements(
+            db, lambda: ChatRoomService.get_recent_messages(room.id, attendee.id, privileged=False)
+        )
+
+        assert [m["content"] for m in first] == ["m0", "m1", "m2"]
+        assert second == first
+        assert queries == 0
+
+    def test_new_messages_and_moderation(self, db, room_setup):
+        room, admin, attendee = room_setup
+        ChatRoomService.get_recent_messages(room.id, attendee.id, privileged=False)
+
+        message = ChatRoomService.send_message(room.id, attendee.id, "m3")
+        emit_new_chat_message(message, room.id)
+
+        for privileged in (True, False):
+            history = ChatRoomService.get_recent_messages(room.id, attendee.id, privileged=privileged)
+            assert [m["content"] for m in history] == ["m0", "m1", "m2", "m3"]
+
+        ChatRoomService.delete_message(message.id, admin.id)
+
+        visible = ChatRoomService.get_recent_messages(room.id, attendee.id, privileged=False)
+        assert [m["content"] for m in visible] == ["m0", "m1", "m2"]
+
+        everything = ChatRoomService.get_recent_messages(room.id, admin.id)
+        assert everything[-1]["id"] == message.id
+        assert everything[-1]["is_deleted"]
+        assert everything[-1]["deleted_by"]["id"] == admin.id
+
+    def test_ring_keeps_last_messages(self, db, room_setup, monkeypatch):
+        room, _, attendee = room_setup
+        monkeypatch.setattr(ChatHistoryCache, "RING_SIZE", 3)
+        ChatRoomService.get_recent_messages(room.id, attendee.id, limit=3, privileged=False)
+
+        message = ChatRoomService.send_message(room.id, attendee.id, "m3")
+        emit_new_chat_message(message, room.id)
+
+        history = ChatRoomService.get_recent_messages(room.id, attendee.id, limit=3, privileged=False)
+        assert [m["content"] for m in history] == ["m1", "m2", "m3"]
+
+
+class TestRebuild:
+    """Test messages and moderation racing a history rebuild"""
+
+    def interleave(self, monkeypatch, *steps):
+        """Run steps[i] right after the rebuild's i-th database load"""
+        load = ChatRoomService._load_recent_messages
+        remaining = list(steps)
+
+        def load_then_step(*args):
+            messages = load(*args)
+            if remaining:
+                remaining.pop(0)()
+            return messages
+
+        monkeypatch.setattr(ChatRoomService, "_load_recent_messages", staticmethod(load_then_step))
+
+    def test_messages_sent_during_a_rebuild_are_kept(self, db, room_setup, monkeypatch):
+        room, admin, attendee = room_setup
+
+        def send(content):
+            message = ChatRoomService.send_message(room.id, attendee.id, content)
+            emit_new_chat_message(message, room.id)
+
+        # m3 misses the moderator view's query but not the attendee view's;
+        # m4 misses both
+        room_id, admin_id = room.id, admin.id
+        self.interleave(monkeypatch, lambda: send("m3"), lambda: send("m4"))
+        ChatRoomService.get_recent_messages(room_id, attendee.id, privileged=False)
+        monkeypatch.undo()
+
+        for privileged in (True, False):
+            history, queries = count_statements(
+                db,
+                lambda: ChatRoomService.get_recent_messages(
+                    room_id, admin_id, privileged=privileged
+                ),
+            )
+            assert [m["content"] for m in history] == ["m0", "m1", "m2", "m3", "m4"]
+            assert queries == 0
+
+    def test_moderation_during_a_rebuild_stores_nothing(self, db, room_setup, monkeypatch):
+        room, _, attendee = room_setup
+
+        self.interleave(monkeypatch, lambda: ChatHistoryCache.invalidate(room.id))
+        history = ChatRoomService.get_recent_messages(room.id, attendee.id, privileged=False)
+
+        assert [m["content"] for m in history] == ["m0", "m1", "m2"]
+        assert ChatHistoryCache.get(room.id, privileged=False) is None
@@ -0,0 +1,162 @@
+"""
+Tests for the chat write-behind buffer.
+
+Buffered messages get their final id up front, are journaled in Redis until
+flushed, and flushing or replaying the journal twice never duplicates rows.
+"""
+import pytest
+
+from api import extensions
+from api.models import ChatMessage, ChatRoom
+from api.models.enums import ChatRoomType, EventUserRole
+from api.schemas import ChatMessageSchema
+from api.services import chat_room as chat_room_module
+from api.services.chat_room import ChatRoomService
+from api.services.chat_write_buffer import ChatWriteBuffer
+
+
+@pytest.fixture
+def room(db, user_factory, event_factory):
+    user = user_factory()
+    event = event_factory()
+    event.add_user(user, EventUserRole.ATTENDEE)
+    room = ChatRoom(event_id=event.id, name="Keynote", room_type=ChatRoomType.GLOBAL)
+    db.session.add(room)
+    db.session.commit()
+    return room, user
+
+
+@pytest.fixture
+def buffer(db):
+    if extensions.redis_client is None:
+        pytest.skip("Redis not available")
+    extensions.redis_client.delete(ChatWriteBuffer.JOURNAL_KEY)
+    buffer = ChatWriteBuffer()
+    buffer.enabled = True
+    yield buffer
+    extensions.redis_client.delete(ChatWriteBuffer.JOURNAL_KEY)
+
+
+def journal_length():
+    return extensions.redis_client.xlen(ChatWriteBuffer.JOURNAL_KEY)
+
+
+class TestChatWriteBuffer:
+    """Test buffering, flushing and journal replay"""
+
+    def test_append_then_flush(self, buffer, room):
+        chat_room, user = room
+
+        messages = [buffer.append(chat_room.id, user.id, f"m{i}") for i in range(3)]
+
+        assert [m.id for m in messages] == sorted(m.id for m in messages)
+        assert ChatMessage.query.filter_by(room_id=chat_room.id).count() == 0
+        assert journal_length() == 3
+
+        assert buffer.flush() == 3
+        stored = ChatMessage.query.filter_by(room_id=chat_room.id).order_by(ChatMessage.id).all()
+        assert [(m.id, m.content) for m in stored] == [(m.id, m.content) for m in messages]
+        assert journal_length() == 0
+        assert buffer.flush() == 0
+
+    def test_replay_after_crash_is_idempotent(self, buffer, room):
+        chat_room, user = room
+        first = buffer.append(chat_room.id, user.id, "flushed")
+        buffer.flush()
+        second = buffer.append(chat_room.id, user.id, "lost with the worker")
+
+        # A new worker replays the journal; the dead one's buffer is gone
+        assert ChatWriteBuffer().recover() == 1
+        assert ChatWriteBuffer().recover() == 0
+
+        # The old buffer flushing late doesn't duplicate anything
+        buffer.flush()
+        stored = ChatMessage.query.filter_by(room_id=chat_room.id).order_by(ChatMessage.id).all()
+        assert [m.id for m in stored] == [first.id, second.id]
+
+    def test_flush_journal_writes_other_workers_rows(self, buffer, room):
+        chat_room, user = room
+        other_worker = ChatWriteBuffer()
+        own = buffer.append(chat_room.id, user.id, "here")
+        theirs = other_worker.append(chat_room.id, user.id, "there")
+
+        assert buffer.flush_journal() == 2
+        stored = ChatMessage.query.filter_by(room_id=chat_room.id).order_by(ChatMessage.id).all()
+        assert [m.id for m in stored] == sorted([own.id, theirs.id])
+
+        # The other worker's own flush is a no-op
+        other_worker.flush()
+        assert ChatMessage.query.filter_by(room_id=chat_room.id).count() == 2
+
+    def test_flush_room_leaves_the_session_alone(self, buffer, room, db):
+        chat_room, user = room
+        message = ChatWriteBuffer().append(chat_room.id, user.id, "theirs")
+        chat_room.name = "Renamed, not committed"
+
+        assert buffer.flush_room(chat_room.id) == 1
+        db.session.rollback()
+
+        assert ChatMessage.query.get(message.id) is not None
+        assert db.session.get(ChatRoom, chat_room.id).name == "Keynote"
+
+    def test_rejected_row_is_dropped(self, buffer, room):
+        chat_room, user = room
+        kept = buffer.append(chat_room.id, user.id, "kept")
+        buffer.append(chat_room.id + 1000000, user.id, "room is gone")
+
+        assert buffer.flush() == 2
+        assert [m.id for m in ChatMessage.query.filter_by(user_id=user.id)] == [kept.id]
+        assert journal_length() == 0
+
+
+class TestSendMessageWriteBehind:
+    """Test ChatRoomService with write-behind enabled"""
+
+    def test_send_and_delete_buffered_message(self, buffer, room, monkeypatch):
+        monkeypatch.setattr(chat_room_module, "chat_write_buffer", buffer)
+        chat_room, user = room
+
+        message = ChatRoomService.send_message(chat_room.id, user.id, "hello")
+        data = ChatRoomService.format_message_for_response(message)
+        assert data["id"] == message.id
+        assert data["content"] == "hello"
+        assert buffer.pending_count() == 1
+
+        # Deleting a message that's still buffered flushes it first
+        with pytest.raises(ValueError):
+            ChatRoomService.delete_message(message.id, user.id)
+        assert buffer.pending_count() == 0
+        assert ChatMessage.query.get(message.id) is not None
+
+    def test_messages_buffered_on_another_worker(self, buffer, room, user_factory, monkeypatch, app, db):
+        monkeypatch.setattr(chat_room_module, "chat_write_buffer", buffer)
+        chat_room, user = room
+        admin = user_factory()
+        chat_room.event.add_user(admin, EventUserRole.ADMIN)
+        other_room = ChatRoom(event_id=chat_room.event_id, name="Lobby", room_type=ChatRoomType.GLOBAL)
+        db.session.add(other_room)
+        db.session.commit()
+        other_worker = ChatWriteBuffer()
+        first = other_worker.append(chat_room.id, user.id, "first")
+        second = other_worker.append(chat_room.id, user.id, "second")
+        elsewhere = other_worker.append(other_room.id, user.id, "another room")
+
+        with app.test_request_context():
+            history = ChatRoomService.get_chat_messages(chat_room.id, admin.id)
+        assert {m.id for m in history} == {first.id, second.id}
+        # Only the requested room's rows are written
+        assert ChatMessage.query.get(elsewhere.id) is None
+        assert journal_length() == 1
+
+        # Older pages can't hold buffered rows, so they don't write any
+        later = other_worker.append(chat_room.id, user.id, "later")
+        with app.test_request_context(f"/api/chat-rooms/{chat_room.id}/messages?page=2&per_page=1"):
+            ChatRoomService.get_chat_messages(chat_room.id, admin.id, ChatMessageSchema(many=True))
+        assert ChatMessage.query.get(later.id) is None
+        assert journal_length() == 2
+
+        # Sent and moderated before the other worker flushed
+        third = other_worker.append(chat_room.id, user.id, "third")
+        deleted = ChatRoomService.delete_message(third.id, admin.id)
+        assert deleted["message_id"] == third.id
+        assert ChatMessage.query.get(third.id).deleted_at is not None
@@ -0,0 +1,158 @@
+"""
+Tests for DirectMessageService.get_user_threads.
+
+Visibility rules (cutoffs, removed connections, event threads shadowed by a
+global thread) are applied in SQL, and each thread comes back with its other
+user, last message and unread count already loaded.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event as sa_event
+
+from api.models import Connection, DirectMessage, DirectMessageThread
+from api.models.enums import ConnectionStatus, MessageStatus
+from api.services.direct_message import DirectMessageService
+
+
+def make_thread(db, user1, user2, event_id=None, messages=0, sender=None):
+    thread = DirectMessageThread(
+        user1_id=user1.id, user2_id=user2.id, event_scope_id=event_id
+    )
+    db.session.add(thread)
+    db.session.flush()
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(messages):
+        db.session.add(
+            DirectMessage(
+                thread_id=thread.id,
+                sender_id=(sender or user2).id,
+                content=f"msg {i}",
+                status=MessageStatus.DELIVERED,
+                created_at=base + timedelta(minutes=i),
+            )
+        )
+    if messages:
+        thread.last_message_at = base + timedelta(minutes=messages - 1)
+    db.session.commit()
+    # Messages were inserted directly, so rebuild the unread counters
+    DirectMessageService.reconcile_unread_counts([thread.id])
+    return thread
+
+
+def connect(db, user1, user2, status=ConnectionStatus.ACCEPTED):
+    db.session.add(
+        Connection(
+            requester_id=user1.id,
+            recipient_id=user2.id,
+            status=status,
+            icebreaker_message="hi",
+        )
+    )
+    db.session.commit()
+
+
+class TestThreadVisibility:
+    """Test the SQL visibility rules"""
+
+    def test_removed_connection_hides_global_thread(self, db, user_factory):
+        me, friend, former = user_factory(), user_factory(), user_factory()
+        kept = make_thread(db, me, friend, messages=1)
+        hidden = make_thread(db, former, me, messages=1)
+        connect(db, me, friend)
+        connect(db, former, me, status=ConnectionStatus.REMOVED)
+
+        ids = [t.id for t in DirectMessageService.get_user_threads(me.id)]
+
+        assert kept.id in ids
+        assert hidden.id not in ids
+
+    def test_event_thread_shadowed_by_global_thread(self, db, user_factory, event_factory):
+        me, other, stranger = user_factory(), user_factory(), user_factory()
+        event = event_factory()
+        global_thread = make_thread(db, me, other, messages=1)
+        shadowed = make_thread(db, other, me, event_id=event.id, messages=1)
+        event_only = make_thread(db, me, stranger, event_id=event.id, messages=1)
+
+        ids = [t.id for t in DirectMessageService.get_user_threads(me.id)]
+
+        assert global_thread.id in ids
+        assert shadowed.id not in ids
+        assert event_only.id in ids
+
+    def test_cutoff_hides_thread_until_new_message(self, db, user_factory):
+        me, other = user_factory(), user_factory()
+        thread = make_thread(db, me, other, messages=2)
+        thread.set_user_cutoff(me.id, datetime(2025, 6, 1, tzinfo=timezone.utc))
+        db.session.commit()
+
+        assert DirectMessageService.get_user_threads(me.id) == []
+        assert [t.id for t in DirectMessageService.get_user_threads(other.id)] == [thread.id]
+
+
+class TestThreadPreloading:
+    """Test that threads come back ready to serialize"""
+
+    def test_last_message_and_unread_count(self, db, user_factory):
+        me, other = user_factory(), user_factory()
+        thread = make_thread(db, me, other, messages=3)
+        DirectMessage.query.filter_by(thread_id=thread.id, content="msg 0").update(
+            {"status": MessageStatus.READ}
+        )
+        db.session.commit()
+        DirectMessageService.reconcile_unread_counts([thread.id])
+
+        (result,) = DirectMessageService.get_user_threads(me.id)
+
+        assert result.preloaded_other_user.id == other.id
+        assert result.preloaded_last_message["content"] == "msg 2"
+        assert result.get_unread_count(me.id) == 2
+
+    def test_format_thread_uses_preloaded_values(self, db, user_factory):
+        me, others = user_factory(), [user_factory() for _ in range(3)]
+        for other in others:
+            make_thread(db, me, other, messages=2)
+        threads = DirectMessageService.get_user_threads(me.id)
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        sa_event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            formatted = [
+                DirectMessageService.format_thread_for_response(t, me.id) for t in threads
+            ]
+        finally:
+            sa_event.remove(db.engine, "before_cursor_execute", record)
+
+        assert statements == []
+        assert {f["other_user"]["id"] for f in formatted} == {o.id for o in others}
+        assert all(f["unread_count"] == 2 for f in formatted)
+
+    def test_preloaded_values_are_per_viewer(self, db, user_factory):
+        me, other = user_factory(), user_factory()
+        thread = make_thread(db, me, other, messages=1)
+        DirectMessageService.get_user_threads(me.id)
+
+        data = DirectMessageService.format_thread_for_response(thread, other.id)
+
+        assert data["other_user"]["id"] == me.id
+        assert data["unread_count"] == 0
+
+
+class TestThreadPaging:
+    """Test ordering and optional paging"""
+
+    def test_most_recent_first_and_paged(self, db, user_factory):
+        me = user_factory()
+        threads = [make_thread(db, me, user_factory(), messages=i + 1) for i in range(5)]
+        expected = [t.id for t in reversed(threads)]
+
+        all_ids = [t.id for t in DirectMessageService.get_user_threads(me.id)]
+        first = DirectMessageService.get_user_threads(me.id, page=1, per_page=2)
+        last = DirectMessageService.get_user_threads(me.id, page=3, per_page=2)
+
+        assert all_ids == expected
+        assert [t.id for t in first] == expected[:2]
+        assert [t.id for t in last] == expected[4:]
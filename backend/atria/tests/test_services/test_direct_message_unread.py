@@ -0,0 +1,93 @@
+"""
+Tests for the materialized DM unread counters.
+
+Counters on each thread must track DELIVERED messages from the other
+participant through send and read, and reconcile_unread_counts must
+repair them from direct_messages when they drift.
+"""
+from api.models import Connection, DirectMessage
+from api.models.enums import ConnectionStatus, MessageStatus
+from api.services.direct_message import DirectMessageService
+
+
+def connected_thread(db, user1, user2):
+    db.session.add(
+        Connection(
+            requester_id=user1.id,
+            recipient_id=user2.id,
+            status=ConnectionStatus.ACCEPTED,
+            icebreaker_message="hi",
+        )
+    )
+    db.session.commit()
+    thread, _ = DirectMessageService.get_or_create_thread(user1.id, user2.id)
+    return thread
+
+
+class TestUnreadCounters:
+    """Test counter maintenance on the write paths"""
+
+    def test_send_and_mark_read(self, db, user_factory):
+        alice, bob = user_factory(), user_factory()
+        thread = connected_thread(db, alice, bob)
+
+        for i in range(3):
+            DirectMessageService.create_message(thread.id, alice.id, f"hi {i}")
+        DirectMessageService.create_message(thread.id, bob.id, "hey")
+
+        assert thread.get_unread_count(bob.id) == 3
+        assert thread.get_unread_count(alice.id) == 1
+        assert DirectMessageService.get_unread_count(bob.id) == 3
+
+        _, _, had_unread = DirectMessageService.mark_messages_read(thread.id, bob.id)
+
+        assert had_unread is True
+        assert thread.get_unread_count(bob.id) == 0
+        assert DirectMessageService.get_unread_count(bob.id) == 0
+        assert DirectMessageService.get_unread_count(alice.id) == 1
+
+        _, _, had_unread = DirectMessageService.mark_messages_read(thread.id, bob.id)
+        assert had_unread is False
+
+    def test_total_across_threads(self, db, user_factory):
+        me = user_factory()
+        for _ in range(3):
+            other = user_factory()
+            thread = connected_thread(db, other, me)
+            DirectMessageService.create_message(thread.id, other.id, "hello")
+
+        assert DirectMessageService.get_unread_count(me.id) == 3
+
+
+class TestReconcileUnreadCounts:
+    """Test rebuilding counters from direct_messages"""
+
+    def test_repairs_drift(self, db, user_factory):
+        alice, bob = user_factory(), user_factory()
+        thread = connected_thread(db, alice, bob)
+        DirectMessageService.create_message(thread.id, alice.id, "counted")
+        # Written behind the service's back
+        db.session.add_all(
+            [
+                DirectMessage(
+                    thread_id=thread.id,
+                    sender_id=alice.id,
+                    content="uncounted",
+                    status=MessageStatus.DELIVERED,
+                ),
+                DirectMessage(
+                    thread_id=thread.id,
+                    sender_id=bob.id,
+                    content="read",
+                    status=MessageStatus.READ,
+                ),
+            ]
+        )
+        db.session.commit()
+        assert DirectMessageService.get_unread_count(bob.id) == 1
+
+        assert DirectMessageService.reconcile_unread_counts() >= 1
+
+        assert DirectMessageService.get_unread_count(bob.id) == 2
+        assert DirectMessageService.get_unread_count(alice.id) == 0
+        assert DirectMessageService.reconcile_unread_counts([thread.id]) == 0
@@ -0,0 +1,140 @@
+"""
+Tests for the cached event detail payload.
+
+GET /events/<id> serves the viewer-independent detail from the cache and
+merges in the viewer's role; changes to the event, its sessions, sponsors or
+listed people invalidate it, attendees joining don't.
+"""
+from contextlib import contextmanager
+from datetime import time
+
+import pytest
+from flask_jwt_extended import create_access_token, verify_jwt_in_request
+from sqlalchemy import event as sa_event
+
+from api import extensions
+from api.models import Session
+from api.models.enums import EventUserRole, SessionStatus, SessionType
+from api.schemas import EventDetailSchema
+from api.services.cache_service import CacheKeys, CacheService
+from api.services.event import EventService
+from api.services.event_user import EventUserService
+from api.services.session import SessionService
+
+
+@contextmanager
+def as_viewer(app, viewer):
+    token = create_access_token(identity=str(viewer.id))
+    with app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+        verify_jwt_in_request()
+        yield
+
+
+def get_event(app, viewer, event_id):
+    with as_viewer(app, viewer):
+        return EventService.get_event(event_id)
+
+
+def count_statements(db, func):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sa_event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        result = func()
+    finally:
+        sa_event.remove(db.engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+def add_session(db, event, title, hour=10):
+    db.session.add(
+        Session(
+            event_id=event.id,
+            title=title,
+            status=SessionStatus.SCHEDULED,
+            session_type=SessionType.PRESENTATION,
+            start_time=time(hour),
+            end_time=time(hour, 30),
+            day_number=1,
+        )
+    )
+    db.session.commit()
+
+
+@pytest.fixture
+def event_setup(db, user_factory, event_factory):
+    if extensions.cache_redis is None:
+        pytest.skip("Redis not available")
+    admin, speaker = user_factory(), user_factory()
+    event = event_factory()
+    event.add_user(admin, EventUserRole.ADMIN)
+    event.add_user(speaker, EventUserRole.SPEAKER)
+    db.session.commit()
+    add_session(db, event, "Keynote")
+    CacheService.delete(CacheKeys.event(event.id))
+    yield event, admin, speaker
+    CacheService.delete(CacheKeys.event(event.id))
+
+
+class TestEventDetailCache:
+    """Test EventService.get_event"""
+
+    def test_matches_schema_and_merges_role(self, app, db, event_setup):
+        event, admin, speaker = event_setup
+
+        detail = get_event(app, speaker, event.id)
+
+        expected = EventDetailSchema().dump(event)
+        expected["user_role"] = EventUserRole.SPEAKER.value
+        assert detail == expected
+        assert get_event(app, admin, event.id)["user_role"] == EventUserRole.ADMIN.value
+
+    def test_cached_detail_runs_no_detail_queries(self, app, db, event_setup):
+        event, admin, _ = event_setup
+        for hour in range(1, 6):
+            add_session(db, event, f"Talk {hour}", hour)
+        CacheService.delete(CacheKeys.event(event.id))
+
+        with as_viewer(app, admin):
+            EventService.get_event(event.id)  # Access check + cold detail
+            detail, queries = count_statements(db, lambda: EventService.get_event(event.id))
+
+        assert len(detail["sessions"]) == 6
+        assert queries == 0
+
+    def test_invalidation(self, app, db, event_setup, user_factory):
+        event, admin, _ = event_setup
+        get_event(app, admin, event.id)
+
+        # Attendees aren't listed, so they don't invalidate
+        EventUserService.add_user_to_event(
+            event.id, {"user_id": user_factory().id, "role": EventUserRole.ATTENDEE}
+        )
+        assert CacheService.exists(CacheKeys.event(event.id))
+
+        new_speaker = user_factory()
+        EventUserService.add_user_to_event(
+            event.id, {"user_id": new_speaker.id, "role": EventUserRole.SPEAKER}
+        )
+        detail = get_event(app, admin, event.id)
+        assert new_speaker.id in [s["id"] for s in detail["speakers"]]
+
+        SessionService.create_session(
+            event.id,
+            {
+                "title": "Closing",
+                "status": SessionStatus.SCHEDULED,
+                "session_type": SessionType.PRESENTATION,
+                "start_time": time(16),
+                "end_time": time(17),
+                "day_number": 1,
+            },
+        )
+        detail = get_event(app, admin, event.id)
+        assert "Closing" in [s["title"] for s in detail["sessions"]]
+
+        EventService.update_event(event.id, {"title": "Renamed"})
+        assert get_event(app, admin, event.id)["title"] == "Renamed"
@@ -0,0 +1,129 @@
+"""
+Tests for the networking attendee list.
+
+Pages are cut in SQL: only the requested page is loaded and privacy filtered,
+sorting and role filtering match the old in-memory behaviour, and name search
+matches word prefixes through the users.name_search_vector index.
+"""
+from contextlib import contextmanager
+
+from flask_jwt_extended import create_access_token, verify_jwt_in_request
+from sqlalchemy import event as sa_event
+
+from api.models import EventUser
+from api.models.enums import EventUserRole
+from api.schemas import EventUserNetworkingSchema
+from api.services.event_user import EventUserService
+
+
+@contextmanager
+def as_viewer(app, viewer, query_string=""):
+    token = create_access_token(identity=str(viewer.id))
+    with app.test_request_context(
+        f"/api/events/1/users?{query_string}",
+        headers={"Authorization": f"Bearer {token}"},
+    ):
+        verify_jwt_in_request()
+        yield
+
+
+def setup_directory(db, user_factory, event_factory, size=7):
+    viewer = user_factory(first_name="Zed", last_name="Viewer")
+    event = event_factory()
+    # Only the users below (the factory adds the event's creator)
+    EventUser.query.filter_by(event_id=event.id).delete()
+    event.add_user(viewer, EventUserRole.ATTENDEE)
+
+    users = [
+        user_factory(first_name=f"First{i}", last_name=f"Last{i:02d}", company_name="Acme")
+        for i in range(size)
+    ]
+    for i, user in enumerate(users):
+        event.add_user(user, EventUserRole.SPEAKER if i % 2 else EventUserRole.ATTENDEE)
+    banned = user_factory(first_name="Banned", last_name="Aaron")
+    event.add_user(banned, EventUserRole.ATTENDEE)
+    db.session.commit()
+    EventUser.query.filter_by(event_id=event.id, user_id=banned.id).update({"is_banned": True})
+    db.session.commit()
+    return viewer, event, users
+
+
+def list_users(app, viewer, event, query_string="", **kwargs):
+    with as_viewer(app, viewer, query_string):
+        return EventUserService.get_event_users_with_connection_status(
+            event.id, schema=EventUserNetworkingSchema(many=True), **kwargs
+        )
+
+
+class TestEventUserDirectory:
+    """Test get_event_users_with_connection_status"""
+
+    def test_pages_are_sorted_and_exclude_banned(self, app, db, user_factory, event_factory):
+        viewer, event, users = setup_directory(db, user_factory, event_factory)
+
+        first = list_users(app, viewer, event, "page=1&per_page=3")
+        last = list_users(app, viewer, event, "page=3&per_page=3")
+
+        assert [u["last_name"] for u in first["event_users"]] == ["Last00", "Last01", "Last02"]
+        assert [u["last_name"] for u in last["event_users"]] == ["Last06", "Viewer"]
+        assert first["total_items"] == 8
+        assert first["total_pages"] == 3
+        assert first["has_next"] and not first["has_prev"]
+        assert not last["has_next"] and last["has_prev"]
+
+    def test_role_filter_and_search(self, app, db, user_factory, event_factory):
+        viewer, event, users = setup_directory(db, user_factory, event_factory)
+
+        speakers = list_users(app, viewer, event, role=EventUserRole.SPEAKER)
+        assert [u["last_name"] for u in speakers["event_users"]] == ["Last01", "Last03", "Last05"]
+
+        by_name = list_users(app, viewer, event, search="first3 las")
+        assert [u["last_name"] for u in by_name["event_users"]] == ["Last03"]
+
+        by_company = list_users(app, viewer, event, search="acm")
+        assert by_company["total_items"] == len(users)
+
+        # Punctuation can't break the query; no words means no filter
+        assert list_users(app, viewer, event, search="'&|:*")["total_items"] == 8
+
+    def test_hidden_companies_are_not_searchable(self, app, db, user_factory, event_factory):
+        viewer, event, users = setup_directory(db, user_factory, event_factory, size=4)
+        users[0].privacy_settings = {**users[0].privacy_settings, "show_company": False}
+        EventUser.query.filter_by(event_id=event.id, user_id=users[1].id).update(
+            {"privacy_overrides": {"show_company": False}}
+        )
+        db.session.commit()
+
+        def found(viewer, search):
+            result = list_users(app, viewer, event, search=search)
+            return [u["last_name"] for u in result["event_users"]]
+
+        assert found(viewer, "acm") == ["Last02", "Last03"]
+        assert found(viewer, "first0 acm") == []
+        # Their names are still searchable
+        assert found(viewer, "first0") == ["Last00"]
+
+        # Organizers can see hidden companies, so they can search them too
+        organizer = user_factory(first_name="Olga", last_name="Organizer")
+        event.add_user(organizer, EventUserRole.ORGANIZER)
+        db.session.commit()
+        assert found(organizer, "acm") == ["Last00", "Last01", "Last02", "Last03"]
+
+    def test_query_count_does_not_grow_with_event(self, app, db, user_factory, event_factory):
+        counts = []
+        for size in (4, 20):
+            viewer, event, _ = setup_directory(db, user_factory, event_factory, size)
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            sa_event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                result = list_users(app, viewer, event, "per_page=3")
+            finally:
+                sa_event.remove(db.engine, "before_cursor_execute", record)
+            assert len(result["event_users"]) == 3
+            counts.append(len(statements))
+
+        assert counts[0] == counts[1]
@@ -0,0 +1,321 @@
+"""
+Tests for upload image processing.
+
+Images are verified and rendered (full, medium, thumbnail) by
+api.commons.images, off the request thread in worker processes when they're
+configured, and background uploads can be polled until they're stored.
+"""
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+from flask_jwt_extended import create_access_token
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from api.commons.images import RENDITION_SIZES, load_image, render_image
+from api.extensions import socketio
+from api.services import image_pipeline as image_pipeline_module
+from api.services.image_pipeline import ImageProcessingError, JobStatus, image_pipeline
+from api.services.storage import storage_service
+
+
+def make_image(size, format="JPEG", mode="RGB", exif=None):
+    image = Image.new(mode, size, (200, 30, 30) if mode == "RGB" else (200, 30, 30, 128))
+    output = BytesIO()
+    if exif is not None:
+        image.save(output, format=format, exif=exif)
+    else:
+        image.save(output, format=format)
+    return output.getvalue()
+
+
+def decoded_size(rendition):
+    content, _ = rendition
+    return Image.open(BytesIO(content)).size
+
+
+@pytest.fixture
+def pipeline():
+    """Restore the pipeline's configuration after the test"""
+    workers = image_pipeline.workers
+    max_tasks = image_pipeline.max_tasks
+    staging_dir = image_pipeline.staging_dir
+    render_timeout = image_pipeline.render_timeout
+    yield image_pipeline
+    image_pipeline.configure(workers, max_tasks, staging_dir, render_timeout)
+
+
+class TestRenderImage:
+    """Test render_image"""
+
+    def test_renditions_by_context(self):
+        renditions = render_image(make_image((4000, 3000)), "event_banner")
+
+        assert decoded_size(renditions["full"]) == (1600, 1200)
+        assert decoded_size(renditions["medium"]) == (480, 360)
+        assert decoded_size(renditions["thumbnail"]) == (160, 120)
+        assert all(ext == "webp" for _, ext in renditions.values())
+
+    def test_small_images_are_not_upscaled(self):
+        renditions = render_image(make_image((300, 200), format="PNG"), "avatar")
+
+        assert decoded_size(renditions["full"]) == (300, 200)
+        assert renditions["medium"] is renditions["full"]
+        assert decoded_size(renditions["thumbnail"]) == (160, 107)
+
+    def test_large_jpegs_are_decoded_reduced(self):
+        image = load_image(make_image((4000, 3000)), 480)
+
+        # draft() decoded at 1/4 scale (1000x750) instead of the full bitmap
+        assert image.size == (480, 360)
+        assert image.mode == "RGB"
+
+    def test_exif_orientation_is_applied(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90° clockwise
+        renditions = render_image(make_image((400, 200), exif=exif), "event_logo")
+
+        assert decoded_size(renditions["full"]) == (200, 400)
+
+    def test_transparency_is_kept_for_logos(self):
+        data = make_image((100, 100), format="PNG", mode="RGBA")
+
+        logo = Image.open(BytesIO(render_image(data, "sponsor_logo")["full"][0]))
+        banner = Image.open(BytesIO(render_image(data, "event_banner")["full"][0]))
+
+        assert logo.mode == "RGBA"
+        assert banner.mode == "RGB"
+
+    def test_invalid_images_are_rejected(self):
+        truncated = make_image((400, 400))[:200]
+
+        with pytest.raises(ValueError, match="Invalid image file"):
+            render_image(truncated, "avatar")
+        with pytest.raises(ValueError, match="Invalid image file"):
+            render_image(b"not an image", "avatar")
+
+
+# Renders concurrently under eventlet; prints the longest the hub went without running
+EVENTLET_RENDERS = """
+import eventlet
+eventlet.monkey_patch()
+
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from api.services.image_pipeline import ImagePipeline
+
+image = Image.effect_noise((4000, 3000), 64).convert("RGB")
+output = BytesIO()
+image.save(output, format="JPEG")
+data = output.getvalue()
+
+pipeline = ImagePipeline()
+# Six images on two processes retiring every two: renders queue for a
+# process and processes are replaced while others render
+pipeline.configure(workers=2, max_tasks=2)
+
+stall = 0.0
+running = True
+
+def tick():
+    global stall
+    last = time.monotonic()
+    while running:
+        eventlet.sleep(0.02)
+        now = time.monotonic()
+        stall = max(stall, now - last - 0.02)
+        last = now
+
+ticker = eventlet.spawn(tick)
+pool = eventlet.GreenPool()
+results = list(pool.imap(lambda _: pipeline.render(data, "event_banner"), range(6)))
+running = False
+ticker.wait()
+pipeline.shutdown()
+
+assert [Image.open(BytesIO(r["full"][0])).size for r in results] == [(1600, 1200)] * 6
+print(stall)
+"""
+
+
+class TestImagePipeline:
+    """Test image_pipeline rendering and background jobs"""
+
+    def test_worker_process_matches_inline(self, pipeline):
+        data = make_image((1200, 900))
+        pipeline.configure(workers=0)
+        inline = pipeline.render(data, "event_logo")
+
+        pipeline.configure(workers=1, max_tasks=10)
+        rendered = pipeline.render(data, "event_logo")
+
+        assert {name: decoded_size(r) for name, r in rendered.items()} == {
+            name: decoded_size(r) for name, r in inline.items()
+        }
+        with pytest.raises(ValueError, match="Invalid image file"):
+            pipeline.render(b"GIF89a truncated", "event_logo")
+
+    def test_processes_are_retired_after_max_tasks(self, pipeline, monkeypatch):
+        started = []
+
+        class CountedProcess(image_pipeline_module._RenderProcess):
+            def __init__(self, generation):
+                super().__init__(generation)
+                started.append(self)
+
+        monkeypatch.setattr(image_pipeline_module, "_RenderProcess", CountedProcess)
+        pipeline.configure(workers=2, max_tasks=2)
+        images = [make_image((300 + 50 * i, 200)) for i in range(7)]
+
+        # More concurrent renders than there are processes
+        with ThreadPoolExecutor(max_workers=len(images)) as threads:
+            results = list(threads.map(lambda data: pipeline.render(data, "event_logo"), images))
+
+        assert [decoded_size(r["full"]) for r in results] == [
+            (300 + 50 * i, 200) for i in range(7)
+        ]
+        assert all(process.tasks <= 2 for process in started)
+        assert len(started) >= 4
+        assert len(pipeline._idle) <= 2
+
+    def test_dead_process_is_replaced(self, pipeline):
+        pipeline.configure(workers=1)
+        data = make_image((600, 400))
+        pipeline.render(data, "event_logo")
+
+        [process] = pipeline._idle
+        process.process.kill()
+        process.process.wait()
+
+        assert decoded_size(pipeline.render(data, "event_logo")["full"]) == (600, 400)
+        assert pipeline._idle[0] is not process
+
+    def test_render_timeout_kills_process(self, pipeline):
+        pipeline.configure(workers=1, render_timeout=0.001)
+        data = make_image((4000, 3000))
+
+        with pytest.raises(ImageProcessingError):
+            pipeline.render(data, "event_banner")
+        assert pipeline._idle == []
+
+        pipeline.render_timeout = 30
+        assert decoded_size(pipeline.render(data, "event_banner")["full"]) == (1600, 1200)
+
+    def test_hub_keeps_running_under_eventlet(self):
+        # A fresh interpreter, since the test process isn't monkey-patched
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", EVENTLET_RENDERS],
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+            capture_output=True, text=True, timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        stall = float(result.stdout.strip().splitlines()[-1])
+        assert stall < 0.3
+
+
+    def test_upload_stores_every_rendition(self, app):
+        upload = BytesIO(make_image((2000, 1000)))
+
+        result = storage_service.upload_image(
+            FileStorage(upload, filename="banner.jpg"), context="event_banner", event_id=7
+        )
+
+        assert result["object_key"].startswith("events/7/banners/")
+        assert set(result["renditions"]) == {"full", *RENDITION_SIZES}
+        assert result["renditions"]["full"] == result["object_key"]
+        assert sorted(storage_service.rendition_keys(result["object_key"])) == sorted(
+            key for name, key in result["renditions"].items() if name != "full"
+        )
+
+
+def wait_for_job(client, job_id, headers, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get(f"/api/uploads/image/jobs/{job_id}", headers=headers)
+        if response.json["status"] in (JobStatus.DONE, JobStatus.FAILED):
+            return response
+        assert time.monotonic() < deadline, "Upload job didn't finish"
+        # Yield to the background task (a green thread under eventlet)
+        socketio.sleep(0.05)
+
+
+class TestUploadJobRoutes:
+    """Test background uploads through the API"""
+
+    def auth(self, app, user):
+        with app.app_context():
+            return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+    def post_job(self, client, headers, data, filename="avatar.png"):
+        return client.post(
+            "/api/uploads/image/jobs",
+            data={"context": "avatar", "file": (BytesIO(data), filename)},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+
+    def test_job_is_processed_and_polled(self, app, client, db, user_factory, tmp_path, pipeline):
+        pipeline.configure(workers=0, staging_dir=str(tmp_path))
+        user, other = user_factory(), user_factory()
+        headers = self.auth(app, user)
+
+        response = self.post_job(client, headers, make_image((900, 900), format="PNG"))
+        assert response.status_code == 202
+        job_id = response.json["job_id"]
+
+        done = wait_for_job(client, job_id, headers)
+        assert done.json["status"] == JobStatus.DONE
+        result = done.json["result"]
+        assert result["object_key"].startswith(f"users/{user.id}/avatars/")
+        assert result["url"] == f"/api/content/{result['object_key']}"
+        assert set(result["renditions"]) == {"full", *RENDITION_SIZES}
+        assert list(tmp_path.iterdir()) == []  # Staged upload removed
+
+        other_response = client.get(
+            f"/api/uploads/image/jobs/{job_id}", headers=self.auth(app, other)
+        )
+        assert other_response.status_code == 404
+
+    def test_undecodable_upload_fails_the_job(self, app, client, db, user_factory, tmp_path, pipeline):
+        pipeline.configure(workers=0, staging_dir=str(tmp_path))
+        headers = self.auth(app, user_factory())
+
+        # A valid header is enough to be accepted; decoding happens later
+        data = make_image((400, 400))
+        response = self.post_job(client, headers, data[: len(data) // 2], "avatar.jpg")
+        assert response.status_code == 202
+
+        failed = wait_for_job(client, response.json["job_id"], headers)
+        assert failed.json["status"] == JobStatus.FAILED
+        assert failed.json["error"] == "Invalid image file"
+        assert failed.json["result"] is None
+
+    def test_unavailable_workers_are_a_503(self, app, client, db, user_factory, pipeline, monkeypatch):
+        headers = self.auth(app, user_factory())
+
+        def unavailable(data, context):
+            raise ImageProcessingError("Image processing is temporarily unavailable")
+
+        monkeypatch.setattr(pipeline, "render", unavailable)
+        response = client.post(
+            "/api/uploads/image",
+            data={"context": "avatar", "file": (BytesIO(make_image((200, 200), format="PNG")), "a.png")},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 503
+
+    def test_non_images_are_rejected_up_front(self, app, client, db, user_factory, pipeline):
+        headers = self.auth(app, user_factory())
+
+        response = self.post_job(client, headers, b"not an image")
+        assert response.status_code == 400
@@ -10,6 +10,7 @@ import time
 from datetime import timedelta
 from api.models import Organization, User, Session, Event
 from api.models.enums import SessionType, SessionChatMode, SessionStatus, EventUserRole
+from api.commons.signing_keys import TOKEN_REUSE_WINDOW
 from api.services.jaas_service import JaaSService
 from tests.factories.user_factory import UserFactory
 from tests.factories.event_factory import EventFactory
@@ -267,7 +268,7 @@ class TestJaasTokenGeneration:
         # Verify expiration is ~8 hours from now
         expected_exp = before_time + JaaSService.DEFAULT_TOKEN_EXPIRATION
         assert decoded["exp"] >= expected_exp
-        assert decoded["exp"] <= after_time + JaaSService.DEFAULT_TOKEN_EXPIRATION
+        assert decoded["exp"] <= after_time + JaaSService.DEFAULT_TOKEN_EXPIRATION + TOKEN_REUSE_WINDOW
 
         # Verify expires_at matches JWT exp
         assert token_data["expires_at"] == decoded["exp"]
@@ -299,7 +300,7 @@ class TestJaasTokenGeneration:
         # Verify expiration is ~2 hours from now
         expected_exp = before_time + custom_expiration
         assert decoded["exp"] >= expected_exp
-        assert decoded["exp"] <= after_time + custom_expiration
+        assert decoded["exp"] <= after_time + custom_expiration + TOKEN_REUSE_WINDOW
 
     def test_token_nbf_accounts_for_clock_skew(self, db, org_with_jaas_credentials):
         """Test that nbf (not before) is set to account for clock skew"""
@@ -432,7 +433,7 @@ class TestSessionTokenExpiration:
             # Verify expiration is 90 min + 60 min buffer = 150 minutes = 9000 seconds
             expected_exp = before_time + 9000
             assert token_data["expires_at"] >= expected_exp
-            assert token_data["expires_at"] <= expected_exp + 2  # Allow 2 sec tolerance
+            assert token_data["expires_at"] <= expected_exp + TOKEN_REUSE_WINDOW + 2  # Rounded up to the reuse window
 
     @pytest.fixture
     def org_with_jaas_credentials(self, db):
@@ -0,0 +1,154 @@
+"""
+Tests for full-text message search.
+
+Searches must use the tsvector index (stemmed word matching rather than
+substring matching), rank and highlight hits, never match E2EE messages,
+and only return messages the user is allowed to read.
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from api.models import ChatRoom, ChatMessage, DirectMessage, DirectMessageThread
+from api.models.enums import ChatRoomType, EventUserRole
+from api.schemas import ChatMessageSearchResultSchema, DirectMessageSearchResultSchema
+from api.services.chat_room import ChatRoomService
+from api.services.direct_message import DirectMessageService
+
+
+@pytest.fixture
+def dm_setup(db, user_factory):
+    me, other, stranger = user_factory(), user_factory(), user_factory()
+    mine = DirectMessageThread(user1_id=me.id, user2_id=other.id)
+    theirs = DirectMessageThread(user1_id=other.id, user2_id=stranger.id)
+    db.session.add_all([mine, theirs])
+    db.session.flush()
+    db.session.add_all(
+        [
+            DirectMessage(thread_id=mine.id, sender_id=other.id, content="Are you attending the keynote?"),
+            DirectMessage(thread_id=mine.id, sender_id=me.id, content="Keynote keynote keynotes, always"),
+            DirectMessage(thread_id=mine.id, sender_id=me.id, content="Lunch <b>after</b> the keynote"),
+            DirectMessage(
+                thread_id=mine.id,
+                sender_id=other.id,
+                content="secret keynote plans",
+                encrypted_content="ciphertext",
+            ),
+            DirectMessage(thread_id=theirs.id, sender_id=other.id, content="Private keynote gossip"),
+        ]
+    )
+    db.session.commit()
+    return me, mine
+
+
+class TestDirectMessageSearch:
+    """Test DirectMessageService.search_messages"""
+
+    def test_matches_stems_and_skips_encrypted(self, dm_setup):
+        me, _ = dm_setup
+
+        results = DirectMessageService.search_messages(me.id, "keynotes")
+
+        contents = [m.content for m in results]
+        assert len(contents) == 3
+        assert "secret keynote plans" not in contents
+        assert "Private keynote gossip" not in contents
+        # Most occurrences ranks first
+        assert contents[0] == "Keynote keynote keynotes, always"
+
+    def test_headline_is_escaped_and_highlighted(self, dm_setup):
+        me, _ = dm_setup
+
+        (hit,) = DirectMessageService.search_messages(me.id, "lunch")
+
+        assert "<mark>Lunch</mark>" in hit.search_headline
+        assert "&lt;b&gt;" in hit.search_headline
+        assert "<b>" not in hit.search_headline
+        assert hit.search_rank > 0
+
+    def test_cutoff_hides_older_messages(self, db, dm_setup):
+        me, thread = dm_setup
+        thread.set_user_cutoff(me.id)
+        db.session.commit()
+
+        assert DirectMessageService.search_messages(me.id, "keynote") == []
+
+    def test_short_query_rejected(self, dm_setup):
+        me, _ = dm_setup
+
+        with pytest.raises(ValueError):
+            DirectMessageService.search_messages(me.id, " a ")
+
+    def test_paginated_schema(self, app, dm_setup):
+        me, _ = dm_setup
+
+        with app.test_request_context("/api/direct-messages/search?q=keynote&per_page=2"):
+            result = DirectMessageService.search_messages(
+                me.id, "keynote", DirectMessageSearchResultSchema(many=True)
+            )
+
+        assert result["total_items"] == 3
+        assert len(result["results"]) == 2
+        assert "search_vector" not in result["results"][0]
+        assert "<mark>" in result["results"][0]["headline"]
+
+
+@pytest.fixture
+def chat_setup(db, user_factory, event_factory):
+    admin, attendee = user_factory(), user_factory()
+    event = event_factory()
+    event.add_user(admin, EventUserRole.ADMIN)
+    event.add_user(attendee, EventUserRole.ATTENDEE)
+    general = ChatRoom(event_id=event.id, name="General", room_type=ChatRoomType.GLOBAL)
+    admins = ChatRoom(event_id=event.id, name="Admins", room_type=ChatRoomType.ADMIN)
+    db.session.add_all([general, admins])
+    db.session.flush()
+    db.session.add_all(
+        [
+            ChatMessage(room_id=general.id, user_id=attendee.id, content="Where is the wifi password?"),
+            ChatMessage(room_id=admins.id, user_id=admin.id, content="Wifi password rotates at noon"),
+            ChatMessage(
+                room_id=general.id,
+                user_id=attendee.id,
+                content="Wifi password is hunter2",
+                deleted_at=datetime.now(timezone.utc),
+                deleted_by_id=admin.id,
+            ),
+        ]
+    )
+    db.session.commit()
+    return event, admin, attendee, general, admins
+
+
+class TestChatMessageSearch:
+    """Test ChatRoomService.search_messages"""
+
+    def test_only_accessible_rooms(self, chat_setup):
+        event, admin, attendee, *_ = chat_setup
+
+        attendee_hits = ChatRoomService.search_messages(event.id, attendee.id, "wifi")
+        admin_hits = ChatRoomService.search_messages(event.id, admin.id, "wifi")
+
+        assert [m.content for m in attendee_hits] == ["Where is the wifi password?"]
+        # Admins also see the admin room and moderated messages
+        assert len(admin_hits) == 3
+
+    def test_room_filter(self, chat_setup):
+        event, admin, attendee, general, admins = chat_setup
+
+        hits = ChatRoomService.search_messages(event.id, admin.id, "password", room_id=admins.id)
+        assert [m.content for m in hits] == ["Wifi password rotates at noon"]
+
+        with pytest.raises(ValueError):
+            ChatRoomService.search_messages(event.id, attendee.id, "password", room_id=admins.id)
+
+    def test_paginated_schema(self, app, chat_setup):
+        event, _, attendee, *_ = chat_setup
+
+        with app.test_request_context(f"/api/events/{event.id}/chat-rooms/search?q=wifi"):
+            result = ChatRoomService.search_messages(
+                event.id, attendee.id, "wifi", schema=ChatMessageSearchResultSchema(many=True)
+            )
+
+        assert result["total_items"] == 1
+        assert "<mark>wifi</mark>" in result["results"][0]["headline"]
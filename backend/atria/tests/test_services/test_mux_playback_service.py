@@ -8,6 +8,7 @@ import jwt
 import time
 from datetime import datetime, timedelta
 from api.models import Organization
+from api.commons.signing_keys import TOKEN_REUSE_WINDOW
 from api.services.mux_playback_service import MuxPlaybackService
 
 
@@ -293,7 +294,8 @@ class TestMuxPlaybackServiceSignedPlayback:
 
             time_until_exp = (exp_time - now).total_seconds()
             # Should be close to 1 hour (within 5 seconds)
-            assert abs(time_until_exp - custom_expiration) < 5
+            # Rounded up to the token reuse window
+            assert -5 < time_until_exp - custom_expiration < TOKEN_REUSE_WINDOW + 5
 
 
 class TestMuxPlaybackServiceSessionDuration:
@@ -445,7 +447,7 @@ class TestMuxPlaybackServiceSessionDuration:
 
             # Should be close to 3 hours (2hr session + 1hr buffer)
             expected_duration = (2 * 60 * 60) + (60 * 60)  # 3 hours
-            assert abs(time_until_exp - expected_duration) < 5  # Within 5 seconds
+            assert -5 < time_until_exp - expected_duration < TOKEN_REUSE_WINDOW + 5  # Rounded up to the reuse window
 
 
 class TestMuxPlaybackServiceEdgeCases:
@@ -0,0 +1,226 @@
+"""
+Tests for the coalesced presence-count broadcaster.
+
+Any number of joins/leaves between two ticks must produce a single count
+broadcast per room (and per admin channel), carrying the count at flush time.
+The admin panel snapshot must be a single event built from one pipeline.
+Online status changes go to a cached audience, batched per room, and users
+who flap back to where they started are not broadcast at all.
+"""
+import pytest
+
+from api import extensions
+from api.models import ChatRoom, Connection
+from api.models.enums import ChatRoomType, ConnectionStatus, EventUserRole
+from api.services.chat_room import ChatRoomService
+from api.services.connection import ConnectionService
+from api.services.online_status import OnlineStatusService
+from api.services.presence_service import PresenceService
+from api.sockets import presence_broadcaster as broadcaster_module
+from api.sockets import presence_notifications
+from api.sockets.presence_broadcaster import (
+    OnlineStatusBroadcaster,
+    PresenceCountBroadcaster,
+)
+from api.sockets.session_manager import MemorySessionRegistry, session_manager
+
+
+@pytest.fixture
+def presence(app):
+    if not extensions.presence_redis:
+        pytest.skip("Redis not available")
+    extensions.presence_redis.flushdb()
+    yield extensions.presence_redis
+    extensions.presence_redis.flushdb()
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        broadcaster_module.socketio,
+        "emit",
+        lambda event, data, room=None, **kwargs: calls.append((event, data, room)),
+    )
+    return calls
+
+
+@pytest.fixture
+def broadcaster():
+    broadcaster = PresenceCountBroadcaster()
+    broadcaster._started = True  # Flush by hand instead of on a tick
+    return broadcaster
+
+
+class TestPresenceCounts:
+    """Test the pipelined count reads"""
+
+    def test_bulk_counts(self, presence):
+        PresenceService.join_room(1, 10)
+        PresenceService.join_room(1, 11)
+        PresenceService.join_session(5, 10)
+
+        room_counts, session_counts = PresenceService.get_presence_counts(
+            room_ids=[1, 2], session_ids=[5]
+        )
+
+        assert room_counts == {1: 2, 2: 0}
+        assert session_counts == {5: 1}
+        assert PresenceService.get_room_user_counts([1]) == {1: 2}
+
+
+class TestCoalescing:
+    """Test that marks collapse into one broadcast per target"""
+
+    def test_many_joins_one_broadcast(self, presence, emitted, broadcaster):
+        for user_id in range(50):
+            PresenceService.join_room(7, user_id)
+            broadcaster.mark_room(7, event_id=3)
+
+        assert emitted == []
+        assert broadcaster.flush() == 1
+
+        assert emitted == [
+            ("room_user_count", {"room_id": 7, "user_count": 50}, "room_7"),
+            ("room_user_count", {"room_id": 7, "user_count": 50}, "event_3_admin"),
+        ]
+        assert broadcaster.flush() == 0
+
+    def test_event_remembered_for_later_marks(self, presence, emitted, broadcaster):
+        broadcaster.mark_room(8, event_id=4)
+        broadcaster.flush()
+        emitted.clear()
+
+        broadcaster.mark_room(8)  # e.g. from disconnect cleanup
+        broadcaster.flush()
+
+        assert [room for _, _, room in emitted] == ["room_8", "event_4_admin"]
+
+    def test_sessions(self, presence, emitted, broadcaster):
+        PresenceService.join_session(9, 1)
+        broadcaster.mark_session(9)
+        broadcaster.mark_session(9)
+
+        broadcaster.flush()
+
+        assert emitted == [
+            ("session_viewer_count", {"session_id": 9, "viewer_count": 1}, "session_9")
+        ]
+
+
+class TestRoomCountSnapshot:
+    """Test the single-event admin snapshot"""
+
+    def test_snapshot_and_room_index(self, db, presence, emitted, monkeypatch, event_factory):
+        monkeypatch.setattr(presence_notifications, "socketio", broadcaster_module.socketio)
+        event = event_factory()
+        rooms = [
+            ChatRoom(event_id=event.id, name=f"Room {i}", room_type=ChatRoomType.GLOBAL)
+            for i in range(3)
+        ]
+        db.session.add_all(rooms)
+        db.session.commit()
+        PresenceService.join_room(rooms[0].id, 1)
+        PresenceService.join_room(rooms[0].id, 2)
+        PresenceService.join_room(rooms[2].id, 1)
+
+        presence_notifications.emit_all_room_counts_for_event(event.id, to="admin-sid")
+
+        ((name, data, room),) = emitted
+        assert name == "room_user_counts"
+        assert room == "admin-sid"
+        counts = {c["room_id"]: c["user_count"] for c in data["counts"]}
+        assert counts == {rooms[0].id: 2, rooms[1].id: 0, rooms[2].id: 1}
+
+        new_room = ChatRoomService.create_event_chat_room(
+            event.id, {"name": "Late addition", "room_type": "GLOBAL"}, user_id=None
+        )
+
+        assert new_room.id in ChatRoomService.get_event_room_ids(event.id)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MemorySessionRegistry()
+    monkeypatch.setattr(session_manager, "registry", registry)
+    return registry
+
+
+@pytest.fixture
+def status_broadcaster(app):
+    broadcaster = OnlineStatusBroadcaster()
+    broadcaster._started = True  # Flush by hand instead of on a tick
+    return broadcaster
+
+
+class TestOnlineStatus:
+    """Test online status audience fan-out"""
+
+    def test_batched_to_audience(
+        self, db, emitted, registry, status_broadcaster, user_factory, event_factory
+    ):
+        me, friend, stranger = user_factory(), user_factory(), user_factory()
+        event = event_factory()
+        event.add_user(me, EventUserRole.ATTENDEE)
+        db.session.add(
+            Connection(
+                requester_id=me.id,
+                recipient_id=friend.id,
+                status=ConnectionStatus.ACCEPTED,
+                icebreaker_message="hi",
+            )
+        )
+        db.session.commit()
+
+        for user in (me, friend):
+            registry.add(f"sid-{user.id}", user.id)
+            status_broadcaster.mark(user.id, True)
+
+        assert status_broadcaster.flush() == 2
+
+        rooms = {room: data["statuses"] for _, data, room in emitted}
+        assert set(rooms) == {f"user_{me.id}", f"user_{friend.id}", f"event_{event.id}"}
+        # Each user hears about the other in a single batched event
+        assert {s["user_id"] for s in rooms[f"user_{friend.id}"]} == {me.id, friend.id}
+        assert f"user_{stranger.id}" not in rooms
+
+    def test_flap_is_not_broadcast(self, db, emitted, registry, status_broadcaster, user_factory):
+        me = user_factory()
+
+        registry.add("a", me.id)
+        status_broadcaster.mark(me.id, True)
+        registry.remove("a")
+        status_broadcaster.mark(me.id, False)
+
+        assert status_broadcaster.flush() == 0
+        assert emitted == []
+
+    def test_audience_refreshed_on_connection_change(self, db, user_factory):
+        me, friend = user_factory(), user_factory()
+        connection = Connection(
+            requester_id=friend.id,
+            recipient_id=me.id,
+            status=ConnectionStatus.PENDING,
+            icebreaker_message="hi",
+        )
+        db.session.add(connection)
+        db.session.commit()
+
+        assert OnlineStatusService.get_audience(me.id) == [f"user_{me.id}"]
+
+        ConnectionService.update_connection_status(
+            connection.id, me.id, ConnectionStatus.ACCEPTED
+        )
+
+        assert f"user_{friend.id}" in OnlineStatusService.get_audience(me.id)
+
+
+class TestTickingBroadcaster:
+    """Test the flush loop base class"""
+
+    def test_subclass_without_flush_fails_on_creation(self):
+        class Incomplete(broadcaster_module._TickingBroadcaster):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
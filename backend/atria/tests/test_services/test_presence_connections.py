@@ -0,0 +1,95 @@
+"""
+Tests for per-connection refcounted presence.
+
+A user with several sockets open is in a room while any of them is, and
+leaves (triggering count updates and the offline status) only when the last
+one goes.
+"""
+import pytest
+
+from api import extensions
+from api.services.presence_service import PresenceService
+from api.sockets import presence_notifications
+
+
+@pytest.fixture
+def presence(app):
+    if not extensions.presence_redis:
+        pytest.skip("Redis not available")
+    extensions.presence_redis.flushdb()
+    yield extensions.presence_redis
+    extensions.presence_redis.flushdb()
+
+
+@pytest.fixture
+def notified(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        presence_notifications,
+        "emit_room_user_count",
+        lambda room_id, event_id=None: calls.append(("room", room_id)),
+    )
+    monkeypatch.setattr(
+        presence_notifications,
+        "emit_session_viewer_count",
+        lambda session_id: calls.append(("session", session_id)),
+    )
+    monkeypatch.setattr(
+        presence_notifications,
+        "emit_user_online_status",
+        lambda user_id, is_online: calls.append(("online", is_online)),
+    )
+    return calls
+
+
+class TestConnectionRefcounts:
+    """Test join/leave per connection"""
+
+    def test_second_tab_does_not_rejoin(self, presence):
+        PresenceService.register_connection("a", 1)
+        PresenceService.register_connection("b", 1)
+
+        assert PresenceService.join_room_for_connection("a", 5, 1) == (True, 1)
+        assert PresenceService.join_room_for_connection("b", 5, 1) == (False, 1)
+        # Joining twice from the same tab is not a second reference
+        assert PresenceService.join_room_for_connection("a", 5, 1) == (False, 1)
+
+        assert PresenceService.leave_room_for_connection("a", 5, 1) == (False, 1)
+        assert PresenceService.is_user_in_room(5, 1)
+        assert PresenceService.leave_room_for_connection("b", 5, 1) == (True, 0)
+        assert PresenceService.get_user_rooms(1) == set()
+
+    def test_release_keeps_rooms_held_by_other_tabs(self, presence):
+        for sid in ("a", "b"):
+            PresenceService.register_connection(sid, 1)
+        PresenceService.join_room_for_connection("a", 5, 1)
+        PresenceService.join_room_for_connection("b", 5, 1)
+        PresenceService.join_room_for_connection("a", 6, 1)
+
+        released = PresenceService.release_connection("a")
+
+        assert released.user_id == 1
+        assert released.rooms == {6}
+        assert not released.last_connection
+        assert PresenceService.get_user_rooms(1) == {5}
+        assert not presence.exists(PresenceService._get_connection_key("a"))
+
+        assert PresenceService.release_connection("b", 1).last_connection
+        assert PresenceService.get_room_user_count(5) == 0
+
+
+class TestDisconnectCleanup:
+    """Test cleanup_user_presence with a sid"""
+
+    def test_only_last_connection_notifies(self, presence, notified):
+        for sid in ("a", "b"):
+            PresenceService.register_connection(sid, 1)
+            PresenceService.join_room_for_connection(sid, 5, 1)
+
+        presence_notifications.cleanup_user_presence(1, sid="a")
+        assert notified == []
+        assert PresenceService.is_user_in_room(5, 1)
+
+        presence_notifications.cleanup_user_presence(1, sid="b")
+        assert notified == [("room", 5), ("online", False)]
+        assert not PresenceService.is_user_in_room(5, 1)
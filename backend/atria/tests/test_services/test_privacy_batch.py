@@ -0,0 +1,92 @@
+"""
+Tests for batch privacy filtering.
+
+filter_users_batch must return exactly what filter_user_data returns user by
+user, with a fixed number of queries however many users are filtered.
+"""
+from sqlalchemy import event as sa_event
+
+from api.models import Connection, EventUser
+from api.models.enums import ConnectionStatus, EventUserRole
+from api.services.privacy import PrivacyService
+
+
+def setup_directory(db, user_factory, event_factory, size=6):
+    viewer = user_factory()
+    event = event_factory()
+    event.add_user(viewer, EventUserRole.ATTENDEE)
+
+    users = [user_factory() for _ in range(size)]
+    for i, user in enumerate(users):
+        event.add_user(user, EventUserRole.SPEAKER if i % 3 == 0 else EventUserRole.ATTENDEE)
+    users[0].privacy_settings = {"email_visibility": "event_attendees", "show_bio": False}
+    users[1].privacy_settings = {"email_visibility": "CONNECTIONS_ORGANIZERS"}
+    users[2].privacy_settings = {"show_social_links": "HIDDEN", "allow_connection_requests": "NONE"}
+    db.session.add(
+        Connection(
+            requester_id=viewer.id,
+            recipient_id=users[1].id,
+            status=ConnectionStatus.ACCEPTED,
+            icebreaker_message="Hi",
+        )
+    )
+    db.session.commit()
+
+    EventUser.query.filter_by(event_id=event.id, user_id=users[3].id).update(
+        {"privacy_overrides": {"email_visibility": "HIDDEN", "show_company": False}}
+    )
+    db.session.commit()
+
+    pairs = [
+        (user, EventUser.query.filter_by(event_id=event.id, user_id=user.id).first())
+        for user in [viewer] + users
+    ]
+    return viewer, event, pairs
+
+
+class TestFilterUsersBatch:
+    """Test filter_users_batch against filter_user_data"""
+
+    def test_matches_single_user_filtering(self, db, user_factory, event_factory):
+        viewer, event, pairs = setup_directory(db, user_factory, event_factory)
+
+        batch = PrivacyService.filter_users_batch(viewer, pairs, event.id)
+
+        expected = [
+            PrivacyService.filter_user_data(
+                user, PrivacyService.get_viewer_context(user, viewer, event.id), event.id
+            )
+            for user, _ in pairs
+        ]
+        assert batch == expected
+        assert batch[2]["email"] == pairs[2][0].email  # Connected
+        assert batch[4]["email"] is None  # Event override hides it
+        assert batch[1]["event_role"] == EventUserRole.SPEAKER.value
+
+    def test_fixed_query_count(self, db, user_factory, event_factory):
+        counts = []
+        for size in (4, 12):
+            viewer, event, pairs = setup_directory(db, user_factory, event_factory, size)
+            pairs = [(user, event_user) for user, event_user in pairs if user.id != viewer.id]
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            sa_event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                PrivacyService.filter_users_batch(viewer, pairs, event.id)
+            finally:
+                sa_event.remove(db.engine, "before_cursor_execute", record)
+            counts.append(len(statements))
+
+        # Viewer membership + connections, regardless of directory size
+        assert counts == [2, 2]
+
+    def test_rules_are_shared(self):
+        first = PrivacyService.get_rules({"show_bio": False, "email_visibility": "hidden"})
+        second = PrivacyService.get_rules({"email_visibility": "hidden", "show_bio": False})
+
+        assert first is second
+        assert first.email_visibility == "HIDDEN"
+        assert first.show_social_links == "EVENT_ATTENDEES"
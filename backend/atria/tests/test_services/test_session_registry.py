@@ -0,0 +1,137 @@
+"""
+Tests for the socket session registry.
+
+Both backends must agree on per-process behaviour; the Redis backend must
+also answer cluster-wide questions for sids registered by other workers, and
+drop the sids of workers that died without disconnecting them.
+"""
+import time
+
+import pytest
+
+from api import extensions
+from api.sockets import sweep_dead_socket_workers
+from api.sockets.session_manager import (
+    MemorySessionRegistry,
+    RedisSessionRegistry,
+    SessionManager,
+)
+
+
+@pytest.fixture
+def presence(app):
+    if not extensions.presence_redis:
+        pytest.skip("Redis not available")
+    extensions.presence_redis.flushdb()
+    yield extensions.presence_redis
+    extensions.presence_redis.flushdb()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def manager(request, app):
+    if request.param == "redis":
+        request.getfixturevalue("presence")
+        return SessionManager(RedisSessionRegistry(extensions.presence_redis))
+    return SessionManager(MemorySessionRegistry())
+
+
+class TestSessionManager:
+    """Test behaviour shared by both backends"""
+
+    def test_connection_lifecycle(self, manager):
+        assert manager.authenticate("a", "7") is True
+        assert manager.authenticate("b", 7) is False
+
+        assert manager.is_authenticated("a")
+        assert manager.get_user_id("a") == 7
+        assert manager.get_user_sids(7) == {"a", "b"}
+        assert manager.online_user_count() == 1
+
+        assert manager.remove_session("a") is False
+        assert manager.remove_session("b") is True
+        assert not manager.is_user_online(7)
+        assert manager.online_user_count() == 0
+
+    def test_cleanup_inactive(self, manager):
+        manager.authenticate("old", 1)
+        manager.authenticate("new", 2)
+        manager.registry.sessions["old"][1] = time.time() - 2 * 3600
+        if isinstance(manager.registry, RedisSessionRegistry):
+            manager.registry.redis.zadd("sockets:active", {"old": time.time() - 2 * 3600})
+
+        assert manager.cleanup_inactive(timeout_hours=1) == 1
+        assert not manager.is_authenticated("old")
+        assert manager.is_authenticated("new")
+        assert manager.online_user_count() == 1
+
+
+class TestRedisRegistry:
+    """Test cluster-wide views across two workers"""
+
+    def test_sees_other_workers(self, presence):
+        worker_a = SessionManager(RedisSessionRegistry(presence))
+        worker_b = SessionManager(RedisSessionRegistry(presence))
+
+        assert worker_a.authenticate("a1", 1) is True
+        assert worker_b.authenticate("b1", 1) is False
+        worker_b.authenticate("b2", 2)
+
+        assert worker_a.online_user_count() == 2
+        assert worker_a.get_user_sids(1) == {"a1", "b1"}
+        # Only the owning worker treats the sid as one of its sockets
+        assert not worker_a.is_authenticated("b1")
+        assert worker_a.get_user_id("b1") == 1
+
+        assert worker_b.remove_session("b1") is False
+        assert worker_a.remove_session("a1") is True
+        assert worker_b.online_user_count() == 1
+
+    def test_activity_is_batched(self, presence):
+        manager = SessionManager(RedisSessionRegistry(presence))
+        manager.authenticate("a", 1)
+        before = presence.zscore("sockets:active", "a")
+
+        for _ in range(5):
+            manager.update_activity("a")
+
+        assert presence.zscore("sockets:active", "a") == before
+        assert manager.flush_activity() == 1
+        assert presence.zscore("sockets:active", "a") >= before
+        assert manager.flush_activity() == 0
+
+    def test_flush_does_not_resurrect_removed_sid(self, presence):
+        manager = SessionManager(RedisSessionRegistry(presence))
+        manager.authenticate("a", 1)
+        manager.update_activity("a")
+        manager.registry.remove("a")
+        manager.registry._pending_activity["a"] = time.time()
+
+        manager.flush_activity()
+
+        assert presence.zscore("sockets:active", "a") is None
+
+    def test_dead_worker_sids_are_swept(self, app, presence, monkeypatch):
+        dead = SessionManager(RedisSessionRegistry(presence))
+        alive = SessionManager(RedisSessionRegistry(presence))
+        dead.authenticate("d1", 1)
+        dead.authenticate("d2", 2)
+        alive.authenticate("a1", 2)
+
+        # Killed: its liveness key lapses without it disconnecting anything
+        presence.delete(RedisSessionRegistry._worker_alive_key(dead.registry.worker_id))
+        alive.flush_activity()
+
+        offline = []
+        monkeypatch.setattr(
+            "api.sockets.presence_notifications.emit_user_online_status",
+            lambda user_id, is_online: offline.append((user_id, is_online)),
+        )
+        sweep_dead_socket_workers(app)
+
+        assert offline == [(1, False)]
+        assert alive.online_user_count() == 1
+        assert alive.get_user_sids(2) == {"a1"}
+        assert dead.registry.worker_id not in presence.smembers("sockets:workers")
+        assert alive.sweep_dead_workers() == set()
+        # The user's next connect is their first again
+        assert alive.authenticate("a2", 1) is True
@@ -0,0 +1,192 @@
+"""
+Tests for the cached event schedule.
+
+The session list is served from a versioned cache per audience, must show
+every viewer exactly what per-request privacy filtering showed them, move to
+a new version on session or speaker changes, and answer polling clients with
+304 Not Modified.
+"""
+from contextlib import contextmanager
+from datetime import time
+
+import pytest
+from flask_jwt_extended import create_access_token, verify_jwt_in_request
+from sqlalchemy import event as sa_event
+
+from api import extensions
+from api.models import Connection, Session
+from api.models.enums import ConnectionStatus, EventUserRole, SessionStatus, SessionType
+from api.schemas import SessionAdminListSchema
+from api.services.cache_service import CacheKeys, CacheService
+from api.services.session import SessionService
+
+
+@contextmanager
+def as_viewer(app, viewer, query_string=""):
+    token = create_access_token(identity=str(viewer.id))
+    with app.test_request_context(
+        f"/api/events/1/sessions?{query_string}",
+        headers={"Authorization": f"Bearer {token}"},
+    ):
+        verify_jwt_in_request()
+        yield
+
+
+def list_sessions(app, viewer, event_id, query_string="", day_number=None):
+    with as_viewer(app, viewer, query_string):
+        return SessionService.get_event_sessions(
+            event_id, day_number, SessionAdminListSchema(many=True)
+        )
+
+
+def uncached_sessions(app, viewer, event_id):
+    """What the endpoint returned before caching: privacy filtered per request"""
+    with as_viewer(app, viewer):
+        return SessionAdminListSchema(many=True).dump(SessionService.get_event_sessions(event_id))
+
+
+def add_session(db, event, title, day_number=1, hour=10):
+    session = Session(
+        event_id=event.id,
+        title=title,
+        status=SessionStatus.SCHEDULED,
+        session_type=SessionType.PRESENTATION,
+        start_time=time(hour),
+        end_time=time(hour, 30),
+        day_number=day_number,
+    )
+    db.session.add(session)
+    db.session.commit()
+    return session
+
+
+@pytest.fixture
+def schedule(db, user_factory, event_factory):
+    if extensions.cache_redis is None:
+        pytest.skip("Redis not available")
+    organizer, attendee, open_speaker, private_speaker = (user_factory() for _ in range(4))
+    private_speaker.privacy_settings = {
+        "show_company": False,
+        "show_social_links": "CONNECTIONS",
+    }
+    event = event_factory(end_date=event_factory.build().start_date)
+    event.add_user(organizer, EventUserRole.ORGANIZER)
+    event.add_user(attendee, EventUserRole.ATTENDEE)
+    event.add_user(open_speaker, EventUserRole.SPEAKER)
+    event.add_user(private_speaker, EventUserRole.SPEAKER)
+    db.session.commit()
+
+    keynote = add_session(db, event, "Keynote")
+    panel = add_session(db, event, "Panel", hour=11)
+    keynote.add_speaker(open_speaker)
+    panel.add_speaker(open_speaker)
+    panel.add_speaker(private_speaker)
+    db.session.commit()
+    CacheService.bump_version(CacheKeys.event_sessions_version(event.id))
+    return event, organizer, attendee, open_speaker, private_speaker
+
+
+def count_statements(db, func):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sa_event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        result = func()
+    finally:
+        sa_event.remove(db.engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+class TestScheduleCache:
+    """Test SessionService.get_event_sessions with a schema"""
+
+    def test_every_viewer_sees_what_they_saw_before(self, app, db, schedule):
+        event, organizer, attendee, open_speaker, private_speaker = schedule
+        db.session.add(
+            Connection(
+                requester_id=attendee.id,
+                recipient_id=private_speaker.id,
+                status=ConnectionStatus.ACCEPTED,
+                icebreaker_message="Hi",
+            )
+        )
+        db.session.commit()
+
+        for viewer in (organizer, attendee, open_speaker, private_speaker):
+            result = list_sessions(app, viewer, event.id)
+            assert result["sessions"] == uncached_sessions(app, viewer, event.id)
+
+        panel = list_sessions(app, open_speaker, event.id)["sessions"][1]
+        hidden = next(s for s in panel["session_speakers"] if s["user_id"] == private_speaker.id)
+        assert hidden["company_name"] is None
+        assert hidden["social_links"] is None
+
+    def test_cached_page_only_looks_up_connections(self, app, db, schedule):
+        event, organizer, *_ = schedule
+
+        with as_viewer(app, organizer, "per_page=1&page=2"):
+            schema = SessionAdminListSchema(many=True)
+            SessionService.get_event_sessions(event.id, None, schema)
+            result, queries = count_statements(
+                db, lambda: SessionService.get_event_sessions(event.id, None, schema)
+            )
+
+        assert [s["title"] for s in result["sessions"]] == ["Panel"]
+        assert result["total_items"] == 2
+        assert result["total_pages"] == 2
+        assert "prev" in result and "next" not in result
+        # Only the viewer's connections to the connections-only speaker
+        assert queries == 1
+
+    def test_changes_bump_the_version(self, app, db, schedule, user_factory):
+        event, organizer, attendee, open_speaker, _ = schedule
+        list_sessions(app, attendee, event.id)
+
+        newcomer = user_factory()
+        event.add_user(newcomer, EventUserRole.SPEAKER)
+        db.session.commit()
+        keynote = Session.query.filter_by(event_id=event.id, title="Keynote").one()
+        SessionService.add_speaker_to_session(keynote.id, newcomer.id)
+
+        keynote_data = list_sessions(app, attendee, event.id)["sessions"][0]
+        assert newcomer.id in [s["user_id"] for s in keynote_data["session_speakers"]]
+
+        SessionService.update_session(keynote.id, {"title": "Opening keynote"})
+        titles = [s["title"] for s in list_sessions(app, attendee, event.id)["sessions"]]
+        assert titles == ["Opening keynote", "Panel"]
+
+    def test_day_filter(self, app, db, schedule):
+        event, organizer, *_ = schedule
+        add_session(db, event, "Day two", day_number=2)
+        CacheService.bump_version(CacheKeys.event_sessions_version(event.id))
+
+        result = list_sessions(app, organizer, event.id, day_number=2)
+        assert [s["title"] for s in result["sessions"]] == ["Day two"]
+
+
+class TestScheduleEtag:
+    """Test conditional GETs on the session list"""
+
+    def test_not_modified_until_schedule_changes(self, app, client, db, schedule):
+        event, organizer, attendee, *_ = schedule
+        with app.app_context():
+            token = create_access_token(identity=str(attendee.id))
+        headers = {"Authorization": f"Bearer {token}"}
+        url = f"/api/events/{event.id}/sessions"
+
+        first = client.get(url, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        again = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert again.status_code == 304
+
+        keynote = Session.query.filter_by(event_id=event.id, title="Keynote").one()
+        SessionService.update_session(keynote.id, {"title": "Opening keynote"})
+
+        changed = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
@@ -0,0 +1,131 @@
+"""
+Tests for the socket connect path.
+
+Connect must join event rooms from a cached per-user list (invalidated on
+membership and ban changes) and refuse connects beyond the admission rate,
+where anonymous connects can't use up authenticated users' admissions.
+"""
+import pytest
+from flask import request
+from flask_jwt_extended import create_access_token
+
+from api.models.enums import EventUserRole
+from api.services.event_user import EventUserService
+from api.services.moderation import ModerationService
+from api.sockets import admission as admission_module
+from api.sockets.admission import ConnectionAdmission, anonymous_admission, connection_admission
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission_module.time, "monotonic", clock)
+    return clock
+
+
+class TestConnectionAdmission:
+    """Test the connect token bucket"""
+
+    def test_burst_then_refuse_then_recover(self, clock):
+        limiter = ConnectionAdmission(rate=10, burst=3)
+
+        assert [limiter.admit() for _ in range(3)] == [None, None, None]
+        retry_after = limiter.admit()
+        assert retry_after is not None and retry_after >= 1
+        assert limiter.stats()["in_storm"]
+
+        clock.now += 0.1  # One token at 10/s
+        assert limiter.admit() is None
+
+        stats = limiter.stats()
+        assert stats["admitted"] == 4
+        assert stats["rejected"] == 1
+        assert stats["storms"] == 1
+        assert not stats["in_storm"]
+
+    def test_zero_rate_disables(self):
+        limiter = ConnectionAdmission(rate=0, burst=0)
+
+        assert all(limiter.admit() is None for _ in range(100))
+
+
+@pytest.fixture
+def small_buckets(clock):
+    """Tiny connect buckets that don't refill during the test"""
+    saved = [(limiter, limiter.rate, limiter.burst) for limiter in (connection_admission, anonymous_admission)]
+    connection_admission.configure(rate=1, burst=2)
+    anonymous_admission.configure(rate=1, burst=1)
+    yield
+    for limiter, rate, burst in saved:
+        limiter.configure(rate, burst)
+
+
+@pytest.fixture
+def connect(app, monkeypatch):
+    """Run the connect handler for a new socket; returns the events it emitted, or None if refused"""
+    import api.sockets as sockets_module
+    from flask_socketio import ConnectionRefusedError
+
+    emitted = []
+    monkeypatch.setattr(sockets_module, "emit", lambda event, *args, **kwargs: emitted.append(event))
+    monkeypatch.setattr(sockets_module, "join_room", lambda room: None)
+    sids = iter(range(1000))
+
+    def run(auth=None):
+        emitted.clear()
+        with app.test_request_context("/socket.io/"):
+            request.sid, request.namespace = f"sid-{next(sids)}", "/"
+            try:
+                sockets_module.handle_connect(auth)
+            except ConnectionRefusedError:
+                return None
+        return list(emitted)
+
+    return run
+
+
+class TestConnectAdmission:
+    """Test admission in the connect handler"""
+
+    def test_anonymous_connects_do_not_lock_out_users(self, app, db, user_factory, small_buckets, connect):
+        user = user_factory()
+        with app.app_context():
+            token = create_access_token(identity=str(user.id))
+
+        anonymous = [connect() for _ in range(3)]
+        forged = connect({"token": "not-a-jwt"})
+        authenticated = [connect({"token": token}) for _ in range(3)]
+
+        assert anonymous == [["auth_required"], None, None]
+        assert forged is None
+        assert authenticated == [["connection_success"], ["connection_success"], None]
+
+
+class TestUserEventIds:
+    """Test the cached event list used on connect"""
+
+    def test_invalidated_on_membership_and_ban(self, db, user_factory, event_factory):
+        admin, user = user_factory(), user_factory()
+        first, second = event_factory(), event_factory()
+        first.add_user(admin, EventUserRole.ADMIN)
+        first.add_user(user, EventUserRole.ATTENDEE)
+        db.session.commit()
+
+        assert EventUserService.get_user_event_ids(user.id) == [first.id]
+
+        EventUserService.add_user_to_event(
+            second.id, {"user_id": user.id, "role": EventUserRole.ATTENDEE}
+        )
+        assert EventUserService.get_user_event_ids(user.id) == sorted([first.id, second.id])
+
+        ModerationService.ban_user_from_event(first.id, user.id, {"reason": "spam"}, admin.id)
+        assert EventUserService.get_user_event_ids(user.id) == [second.id]
+
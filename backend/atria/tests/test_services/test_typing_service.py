@@ -0,0 +1,56 @@
+"""
+Tests for TypingService.
+
+Disconnect cleanup must go through the user -> typing keys reverse index
+rather than scanning the keyspace, and only ever touch that user's entries.
+"""
+import pytest
+
+from api import extensions
+from api.services.typing_service import TypingService
+
+
+@pytest.fixture
+def presence(app):
+    if not extensions.presence_redis:
+        pytest.skip("Redis not available")
+    extensions.presence_redis.flushdb()
+    yield extensions.presence_redis
+    extensions.presence_redis.flushdb()
+
+
+class TestTypingIndex:
+    """Test the reverse index kept by set_typing_*"""
+
+    def test_index_follows_typing_state(self, presence):
+        TypingService.set_typing_in_room(1, 10, True)
+        TypingService.set_typing_in_dm(2, 10, True)
+
+        assert presence.smembers("typing:user:10") == {"typing:room:1", "typing:dm:2"}
+        assert 0 < presence.ttl("typing:user:10") <= TypingService.TYPING_TTL
+        assert TypingService.is_user_typing_in_room(1, 10)
+
+        TypingService.set_typing_in_room(1, 10, False)
+
+        assert presence.smembers("typing:user:10") == {"typing:dm:2"}
+        assert TypingService.get_typing_users_in_room(1) == []
+
+
+class TestCleanupUserTyping:
+    """Test disconnect cleanup"""
+
+    def test_cleans_only_that_user_without_scanning(self, presence, monkeypatch):
+        TypingService.set_typing_in_room(1, 10, True)
+        TypingService.set_typing_in_dm(2, 10, True)
+        TypingService.set_typing_in_room(1, 11, True)
+
+        def no_scan(*args, **kwargs):
+            raise AssertionError("cleanup must not scan the keyspace")
+
+        monkeypatch.setattr(presence, "scan_iter", no_scan)
+
+        assert TypingService.cleanup_user_typing(10) == 2
+        assert [u["user_id"] for u in TypingService.get_typing_users_in_room(1)] == [11]
+        assert TypingService.get_typing_users_in_dm(2) == []
+        assert not presence.exists("typing:user:10")
+        assert TypingService.cleanup_user_typing(10) == 0
@@ -17,6 +17,7 @@ import type {
   ChatRoomCreatedPayload,
   ChatRoomUpdatedPayload,
   RoomUserCountPayload,
+  RoomUserCountsPayload,
   UserJoinedRoomPayload,
   UserLeftRoomPayload,
   ChatRoomsPayload,
@@ -149,6 +150,17 @@ export const initializeSocket = (token: string | null = null): Socket | null =>
       description: (error as { description?: string }).description,
       type: (error as { type?: string }).type,
     });
+
+    // Refused by the server's admission limiter (reconnect storm). Socket.IO
+    // doesn't auto-retry server refusals, so come back after the given delay.
+    const retryAfter = (error as { data?: { retry_after?: number } }).data?.retry_after;
+    if (retryAfter) {
+      setTimeout(() => {
+        if (socket && !socket.connected) {
+          socket.connect();
+        }
+      }, retryAfter * 1000);
+    }
   });
 
   socket.on('connect', () => {
@@ -736,6 +748,24 @@ export const initializeSocket = (token: string | null = null): Socket | null =>
     }
   });
 
+  // Admin panel snapshot: one event carrying every room's count
+  socket.on('room_user_counts', (data: RoomUserCountsPayload) => {
+    if (!data || !Array.isArray(data.counts)) return;
+
+    data.counts.forEach(({ room_id, user_count }) => {
+      const roomId = parseInt(String(room_id));
+      const callback = roomPresenceCallbacks.get(roomId);
+
+      if (callback) {
+        callback({
+          type: 'user_count_update',
+          room_id: roomId,
+          user_count,
+        });
+      }
+    });
+  });
+
   // Typing indicator events
   socket.on('typing_in_dm', (data: TypingInDMPayload) => {
     console.log('⌨️ Typing in DM:', data);
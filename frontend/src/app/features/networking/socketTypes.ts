@@ -57,6 +57,7 @@ export type ServerToClientEvent =
   | 'chat_room_created'
   | 'chat_room_updated'
   | 'room_user_count'
+  | 'room_user_counts'
   | 'user_joined_room'
   | 'user_left_room'
   | 'chat_rooms'
@@ -159,6 +160,12 @@ export type RoomUserCountPayload = {
   user_count: number;
 };
 
+/** Snapshot of every room's user count in an event (sent on join_event_admin) */
+export type RoomUserCountsPayload = {
+  event_id: number;
+  counts: RoomUserCountPayload[];
+};
+
 /** User joined room payload */
 export type UserJoinedRoomPayload = {
   room_id: number;